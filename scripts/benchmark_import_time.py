@@ -0,0 +1,81 @@
+################################################################################
+# Module:      benchmark_import_time.py
+# Description: Import time of mosaic_framework, as paid by a cold start. Parses
+#              the report of python -X importtime, exits with an error if the
+#              import is slower than a threshold or loads lazy dependencies.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from typing import List, Tuple
+import subprocess
+import argparse
+import sys
+import re
+
+#Dependencies that must be imported just when they are used.
+LAZY_MODULES = ['boto3', 'botocore', 'requests', 'openpyxl', 'pkg_resources']
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)$")
+
+def get_import_times(module:str) -> List[Tuple[str, int, int, int]]:
+    """
+    Import a module in a new interpreter, with -X importtime.
+    ---\n
+    params:
+    module: str - Module to import.
+    ---\n
+    returns:
+    List[Tuple[str, int, int, int]] - Each imported module: name, self and cumulative time (us), depth.
+    """
+    stderr = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, check=True).stderr
+    times  = list()
+    for line in stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match is not None:
+            times.append((match.group(4), int(match.group(1)), int(match.group(2)), len(match.group(3))//2))
+    #Modules imported by the interpreter startup come before 'site', they are not part of the import.
+    startup = [i for i, m in enumerate(times) if m[0] == 'site' and m[3] == 0]
+    return times[startup[0]+1:] if len(startup) > 0 else times
+
+def main(module:str, runs:int, top:int, max_ms:float) -> int:
+    #Fastest run, the others are slowed by the OS (eg. cold disk cache).
+    times    = min([get_import_times(module=module) for _ in range(runs)], key=lambda t: sum([m[1] for m in t]))
+    total_ms = sum([m[1] for m in times])/1000
+    imported = set([m[0] for m in times])
+    lazy     = [m for m in LAZY_MODULES if m in imported]
+
+    print(f"\nImport of {module} (best of {runs} runs)")
+    print("---------------------------------")
+    print(f"Total          : {total_ms:.1f} ms")
+    print(f"Modules        : {len(times)} ({len([m for m in imported if m.startswith('mosaic_framework')])} of mosaic_framework)")
+    print(f"Lazy imported  : {lazy if len(lazy) > 0 else 'none'}")
+    print("---------------------------------")
+    print(f"Slowest packages (cumulative):")
+    packages = dict()
+    for name, _, cumulative, depth in times:
+        if depth == 0 or name.startswith('mosaic_framework'):
+            packages[name] = max(packages.get(name, 0), cumulative)
+    for name, cumulative in sorted(packages.items(), key=lambda p: p[1], reverse=True)[:top]:
+        print(f"  {name:<55} {cumulative/1000:>8.1f} ms")
+    print("---------------------------------")
+
+    failed = False
+    if len(lazy) > 0:
+        print(f"FAILED: {lazy} must be imported just when they are used.")
+        failed = True
+    if max_ms is not None and total_ms > max_ms:
+        print(f"FAILED: import takes {total_ms:.1f} ms, more than {max_ms} ms.")
+        failed = True
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import time of mosaic_framework.")
+    parser.add_argument("--module", type=str, default="mosaic_framework.engine.mosaic_engine", help="Module to import.")
+    parser.add_argument("--runs", type=int, default=5, help="Imports measured, the fastest is reported.")
+    parser.add_argument("--top", type=int, default=15, help="Slowest packages listed.")
+    parser.add_argument("--max-ms", type=float, default=None, help="Import time threshold, in ms.")
+    args = parser.parse_args()
+    sys.exit(main(module=args.module, runs=args.runs, top=args.top, max_ms=args.max_ms))
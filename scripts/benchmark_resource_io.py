@@ -0,0 +1,45 @@
+################################################################################
+# Module:      benchmark_resource_io.py
+# Description: Overhead of the MosaicDataStorage for each Resource written and
+#              read, and of Component construction.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+import contextlib
+import argparse
+import timeit
+import io
+import pandas as pd
+
+from mosaic_framework.data_storage.data_storage import MosaicDataStorage
+from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.environment.source import Source
+
+def bench(label:str, fnc, repeat:int) -> None:
+    #Logs of the storage are not part of the overhead.
+    with contextlib.redirect_stdout(io.StringIO()):
+        fnc()
+        elapsed = min(timeit.repeat(fnc, number=repeat, repeat=3))
+    print(f"{label:<45} {elapsed/repeat*1e6:>10.1f} us")
+
+def main(repeat:int) -> None:
+    frame = pd.DataFrame(data={'sampleDate': pd.date_range('2024-01-01', periods=24, freq='h').astype(str), 'temp': range(24)})
+    for backend in ['file', 'memory']:
+        data_storage = MosaicDataStorage(DEBUG=False, backend=backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_storage.allocate()
+        for file_type, data in [('txt', "Model(label='m')"), ('csv', frame), ('npz', frame)]:
+            def io_cycle():
+                data_storage.add_resource(resource=Resource(label=f"bench_{file_type}", data=data, file_type=file_type))
+                data_storage.get_resource(label=f"bench_{file_type}").get_data()
+            bench(f"[{backend}] add + read {file_type} resource", io_cycle, repeat)
+        with contextlib.redirect_stdout(io.StringIO()):
+            data_storage.deallocate()
+    bench("Source construction (file autofill)", lambda: Source(label='bench_source'), repeat)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-resource overhead of the MosaicDataStorage.")
+    parser.add_argument("--repeat", type=int, default=200, help="Iterations of each measure.")
+    main(repeat=parser.parse_args().repeat)
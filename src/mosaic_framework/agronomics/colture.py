@@ -10,8 +10,6 @@ from __future__ import annotations
 from typing import List, TYPE_CHECKING, Any
 from copy import deepcopy
 import dateutil
-import pkgutil
-import importlib
 import datetime
 import os
 import dateutil.parser
@@ -19,12 +17,10 @@ import pandas as pd
 import warnings
 import json
 
-import mosaic_framework
-import mosaic_framework.agronomics
 from mosaic_framework.config.configuration import COLTURE
 from mosaic_framework.components.components import Component
 from mosaic_framework.agronomics.susceptibility import Susceptibility
-from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.engine.class_registry import get_class
 from mosaic_framework.agronomics.exceptions import StartDateValueException
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.data_storage import MosaicDataStorage
@@ -64,23 +60,6 @@ class Colture(Component):
         self.data_storage: MosaicDataStorageType = None
         self.shared_memory: MosaicSharedMemoryType = None
 
-    @staticmethod
-    def get_modules() -> List[Any]:
-        """
-        Dynamically discover and load all modules in the mosaic_framework.retrieving.connectors package.
-
-        Walks through the package to find any Connectors and adds them to a list.
-        Modules are discovered at runtime.
-
-        Returns:
-            List[Any]: List of discovered modules in the connectors path
-        """
-        modules = list()
-        for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.agronomics.__path__, mosaic_framework.agronomics.__name__ + '.'):
-            module = importlib.import_module(module_name)
-            modules.append(module)
-        return modules
-    
     def get_extra_params(self) -> List[str]:
         """
         Retrieve extra parameters not present in the configuration.
@@ -134,7 +113,6 @@ class Colture(Component):
         Raises:
             ClassNotFoundException: If growth model class cannot be found
         """
-        modules = self.get_modules()
         model_type = deepcopy(self.model_type)
         model_type = model_type.replace('_', ' ')
         model_type = model_type.split(' ')
@@ -143,28 +121,25 @@ class Colture(Component):
         growth_model_classname = f"{model_type}GrowthModel"
         print(f"growth_model_classname={growth_model_classname}")
 
-        for m in modules:
-            if hasattr(m, growth_model_classname):
-                cls = getattr(m, growth_model_classname)
-                obj = cls(
-                    data_storage=self.data_storage,
-                    shared_memory=self.shared_memory, 
-                    data_source=self.data_source,
-                    parent=self.label,
-                    colture_data={
-                        'commodity_id': self.commodity_id,
-                        'destination_use_id': self.destination_use_id,
-                        'precocity_id': self.precocity_id,
-                        'stage'       : os.getenv('dev_environment', None),
-                        'model_type'  : self.model_type,
-                        'start_date'  : self.get_start_date(),
-                        'calendar_id' : self.calendar_id,
-                        'policy_type_id': self.policy_type_id,
-                        'planting_id'  : self.planting_id
-                    })
-                print(f'[Colture]: Oggetto creato della classe: {growth_model_classname}.')
-                return obj
-        raise ClassNotFoundException(f"Class: {growth_model_classname} cannot be found in modules available.")
+        cls = get_class(name=growth_model_classname, package='mosaic_framework.agronomics')
+        obj = cls(
+            data_storage=self.data_storage,
+            shared_memory=self.shared_memory, 
+            data_source=self.data_source,
+            parent=self.label,
+            colture_data={
+                'commodity_id': self.commodity_id,
+                'destination_use_id': self.destination_use_id,
+                'precocity_id': self.precocity_id,
+                'stage'       : os.getenv('dev_environment', None),
+                'model_type'  : self.model_type,
+                'start_date'  : self.get_start_date(),
+                'calendar_id' : self.calendar_id,
+                'policy_type_id': self.policy_type_id,
+                'planting_id'  : self.planting_id
+            })
+        print(f'[Colture]: Oggetto creato della classe: {growth_model_classname}.')
+        return obj
     
     def run(self) -> None:
         """
@@ -13,8 +13,6 @@ from typing import List, Any, Dict, TYPE_CHECKING
 from copy import deepcopy
 import datetime
 import pandas as pd
-import pkgutil
-import importlib
 import json
 import os
 
@@ -24,10 +22,8 @@ if TYPE_CHECKING:
     MosaicDataStorageType  = MosaicDataStorage
     MosaicSharedMemoryType = MosaicSharedMemory
 
-import mosaic_framework
-import mosaic_framework.data_layer
 from mosaic_framework.config.data_layer_configuration import PHENOSTAGE_API_URL, INSURTECH_API_URL
-from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.engine.class_registry import get_class
 from mosaic_framework.agronomics.exceptions import DataFormatException
 from mosaic_framework.retrieving.exceptions import DataBridgeConnectionException
 from mosaic_framework.components.sub_component import SubComponent
@@ -61,25 +57,6 @@ class GrowthModel(SubComponent):
         self.stage            = kwargs.get('stage', os.getenv('dev_environment', 'develop'))
         
     
-    @staticmethod
-    def get_modules() -> List[Any]:
-        """
-        Run over mosaic_framework.retrieving.connectors package, find any Connector that is part of the package
-        then add them to a list. Modules are found dynamically at runtime.
-
-        Returns:
-            List[Any]: List of dynamically loaded connector modules from mosaic_framework.data_layer
-        """
-        # Iterate through all modules in package
-        modules = list()
-        for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.data_layer.__path__, mosaic_framework.data_layer.__name__ + '.'):
-            # Import module dynamically
-            module = importlib.import_module(module_name)
-            # Add module to list
-            modules.append(module)
-
-        return modules
-    
     def get_data_retriever_object(self, http_request_type:str="get") -> Any:
         """
         Retrieves the correct data retriever object based on request type and data source.
@@ -93,15 +70,11 @@ class GrowthModel(SubComponent):
         Raises:
             ClassNotFoundException: If matching retriever class cannot be found
         """
-        modules                  = self.get_modules()
         data_retriever_classname = f"{str(http_request_type).capitalize()}{str(self.data_source).capitalize()}"
-        for m in modules:
-            if hasattr(m, data_retriever_classname):
-                cls = getattr(m, data_retriever_classname)
-                obj = cls(stage=self.stage) 
-                print(f'[GrowthModel]: Oggetto creato della classe: {data_retriever_classname}.')
-                return obj
-        raise ClassNotFoundException(f"Class: {data_retriever_classname} cannot be found in modules available.")
+        cls = get_class(name=data_retriever_classname, package='mosaic_framework.data_layer')
+        obj = cls(stage=self.stage) 
+        print(f'[GrowthModel]: Oggetto creato della classe: {data_retriever_classname}.')
+        return obj
     
     def get_sources_to_update(self) -> List[Dict]:
         """
@@ -139,11 +112,11 @@ class GrowthModel(SubComponent):
         components_image         = self.shared_memory.get_variable(key='components_image', error_policy='raise').content
 
         #get the connectors that have as connect_out the parent component (self)
-        parent_connector      = [c for c in connectors if c['connect_in'] == self.parent]
+        parent_connector      = connectors.get_by_connect_in(self.parent)
         if len(parent_connector) != 1:
             raise DataBridgeConnectionException(f"There are no connectors that have '{self.parent}' as input connection.")
         #filtering connectors that have connect_out equal to the parent.
-        c_out_connectors         = [c for c in connectors if c['connect_out'] == parent_connector[0]['connect_out']]
+        c_out_connectors         = connectors.get_by_connect_out(parent_connector[0]['connect_out'])
         #filtering all the connectors found, that have also Source type as connect_in.
         filtered_connectors      = [c for c in c_out_connectors if components_image[c['connect_in']] == 'Source']
         if len(filtered_connectors) == 0:
@@ -282,10 +255,9 @@ class FixedGrowthModel(GrowthModel):
             self.data_storage.replace_resource(new_resource=new_resource)
             #Update the Connector with the new data
             connectors_to_update = self.shared_memory.get_variable(key='connectors').content
-            for i, ctu in enumerate(connectors_to_update):
-                if connectors_to_update[i]['connect_in'] == c['connect_in']:
-                    connectors_to_update[i]['resource'] = new_resource
-                    break
+            for ctu in connectors_to_update.get_by_connect_in(c['connect_in']):
+                ctu['resource'] = new_resource
+                break
             self.shared_memory.update_variable(key='connectors', new_content=connectors_to_update)
         print("[FixedGrowthModel]: Closed.")
         return data
@@ -21,6 +21,7 @@ from mosaic_framework.components.components import Component
 
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.data_storage import MosaicDataStorage
+    from mosaic_framework.data_storage.connector_registry import ConnectorRegistry
     from mosaic_framework.data_storage.shared_memory import MosaicSharedMemory
     MosaicDataStorageType  = MosaicDataStorage
     MosaicSharedMemoryType = MosaicSharedMemory
@@ -54,21 +55,17 @@ class LambdaOutput(Component):
         return data.to_dict('records')
     
     @staticmethod
-    def get_involved_connectors(connectors:List[dict], label:str)->List[dict]:
+    def get_involved_connectors(connectors:ConnectorRegistry, label:str)->List[dict]:
         """
         This method is used to get the connectors involved in the flow, based on the
         label passed.
 
-        :param connectors: List of connectors.
+        :param connectors: Connectors, indexed by their endpoints.
         :param label: Label to filter the connectors.
         :return: List of connectors involved in the flow.
         :rtype: List[dict]
         """
-        involved_connectors = []
-        for i, _ in enumerate(connectors):
-            if connectors[i]['connect_out'] == label:
-                involved_connectors.append(connectors[i])
-        return involved_connectors
+        return connectors.get_by_connect_out(label)
 
     def run(self)->None:
         """
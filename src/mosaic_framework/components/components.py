@@ -12,9 +12,6 @@ from mosaic_framework.components.protocol_component import ProtocolComponent
 from mosaic_framework.components.exceptions import ComponentParameterException
 import mosaic_framework.components.fill_parameter_method 
 
-import inspect
-import re
-
 class Component(ProtocolComponent):
     """
     Component is the basic class that describes objects that are expressed in a python
@@ -120,15 +117,12 @@ class Component(ProtocolComponent):
         returns:  
         None
         """
-        #Find function in fill_parameter_method.py
+        #Find function in fill_parameter_method.py, by name
         def find_fnc(module, fnc_string):
-            # Ispeziona tutte le funzioni definite nel modulo
-            for name, func in inspect.getmembers(module, inspect.isfunction):
-                # Ottieni il codice sorgente della funzione
-                source = inspect.getsource(func)
-                # Cerca la stringa nel codice sorgente della funzione
-                if re.search(fnc_string, source):
-                    return func
+            fnc = getattr(module, fnc_string, None)
+            if not callable(fnc):
+                raise ComponentParameterException(f"Cannot find '{fnc_string}' function to fill default parameters.")
+            return fnc
 
         #pointing to 'params'
         params_config   = self.config['params']
@@ -50,6 +50,16 @@ SOURCE = {
                 "values"  : ["Any"],
                 "optional": True,
                 "default" : "auto"
+            },
+            "datetime_columns":{
+                "values"  : ["all", "auto"],
+                "optional": True,
+                "default" : "all"
+            },
+            "loading":{
+                "values"  : ["resource", "mapped"],
+                "optional": True,
+                "default" : "resource"
             }
     }
 }
@@ -217,6 +227,51 @@ MODEL = {
             "values"  : ['active', 'default'],
             "optional": True,
             "default" : "default"
+        },
+        "rule_pruning": {
+            "values"  : ['active', 'inactive'],
+            "optional": True,
+            "default" : "active"
+        },
+        "results_format": {
+            "values"  : ['auto', 'csv', 'feather', 'npz'],
+            "optional": True,
+            "default" : "auto"
+        },
+        "max_workers": {
+            "values"  : ["Any"],
+            "optional": True,
+            "default" : 1
+        },
+        "evaluation": {
+            "values"  : ['batch', 'streaming', 'incremental'],
+            "optional": True,
+            "default" : "batch"
+        },
+        "chunk_days": {
+            "values"  : ["Any"],
+            "optional": True,
+            "default" : 30
+        },
+        "state_folder": {
+            "values"  : ["Any"],
+            "optional": True,
+            "default" : "state"
+        },
+        "result_cache": {
+            "values"  : ['active', 'inactive'],
+            "optional": True,
+            "default" : "inactive"
+        },
+        "cache_folder": {
+            "values"  : ["Any"],
+            "optional": True,
+            "default" : "cache"
+        },
+        "cache_size": {
+            "values"  : ["Any"],
+            "optional": True,
+            "default" : 512
         }
     },
     "data":{
@@ -339,7 +394,9 @@ WRITERS_MAPPING = {
     "json" : "JsonWriter",
     "csv"  : "CsvWriter",
     "xlsx" : "ExcelWriter",
-    "py"   : "PyWriter"
+    "py"   : "PyWriter",
+    "feather" : "FeatherWriter",
+    "npz"  : "NpzWriter"
 }
 
 READERS_MAPPING = {
@@ -347,14 +404,18 @@ READERS_MAPPING = {
     "json" : "JsonReader",
     "csv"  : "CsvReader",
     "xlsx" : "ExcelReader",
-    "py"   : "PyReader"
+    "py"   : "PyReader",
+    "feather" : "FeatherReader",
+    "npz"  : "NpzReader"
 }
 
 CONVERTERS_MAPPING = {
     "extensions":{
         "json"  : "json",
         "csv"   : "dataframe",
-        "xlsx"  : "xlsx"
+        "xlsx"  : "xlsx",
+        "feather": "dataframe",
+        "npz"   : "dataframe"
     },
     "types"     :{
         "pandas.core.frame.DataFrame": "dataframe",
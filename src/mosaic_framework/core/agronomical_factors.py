@@ -7,14 +7,13 @@
 ################################################################################
 
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, Dict, Tuple, Any, TYPE_CHECKING
 
 
 import re
 import random
 import string
 import pandas as pd
-from copy import deepcopy
 from typing import List
 from warnings import warn
 import time
@@ -26,6 +25,7 @@ if TYPE_CHECKING:
 
 from mosaic_framework.core.protocols import ProtocolAgroRule
 from mosaic_framework.core.exceptions import ColumnNameError
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
 
 from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
 
@@ -200,7 +200,7 @@ class AgroRule(ProtocolAgroRule):
         if self.debug: print(f"Evaluating  : {self.column + ' '*(25-len(self.column))} | {str(type(self))[str(type(self)).rfind('.')+1:-2]}")
         
         self.start_time = time.time()
-        updt_df         = deepcopy(data)
+        updt_df         = get_evaluation_frame(data)
 
         #We want to pre-calculate the 'on_condition', 
         #based on the fact weather it is, or not, a 
@@ -244,7 +244,7 @@ class AgroRule(ProtocolAgroRule):
                         keep_columns.remove(r.column)
             return keep_columns
         
-        final_df = deepcopy(data)
+        final_df = get_evaluation_frame(data)
 
         output_column = self.column if self.validate_column_name(data=data) else None
         
@@ -288,6 +288,113 @@ class AgroRule(ProtocolAgroRule):
         """
         self.rules_hub = rules_hub
 
+    #Columns read from the dataframe, known before evaluation.
+    #Used to build the dependency graph between rules.
+    def get_input_columns(self) -> Optional[List[str]]:
+        """
+        Get the columns the rule reads from the input dataframe, collected from
+        target, on_condition and nested rules. Reflective targets (eg. 'temp[-1]')
+        are mapped to their column, and the column of the rule itself is excluded.
+
+        Returns:
+            Optional[List[str]]: Input column names, None if they are detected only during evaluation
+        """
+        def get_target_columns(target:object) -> Optional[List[str]]:
+            if target is None or target == "None":
+                return []
+            if isinstance(target, str):
+                return [re.sub(r'\[-[1-9]\d*\]$', '', target)]
+            if isinstance(target, AgroRule):
+                nested_columns = target.get_input_columns()
+                return None if nested_columns is None else [target.column]+nested_columns
+            if isinstance(target, List):
+                columns = list()
+                for t in target:
+                    t_columns = get_target_columns(t)
+                    if t_columns is None:
+                        return None
+                    columns.extend(t_columns)
+                return columns
+            return None
+
+        #Nested rules are evaluated by the rule itself,
+        #only their inputs are read from the dataframe.
+        columns = get_target_columns(self.target)
+        nested_rules = [self.on_condition] if isinstance(self.on_condition, AgroRule) else []
+        nested_rules += self.__dict__.get('rules', None) or []
+        nested_rules += self.__dict__.get('reflective_rules', None) or []
+        for r in nested_rules:
+            r_columns = r.get_input_columns() if isinstance(r, AgroRule) else None
+            if columns is None or r_columns is None:
+                return None
+            columns.extend(r_columns)
+        if columns is None:
+            return None
+        return [c for c in dict.fromkeys(columns) if c != self.column]
+
+    #Rows read before the current one, known before evaluation.
+    #Used to evaluate the data in chunks.
+    def get_lag(self) -> Optional[int]:
+        """
+        Get the number of rows, before the current one, the rule reads to evaluate a row,
+        including the ones read by its nested rules (target, on_condition, rules). Reflective
+        rules read their own older results, so they depend on every row from the start of the data.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the rule carries a state from the start of the data
+        """
+        if self.is_reflective:
+            return None
+        nested_rules = [t for t in (self.target if isinstance(self.target, List) else [self.target]) if isinstance(t, AgroRule)]
+        nested_rules += [self.on_condition] if isinstance(self.on_condition, AgroRule) else []
+        nested_rules += self.__dict__.get('rules', None) or []
+        nested_rules += self.__dict__.get('reflective_rules', None) or []
+        lags = [0]
+        for r in nested_rules:
+            r_lag = r.get_lag() if isinstance(r, AgroRule) and str(r.target) != str(self.column) else None
+            if r_lag is None:
+                return None
+            lags.append(r_lag)
+        return max(lags)
+
+    #Rows read before the current one, when the rule goes on from a carried over state.
+    #Used to evaluate new data incrementally.
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Get the number of rows, before the current one, the rule reads to evaluate a row when it
+        goes on from the state carried over by the evaluation of the previous data (see set_carry_over).
+        Same of get_lag for rules that do not carry a state.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the rule cannot go on from a carried over state
+        """
+        return self.get_lag()
+
+    def set_carry_over(self, state:Optional[Dict[str, Any]], row:int, next_rows:Optional[Tuple[int, int]]) -> None:
+        """
+        Set the state the rule goes on from, and the rows whose state is carried over to the next
+        evaluation (see OutputModel). Read during evaluation by the rules that carry a state from
+        the start of the data (get_lag is None) and can go on from it (get_carry_lag is not None).
+
+        Args:
+            state (Optional[Dict[str, Any]]): State of the rule before 'row' (see get_carry_state), None to evaluate from the start of the data
+            row (int): First row to evaluate, rows before it were evaluated with the previous data
+            next_rows (Optional[Tuple[int, int]]): First row kept for the next evaluation and first row it evaluates, None if the state is not carried over
+        """
+        self.carry_state      = state
+        self.carry_row        = row if state is not None else 0
+        self.next_carry_rows  = next_rows
+        self.next_carry_state = None
+
+    def get_carry_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the state of the rule before the first row of the next evaluation (see set_carry_over).
+
+        Returns:
+            Optional[Dict[str, Any]]: State of the rule, as json values, None if the rule does not carry a state
+        """
+        return self.__dict__.get('next_carry_state', None)
+
     #@override print function
     def __str__(self):
         return f'{self.__class__}: | params: {[(k, str(v))  for k, v in (self.__dict__.items())]}'
@@ -7,15 +7,17 @@
 ################################################################################
 
 import re
+import numpy as np
 import pandas as pd
-from copy import deepcopy
-from typing import List, Callable, Dict
+from typing import List, Callable, Dict, Optional
 
-from mosaic_framework.core.math_utils import get_mapped_function
+from mosaic_framework.core.math_utils import get_mapped_function, get_rolling_aggregation
 from mosaic_framework.core.agronomical_factors import AgroRule
 from mosaic_framework.core.reflection import ReflectiveAgroRule
 from mosaic_framework.core.reflection_factors import ReflectiveAgroFactor, ReflectiveSeries
-from mosaic_framework.core.functions import and_rule_over_row, or_rule_over_row
+from mosaic_framework.core.functions import (and_rule_over_row, or_rule_over_row, 
+    and_rule_over_columns, or_rule_over_columns, compile_condition)
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
 
 
 #generic comparative rule
@@ -33,12 +35,19 @@ class ComparativeRule(AgroRule):
         debug (bool, optional): Whether to print debug information or not. Defaults to False.
         condition (str): Express the condition that must be met.
         boolean_mapping (Dict): A dictionary mapping the values of the target column to boolean values.
+        evaluation_mode (str, optional): 'vectorized' applies the condition over the whole column at
+            once, 'reference' applies it value by value. Defaults to 'vectorized'.
     """
 
     def __init__(self, condition:str="", **kwargs) -> None:
         super().__init__(target=kwargs.get('target', None), column=kwargs.get('column', None), is_implicit=kwargs.get('is_implicit', False), debug=kwargs.get('debug', False))
-        self.condition       = self.get_condition(raw_condition=condition) if condition!="" else ""
-        self.boolean_mapping = kwargs.get('boolean_mapping', None)
+        self.condition          = self.get_condition(raw_condition=condition) if condition!="" else ""
+        self.boolean_mapping    = kwargs.get('boolean_mapping', None)
+        self.evaluation_mode    = kwargs.get('evaluation_mode', 'vectorized')
+        self.compiled_condition = None
+
+        if not self.evaluation_mode in ['vectorized', 'reference']:
+            raise ValueError(f"evaluation_mode must be one of: ['vectorized', 'reference']. Found: {self.evaluation_mode}")
 
     #get raw condition like: 'gt0', 'lt0', goet0, 'loet0' as:
     #{'comp': 'gt', val: 0}
@@ -63,6 +72,18 @@ class ComparativeRule(AgroRule):
         val = float(val_match.group()) if val_match else None
 
         return {'comp': comp, 'val': val}
+
+    def get_compiled_condition(self) -> Callable:
+        """
+        This method returns the condition compiled as a single numpy comparison,
+        compiling it on the first request only.
+
+        Returns:
+            Callable applying the condition over an entire column
+        """
+        if self.compiled_condition == None:
+            self.compiled_condition = compile_condition(cond=self.condition)
+        return self.compiled_condition
     
     def to_actual_mapping(self, data:pd.DataFrame) -> pd.DataFrame:
         """
@@ -74,10 +95,17 @@ class ComparativeRule(AgroRule):
         Returns:
             pd.DataFrame with boolean mapping applied
         """
-        updt_data = deepcopy(data)
+        updt_data = get_evaluation_frame(data)
 
         if self.boolean_mapping != None:
-            updt_data[self.column] = updt_data[self.column].apply(lambda x:self.boolean_mapping[x])
+            if self.evaluation_mode == 'reference':
+                updt_data[self.column] = updt_data[self.column].apply(lambda x:self.boolean_mapping[x])
+            else:
+                #Same KeyError of the reference mode, if any value is not mapped.
+                not_mapped = [v for v in updt_data[self.column].unique() if not v in self.boolean_mapping]
+                if len(not_mapped) > 0:
+                    raise KeyError(not_mapped[0])
+                updt_data[self.column] = updt_data[self.column].map(self.boolean_mapping)
 
         return updt_data
 
@@ -103,6 +131,7 @@ class SimpleComparativeRule(ComparativeRule):
         debug (bool, optional): Whether to print debug information or not. Defaults to False.
         condition (str): Express the condition that must be met.
         boolean_mapping (Dict): A dictionary mapping the values of the target column to boolean values.
+        evaluation_mode (str, optional): 'vectorized' | 'reference'. Defaults to 'vectorized'.
     """
 
     def __init__(self, **kwargs) -> None:
@@ -121,8 +150,9 @@ class SimpleComparativeRule(ComparativeRule):
         prepared_dataset = super().prepare(data)
         return prepared_dataset
     
-    #Evaluating the Rule, applying each time 'apply_condition' 
-    #to the whole column selected as 'target'
+    #Evaluating the Rule, applying the compiled condition to the 
+    #whole column selected as 'target'. The 'reference' mode keeps
+    #applying 'apply_condition' value by value.
     def evaluate(self, data:pd.DataFrame) -> pd.DataFrame:
         """
         This method evaluates the rule on the input data.
@@ -147,9 +177,12 @@ class SimpleComparativeRule(ComparativeRule):
         
         super().evaluate(data=data)
         df      = self.prepare(data)
-        updt_df = deepcopy(df)
+        updt_df = get_evaluation_frame(df)
         
-        updt_df[self.column] = updt_df[self.target].apply(lambda x:apply_condition(x, self.condition))
+        if self.evaluation_mode == 'reference':
+            updt_df[self.column] = updt_df[self.target].apply(lambda x:apply_condition(x, self.condition))
+        else:
+            updt_df[self.column] = self.get_compiled_condition()(updt_df[self.target].values)
         
         updt_df = self.to_actual_mapping(data=updt_df)
 
@@ -176,13 +209,26 @@ class ComparativeTimeframeRule(ComparativeRule):
         condition (str): Express the condition that must be met.
         boolean_mapping (Dict): A dictionary mapping the values of the target column to boolean values.
         timeframe (int): The number of hours to consider for the comparison.
-        aggregation_fnc (Callable): The aggregation function to apply to the target column.
+        aggregation_fnc (Callable): The aggregation function to apply to the target column, or its
+            name (eg. 'sum'). sum, mean, median, min and max are applied as rolling aggregations.
+        evaluation_mode (str, optional): 'vectorized' | 'reference'. Defaults to 'vectorized'.
     """
 
     def __init__(self, timeframe:int, aggregation_fnc:Callable, **kwargs) -> None:
         super().__init__(**kwargs)
         self.timeframe       = timeframe        #expressed as 'hours'
-        self.aggregation_fnc = aggregation_fnc  #sum, mean, etc.
+        self.aggregation_fnc = get_mapped_function(aggregation_fnc) \
+            if isinstance(aggregation_fnc, str) else aggregation_fnc  #sum, mean, etc.
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Each value aggregates the 'timeframe' rows before it.
+
+        Returns:
+            Optional[int]: Rows read before the current one
+        """
+        lag = super().get_lag()
+        return None if lag is None else max(lag, self.timeframe)
     
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -221,13 +267,23 @@ class ComparativeTimeframeRule(ComparativeRule):
         
         AgroRule.evaluate(self, data=data)
         df      = self.prepare(data)
-        updt_df = deepcopy(df)
+        updt_df = get_evaluation_frame(df)
         
         #This is an intensive calculation, so we decided to work
         #more 'raw' data, and then convert them into a pandas column ç.ç
         #it's just a moving-applied-function (eg. moving-average)
         target_values         = updt_df[self.target].values
-        applied_target_values = [apply_condition(self.aggregation_fnc(target_values[i-self.timeframe:i]), self.condition) if i>=self.timeframe else 0.0 for i in range(len(target_values))]
+        rolling_values        = None
+        if self.evaluation_mode != 'reference' and len(target_values) > self.timeframe:
+            rolling_values = get_rolling_aggregation(values=target_values, window=self.timeframe, fnc=self.aggregation_fnc)
+        
+        if rolling_values is None:
+            #Custom aggregation functions are applied window by window.
+            applied_target_values = [apply_condition(self.aggregation_fnc(target_values[i-self.timeframe:i]), self.condition) if i>=self.timeframe else 0.0 for i in range(len(target_values))]
+        else:
+            #Value i aggregates the window ending at i-1, the first 'timeframe' values are 0.0
+            applied_target_values = np.zeros(len(target_values))
+            applied_target_values[self.timeframe:] = self.get_compiled_condition()(rolling_values[self.timeframe-1:-1])
         #SAME CODE BUT NO COMPREHENSION - FOR DEBUG
         # applied_target_values = list()
         # for i in range(len(target_values)):
@@ -265,6 +321,23 @@ class ApplyAndBreakOnCondition(ComparativeRule):
         self.reset_value        = reset_value
         self.start_condition    = self.get_condition(kwargs.get('start_condition', None)) if kwargs.get('start_condition', None)!=None else None
 
+    def get_lag(self) -> Optional[int]:
+        """
+        The function is applied to all the values since the last break.
+
+        Returns:
+            Optional[int]: None, the rule carries a state from the start of the data
+        """
+        return None
+
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        The function goes on from the values since the last break, carried over by the previous data.
+
+        Returns:
+            Optional[int]: Rows read before the current one
+        """
+        return AgroRule.get_lag(self)
     
     def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -316,7 +389,20 @@ class ApplyAndBreakOnCondition(ComparativeRule):
             progr_fnc_vals  = []
             start_flag      = False
             break_flag      = True
-            for i in range(len(column_data)):
+            #Going on from the state carried over, rows before carry_row are the ones of the previous data.
+            carry_state     = self.__dict__.get('carry_state', None)
+            carry_row       = self.__dict__.get('carry_row', 0)
+            next_rows       = self.__dict__.get('next_carry_rows', None)
+            if carry_state is not None:
+                applied_data    = [np.nan]*carry_row
+                progr_fnc_vals  = list(carry_state['values'])
+                start_flag      = carry_state['start_flag']
+                break_flag      = carry_state['break_flag']
+            for i in range(carry_row, len(column_data)+1):
+                if next_rows is not None and i == next_rows[1]:
+                    self.next_carry_state = {'values': list(progr_fnc_vals), 'start_flag': start_flag, 'break_flag': break_flag}
+                if i == len(column_data):
+                    break
                 #Checking, if specified, the start flag
                 if self.start_condition != None:
                     if break_flag==True:
@@ -350,7 +436,7 @@ class ApplyAndBreakOnCondition(ComparativeRule):
         
         AgroRule.evaluate(self, data=data)
 
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         #then we define a new column
         updt_df[self.column] = apply_or_break(column_data=updt_df[self.target].values, condition=self.condition)
@@ -373,6 +459,7 @@ class AndComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
         on_condition (object, optional): The condition for the agronomical factor. Defaults to None.
         debug (bool, optional): Whether to print debug information or not. Defaults to False.
         rules (List[AgroRule]): List of rules that are evaluated and concatenated as and rule.
+        evaluation_mode (str, optional): 'vectorized' | 'reference'. Defaults to 'vectorized'.
     """
 
     def __init__(self, rules:List[AgroRule], **kwargs) -> None:
@@ -380,6 +467,17 @@ class AndComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
         self.rules            = rules
         self.reflective_rules = None
         self.fnc              = and_rule_over_row
+        self.columnar_fnc     = and_rule_over_columns
+
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Get the number of rows, before the current one, the rule reads to evaluate a row when it
+        goes on from its results carried over by the previous data.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the rule carries another state
+        """
+        return self.get_compound_carry_lag()
     
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -416,7 +514,7 @@ class AndComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
             pd.DataFrame with rule applied
         """
         super().evaluate(data=data)
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
         updt_df = self.prepare(data=updt_df)
 
         #Evaluating base cases (No-Reflection)
@@ -433,8 +531,12 @@ class AndComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
                 updt_df = pd.merge(left=updt_df, right=implicit_data, on='sampleDate', how='inner')
 
         #then we define a new colum
-        #Applying all non-reflective rules
-        updt_df['INTERNAL_'+self.column] = updt_df.apply(lambda row: self.fnc(row=row, columns=[r.column for r in self.rules]), axis=1)
+        #Applying all non-reflective rules, reducing the columns all at once.
+        #Row by row only when reflection is involved (or in 'reference' mode).
+        if self.is_reflective or self.evaluation_mode == 'reference':
+            updt_df['INTERNAL_'+self.column] = updt_df.apply(lambda row: self.fnc(row=row, columns=[r.column for r in self.rules]), axis=1)
+        else:
+            updt_df['INTERNAL_'+self.column] = self.columnar_fnc(data=updt_df, columns=[r.column for r in self.rules])
 
         #Evaluating reflecting cases
         if self.is_reflective:
@@ -472,6 +574,7 @@ class OrComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
         on_condition (object, optional): The condition for the agronomical factor. Defaults to None.
         debug (bool, optional): Whether to print debug information or not. Defaults to False.
         rules (List[AgroRule]): List of rules that are evaluated and concatenated as and rule.
+        evaluation_mode (str, optional): 'vectorized' | 'reference'. Defaults to 'vectorized'.
     """
 
     def __init__(self, rules:List[AgroRule],**kwargs) -> None:
@@ -479,6 +582,17 @@ class OrComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
         self.rules            = rules
         self.reflective_rules = None
         self.fnc              = or_rule_over_row
+        self.columnar_fnc     = or_rule_over_columns
+
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Get the number of rows, before the current one, the rule reads to evaluate a row when it
+        goes on from its results carried over by the previous data.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the rule carries another state
+        """
+        return self.get_compound_carry_lag()
     
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -517,7 +631,7 @@ class OrComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
         """
        
         super().evaluate(data=data)
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
         updt_df = self.prepare(data=updt_df)
 
         #Evaluating base cases (No-Reflection)
@@ -538,8 +652,12 @@ class OrComparativeAgroRule(ComparativeRule, ReflectiveAgroRule):
                     updt_df = pd.merge(left=updt_df, right=implicit_data, on='sampleDate', how='inner')
         
         #then we define a new colum
-        #Applying all non-reflective rules
-        updt_df['INTERNAL_'+self.column] = updt_df.apply(lambda row: self.fnc(row=row, columns=[r.column for r in self.rules]), axis=1)
+        #Applying all non-reflective rules, reducing the columns all at once.
+        #Row by row only when reflection is involved (or in 'reference' mode).
+        if self.is_reflective or self.evaluation_mode == 'reference':
+            updt_df['INTERNAL_'+self.column] = updt_df.apply(lambda row: self.fnc(row=row, columns=[r.column for r in self.rules]), axis=1)
+        else:
+            updt_df['INTERNAL_'+self.column] = self.columnar_fnc(data=updt_df, columns=[r.column for r in self.rules])
 
         #Evaluating reflecting cases
         if self.is_reflective:
@@ -0,0 +1,129 @@
+################################################################################
+# Module: daily_compaction.py
+# Description: Daily aggregates of the hourly data, shared by the output rules.
+# Author:     Stefano Zimmitti
+# Date: 15/01/2024
+# Company: xFarm Technologies
+################################################################################
+
+from typing import List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mosaic_framework.core.evaluation_frame import get_days
+
+class DailyAggregate():
+    """
+    Daily aggregate of a column, together with the hourly values it was computed from.
+
+    Args:
+        labels (np.ndarray): Values of the date column
+        values (np.ndarray): Values of the aggregated column
+        days (np.ndarray): Days of the aggregate, as "YYYY-MM-DD" strings
+        aggregated (np.ndarray): Aggregated value of each day
+    """
+    def __init__(self, labels:np.ndarray, values:np.ndarray, days:np.ndarray, aggregated:np.ndarray) -> None:
+        self.labels     = labels
+        self.values     = values
+        self.days       = days
+        self.aggregated = aggregated
+
+    def is_valid(self, labels:np.ndarray, values:np.ndarray) -> bool:
+        """
+        Check if the aggregate still describes the hourly data.
+
+        Args:
+            labels (np.ndarray): Current values of the date column
+            values (np.ndarray): Current values of the aggregated column
+
+        Returns:
+            bool: True if both columns hold the values the aggregate was computed from
+        """
+        if len(labels) != len(self.labels) or values.dtype != self.values.dtype:
+            return False
+        return bool((labels == self.labels).all()) and \
+            np.array_equal(values, self.values, equal_nan=values.dtype.kind == 'f')
+
+class DailyCompaction():
+    """
+    Compaction of the hourly data of an output into daily aggregates, shared by its
+    output rules. OutputModel collects the aggregates (target, function) read by its
+    output rules, the first time one of them is needed all of them are computed, with
+    a single grouping over the days of the timeline. Aggregates are cached together
+    with the hourly values they come from, they are computed again only if those change.
+    Days are the ones of the wall clock, only days with data are kept.
+
+    Args:
+        date_column (str, optional): Date column of the hourly data. Defaults to 'sampleDate'.
+    """
+    def __init__(self, date_column:str='sampleDate') -> None:
+        self.date_column = date_column
+        self.requests    = list()
+        self.aggregates  = dict()
+
+    def add_requests(self, aggregates:List[Tuple[str, str]]) -> None:
+        """
+        Add the aggregates needed by an output rule.
+
+        Args:
+            aggregates (List[Tuple[str, str]]): Aggregates as (target column, function name)
+        """
+        self.requests.extend([a for a in aggregates if not a in self.requests])
+        return
+
+    def get_missing_aggregates(self, data:pd.DataFrame, aggregates:List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+        """
+        Get the aggregates that must be computed, because they are not cached or they
+        have been computed from different hourly values.
+
+        Args:
+            data (pd.DataFrame): Hourly data
+            aggregates (List[Tuple[str, str]]): Aggregates as (target column, function name)
+
+        Returns:
+            List[Tuple[str, str]]: Aggregates to compute
+        """
+        labels = data[self.date_column].values
+        return [a for a in aggregates
+            if not a in self.aggregates or not self.aggregates[a].is_valid(labels=labels, values=data[a[0]].values)]
+
+    def compute(self, data:pd.DataFrame, aggregates:List[Tuple[str, str]]) -> None:
+        """
+        Compute aggregates with a single grouping of the hourly data, by day.
+
+        Args:
+            data (pd.DataFrame): Hourly data
+            aggregates (List[Tuple[str, str]]): Aggregates as (target column, function name)
+        """
+        targets = list(dict.fromkeys([t for t, _ in aggregates]))
+        grouped = data[targets].groupby(get_days(data=data, column=self.date_column).values) \
+            .agg({t:[f for a_t, f in aggregates if a_t == t] for t in targets})
+        labels  = data[self.date_column].values.copy()
+        days    = grouped.index.values
+        for t, f in aggregates:
+            self.aggregates[(t, f)] = DailyAggregate(labels=labels, values=data[t].values.copy(), days=days, aggregated=grouped[(t, f)].values)
+        return
+
+    def get_aggregates(self, data:pd.DataFrame, aggregates:List[Tuple[str, str]]) -> pd.DataFrame:
+        """
+        Get daily aggregates of the hourly data.
+
+        Args:
+            data (pd.DataFrame): Hourly data
+            aggregates (List[Tuple[str, str]]): Aggregates as (target column, function name)
+
+        Returns:
+            pd.DataFrame: 'date' column with the days, and a '<target>_<function>' column for each aggregate
+        """
+        aggregates = list(dict.fromkeys(aggregates))
+        missing    = self.get_missing_aggregates(data=data, aggregates=aggregates)
+        if len(missing) > 0:
+            #Aggregates requested by the other output rules are computed in the same grouping.
+            requests = [a for a in self.requests if a[0] in data.columns and not a in missing]
+            self.compute(data=data, aggregates=missing+self.get_missing_aggregates(data=data, aggregates=requests))
+
+        days        = self.aggregates[aggregates[0]].days if len(aggregates) > 0 else np.array([], dtype=object)
+        daily_data  = {'date': days}
+        daily_data.update({f'{t}_{f}':self.aggregates[(t, f)].aggregated for t, f in aggregates})
+        return pd.DataFrame(data=daily_data)
@@ -9,11 +9,11 @@
 from warnings import warn
 from typing import List, Any
 import pandas as pd
-from copy import deepcopy
 
 from mosaic_framework.core.environment.rules_env_variable import RulesEnvironmentVariable
 from mosaic_framework.core.environment.exceptions import RulesEnvironmentVariableOverwrittenException, \
     RulesEnvironmentVariableNotFoundException
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
 
 class MosaicRulesHub():
     """
@@ -42,13 +42,13 @@ class MosaicRulesHub():
             key=key,
             content=content,
             is_immutable=is_immutable)
-        if not rules_environment_var.key in list(self.content.keys()):
+        if not rules_environment_var.key in self.content:
             self.content[rules_environment_var.key] = rules_environment_var
         else:
             raise RulesEnvironmentVariableOverwrittenException(f"You are trying to setup a new RulesEnvironmentVariable with an existing key: {rules_environment_var.key} ")
             
         print(f"\n[MosaicRulesHub]: {rules_environment_var} added to the MosaicRulesHub.")
-        return rules_environment_var.key in list(self.content.keys())
+        return rules_environment_var.key in self.content
     
     def get_variable(self, key:str, default:Any=None, original:bool=True, error_policy:str='pass')->RulesEnvironmentVariable:
         """
@@ -63,7 +63,7 @@ class MosaicRulesHub():
         (Resource)-> Get the requested RulesEnvironmentVariable if it is present.
         """
         #print(f"[MosaicRulesHub]: Resource will be searched: {key}")
-        if key in list(self.content.keys()): 
+        if key in self.content: 
             return {'key':key, 'content': self.content[key]} if not original else self.content[key]
         if error_policy=='raise':
             raise RulesEnvironmentVariableNotFoundException(f"Cannot get RulesEnvironmentVariable '{key}'. ")
@@ -83,13 +83,13 @@ class MosaicRulesHub():
         mutable.
         """
 
-        for k in list(self.content.keys()):
-            if k == key:
-                self.content[k].update(new_content=new_content)
-        return self.content[k]
+        if not key in self.content:
+            return None
+        return self.content[key].update(new_content=new_content)
     
     def register(self, rule:Any)->None:
-        """Register a single rule into the MosaicRulesHub.
+        """Register a single rule into the MosaicRulesHub. Rules are registered each time they are
+        evaluated (eg. for each chunk of the data), images already registered are not added again.
 
         Args:
             rule (Any): Rule to be added.
@@ -99,6 +99,8 @@ class MosaicRulesHub():
             if p in list(rule.__dict__.keys()):
                 filtered_rule[p] = rule.__dict__.get(p)
         
+        if filtered_rule in self.rule_imgs:
+            return
         if filtered_rule: 
             self.rule_imgs.append(filtered_rule)
         else:
@@ -114,7 +116,7 @@ class MosaicRulesHub():
         Returns:
             pd.DataFrame: updated dataframe.
         """
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         for ri in self.rule_imgs:
             if ri.get("column") in updt_df.columns and ri.get("is_implicit")==True:
@@ -0,0 +1,140 @@
+################################################################################
+# Module: evaluation_frame.py
+# Description: Working DataFrame shared by rules during the evaluation.
+# Author:     Stefano Zimmitti
+# Date: 15/01/2024
+# Company: xFarm Technologies
+################################################################################
+
+import numpy as np
+import pandas as pd
+
+from mosaic_framework.dt.datetime_parser import DatetimeParser
+
+#Attribute of the working DataFrame holding the timelines of its date columns.
+TIMELINE_ATTR = 'timelines'
+
+#Rules append new columns to the working DataFrame of the model and never
+#modify the columns they receive. With pandas copy-on-write, each rule can
+#work on a lazy copy, that shares the unchanged columns with its input,
+#instead of copying the whole DataFrame.
+def evaluation_context() -> pd.option_context:
+    """
+    Context in which rules are evaluated, with pandas copy-on-write enabled.
+
+    Returns:
+        pd.option_context: context manager to use with 'with'
+    """
+    return pd.option_context('mode.copy_on_write', True)
+
+def get_evaluation_frame(data:pd.DataFrame) -> pd.DataFrame:
+    """
+    Get the DataFrame a rule works on, from its input.
+    Inside evaluation_context it is a lazy copy (columns are copied only 
+    when modified), otherwise a deep copy.
+
+    Args:
+        data (pd.DataFrame): Input dataframe
+
+    Returns:
+        pd.DataFrame: Dataframe that can be modified without side effects on data
+    """
+    return data.copy(deep=not pd.get_option('mode.copy_on_write'))
+
+class Timeline():
+    """
+    Typed version of a date column of the working DataFrame: its timezone aware 
+    datetime64[ns] values, together with the strings they stand for. Rules keep 
+    receiving date strings, the timeline is reused as long as the column holds the
+    same strings, so that dates are parsed once per evaluation and not by each rule.
+
+    Args:
+        labels (np.ndarray): Values of the date column
+        dates (pd.arrays.DatetimeArray): Timezone aware datetimes of the column
+    """
+    def __init__(self, labels:np.ndarray, dates:pd.arrays.DatetimeArray) -> None:
+        self.labels = labels
+        self.dates  = dates
+
+    def is_valid(self, labels:np.ndarray) -> bool:
+        """
+        Check if the timeline still describes a date column.
+
+        Args:
+            labels (np.ndarray): Current values of the date column
+
+        Returns:
+            bool: True if the column holds the same values the timeline was built from
+        """
+        if len(labels) != len(self.labels):
+            return False
+        return labels is self.labels or bool((labels == self.labels).all())
+
+def set_timeline(data:pd.DataFrame, dates:pd.Series, column:str='sampleDate') -> pd.DataFrame:
+    """
+    Attach to the working DataFrame the typed timeline of one of its date columns.
+    The timeline follows the DataFrame through copies, selections and merges
+    (DataFrame.attrs), and it is used until the column changes.
+
+    Args:
+        data (pd.DataFrame): Working dataframe
+        dates (pd.Series): Timezone aware datetimes, aligned with the column
+        column (str, optional): Date column. Defaults to 'sampleDate'.
+
+    Returns:
+        pd.DataFrame: The working dataframe
+    """
+    timelines = dict(data.attrs.get(TIMELINE_ATTR, dict()))
+    timelines[column] = Timeline(labels=data[column].values.copy(), dates=dates.array)
+    data.attrs[TIMELINE_ATTR] = timelines
+    return data
+
+def get_timeline(data:pd.DataFrame, column:str='sampleDate') -> pd.Series:
+    """
+    Get the timezone aware datetimes of a date column of the working DataFrame.
+    The timeline attached to the DataFrame is used if it is still valid, otherwise
+    the column is parsed and its timeline is attached, for the next rules.
+
+    Args:
+        data (pd.DataFrame): Working dataframe
+        column (str, optional): Date column. Defaults to 'sampleDate'.
+
+    Raises:
+        DateParsingException: Not valid datetime format
+        ValueError: Dates have different timezones
+
+    Returns:
+        pd.Series: Datetimes (datetime64[ns, tz]), with the index of the dataframe
+    """
+    timeline = data.attrs.get(TIMELINE_ATTR, dict()).get(column, None)
+    if timeline is None or not timeline.is_valid(labels=data[column].values):
+        set_timeline(data=data, dates=DatetimeParser().parse_timeline(data[column]), column=column)
+        timeline = data.attrs[TIMELINE_ATTR][column]
+    return pd.Series(timeline.dates, index=data.index, name=column)
+
+def get_days(data:pd.DataFrame, column:str='sampleDate') -> pd.Series:
+    """
+    Get the days of a date column of the working DataFrame, as "YYYY-MM-DD" strings.
+    Days are the ones of the wall clock, in the timezone of the dates.
+
+    Args:
+        data (pd.DataFrame): Working dataframe
+        column (str, optional): Date column. Defaults to 'sampleDate'.
+
+    Returns:
+        pd.Series: Days, with the index of the dataframe
+    """
+    return get_timeline_days(dates=get_timeline(data=data, column=column))
+
+def get_timeline_days(dates:pd.Series) -> pd.Series:
+    """
+    Get the days of timezone aware datetimes, as "YYYY-MM-DD" strings of the wall clock.
+
+    Args:
+        dates (pd.Series): Datetimes (datetime64[ns, tz]), eg. a timeline
+
+    Returns:
+        pd.Series: Days, with the index of the datetimes (NaN where they are NaT)
+    """
+    days  = np.datetime_as_string(dates.dt.tz_localize(None).values, unit='D')
+    return pd.Series(days, index=dates.index, dtype=object).where(dates.notnull(), np.nan)
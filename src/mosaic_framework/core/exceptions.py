@@ -42,6 +42,24 @@ class ComplexValueError(GeneralError):
     def __init__(self, error_message="", level="ERROR", status="BLOCKED"):
         super().__init__(error_message=str(self.__class__)+":"+error_message, level=level, status=status)
 
+#If an equation contains a not supported expression (eg. unknown function
+#or statement), then raise an error during compilation
+class ExpressionFormatError(GeneralError):
+    """
+    Error class for not supported equation expressions.
+    """
+    def __init__(self, error_message="", level="ERROR", status="BLOCKED"):
+        super().__init__(error_message=str(self.__class__)+":"+error_message, level=level, status=status)
+
+#If an equation calls a function that cannot be compiled (eg. np.exp), then
+#raise an error during compilation, the equation is evaluated row by row
+class UnsupportedFunctionError(ExpressionFormatError):
+    """
+    Error class for equation expressions calling not mapped functions.
+    """
+    def __init__(self, error_message="", level="ERROR", status="BLOCKED"):
+        super().__init__(error_message=error_message, level=level, status=status)
+
 #If a nested rule is detected then raise an error
 class NestedRuleError(GeneralError):
     """
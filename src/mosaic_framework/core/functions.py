@@ -7,6 +7,18 @@
 ################################################################################
 
 from typing import Callable, List, Dict
+import numpy as np
+import pandas as pd
+
+#Mapping between the comparison prefixes used in conditions ('gt0.0', 'loet1.0', ...)
+#and the numpy ufuncs that implement them over a whole array.
+CONDITION_OPERATORS = {
+    'gt'  : np.greater,
+    'goet': np.greater_equal,
+    'lt'  : np.less,
+    'loet': np.less_equal,
+    'et'  : np.equal
+}
 
 def and_rule_over_row(row: Dict, **kwargs) -> int:
     """
@@ -44,6 +56,42 @@ def or_rule_over_row(row: Dict, **kwargs) -> int:
         result += row[col]
     return 1 if result>0 else 0
 
+def and_rule_over_columns(data: pd.DataFrame, **kwargs) -> np.ndarray:
+    """
+    Apply an AND rule over entire columns. Same as and_rule_over_row, 
+    reducing the columns all at once instead of row by row.
+
+    Args:
+        data (pd.DataFrame): Data containing the columns to be checked
+        columns (List): List of columns to be checked
+
+    Returns:
+        np.ndarray: 1 where the condition is met, 0 otherwise
+    """
+    #needs columns:list
+    columns = kwargs.get('columns')
+    if len(columns) == 0:
+        return np.ones(len(data), dtype=int)
+    return np.multiply.reduce([data[col].values for col in columns], axis=0)
+
+def or_rule_over_columns(data: pd.DataFrame, **kwargs) -> np.ndarray:
+    """
+    Apply an OR rule over entire columns. Same as or_rule_over_row, 
+    reducing the columns all at once instead of row by row.
+
+    Args:
+        data (pd.DataFrame): Data containing the columns to be checked
+        columns (List): List of columns to be checked
+
+    Returns:
+        np.ndarray: 1 where the condition is met, 0 otherwise
+    """
+    #needs columns:list
+    columns = kwargs.get('columns')
+    if len(columns) == 0:
+        return np.zeros(len(data), dtype=int)
+    return np.where(np.add.reduce([data[col].values for col in columns], axis=0) > 0, 1, 0)
+
 def apply_condition(v: float, cond: Dict) -> int:
     """
     Apply a condition over a value.
@@ -86,3 +134,25 @@ def apply_condition_over_values(v: List, cond: Dict, iterable_fnc: Callable) ->
     }
 
     return 1 if operators[cond['comp']] else 0
+
+
+def compile_condition(cond: Dict) -> Callable:
+    """
+    Compile a parsed condition into a function that applies it over an entire
+    array at once. The comparison prefix is resolved a single time, then each
+    call runs one numpy comparison over the whole input.
+
+    Args:
+        cond (Dict): Condition to be compiled, as {'comp': 'gt', 'val': 0.0}
+
+    Returns:
+        Callable: Function that takes an array-like and returns an array of 1 
+        where the condition is met, 0 otherwise
+    """
+    operator = CONDITION_OPERATORS[cond['comp']]
+    val      = cond['val']
+
+    def apply_compiled_condition(v) -> np.ndarray:
+        return np.where(operator(np.asarray(v), val), 1, 0)
+
+    return apply_compiled_condition
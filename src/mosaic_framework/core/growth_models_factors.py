@@ -6,13 +6,13 @@
 # Company: xFarm Technologies
 ################################################################################
 
+import numpy as np
 import pandas as pd
-from copy import deepcopy
-from typing import List, Dict, AnyStr, Any
-import dateutil
+from typing import List, Dict, AnyStr, Any, Optional
 
 from mosaic_framework.core.agronomical_factors import AgroRule
 from mosaic_framework.core.exceptions import ColumnNameError, DataFormatException
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame, get_timeline
 
 class DayOfYear(AgroRule):
     """
@@ -68,23 +68,12 @@ class DayOfYear(AgroRule):
         Returns:
             pd.DataFrame: Processed dataframe with day of year calculations added
         """
-        def compute_doy(date:str) -> int:
-            """
-            Compute the day of year from a date string. Uses the dateutil library.
-
-            Args:
-                date (str): Date string to process
-
-            Returns:
-                int: Day of year (1-366)
-            """
-            return dateutil.parser.parse(date).timetuple().tm_yday
-        
         AgroRule.evaluate(self, data=data)
         data    = self.prepare(data)
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
-        updt_df[self.column] = updt_df.apply(lambda row: compute_doy(row[self.target]), axis=1)
+        #Day of year of the wall clock, from the timeline of the target column
+        updt_df[self.column] = get_timeline(data, column=self.target).dt.dayofyear.astype('int64')
 
         return self.finalize(data=updt_df)
 
@@ -150,12 +139,39 @@ class GDD(AgroRule):
             raise ColumnNameError(f"Columns are not been recognized or they are absent. Check Minimum and Maximum or Sample Date.")
         return target
     
+    def get_input_columns(self) -> Optional[List[str]]:
+        """
+        Temperature and date columns are detected on the dataframe, during evaluation.
+
+        Returns:
+            Optional[List[str]]: None, inputs are not known before evaluation
+        """
+        return None
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Cumulated GDD sum all the values from the start of the data.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if GDD are cumulated
+        """
+        return None if self.cumulate else super().get_lag()
+
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Cumulated GDD go on from the sum carried over by the previous data.
+
+        Returns:
+            Optional[int]: Rows read before the current one
+        """
+        return super().get_lag()
+    
     def get_doy(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Get the day of year for the GDD rule.
         """
         # Calculate day of year using pandas datetime
-        data['doy_to_remove'] = pd.to_datetime(data[self.get_target_column(data)['sample_date']]).dt.dayofyear
+        data['doy_to_remove'] = get_timeline(data, column=self.get_target_column(data)['sample_date']).dt.dayofyear
         return data
     
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
@@ -198,7 +214,7 @@ class GDD(AgroRule):
         
         AgroRule.evaluate(self, data=data)
         data    = self.prepare(data)
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         detected_columns     = self.get_target_column(data=data)
 
@@ -213,7 +229,20 @@ class GDD(AgroRule):
         
         #If cumulate is True, compute the cumulative sum of the GDD
         if self.cumulate:
-            updt_df['temp_cum']  = updt_df[self.column].cumsum()
+            carry_state = self.__dict__.get('carry_state', None)
+            carry_row   = self.__dict__.get('carry_row', 0)
+            if carry_state is None:
+                updt_df['temp_cum']  = updt_df[self.column].cumsum()
+            else:
+                #The sum goes on from the one carried over, rows before carry_row are the ones of the previous data.
+                gdd_values = pd.concat([pd.Series([carry_state['cumulated']]), updt_df[self.column].iloc[carry_row:]], ignore_index=True)
+                updt_df['temp_cum']  = np.append(updt_df[self.column].iloc[:carry_row].to_numpy(), gdd_values.cumsum().to_numpy()[1:])
+            next_rows = self.__dict__.get('next_carry_rows', None)
+            if next_rows is not None:
+                #Sum of the rows before the first one of the next evaluation.
+                self.next_carry_state = {'cumulated': 
+                    float(updt_df['temp_cum'].iat[next_rows[1]-1]) if next_rows[1] > carry_row else 
+                    carry_state['cumulated'] - float(updt_df[self.column].iloc[next_rows[1]:carry_row].sum()) if carry_state is not None else 0.0}
             updt_df[self.column] = updt_df['temp_cum']
             updt_df.drop('temp_cum',      axis=1, inplace=True)
             updt_df.drop('doy_to_remove', axis=1, inplace=True)
@@ -325,7 +354,7 @@ class ActualPhenostageData(AgroRule):
             return self.default_value
         AgroRule.evaluate(self, data=data)
         data    = self.prepare(data)
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         growth_model = self.get_growth_model()
 
@@ -6,12 +6,12 @@
 # Company: xFarm Technologies
 ################################################################################
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import pandas as pd
-from copy import deepcopy
 
 from mosaic_framework.core.agronomical_factors import AgroRule
 from mosaic_framework.core.exceptions import DataFormatException
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
 
 class IrrigationDeficit(AgroRule):
     """
@@ -36,6 +36,35 @@ class IrrigationDeficit(AgroRule):
         self.irrigation_coefficient  = irrigation_coefficient
         self.default_value           = default_value
     
+    def get_input_columns(self) -> Optional[List[str]]:
+        """
+        Previous data columns are found on the dataframe, during evaluation.
+
+        Returns:
+            Optional[List[str]]: None, inputs are not known before evaluation
+        """
+        return None
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Each deficit is computed from the previous ones.
+
+        Returns:
+            Optional[int]: None, the rule carries a state from the start of the data
+        """
+        return None
+
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Deficits go on from the last ones carried over by the previous data, each one reads
+        the two deficits before it.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the nested rules carry a state
+        """
+        nested_lag = AgroRule.get_lag(self)
+        return None if nested_lag is None else max(nested_lag, self.previous_data_index, 2)
+    
     def validate_parameters(self, data: pd.DataFrame) -> List[str]:
         """
         Get the parameters for the irrigation rule.
@@ -71,7 +100,13 @@ class IrrigationDeficit(AgroRule):
             pu_prev_2  = data["pu_previous_2"].values
             Rain_sum   = data["Rain_sum"].values
             fase_in    = data["fase_in"].values
-            for i in range(0, len(di)): #per tutte le righe
+            #Going on from the deficits carried over, rows before carry_row are the ones of the previous data.
+            carry_state = self.__dict__.get('carry_state', None)
+            carry_row   = self.__dict__.get('carry_row', 0)
+            if carry_state is not None:
+                deficits = carry_state['deficits'][max(len(carry_state['deficits'])-carry_row, 0):]
+                di[carry_row-len(deficits):carry_row] = deficits
+            for i in range(carry_row, len(di)): #per tutte le righe
                 if i >= self.previous_data_index:
                     # Calculate the irrigation deficit
                     if self.taw - di[i-1] > self.raw:
@@ -101,11 +136,14 @@ class IrrigationDeficit(AgroRule):
                     else:
                         irrigation = self.taw / 2
                     di[i] = partial_factor - irrigation
+            next_rows = self.__dict__.get('next_carry_rows', None)
+            if next_rows is not None:
+                self.next_carry_state = {'deficits': di[max(next_rows[1]-2, 0):next_rows[1]]}
             return di
 
         AgroRule.evaluate(self, data=data)
         data    = self.prepare(data)
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         self.validate_parameters(data=data)
         #get the actual phase data parameter, 
@@ -7,9 +7,8 @@
 ################################################################################
 
 import re
-from typing import List
+from typing import List, Optional
 import pandas as pd
-from copy import deepcopy
 from typing import Callable, Iterable, Dict
 import numpy as np
 from statistics import mean, median
@@ -17,11 +16,13 @@ from math import sin, cos, tan
 from math import asin as arcsin, acos as arccos, atan as arctan
 from numpy import sign 
 
-from mosaic_framework.core.math_utils import get_mapped_function
+from mosaic_framework.core.math_utils import (get_mapped_function, get_rolling_aggregation, 
+    compile_expression, CompiledExpression, PLACEHOLDER_PATTERN)
 from mosaic_framework.core.reflection import ReflectiveAgroRule
 from mosaic_framework.core.reflection_factors import ReflectiveValue
 from mosaic_framework.core.agronomical_factors import AgroRule
-from mosaic_framework.core.exceptions import ComplexValueError
+from mosaic_framework.core.exceptions import ComplexValueError, UnsupportedFunctionError
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
 
 #super class needed to define calculation on particular condition
 #condition can be over an existing column | on demand AgroRule
@@ -39,6 +40,9 @@ class Equation(AgroRule, ReflectiveAgroRule):
         on_condition (object, optional): The condition for the agronomical factor. Defaults to None
         debug (bool, optional): Whether to print debug information or not. Defaults to False
         apply (str): The equation to be applied
+        evaluation_mode (str, optional): 'vectorized' evaluates the compiled equation over whole
+            columns, 'reference' fills and evals the equation row by row. Defaults to 'vectorized',
+            equations calling not mapped functions (eg. np.exp) are evaluated as 'reference'.
     """
     def __init__(self, apply:str, **kwargs) -> None:
         super().__init__(
@@ -50,6 +54,10 @@ class Equation(AgroRule, ReflectiveAgroRule):
         self.target            = self.get_target_column(self.target)
         self.apply             = apply
         self.reflective_rules  = None
+        self.evaluation_mode   = kwargs.get('evaluation_mode', 'vectorized')
+
+        if not self.evaluation_mode in ['vectorized', 'reference']:
+            raise ValueError(f"evaluation_mode must be one of: ['vectorized', 'reference']. Found: {self.evaluation_mode}")
 
     def get_post_processed_equation(self, equation:str) -> str:
         """
@@ -130,6 +138,63 @@ class Equation(AgroRule, ReflectiveAgroRule):
             filled_equation = filled_equation.replace('<'+str(updt_k)+'>', str(values[updt_k]))
         return filled_equation
     
+    def get_compiled_expression(self) -> CompiledExpression:
+        """
+        Get the compiled equation. Must be called after prepare,
+        that removes the reflective references from 'self.apply'.
+
+        Returns:
+            CompiledExpression: The compiled equation (cached by expression)
+        """
+        return compile_expression(self.apply)
+
+    def get_evaluation_mode(self) -> str:
+        """
+        Get the evaluation mode of the equation. Must be called after prepare.
+        Equations calling functions that cannot be compiled are evaluated
+        row by row, as 'reference'.
+
+        Returns:
+            str: 'vectorized' | 'reference'
+        """
+        if self.evaluation_mode == 'reference':
+            return 'reference'
+        try:
+            self.get_compiled_expression()
+        except UnsupportedFunctionError:
+            print(f"[Equation] {self.column}: not mapped functions, evaluated row by row. equation={self.apply}")
+            return 'reference'
+        return self.evaluation_mode
+
+    def get_input_columns(self) -> Optional[List[str]]:
+        """
+        Get the columns read from the input dataframe, including the
+        columns referenced in the equation as <column>.
+
+        Returns:
+            Optional[List[str]]: Input column names, None if they are detected only during evaluation
+        """
+        columns = super().get_input_columns()
+        if columns is None:
+            return None
+        placeholders = [re.sub(r'\[-[1-9]\d*\]$', '', c) for c in PLACEHOLDER_PATTERN.findall(self.apply)]
+        return [c for c in dict.fromkeys(columns+placeholders) if c != self.column]
+
+    def calculate_on_values(self, values:Dict) -> float:
+        """
+        Calculate the equation on the values of a single row.
+
+        Args:
+            values (Dict): Dictionary mapping columns to values
+
+        Returns:
+            float: Calculated result
+        """
+        result = self.get_compiled_expression()(values)
+        if isinstance(result, complex):
+            raise ComplexValueError(f"Evaluation returned a not handled complex number. equation={self.apply} | values={values} | val={result}")
+        return result
+
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepare the data for evaluation by handling reflection.
@@ -166,6 +231,30 @@ class Equation(AgroRule, ReflectiveAgroRule):
                 self.apply = self.apply.replace('<'+self.target[i]+'>', '<'+ref_tar+'>')
         return super().prepare(data)
 
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Get the number of rows, before the current one, the rule reads to evaluate a row when it
+        goes on from its results carried over by the previous data. Reflective equations read 
+        their own results back to the oldest [-n] reference (of the target or of the on_condition).
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the rule carries another state
+        """
+        if not self.is_reflective:
+            return self.get_lag()
+        references   = [(t[t.find("<")+1:t.find("[")], -int(t[t.find("[")+1:t.find("]")])) 
+            for t in self.target if isinstance(t, str) and re.search(r'\[-?\d+\]', t)]
+        nested_rules = [t for t in self.target if isinstance(t, AgroRule)]
+        if self.has_reflective_condition:
+            if 'rules' not in self.on_condition.__dict__.keys():
+                return None
+            condition_rules = self.on_condition.rules + (self.on_condition.__dict__.get('reflective_rules', None) or [])
+            references   += [(r.target, r.__dict__.get('ref_start', r.__dict__.get('ref', None))) for r in condition_rules if str(r.target) == str(self.column)]
+            nested_rules += [r for r in condition_rules if str(r.target) != str(self.column)]
+        elif isinstance(self.on_condition, AgroRule):
+            nested_rules.append(self.on_condition)
+        return self.get_reflective_carry_lag(references=references, nested_rules=nested_rules)
+
     def evaluate(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Evaluate the rule on the input data.
@@ -205,24 +294,43 @@ class Equation(AgroRule, ReflectiveAgroRule):
             if str(result).find("I")!=-1 or str(result).find("j")!=-1:
                 raise ComplexValueError(f"Evaluation returned a not handled complex number. filled_equation={filled_equation} | val={result}")
             return result        
+
+        def calculate_on_compiled_row(row:Dict, **kwargs):
+            """
+            Calculate the result for a given row, using the compiled equation.
+
+            Args:
+                row (Dict): Row data
+                **kwargs: Additional arguments
+
+            Returns:
+                float: Calculated result
+            """
+            on_cond_column, _ = self.get_on_condition_column()
+            return self.calculate_on_values(values=row) if row[on_cond_column] == 1 else 0.0
         
         updt_df = AgroRule.evaluate(self, data=data)
         updt_df = self.prepare(updt_df)
+        evaluation_mode = self.get_evaluation_mode()
                                 
         #Effective evaluation starts as specified below for reflective case        
         if self.is_reflective:
             #We need to extract targets and pass them as involved_rules
             #Applying reflective rules, one by one
             #they have the same target.
-            updt_df = self.reflective_evaluate(
+            reflective_kwargs = dict(
                 data=updt_df, 
-                fnc=calculate_on_row,
+                fnc=calculate_on_row if evaluation_mode == 'reference' else calculate_on_compiled_row,
                 reflective_rules=self.reflective_rules,
                 involved_columns=self.target, #We need to pass the targets WARN, they have BRACKETS!
                 involved_condition=self.get_on_condition_column()[0],
                 reflective_condition=self.on_condition \
                     if self.has_reflective_condition\
-                    else None) 
+                    else None)
+            if evaluation_mode == 'reference':
+                updt_df = self.reflective_evaluate_reference(**reflective_kwargs)
+            else:
+                updt_df = self.reflective_evaluate(**reflective_kwargs, expression=self.get_compiled_expression())
                                      
             updt_df[self.column] = updt_df['reflective_'+self.column]
             updt_df.drop('reflective_'+self.column, axis=1, inplace=True)
@@ -232,10 +340,38 @@ class Equation(AgroRule, ReflectiveAgroRule):
             #Has a different behaviour from Comparative rules, where an equation MUST
             #have all the factors all calculated before starting the effective evaluation.
 
-            updt_df[self.column] = updt_df.apply(lambda row:calculate_on_row(row=row), axis=1)
+            if evaluation_mode == 'reference':
+                updt_df[self.column] = updt_df.apply(lambda row:calculate_on_row(row=row), axis=1)
+            else:
+                updt_df[self.column] = self.evaluate_vectorized(data=updt_df)
 
         return self.finalize(data=updt_df)
 
+    def evaluate_vectorized(self, data: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the compiled equation over whole columns, filtered by the on_condition column.
+
+        Args:
+            data (pd.DataFrame): Prepared dataframe
+
+        Returns:
+            np.ndarray: Calculated results
+        """
+        compiled          = self.get_compiled_expression()
+        on_cond_column, _ = self.get_on_condition_column()
+        values            = {c:data[c].to_numpy(dtype=float) for c in compiled.columns}
+        is_active         = data[on_cond_column].values == 1
+        result            = compiled.evaluate_arrays(values=values, length=len(data))
+
+        #NumPy returns nan (or inf) where python arithmetic returns a complex
+        #number or raises (eg. ZeroDivisionError). Only those rows, if active and
+        #with finite inputs, are calculated again with python arithmetic.
+        has_finite_inputs = np.all([np.isfinite(v) for v in values.values()], axis=0)
+        for i in np.flatnonzero(is_active & has_finite_inputs & ~np.isfinite(result)):
+            result[i] = self.calculate_on_values(values={c:v[i] for c, v in values.items()})
+
+        return np.where(is_active, result, 0.0)
+
 #Class that allows to apply a single function to a set of columns
 #ON_CONDITION FILTERING IS <NOT> ACTIVE
 class ApplyFunction(AgroRule):
@@ -289,7 +425,7 @@ class ApplyFunction(AgroRule):
         """
         AgroRule.evaluate(self, data=data)
 
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         #then we define a new column
         #applying self.function to each column specified in self.target
@@ -317,12 +453,33 @@ class ApplyFunctionOnRange(AgroRule):
         range (Iterable): The range of indexes to apply the function on
         on_out_of_range (str): Policy to decide what to do on 'non present data'
             due to an index that is lesser than the range
+        evaluation_mode (str, optional): 'vectorized' applies sum, mean, median, min and max
+            as rolling aggregations, 'reference' applies the function range by range. 
+            Defaults to 'vectorized'.
     """
     def __init__(self, function:str, range:Iterable, **kwargs) -> None:
         super().__init__(column=kwargs.get('column', None), target=kwargs.get('target', None), is_implicit=kwargs.get('is_implicit', False), debug=kwargs.get('debug', False))
         self.function        = get_mapped_function(function)
         self.range           = range
         self.on_out_of_range = kwargs.get('on_out_of_range', 'default')
+        self.evaluation_mode = kwargs.get('evaluation_mode', 'vectorized')
+
+        if not self.evaluation_mode in ['vectorized', 'reference']:
+            raise ValueError(f"evaluation_mode must be one of: ['vectorized', 'reference']. Found: {self.evaluation_mode}")
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Each value applies the function to the rows of 'range' before it, the first
+        range[0]+1 rows are filled by the on_out_of_range policy.
+
+        Returns:
+            Optional[int]: Rows needed before the current one, None if the range reads following rows
+        """
+        lag       = super().get_lag()
+        ref_range = list(self.range) if isinstance(self.range, Iterable) else [self.range, 0]
+        if lag is None or not all([isinstance(r, (int, np.integer)) and r >= 0 for r in ref_range]):
+            return None
+        return max([lag, ref_range[0]+1])
     
     def get_on_out_of_range_value(self, data:List[float], index:int, on_out_of_range:str) -> float:
         """
@@ -369,7 +526,7 @@ class ApplyFunctionOnRange(AgroRule):
         """
         AgroRule.evaluate(self, data=data)
 
-        updt_df = deepcopy(data)
+        updt_df = get_evaluation_frame(data)
 
         ref_start = None
         ref_end   = None
@@ -386,10 +543,21 @@ class ApplyFunctionOnRange(AgroRule):
 
         #then we define a new column
         #applying self.function to each column specified in self.target
-        values      = updt_df[self.target].to_list()
-        updt_values = list()
-        for i in range(len(values)):
-            updt_values.append(self.function(values[i-ref_start:i-ref_end+1])if i>ref_start else self.get_on_out_of_range_value(data=values, index=i, on_out_of_range=self.on_out_of_range))
+        values         = updt_df[self.target].to_list()
+        rolling_values = None
+        if self.evaluation_mode != 'reference' and isinstance(ref_start, (int, np.integer)) \
+            and isinstance(ref_end, (int, np.integer)) and 0 <= ref_end <= ref_start < len(values)-1:
+            rolling_values = get_rolling_aggregation(values=updt_df[self.target].values, window=ref_start-ref_end+1, fnc=self.function)
+        
+        if rolling_values is None:
+            #Custom functions (or ranges) are applied range by range.
+            updt_values = list()
+            for i in range(len(values)):
+                updt_values.append(self.function(values[i-ref_start:i-ref_end+1])if i>ref_start else self.get_on_out_of_range_value(data=values, index=i, on_out_of_range=self.on_out_of_range))
+        else:
+            #Value i aggregates the range ending at i-ref_end.
+            updt_values = [self.get_on_out_of_range_value(data=values, index=i, on_out_of_range=self.on_out_of_range) for i in range(ref_start+1)]
+            updt_values = updt_values + rolling_values[ref_start+1-ref_end:len(values)-ref_end].tolist()
         
         updt_df[self.column] = updt_values
         return self.finalize(data=updt_df)
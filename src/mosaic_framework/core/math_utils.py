@@ -6,11 +6,26 @@
 # Company: xFarm Technologies
 ################################################################################
 
-from typing import Callable
+import re
+import ast
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from numpy.lib.stride_tricks import sliding_window_view
 from statistics import mean, median
 from math import sin, cos, tan
 from math import asin as arcsin, acos as arccos, atan as arctan
 
+from mosaic_framework.core.exceptions import ExpressionFormatError, UnsupportedFunctionError
+
+FUNCTION_MAPPINGS = {
+    'sum': sum, 'mean': mean, 'median':median,
+    'avg': mean, 'min': min,  'max': max,
+    'sin': sin,  'cos': cos,  'tan': tan,
+    'arcsin': arcsin,  'arccos': arccos,  'arctan': arctan,
+    'sign': np.sign, 'abs': abs, 'round': round, 'pow': pow}
+
 def get_mapped_function(fnc: str) -> Callable:
     """
     Maps a string function name to its corresponding callable function.
@@ -21,8 +36,257 @@ def get_mapped_function(fnc: str) -> Callable:
     Returns:
         Callable: The mapped function
     """
-    mappings = {'sum': sum, 'mean': mean, 'median':median, 
-                'avg': mean, 'min': min,  'max': max,
-                'sin': sin,  'cos': cos,  'tan': tan,
-                'arcsin': arcsin,  'arccos': arccos,  'arctan': arctan}
-    return mappings[fnc]
+    return FUNCTION_MAPPINGS[fnc]
+
+def get_array_reduction(fnc: Callable) -> Callable:
+    """
+    Wraps a NumPy reduction, so that it is applied element-wise over its
+    operands, as the mapped function is applied over the values of a row.
+    eg. max([<a>, <b>]) or max(<a>, <b>) -> element-wise maximum of a and b
+
+    Args:
+        fnc (Callable): NumPy reduction accepting the 'axis' argument
+
+    Returns:
+        Callable: The element-wise reduction
+    """
+    def reduce_operands(*args):
+        operands = args[0] if len(args)==1 and isinstance(args[0], (list, tuple)) else args
+        return fnc(np.vstack(np.broadcast_arrays(*operands)), axis=0)
+    return reduce_operands
+
+#Same keys of FUNCTION_MAPPINGS, working on whole columns.
+ARRAY_FUNCTION_MAPPINGS = {
+    'sum': get_array_reduction(np.sum), 'mean': get_array_reduction(np.mean), 'median': get_array_reduction(np.median),
+    'avg': get_array_reduction(np.mean), 'min': get_array_reduction(np.min),  'max': get_array_reduction(np.max),
+    'sin': np.sin,  'cos': np.cos,  'tan': np.tan,
+    'arcsin': np.arcsin,  'arccos': np.arccos,  'arctan': np.arctan,
+    'sign': np.sign, 'abs': np.abs, 'round': np.round, 'pow': np.power}
+
+#Aggregations of FUNCTION_MAPPINGS that have an O(n) rolling implementation in pandas.
+ROLLING_FUNCTION_MAPPINGS = [
+    (sum, 'sum'), (mean, 'mean'), (median, 'median'), (min, 'min'), (max, 'max')]
+
+#Aggregations giving integers on integer values, as the rolling ones.
+INTEGER_ROLLING_FUNCTIONS = ['sum', 'min', 'max']
+
+#Element-wise operations applying sum, min and max value by value, in the python order.
+SEQUENTIAL_REDUCTIONS = {'sum': np.add, 'min': np.minimum, 'max': np.maximum}
+
+def get_rolling_aggregation(values:np.ndarray, window:int, fnc:Callable) -> Optional[np.ndarray]:
+    """
+    Applies an aggregation over each window of consecutive values, in O(n).
+    Value j is fnc(values[j-window+1:j+1]), the first window-1 values are
+    not complete windows, so they are NaN (0 for integers). Windows containing non finite
+    values are aggregated by fnc itself, as the rolling implementations 
+    handle NaN and inf differently from python functions.
+
+    Args:
+        values (np.ndarray): Values to aggregate
+        window (int): Number of values of each window
+        fnc (Callable): Aggregation, one of ROLLING_FUNCTION_MAPPINGS
+
+    Returns:
+        Optional[np.ndarray]: Aggregated values, None if fnc or values are not supported
+            (eg. a custom function) and the aggregation must be applied window by window
+    """
+    name   = next((n for f, n in ROLLING_FUNCTION_MAPPINGS if f is fnc), None)
+    values = np.asarray(values)
+    if name is None or not isinstance(window, (int, np.integer)) or window < 1:
+        return None
+    if not (values.dtype.kind == 'f' or (values.dtype.kind in 'iu' and name in INTEGER_ROLLING_FUNCTIONS)):
+        return None
+
+    result = getattr(pd.Series(values).rolling(window), name)().to_numpy()
+    if values.dtype.kind in 'iu':
+        #Rolling sum, min and max of integers are exact, kept as integers.
+        return np.nan_to_num(result).astype(np.int64)
+
+    non_finite = pd.Series(~np.isfinite(values), dtype=float).rolling(window).sum().to_numpy() > 0
+    for j in np.flatnonzero(non_finite):
+        result[j] = fnc(values[j-window+1:j+1])
+    return result
+
+def get_window_aggregation(values:np.ndarray, offsets:List[int], fnc:Callable) -> Optional[np.ndarray]:
+    """
+    Applies an aggregation over a window of values around each index, as a 
+    single array operation over a strided view of the values.
+    Value i is fnc([values[i+o] for o in offsets]), values whose window is not
+    complete (some i+o out of the values) are NaN (0 for integers).
+    sum, min and max are reduced value by value in the python order, giving the 
+    same results of fnc. Windows containing non finite values are aggregated 
+    by fnc itself.
+
+    Args:
+        values (np.ndarray): Values to aggregate
+        offsets (List[int]): Position of each window value, relative to the index (eg. [-2, -1, 1])
+        fnc (Callable): Aggregation, one of ROLLING_FUNCTION_MAPPINGS
+
+    Returns:
+        Optional[np.ndarray]: Aggregated values, None if fnc or values are not supported
+            (eg. a custom function) and the aggregation must be applied window by window
+    """
+    name   = next((n for f, n in ROLLING_FUNCTION_MAPPINGS if f is fnc), None)
+    values = np.asarray(values)
+    if name is None or len(offsets) == 0:
+        return None
+    if not (values.dtype.kind == 'f' or (values.dtype.kind in 'iu' and name in INTEGER_ROLLING_FUNCTIONS)):
+        return None
+
+    start, end = min(offsets), max(offsets)
+    result     = np.zeros(len(values), dtype=np.int64) if values.dtype.kind in 'iu' else np.full(len(values), np.nan)
+    if len(values) < end-start+1:
+        return result
+    
+    #Row k is the window of index k-start.
+    windows = sliding_window_view(values, end-start+1)[:, np.asarray(offsets)-start]
+    if name in SEQUENTIAL_REDUCTIONS:
+        #python sum starts from 0
+        reduced = windows[:, 0] + 0 if name == 'sum' else windows[:, 0]
+        for j in range(1, windows.shape[1]):
+            reduced = SEQUENTIAL_REDUCTIONS[name](reduced, windows[:, j])
+    else:
+        reduced = getattr(np, name)(windows, axis=1)
+    
+    if values.dtype.kind == 'f':
+        reduced = np.array(reduced, dtype=float)
+        for k in np.flatnonzero(~np.isfinite(windows).all(axis=1)):
+            reduced[k] = fnc(windows[k].tolist())
+    first, last = max(0, -start), min(len(values), len(values)-end)
+    if first < last:
+        result[first:last] = reduced[first+start:last+start]
+    return result
+
+#Columns are expressed as <column_name> in the equations
+PLACEHOLDER_PATTERN = re.compile(r'<([^<>\s]+)>')
+
+ALLOWED_NODES = (
+    ast.Expression, ast.BinOp, ast.UnaryOp, ast.Compare, ast.Call, ast.Name, ast.Load,
+    ast.Constant, ast.List, ast.Tuple,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.UAdd, ast.USub,
+    ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq)
+
+class CompiledExpression:
+    """
+    Equation parsed once into a validated AST, where each <column> placeholder
+    is a variable. The same code object is evaluated on whole NumPy arrays or
+    on the values of a single row, without building and parsing strings again.
+    Only the functions exposed by get_mapped_function are compiled, other calls
+    (eg. np.exp(<temp>)) raise UnsupportedFunctionError, the equation is left
+    to the python evaluation row by row.
+
+    Args:
+        expression (str): The equation, eg. '(1-(<hum>/100))*(CONSTANT_E)^(<temp>)'
+    """
+    def __init__(self, expression:str) -> None:
+        self.expression = expression
+        self.columns    = list(dict.fromkeys(PLACEHOLDER_PATTERN.findall(expression)))
+        self.variables  = {c:f'column_{i}' for i, c in enumerate(self.columns)}
+
+        source = PLACEHOLDER_PATTERN.sub(lambda m:self.variables[m.group(1)], expression)
+        source = source.replace('^', '**')
+        source = source.replace('CONSTANT_E', f'{np.e}')
+        try:
+            tree = ast.parse(source.strip(), mode='eval')
+        except SyntaxError as e:
+            raise ExpressionFormatError(f"Invalid equation. expression={expression} | error={e}")
+        self.validate(tree=tree)
+        self.tree = tree
+        self.code = compile(tree, filename='<equation>', mode='eval')
+
+    def is_fallback_call(self, node:ast.Call) -> bool:
+        """
+        Checks that a not mapped call is a plain function (eg. exp(<a>), np.exp(<a>)),
+        that can be left to the python evaluation.
+
+        Args:
+            node (ast.Call): Call of a not mapped function
+
+        Returns:
+            bool: True if the function is a name or an attribute of a name, not private
+        """
+        func = node.func
+        while isinstance(func, ast.Attribute) and not func.attr.startswith('_'):
+            func = func.value
+        return isinstance(func, ast.Name) and not func.id.startswith('_') and not func.id in self.variables.values()
+
+    def validate(self, tree:ast.AST) -> None:
+        """
+        Checks that the expression contains only arithmetic operations,
+        numbers, columns and mapped functions. Calls of other functions
+        are checked in their arguments only, then UnsupportedFunctionError is raised.
+
+        Args:
+            tree (ast.AST): Parsed expression
+        """
+        unsupported_calls = list()
+        nodes             = [tree]
+        while len(nodes) > 0:
+            node = nodes.pop()
+            if isinstance(node, ast.Call) and (not isinstance(node.func, ast.Name) or not node.func.id in FUNCTION_MAPPINGS or len(node.keywords)>0):
+                if not self.is_fallback_call(node=node):
+                    raise ExpressionFormatError(f"Not supported function call: {ast.unparse(node)}. expression={self.expression}")
+                unsupported_calls.append(ast.unparse(node.func))
+                nodes.extend(node.args + [k.value for k in node.keywords])
+                continue
+            nodes.extend(ast.iter_child_nodes(node))
+            if not isinstance(node, ALLOWED_NODES):
+                raise ExpressionFormatError(f"Not supported element: {type(node).__name__}. expression={self.expression}")
+            if isinstance(node, ast.Name) and not node.id in FUNCTION_MAPPINGS and not node.id in self.variables.values():
+                raise ExpressionFormatError(f"Not supported name: {node.id}. expression={self.expression}")
+            if isinstance(node, ast.Constant) and not isinstance(node.value, (int, float)):
+                raise ExpressionFormatError(f"Not supported constant: {node.value!r}. expression={self.expression}")
+            if isinstance(node, ast.Compare) and len(node.ops)>1:
+                raise ExpressionFormatError(f"Chained comparisons are not supported. expression={self.expression}")
+        if len(unsupported_calls) > 0:
+            raise UnsupportedFunctionError(f"Not mapped functions: {', '.join(dict.fromkeys(unsupported_calls))}. expression={self.expression}")
+
+    def evaluate_arrays(self, values:Dict[str, np.ndarray], length:int) -> np.ndarray:
+        """
+        Evaluates the expression over whole columns.
+        Invalid operations (eg. division by zero) do not raise, but produce
+        non finite values, as usual in NumPy.
+
+        Args:
+            values (Dict[str, np.ndarray]): Column name -> column values
+            length (int): Number of rows, used when the expression is a constant
+
+        Returns:
+            np.ndarray: A new float array with the results
+        """
+        namespace = {'__builtins__': {}, **ARRAY_FUNCTION_MAPPINGS}
+        for c in self.columns:
+            namespace[self.variables[c]] = np.asarray(values[c], dtype=float)
+        with np.errstate(all='ignore'):
+            result = eval(self.code, namespace)
+        return np.array(np.broadcast_to(np.asarray(result, dtype=float), (length,)))
+
+    def __call__(self, values:Dict) -> float:
+        """
+        Evaluates the expression on the values of a single row, with
+        python arithmetic (eg. a negative base with fractional exponent
+        returns a complex number).
+
+        Args:
+            values (Dict): Column name -> value
+
+        Returns:
+            float: The result (may be complex)
+        """
+        namespace = {'__builtins__': {}, **FUNCTION_MAPPINGS}
+        for c in self.columns:
+            namespace[self.variables[c]] = float(values[c])
+        return eval(self.code, namespace)
+
+@lru_cache(maxsize=None)
+def compile_expression(expression:str) -> CompiledExpression:
+    """
+    Compiles an equation, caching the result for each expression.
+
+    Args:
+        expression (str): The equation
+
+    Returns:
+        CompiledExpression: The compiled equation
+    """
+    return CompiledExpression(expression=expression)
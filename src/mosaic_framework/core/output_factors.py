@@ -8,25 +8,25 @@
 ################################################################################
 
 from __future__ import annotations
-from typing import List, Callable, TYPE_CHECKING, Dict, Any
+from typing import List, Callable, TYPE_CHECKING, Dict, Any, Optional, Tuple
 
 import re
 import time
 import numpy as np
 import pandas as pd
 from copy import deepcopy
-import datetime
 
 if TYPE_CHECKING:
     from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
     
     MosaicRulesHubType  = MosaicRulesHub
 
-from mosaic_framework.core.math_utils import get_mapped_function
+from mosaic_framework.core.math_utils import get_mapped_function, get_window_aggregation
 from mosaic_framework.core.agronomical_factors import ProtocolAgroRule
 from mosaic_framework.core.functions import apply_condition, apply_condition_over_values
 from mosaic_framework.core.exceptions import DataFormatException
-from mosaic_framework.dt.datetime_parser import DatetimeParser
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame, get_timeline
+from mosaic_framework.core.daily_compaction import DailyCompaction
 
 class OutputAgroRule(ProtocolAgroRule):
     """
@@ -47,6 +47,7 @@ class OutputAgroRule(ProtocolAgroRule):
         self.start_time  = None
         self.end_time    = None
         self.rules_hub   = None
+        self.daily_compaction = None
 
     def get_target(self, target: Any) -> List[str]:
         """
@@ -65,6 +66,69 @@ class OutputAgroRule(ProtocolAgroRule):
         else:
             raise ValueError(f"Target must be a string or a list of strings. Found: {type(target)}")
 
+    def get_input_columns(self) -> Optional[List[str]]:
+        """
+        Gets the columns read from the hourly data.
+
+        Returns:
+            Optional[List[str]]: Input column names
+        """
+        return list(self.target) if isinstance(self.target, list) else [self.target]
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Gets the number of days, before the current one, read to evaluate a day
+        (the daily result is shifted by 'ref' days).
+
+        Returns:
+            Optional[int]: Days read before the current one, None if the rule carries a state from the start of the data
+        """
+        return max(self.ref, 0)
+
+    def get_lead(self) -> int:
+        """
+        Gets the number of days, after the current one, read to evaluate a day.
+
+        Returns:
+            int: Days read after the current one
+        """
+        return max(-self.ref, 0)
+
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Gets the number of days, before the current one, read to evaluate a day when the rule
+        goes on from the state carried over by the evaluation of the previous data (see set_carry_over).
+        Same of get_lag for rules that do not carry a state.
+
+        Returns:
+            Optional[int]: Days read before the current one, None if the rule cannot go on from a carried over state
+        """
+        return self.get_lag()
+
+    def set_carry_over(self, state: Optional[Dict[str, Any]], row: int, next_rows: Optional[Tuple[int, int]]) -> None:
+        """
+        Sets the state the rule goes on from, and the days whose state is carried over to the next
+        evaluation (see OutputModel). Rows are the days of the daily data.
+
+        Parameters:
+            state: State of the rule before 'row' (see get_carry_state), None to evaluate from the start of the data
+            row: First day to evaluate, days before it were evaluated with the previous data
+            next_rows: First day kept for the next evaluation and first day it evaluates, None if the state is not carried over
+        """
+        self.carry_state      = state
+        self.carry_row        = row if state is not None else 0
+        self.next_carry_rows  = next_rows
+        self.next_carry_state = None
+
+    def get_carry_state(self) -> Optional[Dict[str, Any]]:
+        """
+        Gets the state of the rule before the first day of the next evaluation (see set_carry_over).
+
+        Returns:
+            Optional[Dict[str, Any]]: State of the rule, as json values, None if the rule does not carry a state
+        """
+        return self.__dict__.get('next_carry_state', None)
+
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepares the data for rule evaluation.
@@ -117,6 +181,78 @@ class OutputAgroRule(ProtocolAgroRule):
         """
         self.rules_hub = rules_hub
 
+    def set_daily_compaction(self, daily_compaction: DailyCompaction) -> None:
+        """
+        Sets the daily compaction shared by the output rules of the same output.
+
+        Parameters:
+            daily_compaction: DailyCompaction of the current output
+        """
+        self.daily_compaction = daily_compaction
+
+    def get_daily_compaction(self) -> DailyCompaction:
+        """
+        Gets the daily compaction of the rule, a private one if it is not shared.
+
+        Returns:
+            DailyCompaction: Daily compaction used by the rule
+        """
+        if self.daily_compaction is None:
+            self.daily_compaction = DailyCompaction()
+        return self.daily_compaction
+
+    def get_daily_aggregates(self) -> List[tuple[str, str]]:
+        """
+        Gets the daily aggregates read by the rule, that the daily compaction
+        of the output can compute in advance.
+
+        Returns:
+            List[tuple[str, str]]: Aggregates as (target column, function name)
+        """
+        return list()
+
+    def get_current_granularity(self, data: pd.DataFrame) -> str:
+        """
+        Gets current data granularity by analyzing timestamp differences.
+
+        Parameters:
+            data: Input DataFrame
+
+        Returns:
+            str: Granularity as string ('daily' or 'hourly') or None if not recognized
+        """
+        #Seconds between consecutive dates, from the timeline of the dataframe
+        timestamps      = get_timeline(data).values.astype('int64')
+        avg_differences = get_mapped_function('mean')((np.diff(timestamps)/1e9).tolist())
+        #Getting the timeframe supported
+        supported_timeframe      = {'daily': 86400, 'hourly':3600}
+        supported_timeframe_copy = deepcopy(supported_timeframe)
+        supported_timeframe      = {value: key for key, value in supported_timeframe_copy.items()}
+
+        return supported_timeframe.get(avg_differences, None)
+
+    def get_compact_data(self, data: pd.DataFrame, fnc: str) -> pd.DataFrame:
+        """
+        Compacts data by aggregating the target per day, with the daily compaction.
+
+        Parameters:
+            data: Data to be compacted
+            fnc: Function used for compacting
+
+        Returns:
+            pd.DataFrame: Compacted data, with the aggregate as '<fnc>_inner_column' and as target
+        """
+        if isinstance(self.target, list):
+            self.target = self.target[0]
+
+        daily_data   = self.get_daily_compaction().get_aggregates(data=data, aggregates=[(self.target, str(fnc))])
+        compact_data = pd.DataFrame(data={
+            f'{str(fnc)}_inner_column': daily_data[f'{self.target}_{str(fnc)}'],
+            'sampleDate'              : daily_data['date'] + " 00:00"})
+        compact_data[self.target] = compact_data[f'{str(fnc)}_inner_column']
+
+        return compact_data
+
 #This Rule allows to select a max of a single day, in the 
 #selected column, then compare it to a certain threshold
 class SelectMaxAndCompare(OutputAgroRule):
@@ -155,6 +291,16 @@ class SelectMaxAndCompare(OutputAgroRule):
         return {'comp': comp, 'val': val}
     
 
+    def get_daily_aggregates(self) -> List[tuple[str, str]]:
+        """
+        Gets the daily aggregates read by the rule.
+
+        Returns:
+            List[tuple[str, str]]: Aggregates as (target column, function name)
+        """
+        target = self.target[0] if isinstance(self.target, list) else self.target
+        return [(target, 'max')]
+
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepares data for rule evaluation.
@@ -180,36 +326,16 @@ class SelectMaxAndCompare(OutputAgroRule):
         """
         prepared_data = self.prepare(data=data)
         OutputAgroRule.evaluate(self, data=prepared_data)
-        updt_data     = deepcopy(prepared_data)
+        updt_data     = get_evaluation_frame(prepared_data)
 
-        #Separe sampleDate from sampleTime
-        #groupUp for sampleDate, applying max function
-        daily_data = deepcopy(updt_data)
-        daily_data['date'] = np.nan
-        daily_data['date'] = daily_data['sampleDate'].apply(lambda x: x[:x.index(" ")])
-        
         if isinstance(self.target, list):
             self.target = self.target[0]
         
-        #Grouping up data based on sample_date (date part)
-        aggregate_functions = {self.target: ['max'], }
-        map_output_columns  = {f'{self.target}_max':'max_inner_column'}
-
-        grouped_multiple = \
-            daily_data.groupby(['date']).agg(aggregate_functions)
-        
-        merged_cols = ['_'.join(multicol) for multicol in grouped_multiple.columns]
-        grouped_multiple.columns=grouped_multiple.columns.droplevel(1)
-        for i, _ in enumerate(merged_cols):
-            merged_cols = list(map(lambda x: x.replace(merged_cols[i], map_output_columns[merged_cols[i]]), merged_cols))
-        grouped_multiple.columns=merged_cols
-        grouped_multiple.reset_index(inplace=True)  
-        grouped_multiple = grouped_multiple.to_dict('records')
-        for i, _ in enumerate(grouped_multiple):
-            grouped_multiple[i]['sampleDate'] = grouped_multiple[i]['date'] + " 00:00"
-            del grouped_multiple[i]['date']
-        
-        grouped_multiple = pd.DataFrame(grouped_multiple)
+        #Daily max of the target, from the daily compaction
+        daily_data       = self.get_daily_compaction().get_aggregates(data=updt_data, aggregates=self.get_daily_aggregates())
+        grouped_multiple = pd.DataFrame(data={
+            'max_inner_column': daily_data[f'{self.target}_max'],
+            'sampleDate'      : daily_data['date'] + " 00:00"})
 
         #Applying the core check
         grouped_multiple[self.column] = grouped_multiple['max_inner_column'].apply(lambda x:apply_condition(x, cond=self.condition))
@@ -219,7 +345,7 @@ class SelectMaxAndCompare(OutputAgroRule):
 
         #Also we need to dump result, with different granularity into hourly data.
         merged_df = pd.merge(updt_data, grouped_multiple, on='sampleDate', how='left')
-        merged_df[self.column].fillna(0.0, inplace=True)
+        merged_df[self.column] = merged_df[self.column].fillna(0.0)
 
         #remove column on presence, eventually
         if 'sampleDate_daily' in merged_df.columns:
@@ -265,6 +391,15 @@ class SelectMaxApplyAndComparison(OutputAgroRule):
         return {'comp': comp, 'val': val}
     
 
+    def get_daily_aggregates(self) -> List[tuple[str, str]]:
+        """
+        Gets the daily aggregates read by the rule.
+
+        Returns:
+            List[tuple[str, str]]: Aggregates as (target column, function name)
+        """
+        return [(t, 'max') for t in self.target]
+
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepares data for rule evaluation.
@@ -290,37 +425,14 @@ class SelectMaxApplyAndComparison(OutputAgroRule):
         """
         data          = OutputAgroRule.evaluate(self, data=data)
         prepared_data = self.prepare(data=data)
-        updt_data     = deepcopy(prepared_data)
-
-        #Separe sampleDate from sampleTime
-        #groupUp for sampleDate, applying max function
-        daily_data = deepcopy(updt_data)
-        daily_data['date'] = np.nan
-        daily_data['date'] = daily_data['sampleDate'].apply(lambda x: x[:x.index(" ")])
+        updt_data     = get_evaluation_frame(prepared_data)
 
-        #Grouping up data based on sample_date (date part)
-        
-        #aggregate_functions = {self.target: ['max']}
-        aggregate_functions = {t:['max'] for t in self.target}
-
-        #map_output_columns  = {f'{self.target}_max':'max_inner_column'}
-        map_output_columns  =  {f'{t}_max': 'max_inner_column_'+t for t in self.target}
-
-        grouped_multiple = \
-            daily_data.groupby(['date']).agg(aggregate_functions)
-                
-        merged_cols = ['_'.join(multicol) for multicol in grouped_multiple.columns]
-        grouped_multiple.columns=grouped_multiple.columns.droplevel(1)
-        new_merged_cols = [map_output_columns[col] if col in map_output_columns else col for col in merged_cols]
-        merged_cols     = new_merged_cols
-        grouped_multiple.columns=merged_cols
-        grouped_multiple.reset_index(inplace=True)  
-        grouped_multiple = grouped_multiple.to_dict('records')
-        for i, _ in enumerate(grouped_multiple):
-            grouped_multiple[i]['sampleDate'] = grouped_multiple[i]['date'] + " 00:00"
-            del grouped_multiple[i]['date']
-        
-        grouped_multiple = pd.DataFrame(grouped_multiple)
+        #Daily max of each target, from the daily compaction
+        map_output_columns = {f'{t}_max': 'max_inner_column_'+t for t in self.target}
+        daily_data         = self.get_daily_compaction().get_aggregates(data=updt_data, aggregates=self.get_daily_aggregates())
+        merged_cols        = list(map_output_columns.values())
+        grouped_multiple   = pd.DataFrame(data={map_output_columns[c]:daily_data[c] for c in map_output_columns})
+        grouped_multiple['sampleDate'] = daily_data['date'] + " 00:00"
         
         and_columns                   = map_output_columns.values()
         grouped_multiple[self.column] = grouped_multiple.apply(lambda row:apply_condition_over_values(v=[row.to_dict()[k] for k in row.to_dict() if k in and_columns], cond=self.condition, iterable_fnc=all), axis=1)
@@ -334,7 +446,7 @@ class SelectMaxApplyAndComparison(OutputAgroRule):
 
         #Also we need to dump result, with different granularity into hourly data.
         merged_df = pd.merge(updt_data, grouped_multiple, on='sampleDate', how='left')
-        merged_df[self.column].fillna(0.0, inplace=True)
+        merged_df[self.column] = merged_df[self.column].fillna(0.0)
 
         #remove column on presence, eventually
         if 'sampleDate_daily' in merged_df.columns:
@@ -356,92 +468,87 @@ class ApplyWindowing(OutputAgroRule):
         window_fnc (str): Mathematical function for windowing
         select_fnc (str): Mathematical function for data selection
         debug (bool): Whether to print debug information
+        evaluation_mode (str, optional): 'vectorized' applies sum, mean, median, min and max
+            over all windows at once, 'reference' window by window. Defaults to 'vectorized'.
     """
 
     def __init__(self, select_fnc: str, window_fnc: str, window_past: int, window_current: int, window_future: int, **kwargs) -> None:
         super().__init__(column=kwargs.get('column', None), target=kwargs.get('target', None) , ref=kwargs.get('ref', 0), debug=kwargs.get('debug', False))
-        self.window_past    = window_past
-        self.window_current = window_current
-        self.window_future  = window_future
-        self.window_fnc     = get_mapped_function(fnc=window_fnc)
-        self.select_fnc     = select_fnc
+        self.window_past     = window_past
+        self.window_current  = window_current
+        self.window_future   = window_future
+        self.window_fnc      = get_mapped_function(fnc=window_fnc)
+        self.select_fnc      = select_fnc
+        self.evaluation_mode = kwargs.get('evaluation_mode', 'vectorized')
 
+        if not self.evaluation_mode in ['vectorized', 'reference']:
+            raise ValueError(f"evaluation_mode must be one of: ['vectorized', 'reference']. Found: {self.evaluation_mode}")
 
-    def get_current_granularity(self, data: pd.DataFrame) -> str:
+    def get_lag(self) -> Optional[int]:
         """
-        Gets current data granularity.
-
-        Parameters:
-            data: Input DataFrame
+        Gets the past days of the window.
 
         Returns:
-            str: Granularity as string
+            Optional[int]: Days read before the current one
         """
-        #Get the parser
-        dt_parser = DatetimeParser()
+        return self.window_past
 
-        #Separe sampleDate from sampleTime
-        #groupUp for sampleDate, applying max function
-        daily_data = deepcopy(data)
-        daily_data['date']      = np.nan
-        daily_data['date']      = dt_parser.parse_batch(daily_data['sampleDate'].to_list())
-        daily_data['timestamp'] = daily_data['date'].apply(lambda x: datetime.datetime.strptime(x, dt_parser.output_format).timestamp())
-        avg_differences         = get_mapped_function('mean')([daily_data['timestamp'].to_list()[i+1]-daily_data['timestamp'].to_list()[i] for i in range(len(daily_data['timestamp'].to_list())-1)])
-        #Getting the timeframe supported
-        supported_timeframe      = {'daily': 86400, 'hourly':3600}
-        supported_timeframe_copy = deepcopy(supported_timeframe)
-        supported_timeframe      = {value: key for key, value in supported_timeframe_copy.items()}
+    def get_lead(self) -> int:
+        """
+        Gets the future days of the window, the last ones of the data have no complete window.
 
-        return supported_timeframe.get(avg_differences, None)
-    
-    def get_compact_data(self, data: pd.DataFrame, fnc: Callable) -> pd.DataFrame:
+        Returns:
+            int: Days read after the current one
         """
-        Compacts data using specified function.
+        return self.window_future
+
+    def get_window(self, column_data: List[float], index: int, window: tuple) -> Optional[List[float]]:
+        """
+        Gets the values of the window of an index, with past, current and future points.
 
         Parameters:
-            data: Data to be compacted
-            fnc: Function used for compacting
+            column_data: Data to apply window to
+            index: Index of the current point
+            window: Tuple of (past, current, future) window sizes
 
         Returns:
-            pd.DataFrame: Compacted data
+            Optional[List[float]]: Window values, None if future points are not available
         """
-        #Get the parser
-        dt_parser = DatetimeParser()
-
-        #Separe sampleDate from sampleTime
-        #groupUp for sampleDate, applying max function
-        daily_data = deepcopy(data)
-        daily_data['date'] = np.nan
-        daily_data['date'] = dt_parser.parse_batch(daily_data['sampleDate'].to_list())
-        daily_data['date'] = daily_data['date'].apply(lambda x: x[:x.index("T")])
+        # Check if current index is within valid window range
+        if index > len(column_data) - window[2] - 1:
+            return None
+            
+        window_values = []
         
-        if isinstance(self.target, list):
-            self.target = self.target[0]
-        
-        #Grouping up data based on sample_date (date part)
-        aggregate_functions = {self.target: [str(fnc)], }
-        map_output_columns  = {f'{self.target}_{str(fnc)}':f'{str(fnc)}_inner_column'}
-
-        grouped_multiple = \
-            daily_data.groupby(['date']).agg(aggregate_functions)
+        # Add past values
+        if window[0] > 0:
+            past_start = max(0, index - window[0])  # Ensure we don't go below 0
+            past_end = index
+            window_values.extend(column_data[past_start:past_end])
         
-        merged_cols = ['_'.join(multicol) for multicol in grouped_multiple.columns]
-        grouped_multiple.columns=grouped_multiple.columns.droplevel(1)
-        for i, _ in enumerate(merged_cols):
-            merged_cols = list(map(lambda x: x.replace(merged_cols[i], map_output_columns[merged_cols[i]]), merged_cols))
-        grouped_multiple.columns=merged_cols
-        grouped_multiple.reset_index(inplace=True)  
-        grouped_multiple = grouped_multiple.to_dict('records')
-        for i, _ in enumerate(grouped_multiple):
-            grouped_multiple[i]['sampleDate'] = grouped_multiple[i]['date'] + " 00:00"
-            del grouped_multiple[i]['date']
+        # Add current value 
+        if window[1] > 0:
+            window_values.append(column_data[index])
+            
+        # Add future values
+        if window[2] > 0:
+            future_start = index + 1
+            future_end = min(index + window[2] + 1, len(column_data))  # Ensure we don't exceed array length
+            window_values.extend(column_data[future_start:future_end])
         
-        grouped_multiple = pd.DataFrame(grouped_multiple)
-        grouped_multiple[self.target] = grouped_multiple[f'{str(fnc)}_inner_column']
-        grouped_multiple.drop(f'{str(fnc)}_inner_column', axis=1)
-        
-        return grouped_multiple
-    
+        return window_values[-window[0]:] if window[0] > 0 else window_values  # Only use last window[0] values
+
+
+    def get_daily_aggregates(self) -> List[tuple[str, str]]:
+        """
+        Gets the daily aggregates read by the rule, when the data is compacted.
+
+        Returns:
+            List[tuple[str, str]]: Aggregates as (target column, function name)
+        """
+        target = self.target[0] if isinstance(self.target, list) else self.target
+        return [(target, str(self.select_fnc))]
+
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepares data for rule evaluation.
@@ -485,44 +592,38 @@ class ApplyWindowing(OutputAgroRule):
                 List[float]: Windowed results
             """
             result = list()
-            i = 0
-            while i < len(column_data):
-                # Check if current index is within valid window range
-                has_valid_window = (i <= len(column_data) - window[2] - 1)
-                
-                if not has_valid_window:
-                    result.append(0)
-                    i += 1
-                    continue
-                    
-                window_values = []
-                
-                # Add past values
-                if window[0] > 0:
-                    past_start = max(0, i - window[0])  # Ensure we don't go below 0
-                    past_end = i
-                    window_values.extend(column_data[past_start:past_end])
-                
-                # Add current value 
-                if window[1] > 0:
-                    window_values.append(column_data[i])
-                    
-                # Add future values
-                if window[2] > 0:
-                    future_start = i + 1
-                    future_end = min(i + window[2] + 1, len(column_data))  # Ensure we don't exceed array length
-                    window_values.extend(column_data[future_start:future_end])
-                
-                # Calculate window function on collected values
-                window_result = self.window_fnc(window_values[-window[0]:] if window[0] > 0 else window_values)  # Only use last window[0] values
-                result.append(window_result)
-                
-                i += 1
+            for i in range(len(column_data)):
+                window_values = self.get_window(column_data=column_data, index=i, window=window)
+                result.append(0 if window_values is None else self.window_fnc(window_values))
             return result
         
+        def apply_vectorized_fnc(column_data: np.ndarray, window: tuple) -> List[float]:
+            """
+            Applies the window function over all complete windows at once. Windows
+            truncated by the start of the data are computed one by one, as in apply_fnc.
+
+            Parameters:
+                column_data: Data to apply window to
+                window: Tuple of (past, current, future) window sizes
+
+            Returns:
+                List[float]: Windowed results, same of apply_fnc
+            """
+            #Positions of a complete window, relative to its index.
+            offsets    = self.get_window(column_data=list(range(-window[0], window[2]+1)), index=window[0], window=window)
+            first      = max(0, -min(offsets, default=0))
+            last       = len(column_data) - window[2]
+            aggregated = get_window_aggregation(values=column_data, offsets=offsets, fnc=self.window_fnc) \
+                if first < last else None
+            if aggregated is None:
+                return apply_fnc(column_data=column_data.tolist(), window=window)
+            
+            result = apply_fnc(column_data=column_data[:first+window[2]].tolist(), window=window)[:first]
+            return result + aggregated[first:last].tolist() + [0]*(len(column_data)-last)
+        
         prepared_data = self.prepare(data=data)
         OutputAgroRule.evaluate(self, data=prepared_data)
-        updt_data     = deepcopy(prepared_data)
+        updt_data     = get_evaluation_frame(prepared_data)
 
         #Get current data granularity
         current_granularity = self.get_current_granularity(data=updt_data)
@@ -538,7 +639,11 @@ class ApplyWindowing(OutputAgroRule):
             if  current_granularity!='daily' \
             else updt_data
         
-        compact_data[self.column] = apply_fnc(column_data=compact_data[self.target].tolist(), window=(self.window_past, self.window_current, self.window_future))
+        window = (self.window_past, self.window_current, self.window_future)
+        if self.evaluation_mode == 'reference':
+            compact_data[self.column] = apply_fnc(column_data=compact_data[self.target].tolist(), window=window)
+        else:
+            compact_data[self.column] = apply_vectorized_fnc(column_data=compact_data[self.target].values, window=window)
 
         return self.finalize(daily_data=compact_data, hourly_data=updt_data)
 
@@ -554,6 +659,8 @@ class ApplySusceptibility(OutputAgroRule):
         select_fnc (str): Mathematical function for data selection
         grouping_fnc (str): Mathematical function for summarizing window values
         debug (bool): Whether to print debug information
+        evaluation_mode (str, optional): 'vectorized' applies the susceptibility over all days
+            at once, 'reference' day by day. Defaults to 'vectorized'.
     """
 
     def __init__(self, select_fnc: str, grouping_fnc: Callable='sum', susceptibility_window: int=3, susceptibility_column: str='susceptibility', risk_cap: int=4, **kwargs) -> None:
@@ -563,82 +670,49 @@ class ApplySusceptibility(OutputAgroRule):
         self.susceptibility_modifier = susceptibility_column
         self.susceptibility_window   = susceptibility_window
         self.fnc = get_mapped_function(fnc=grouping_fnc)
+        self.evaluation_mode         = kwargs.get('evaluation_mode', 'vectorized')
 
-    def get_current_granularity(self, data: pd.DataFrame) -> str:
-        """
-        Gets current data granularity.
+        if not self.evaluation_mode in ['vectorized', 'reference']:
+            raise ValueError(f"evaluation_mode must be one of: ['vectorized', 'reference']. Found: {self.evaluation_mode}")
 
-        Parameters:
-            data: Input DataFrame
+    def get_input_columns(self) -> Optional[List[str]]:
+        """
+        Gets the columns read from the hourly data, including the susceptibility column.
 
         Returns:
-            str: Granularity as string
+            Optional[List[str]]: Input column names
         """
-        #Get the parser
-        dt_parser = DatetimeParser()
+        return super().get_input_columns()+[self.susceptibility_modifier]
 
-        #Separe sampleDate from sampleTime
-        #groupUp for sampleDate, applying max function
-        daily_data = deepcopy(data)
-        daily_data['date']      = np.nan
-        daily_data['date']      = dt_parser.parse_batch(daily_data['sampleDate'].to_list())
-        daily_data['timestamp'] = daily_data['date'].apply(lambda x: datetime.datetime.strptime(x, dt_parser.output_format).timestamp())
-        avg_differences         = get_mapped_function('mean')([daily_data['timestamp'].to_list()[i+1]-daily_data['timestamp'].to_list()[i] for i in range(len(daily_data['timestamp'].to_list())-1)])
-        #Getting the timeframe supported
-        supported_timeframe      = {'daily': 86400, 'hourly':3600}
-        supported_timeframe_copy = deepcopy(supported_timeframe)
-        supported_timeframe      = {value: key for key, value in supported_timeframe_copy.items()}
+    def get_lag(self) -> Optional[int]:
+        """
+        The susceptibility constant is the first value of the susceptibility column.
 
-        return supported_timeframe.get(avg_differences, None)
-    
-    def get_compact_data(self, data: pd.DataFrame, fnc: Callable) -> pd.DataFrame:
+        Returns:
+            Optional[int]: None, the rule depends on the start of the data
         """
-        Compacts data using specified function.
+        return None
 
-        Parameters:
-            data: Data to be compacted
-            fnc: Function used for compacting
+    def get_carry_lag(self) -> Optional[int]:
+        """
+        Going on from the carried over position of the days and susceptibility constant, each day
+        reads the window before it (and the first day after the window must be in the data).
 
         Returns:
-            pd.DataFrame: Compacted data
+            Optional[int]: Days read before the current one
         """
-        #Get the parser
-        dt_parser = DatetimeParser()
+        return max(self.ref, 0) + self.susceptibility_window + 1
 
-        #Separe sampleDate from sampleTime
-        #groupUp for sampleDate, applying max function
-        daily_data = deepcopy(data)
-        daily_data['date'] = np.nan
-        daily_data['date'] = dt_parser.parse_batch(daily_data['sampleDate'].to_list())
-        daily_data['date'] = daily_data['date'].apply(lambda x: x[:x.index("T")])
-        
-        if isinstance(self.target, list):
-            self.target = self.target[0]
-        
-        #Grouping up data based on sample_date (date part)
-        aggregate_functions = {self.target: [str(fnc)], }
-        map_output_columns  = {f'{self.target}_{str(fnc)}':f'{str(fnc)}_inner_column'}
+    def get_daily_aggregates(self) -> List[tuple[str, str]]:
+        """
+        Gets the daily aggregates read by the rule, when the data is compacted.
+
+        Returns:
+            List[tuple[str, str]]: Aggregates as (target column, function name)
+        """
+        target = self.target[0] if isinstance(self.target, list) else self.target
+        return [(target, str(self.select_fnc))]
 
-        grouped_multiple = \
-            daily_data.groupby(['date']).agg(aggregate_functions)
-        
-        merged_cols = ['_'.join(multicol) for multicol in grouped_multiple.columns]
-        grouped_multiple.columns=grouped_multiple.columns.droplevel(1)
-        for i, _ in enumerate(merged_cols):
-            merged_cols = list(map(lambda x: x.replace(merged_cols[i], map_output_columns[merged_cols[i]]), merged_cols))
-        grouped_multiple.columns=merged_cols
-        grouped_multiple.reset_index(inplace=True)  
-        grouped_multiple = grouped_multiple.to_dict('records')
-        for i, _ in enumerate(grouped_multiple):
-            grouped_multiple[i]['sampleDate'] = grouped_multiple[i]['date'] + " 00:00"
-            del grouped_multiple[i]['date']
-        
-        grouped_multiple = pd.DataFrame(grouped_multiple)
-        grouped_multiple[self.target] = grouped_multiple[f'{str(fnc)}_inner_column']
-        grouped_multiple.drop(f'{str(fnc)}_inner_column', axis=1)
-        
-        return grouped_multiple
-    
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepares data for rule evaluation.
@@ -680,9 +754,35 @@ class ApplySusceptibility(OutputAgroRule):
                         updt_values.append(min(max(values[i] + susceptibility_constant, 0), risk_cap))
             return updt_values
         
+        def get_vectorized_result(values: np.ndarray, susceptibility_constant: int, window: int, fnc: Callable, risk_cap: int) -> Optional[List[float]]:
+            """
+            Same of get_applied_result, over all days at once. Supported on float values, 
+            or on integer values with integer constant and cap, where the result has the 
+            same type of get_applied_result.
+
+            Returns:
+                Optional[List[float]]: Result, None if it must be applied day by day
+            """
+            if window < 1 or len(values) <= window+1:
+                return None
+            if not (values.dtype.kind == 'f' or (values.dtype.kind in 'iu' and isinstance(susceptibility_constant, int) and isinstance(risk_cap, int))):
+                return None
+            
+            if susceptibility_constant > 0:
+                #Value i groups the window ending at i
+                sum_v = get_window_aggregation(values=values, offsets=list(range(-window+1, 1)), fnc=fnc)
+                if sum_v is None:
+                    return None
+                sum_v        = sum_v[window+1:]
+                capped_risk  = np.minimum(np.minimum(values[window:-1], risk_cap) + susceptibility_constant, risk_cap)
+                updt_values  = np.where(sum_v == 0, 0, np.where(sum_v == 1, 1, capped_risk))
+            else:
+                updt_values  = np.minimum(np.maximum(values[window+1:] + susceptibility_constant, 0), risk_cap)
+            return values[:window+1].tolist() + updt_values.tolist()
+        
         prepared_data = self.prepare(data=data)
         OutputAgroRule.evaluate(self, data=prepared_data)
-        updt_data     = deepcopy(prepared_data)
+        updt_data     = get_evaluation_frame(prepared_data)
 
         #Get current data granularity
         current_granularity = self.get_current_granularity(data=updt_data)
@@ -698,14 +798,34 @@ class ApplySusceptibility(OutputAgroRule):
             if  current_granularity!='daily' \
             else updt_data
         
-        #Looking for the susceptibility constant
-        susceptibility_constant = updt_data[self.susceptibility_modifier].unique().tolist()[0]
-        compact_data[self.column]    = get_applied_result(
-            values=compact_data[self.target].to_list(),
+        #Looking for the susceptibility constant, the one of the previous data if carried over.
+        carry_state = self.__dict__.get('carry_state', None)
+        susceptibility_constant = updt_data[self.susceptibility_modifier].unique().tolist()[0] \
+            if carry_state is None \
+            else carry_state['constant']
+        updt_values = get_vectorized_result(
+            values=compact_data[self.target].values,
             susceptibility_constant=susceptibility_constant,
             window=self.susceptibility_window,
             fnc=self.fnc, 
-            risk_cap=self.risk_cap)
+            risk_cap=self.risk_cap) if self.evaluation_mode != 'reference' else None
+        if updt_values is None:
+            updt_values = get_applied_result(
+                values=compact_data[self.target].to_list(),
+                susceptibility_constant=susceptibility_constant,
+                window=self.susceptibility_window,
+                fnc=self.fnc, 
+                risk_cap=self.risk_cap)
+        
+        #Days keep the position they have from the start of the data, the first ones are not modified.
+        first_day = carry_state['days'] - self.carry_row if carry_state is not None else 0
+        if first_day > 0:
+            values      = compact_data[self.target].to_list()
+            updt_values = [values[i] if first_day+i <= self.susceptibility_window else updt_values[i] for i in range(len(values))]
+        next_rows = self.__dict__.get('next_carry_rows', None)
+        if next_rows is not None:
+            self.next_carry_state = {'days': first_day+next_rows[1], 'constant': susceptibility_constant}
+        compact_data[self.column]    = updt_values
 
         return self.finalize(daily_data=compact_data, hourly_data=updt_data)
 
@@ -726,84 +846,16 @@ class SimpleOutputRule(OutputAgroRule):
         super().__init__(column=kwargs.get('column', None), target=kwargs.get('target', None) , ref=kwargs.get('ref', 0), debug=kwargs.get('debug', False))
         self.select_fnc = select_fnc
     
-    def get_current_granularity(self, data: pd.DataFrame) -> str:
-        """
-        Gets current data granularity by analyzing timestamp differences.
-
-        Parameters:
-            data (pd.DataFrame): Input DataFrame with sampleDate column
-
-        Returns:
-            str: Granularity as string ('daily' or 'hourly') or None if not recognized
-        """
-        # Get the parser
-        dt_parser = DatetimeParser()
-
-        # Parse dates and calculate average time difference between samples
-        daily_data = deepcopy(data)
-        daily_data['date']      = np.nan
-        daily_data['date']      = dt_parser.parse_batch(daily_data['sampleDate'].to_list())
-        daily_data['timestamp'] = daily_data['date'].apply(lambda x: datetime.datetime.strptime(x, dt_parser.output_format).timestamp())
-        avg_differences         = get_mapped_function('mean')([daily_data['timestamp'].to_list()[i+1]-daily_data['timestamp'].to_list()[i] for i in range(len(daily_data['timestamp'].to_list())-1)])
-        
-        # Map average difference to granularity
-        supported_timeframe      = {'daily': 86400, 'hourly':3600}
-        supported_timeframe_copy = deepcopy(supported_timeframe)
-        supported_timeframe      = {value: key for key, value in supported_timeframe_copy.items()}
-
-        return supported_timeframe.get(avg_differences, None)
-    
-    def get_compact_data(self, data: pd.DataFrame, fnc: Callable) -> pd.DataFrame:
+    def get_daily_aggregates(self) -> List[tuple[str, str]]:
         """
-        Compacts data by aggregating values per day using the specified function.
-
-        Parameters:
-            data (pd.DataFrame): Data to be compacted
-            fnc (Callable): Function used for aggregating values
+        Gets the daily aggregates read by the rule, when the data is compacted.
 
         Returns:
-            pd.DataFrame: Compacted data with daily granularity
+            List[tuple[str, str]]: Aggregates as (target column, function name)
         """
-        # Get the parser and prepare data
-        dt_parser = DatetimeParser()
-        daily_data = deepcopy(data)
-        daily_data['date'] = np.nan
-        daily_data['date'] = dt_parser.parse_batch(daily_data['sampleDate'].to_list())
-        daily_data['date'] = daily_data['date'].apply(lambda x: x[:x.index("T")])
-        
-        # Handle single target column
-        if isinstance(self.target, list):
-            self.target = self.target[0]
-        
-        # Set up aggregation
-        aggregate_functions = {self.target: [str(fnc)], }
-        map_output_columns  = {f'{self.target}_{str(fnc)}':f'{str(fnc)}_inner_column'}
+        target = self.target[0] if isinstance(self.target, list) else self.target
+        return [(target, str(self.select_fnc))]
 
-        # Group and aggregate data
-        grouped_multiple = \
-            daily_data.groupby(['date']).agg(aggregate_functions)
-        
-        # Clean up column names
-        merged_cols = ['_'.join(multicol) for multicol in grouped_multiple.columns]
-        grouped_multiple.columns=grouped_multiple.columns.droplevel(1)
-        for i, _ in enumerate(merged_cols):
-            merged_cols = list(map(lambda x: x.replace(merged_cols[i], map_output_columns[merged_cols[i]]), merged_cols))
-        grouped_multiple.columns=merged_cols
-        grouped_multiple.reset_index(inplace=True)  
-        
-        # Convert to records and reformat dates
-        grouped_multiple = grouped_multiple.to_dict('records')
-        for i, _ in enumerate(grouped_multiple):
-            grouped_multiple[i]['sampleDate'] = grouped_multiple[i]['date'] + " 00:00"
-            del grouped_multiple[i]['date']
-        
-        # Final cleanup
-        grouped_multiple = pd.DataFrame(grouped_multiple)
-        grouped_multiple[self.target] = grouped_multiple[f'{str(fnc)}_inner_column']
-        grouped_multiple.drop(f'{str(fnc)}_inner_column', axis=1)
-        
-        return grouped_multiple
-    
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Prepares data for rule evaluation by ensuring target is a single column.
@@ -835,7 +887,7 @@ class SimpleOutputRule(OutputAgroRule):
         """
         prepared_data = self.prepare(data=data)
         OutputAgroRule.evaluate(self, data=prepared_data)
-        updt_data     = deepcopy(prepared_data)
+        updt_data     = get_evaluation_frame(prepared_data)
 
         # Check data granularity
         current_granularity = self.get_current_granularity(data=updt_data)
@@ -7,11 +7,13 @@
 ################################################################################
 
 from __future__ import annotations
-from typing import Any, Protocol, TYPE_CHECKING, List, Dict, Tuple
+from typing import Any, Protocol, TYPE_CHECKING, List, Dict, Tuple, Optional, Iterator
+from concurrent.futures import ThreadPoolExecutor, Executor
 
+import math
 import dateutil
+import numpy as np
 import pandas as pd
-from copy import deepcopy
 from warnings import warn
 from datetime import datetime, timedelta
 
@@ -22,8 +24,11 @@ if TYPE_CHECKING:
 
 from mosaic_framework.core.agronomical_factors import AgroRule
 from mosaic_framework.core.output_factors import OutputAgroRule
-from mosaic_framework.core.exceptions import InvalidOutputAgroRule
+from mosaic_framework.core.rule_graph import RuleDependencyGraph
+from mosaic_framework.core.exceptions import InvalidOutputAgroRule, DataFormatException
 from mosaic_framework.dt.datetime_parser import DatetimeParser
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame, evaluation_context, set_timeline, get_timeline_days
+from mosaic_framework.core.daily_compaction import DailyCompaction
 
 class ProtocolOutputModel(Protocol):    
     def prepare(self) -> pd.DataFrame:
@@ -47,8 +52,22 @@ class OutputModel(ProtocolOutputModel):
         output_rule (OutputAgroRule, optional): Rule for generating output. Defaults to None
         risk_window (Tuple[int, int, int]): Window parameters for risk calculation. Defaults to (2,1,2)
         prevision_window (Tuple[int, int, int]): Window parameters for prediction. Defaults to (0,1,5)
+        rule_graph (RuleDependencyGraph, optional): Dependency graph of the rules, used to skip dead rules
+            and drop implicit columns after their last consumer. Defaults to None (all rules evaluated)
+        max_workers (int, optional): Number of threads evaluating independent rules concurrently.
+            Defaults to 1 (rules evaluated one by one, in declaration order)
+        chunk_days (int, optional): Evaluates the data in chunks of days, in time order, each one with
+            the days around it the rules need (see get_chunk_lag). Defaults to None (data evaluated as a whole)
+        start_day (str, optional): First day ("YYYY-MM-DD") of the results, previous days of the data are
+            read just as the days the rules need before it. Defaults to None (results of all the days)
+        carry_over (Dict[str, Dict], optional): States of the rules carrying a state from the start of the 
+            data, carried over by the evaluation of the previous data (see get_carry_over), rules go on from
+            them on the days before start_day. Empty to evaluate from the start of the data, carrying the 
+            states over. Defaults to None (states are not carried over)
+        carry_days (Tuple[str, str], optional): First day of the data of the next evaluation, and its start_day,
+            the states of the rules are carried over to it. Defaults to None
     """
-    def __init__(self, label:str, previsionDay:str, days:int, data:pd.DataFrame, history:Tuple, rules_hub:MosaicRulesHubType, output_rule=None, risk_window:Tuple[int,int,int]=(2, 1, 2), prevision_window:Tuple[int,int,int]=(0, 1, 5)) -> None:
+    def __init__(self, label:str, previsionDay:str, days:int, data:pd.DataFrame, history:Tuple, rules_hub:MosaicRulesHubType, output_rule=None, risk_window:Tuple[int,int,int]=(2, 1, 2), prevision_window:Tuple[int,int,int]=(0, 1, 5), rule_graph:RuleDependencyGraph=None, max_workers:int=1, chunk_days:int=None, start_day:str=None, carry_over:Dict[str, Dict]=None, carry_days:Tuple[str, str]=None) -> None:
         self.data             = data
         self.label            = label
         self.previsionDay     = previsionDay
@@ -57,6 +76,13 @@ class OutputModel(ProtocolOutputModel):
         self.rules            = list()
         self.output_rule      = output_rule
         self.rules_hub        = rules_hub
+        self.rule_graph       = rule_graph
+        self.max_workers      = max_workers
+        self.chunk_days       = chunk_days
+        self.start_day        = start_day
+        self.carry_over       = carry_over
+        self.carry_days       = carry_days
+        self.carried_rules    = dict()
 
     def get_window(self) -> Tuple[int, int]:
         """
@@ -81,7 +107,7 @@ class OutputModel(ProtocolOutputModel):
         Returns:
             pd.DataFrame: Filtered dataframe
         """
-        extr_data = deepcopy(data)
+        extr_data = get_evaluation_frame(data)
         return extr_data
     
     def add_factor(self, factor:AgroRule) -> None:
@@ -127,29 +153,59 @@ class OutputModel(ProtocolOutputModel):
 
         return True
     
-    def prepare(self) -> pd.DataFrame:
+    def get_window_rows(self) -> Tuple[np.ndarray, Optional[pd.Series]]:
         """
-        Prepares input data by filtering to required date range.
+        Gets the rows of the input data in the calculation window, without copying them.
 
         Returns:
-            pd.DataFrame: Prepared dataframe
+            Tuple[np.ndarray, Optional[pd.Series]]: Positions of the rows in the input data, and their
+                datetimes (None if dates have different timezones, they have no timeline)
         """
         dt_parser       = DatetimeParser()
-        prep_data       = deepcopy(self.data)
-        prep_data['dt'] = pd.to_datetime(dt_parser.parse_batch(prep_data['sampleDate'].to_list()))
+        try:
+            timeline    = dt_parser.parse_timeline(self.data['sampleDate'])
+        except ValueError:
+            #Dates with different timezones are compared as UTC, without a timeline.
+            timeline    = None
+        dates           = timeline if timeline is not None else pd.to_datetime(dt_parser.parse_series(self.data['sampleDate']), utc=True)
         calculation_window = self.get_window()
         print(f"[OutputModel] Calculation window is: {calculation_window}")
         start = pd.to_datetime(self.previsionDay - timedelta(days=calculation_window[0]))
         end   = pd.to_datetime(self.previsionDay + timedelta(days=calculation_window[1]))
 
         print(f"[OutputModel] Calculating from: {start} to {end}")
-        prep_data = prep_data[\
-            (prep_data['dt']>=start)&\
-            (prep_data['dt']<end)]
-        prep_data.drop('dt', axis=1, inplace=True)
-        prep_data['sampleDate'] = prep_data['sampleDate'].apply(lambda x:dateutil.parser.parse(x).strftime("%Y-%m-%d %H:%M"))
-        prep_data.reset_index(inplace=True, drop=True)
+        rows  = np.flatnonzero(((dates>=start)&(dates<end)).to_numpy())
+        return rows, timeline.iloc[rows].reset_index(drop=True) if timeline is not None else None
+
+    def prepare_rows(self, rows:np.ndarray, timeline:Optional[pd.Series]) -> pd.DataFrame:
+        """
+        Prepares some rows of the input data (see get_window_rows).
+
+        Parameters:
+            rows (np.ndarray): Positions of the rows in the input data
+            timeline (Optional[pd.Series]): Datetimes of the rows, None if they have no timeline
+
+        Returns:
+            pd.DataFrame: Prepared dataframe, indexed from 0
+        """
+        prep_data = self.data.iloc[rows].reset_index(drop=True)
+        #Dates are formatted once, rules get the timeline of the dataframe.
+        if timeline is not None:
+            prep_data['sampleDate'] = timeline.dt.strftime("%Y-%m-%d %H:%M")
+            set_timeline(data=prep_data, dates=timeline)
+        else:
+            prep_data['sampleDate'] = prep_data['sampleDate'].apply(lambda x:dateutil.parser.parse(x).strftime("%Y-%m-%d %H:%M"))
         return prep_data
+
+    def prepare(self) -> pd.DataFrame:
+        """
+        Prepares input data by filtering to required date range.
+
+        Returns:
+            pd.DataFrame: Prepared dataframe
+        """
+        rows, timeline = self.get_window_rows()
+        return self.prepare_rows(rows=rows, timeline=timeline)
     
     def validation(self) -> bool:
         """
@@ -161,46 +217,354 @@ class OutputModel(ProtocolOutputModel):
         self.is_valid_output_rule()        
         return True
     
-    def estimate(self) -> Tuple[pd.DataFrame, pd.DataFrame]: 
+    def apply_rule(self, data:pd.DataFrame, rule:AgroRule) -> pd.DataFrame:
         """
-        Estimates output risk by applying all rules.
+        Evaluates a single rule on the working data. Implicit rules return
+        just their own column, that is added back to the working data.
+
+        Parameters:
+            data (pd.DataFrame): Working dataframe
+            rule (AgroRule): Rule to evaluate
 
         Returns:
-            Tuple[pd.DataFrame, pd.DataFrame]: Tuple containing hourly and daily results
+            pd.DataFrame: Working dataframe with the column of the rule
         """
-        data = self.prepare()
-        calculation_window = self.get_window()
-        self.validation()
+        result = rule.evaluate(data)
+        self.carry_rule_over(rule=rule, result=result)
+        if not rule.is_implicit:
+            return result
+        updt_df = get_evaluation_frame(data)
+        updt_df[rule.column] = result[rule.column]
+        return updt_df
+
+    def get_steps(self) -> List[List[int]]:
+        """
+        Groups the indexes of the rules in evaluation steps. With max_workers > 1, each step
+        is a level of the dependency graph (independent rules), otherwise a single rule.
+        Dead rules are removed, if the rule graph is set.
+
+        Returns:
+            List[List[int]]: Rule indexes for each step, in declaration order
+        """
+        if self.max_workers > 1:
+            rule_graph = self.rule_graph if self.rule_graph is not None else \
+                RuleDependencyGraph(rules=self.rules, output_rules=self.output_rule)
+            steps = rule_graph.get_levels()
+        else:
+            steps = [[i] for i in range(len(self.rules))]
+
+        if self.rule_graph is not None:
+            for i in sorted(self.rule_graph.dead_rules):
+                print(f"[OutputModel] Factor: <{type(self.rules[i])}>: {self.rules[i].column} skipped, its column is never consumed.")
+            steps = [[i for i in step if not self.rule_graph.is_dead(i)] for step in steps]
+        return [step for step in steps if len(step) > 0]
+
+    def apply_rules(self, data:pd.DataFrame, rules:List[AgroRule], executor:Executor=None) -> Tuple[pd.DataFrame, List[List[str]]]:
+        """
+        Evaluates independent rules on the same working data, concurrently if an executor
+        is given. Columns added by each rule are merged back in declaration order.
+
+        Parameters:
+            data (pd.DataFrame): Working dataframe
+            rules (List[AgroRule]): Independent rules to evaluate
+            executor (Executor, optional): Executor running the rules. Defaults to None
+
+        Returns:
+            Tuple[pd.DataFrame, List[List[str]]]: Working dataframe with the columns of the rules,
+                and the columns added by each rule
+        """
+        added_columns = list()
+        if executor is None or len(rules) == 1:
+            for r in rules:
+                updt_df = self.apply_rule(data=data, rule=r)
+                added_columns.append([c for c in updt_df.columns if not c in data.columns])
+                data    = updt_df
+            return data, added_columns
+        
+        #Each rule gets its own frame, rules may add columns to their input.
+        futures = [executor.submit(r.evaluate, get_evaluation_frame(data)) for r in rules]
+        updt_df = get_evaluation_frame(data)
+        for r, f in zip(rules, futures):
+            result  = f.result()
+            self.carry_rule_over(rule=r, result=result)
+            columns = [r.column] if r.is_implicit else [c for c in result.columns if c == r.column or not c in data.columns]
+            for c in columns:
+                updt_df[c] = result[c]
+            added_columns.append([c for c in columns if not c in data.columns])
+        return updt_df, added_columns
+
+    def get_chunk_lag(self, rows_per_day:int, carry:bool=False) -> Optional[Tuple[int, int]]:
+        """
+        Gets the days of data, before and after a chunk, needed to evaluate the rules and the output
+        rules on the chunk as on the whole data. Output rules read whole days, before ('ref', past
+        windows) and after (future windows) the current one. Rules read rows before the current one,
+        along their dependencies (see RuleDependencyGraph.get_lag), converted to days.
+
+        Parameters:
+            rows_per_day (int): Least number of rows of a day of the data
+            carry (bool, optional): Rules carrying a state go on from the one carried over before 
+                the chunk (see AgroRule.get_carry_lag). Defaults to False
+
+        Returns:
+            Optional[Tuple[int, int]]: Days before and after a chunk, None if a rule carries
+                a state from the start of the data and the output cannot be evaluated in chunks
+        """
+        rule_graph  = self.rule_graph if self.rule_graph is not None else \
+            RuleDependencyGraph(rules=self.rules, output_rules=self.output_rule)
+        rules_lag   = rule_graph.get_lag(carry=carry)
+        output_lags = [r.get_carry_lag() if carry else r.get_lag() for r in self.output_rule]
+        if rules_lag is None or None in output_lags:
+            return None
+        return (
+            max(output_lags, default=0) + math.ceil(rules_lag/rows_per_day), 
+            max([r.get_lead() for r in self.output_rule], default=0))
+
+    def get_chunks(self, length:int, timeline:Optional[pd.Series]) -> List[Tuple[int, int, int, int]]:
+        """
+        Splits the rows of the calculation window in chunks of 'chunk_days' days, each one with the 
+        rows it needs around it (see get_chunk_lag). Days before start_day are not part of any chunk, 
+        they are read just around the first one. Data is evaluated as a single chunk if neither chunk_days 
+        nor start_day are set, or the rules cannot be evaluated in chunks, or its days are not in order.
+
+        Parameters:
+            length (int): Number of rows in the calculation window
+            timeline (Optional[pd.Series]): Datetimes of the rows (see get_window_rows)
+
+        Returns:
+            List[Tuple[int, int, int, int]]: For each chunk, first and last (excluded) row of the data
+                to evaluate, and first and last (excluded) row of the chunk
+        """
+        single_chunk = [(0, length, 0, length)]
+        if (self.chunk_days is None and self.start_day is None) or length == 0:
+            return single_chunk
+        #Dates with different timezones have no days of the wall clock.
+        days = get_timeline_days(dates=timeline).values if timeline is not None else np.array([np.nan])
+        if pd.isnull(days).any() or (days[1:] < days[:-1]).any():
+            print(f"[OutputModel] {self.label}: days are not in order, evaluated as a whole.")
+            return single_chunk
+        day_bounds = np.append(np.flatnonzero(np.append(True, days[1:] != days[:-1])), length)
+        lag        = self.get_chunk_lag(rows_per_day=int(np.diff(day_bounds).min()), carry=self.carry_over is not None)
+        if lag is None:
+            print(f"[OutputModel] {self.label}: rules carry a state from the start of the data, evaluated as a whole.")
+            return single_chunk
+        
+        n_days     = len(day_bounds)-1
+        start      = int(np.searchsorted(days[day_bounds[:-1]], self.start_day)) if self.start_day is not None else 0
+        chunk_days = self.chunk_days if self.chunk_days is not None else max(n_days-start, 1)
+        chunks     = list()
+        for first_day in range(start, n_days, chunk_days):
+            last_day = min(first_day+chunk_days, n_days)
+            #Rules going on from carried over states read the days they were carried over for.
+            chunks.append((
+                day_bounds[max(first_day-lag[0], 0)] if self.carry_over is None else 0, 
+                day_bounds[min(last_day+lag[1], n_days)], 
+                day_bounds[first_day], 
+                day_bounds[last_day]))
+        print(f"[OutputModel] {self.label}: {len(chunks)} chunks of {chunk_days} days from day {start}, {lag[0]} days before and {lag[1]} after each one.")
+        return chunks
+
+    def get_carry_rules(self, steps:List[List[int]]) -> Dict[str, Any]:
+        """
+        Gets the rules (and output rules) carrying a state from the start of the data, among the 
+        evaluated ones.
+
+        Parameters:
+            steps (List[List[int]]): Rule indexes of each evaluation step (see get_steps)
+
+        Returns:
+            Dict[str, Any]: Rules by key (position and column), as in the carried over states
+        """
+        carry_rules = {f"{i}_{self.rules[i].column}": self.rules[i] for step in steps for i in step if self.rules[i].get_lag() is None}
+        carry_rules.update({f"output_{j}_{r.column}": r for j, r in enumerate(self.output_rule) if r.get_lag() is None})
+        return carry_rules
+
+    def set_carry_over(self, data:pd.DataFrame, steps:List[List[int]]) -> None:
+        """
+        Sets the state each rule carrying a state goes on from, before the rows of start_day, and the 
+        rows whose state is carried over to the next evaluation (see AgroRule.set_carry_over). Rows 
+        of output rules are days. States of a previous evaluation are cleared without carry_over.
+
+        Parameters:
+            data (pd.DataFrame): Prepared dataframe (or a chunk of it)
+            steps (List[List[int]]): Rule indexes of each evaluation step (see get_steps)
+
+        Raises:
+            DataFormatException: If the carried over states do not match the rows of the data
+        """
+        days       = data['sampleDate'].str[:10].to_numpy()
+        daily_days = pd.unique(days)
+        def count_before(values:np.ndarray, day:Optional[str]) -> int:
+            return int((values < day).sum()) if day is not None else 0
         
-        print(f"[OutputModel] Estimating: {self.label}")
+        self.carried_rules = dict()
+        for key, rule in self.get_carry_rules(steps=steps).items():
+            values    = daily_days if isinstance(rule, OutputAgroRule) else days
+            row       = count_before(values=values, day=self.start_day) if self.carry_over else 0
+            carry     = self.carry_over.get(key, None) if self.carry_over else None
+            if self.carry_over and (carry is None or carry['rows'] != row):
+                raise DataFormatException(f"State of {key} carried over for {carry['rows'] if carry else 0} rows, found {row} before {self.start_day}.")
+            next_rows = (count_before(values=values, day=self.carry_days[0]), count_before(values=values, day=self.carry_days[1])) \
+                if self.carry_days is not None \
+                else None
+            rule.set_carry_over(state=carry['state'] if carry else None, row=row, next_rows=next_rows)
+            self.carried_rules[key] = {
+                'rule'     : rule, 
+                'row'      : row, 
+                'values'   : carry['values'] if carry else None, 
+                'next_rows': next_rows, 
+                'next_values': None}
+
+    def carry_rule_over(self, rule:AgroRule, result:pd.DataFrame) -> None:
+        """
+        Replaces the results of a rule carrying a state, on the rows evaluated with the previous data,
+        with the ones carried over (see set_carry_over), and keeps the ones carried over to the next 
+        evaluation: rules evaluated later read them, as they do evaluating the whole data.
+
+        Parameters:
+            rule (AgroRule): Evaluated rule
+            result (pd.DataFrame): Dataframe returned by the rule
+        """
+        for carried in self.carried_rules.values():
+            if carried['rule'] is not rule:
+                continue
+            column = result[rule.column].to_numpy(copy=True)
+            if carried['values'] is not None:
+                column[:carried['row']] = carried['values']
+                result[rule.column]     = column
+            if carried['next_rows'] is not None:
+                carried['next_values'] = column[carried['next_rows'][0]:carried['next_rows'][1]].tolist()
+
+    def get_carry_over(self) -> Dict[str, Dict]:
+        """
+        Gets the states of the rules carried over to the next evaluation (see carry_days), with the 
+        results of the rules on the rows of the next evaluation before its start_day.
+
+        Returns:
+            Dict[str, Dict]: For each rule carrying a state, the number of rows ('rows'), their results 
+                ('values', None for output rules) and the state of the rule ('state')
+        """
+        if self.carry_days is None:
+            return dict()
+        return {key: {
+            'rows'  : carried['next_rows'][1]-carried['next_rows'][0], 
+            'values': carried['next_values'], 
+            'state' : carried['rule'].get_carry_state()} for key, carried in self.carried_rules.items()}
+
+    def evaluate_frame(self, data:pd.DataFrame, dump_steps:bool=True) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Applies all rules and output rules to the prepared data.
+
+        Parameters:
+            data (pd.DataFrame): Prepared dataframe (or a chunk of it)
+            dump_steps (bool, optional): Dump the working dataframe after each step. Defaults to True
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: Tuple containing hourly and daily results
+        """
+        steps           = self.get_steps()
+        self.set_carry_over(data=data, steps=steps)
+        expired_columns = self.rule_graph.get_expired_columns(steps={i:n for n, step in enumerate(steps) for i in step}) \
+            if self.rule_graph is not None else dict()
+        executor        = ThreadPoolExecutor(max_workers=self.max_workers) if self.max_workers > 1 else None
+        added_columns   = dict()
+        columns_order   = data.columns.to_list()
         try:
-            data.to_csv(f"results/{self.label}_start_dataset.csv")
-        except:
-            print(f"CANNOT PRINT {self.label}_start_dataset.csv")
+            for n, step in enumerate(steps):
+                data, step_columns = self.apply_rules(data=data, rules=[self.rules[i] for i in step], executor=executor)
+                added_columns.update(zip(step, step_columns))
+                data = data.drop(columns=[c for c in expired_columns.get(n, list()) if c in data.columns])
+                if not dump_steps:
+                    continue
+                try:
+                    data.to_csv(f"results/{self.label}_rules.csv")
+                except:
+                    print(f"CANNOT PRINT {self.label}_rules.csv")
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True)
 
-        for r in self.rules:
-            data = r.evaluate(data) 
-            try:
-                data.to_csv(f"results/{self.label}_rules.csv")
-            except:
-                print(f"CANNOT PRINT {self.label}_rules.csv")
+        #Columns are sorted as they would be added evaluating rules in declaration order.
+        columns_order += [c for i in sorted(added_columns) for c in added_columns[i]]
+        data = data[[c for c in dict.fromkeys(columns_order) if c in data.columns]+[c for c in data.columns if not c in columns_order]]
         
         results = compact_results = None
-        results = deepcopy(data)
+        results = get_evaluation_frame(data)
+        #Output rules share the daily aggregates of the output.
+        daily_compaction = DailyCompaction()
+        for output_rule in self.output_rule:
+            output_rule.set_daily_compaction(daily_compaction)
+            daily_compaction.add_requests(output_rule.get_daily_aggregates())
         for output_rule in self.output_rule:
             compact_results, results = output_rule.evaluate(data=results)
         
         results         = self.rules_hub.remove_implicit_columns(data=results)
         compact_results = self.rules_hub.remove_implicit_columns(data=compact_results)
+        return results, compact_results
 
-        try:
-            results.to_csv(f"results/{self.label}_rules.csv")
-        except:
-            print(f"CANNOT PRINT {self.label}_rules.csv")
+    def estimate_chunks(self) -> Iterator[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Estimates output risk by applying all rules, chunk by chunk (see get_chunks). Only the
+        rows of the current chunk (with the ones around it) are prepared, results of each chunk 
+        are given as soon as it is evaluated, with the rows (and the index) they have in the results
+        of the whole data (from start_day on). Without chunk_days a single chunk is given.
 
-        try:
-            compact_results.to_csv(f"results/{self.label}_result.csv")
-        except:
-            print(f"CANNOT PRINT {self.label}_result.csv")
+        Returns:
+            Iterator[Tuple[pd.DataFrame, pd.DataFrame]]: Hourly and daily results of each chunk
+        """
+        #Rules share the columns of the working dataframe (copy-on-write),
+        #each of them copies only what it modifies.
+        with evaluation_context():
+            rows, timeline = self.get_window_rows()
+            self.validation()
+            print(f"[OutputModel] Estimating: {self.label}")
+            chunks   = self.get_chunks(length=len(rows), timeline=timeline)
+            is_whole = chunks == [(0, len(rows), 0, len(rows))]
+        
+        results_offset = compact_offset = dumped = 0
+        for n, (start, end, chunk_start, chunk_end) in enumerate(chunks):
+            with evaluation_context():
+                data = self.prepare_rows(rows=rows[start:end], timeline=timeline.iloc[start:end].reset_index(drop=True) if not is_whole else timeline)
+                #Rows of the start dataset are dumped once, as they are read.
+                try:
+                    start_dataset       = data.iloc[max(dumped-start, 0):]
+                    start_dataset.index = pd.RangeIndex(max(dumped, start), end)
+                    start_dataset.to_csv(f"results/{self.label}_start_dataset.csv", mode='w' if n == 0 else 'a', header=n == 0)
+                except:
+                    print(f"CANNOT PRINT {self.label}_start_dataset.csv")
+                dumped = end
+                if is_whole:
+                    results, compact_results = self.evaluate_frame(data=data)
+                else:
+                    results, compact_results = self.evaluate_frame(data=data, dump_steps=False)
+                    #Days of the chunk, the ones around it are dropped.
+                    days            = (data['sampleDate'].iat[chunk_start-start][:10], data['sampleDate'].iat[chunk_end-start-1][:10])
+                    results         = results[results['sampleDate'].str[:10].between(*days)]
+                    compact_results = compact_results[compact_results['sampleDate'].str[:10].between(*days)]
+                    results.index         = pd.RangeIndex(results_offset, results_offset+len(results))
+                    compact_results.index = pd.RangeIndex(compact_offset, compact_offset+len(compact_results))
+                    results_offset += len(results)
+                    compact_offset += len(compact_results)
+
+            try:
+                results.to_csv(f"results/{self.label}_rules.csv", mode='w' if n == 0 else 'a', header=n == 0)
+            except:
+                print(f"CANNOT PRINT {self.label}_rules.csv")
+
+            try:
+                compact_results.to_csv(f"results/{self.label}_result.csv", mode='w' if n == 0 else 'a', header=n == 0)
+            except:
+                print(f"CANNOT PRINT {self.label}_result.csv")
+
+            yield results, compact_results
 
-        return results, compact_results
\ No newline at end of file
+    def estimate(self) -> Tuple[pd.DataFrame, pd.DataFrame]: 
+        """
+        Estimates output risk by applying all rules.
+
+        Returns:
+            Tuple[pd.DataFrame, pd.DataFrame]: Tuple containing hourly and daily results
+        """
+        chunks = list(self.estimate_chunks())
+        if len(chunks) == 1:
+            return chunks[0]
+        return pd.concat([r for r, _ in chunks]), pd.concat([c for _, c in chunks])
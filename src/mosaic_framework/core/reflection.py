@@ -7,14 +7,76 @@
 ################################################################################
 
 import re
+import ast
 #from sympy import sympify
 import pandas as pd
 from copy import deepcopy
-from typing import List, Callable, Dict
+from functools import lru_cache
+from typing import List, Callable, Dict, Tuple, Optional
 import numpy as np
 
 from mosaic_framework.core.protocols import ProtocolReflectiveAgroRule
 from mosaic_framework.core.agronomical_factors import AgroRule
+from mosaic_framework.core.reflection_factors import ReflectiveValue, ReflectiveAgroFactor
+from mosaic_framework.core.math_utils import CompiledExpression
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
+
+#numba is optional, when importable the recurrence of reflective
+#equations is JIT-compiled, otherwise it runs on NumPy arrays.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+#Under this number of rows the JIT compilation costs more than it saves.
+JIT_MIN_ROWS = 10000
+
+#Functions of the equations that can be JIT-compiled (math module ones).
+JIT_FUNCTIONS = {'sin': 'sin', 'cos': 'cos', 'tan': 'tan', 'arcsin': 'asin', 'arccos': 'acos', 'arctan': 'atan'}
+
+@lru_cache(maxsize=None)
+def get_jit_recurrence(expression:CompiledExpression, reflective_column:str) -> Callable:
+    """
+    Builds a JIT-compiled recurrence for a reflective equation, like:
+    out[i] = equation(inputs[i], out[i-ref]) if condition[i] == 1 else 0.0
+    evaluated for each ref, in order, as the row by row evaluation does.
+
+    Args:
+        expression (CompiledExpression): The compiled equation
+        reflective_column (str): Column of the equation that refers to the older results
+
+    Returns:
+        Callable: recurrence(inputs, condition, out, refs, start), None if numba is 
+            not importable or the equation uses functions that are not supported
+    """
+    if njit is None:
+        return None
+    for node in ast.walk(expression.tree):
+        if isinstance(node, ast.Call) and not node.func.id in JIT_FUNCTIONS:
+            return None
+
+    class RenameFunctions(ast.NodeTransformer):
+        def visit_Call(self, node):
+            self.generic_visit(node)
+            node.func = ast.Attribute(value=ast.Name(id='math', ctx=ast.Load()), attr=JIT_FUNCTIONS[node.func.id], ctx=ast.Load())
+            return node
+
+    body      = ast.unparse(RenameFunctions().visit(deepcopy(expression.tree)).body)
+    variables = [f"                {expression.variables[c]} = e" if c == reflective_column else f"                {expression.variables[c]} = inputs[i, {j}]" for j, c in enumerate(expression.columns)]
+    source    = "\n".join([
+        "def recurrence(inputs, condition, out, refs, start):",
+        "    for i in range(start, out.shape[0]):",
+        "        for k in range(refs.shape[0]):",
+        "            e = out[i - refs[k]]",
+        "            out[i] = e",
+        "            if condition[i] == 1:",
+        *variables,
+        f"                out[i] = {body}",
+        "            else:",
+        "                out[i] = 0.0"])
+    namespace = {'math': __import__('math')}
+    exec(compile(source, filename='<reflective_equation>', mode='exec'), namespace)
+    return njit(namespace['recurrence'])
 
 class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
     """
@@ -26,8 +88,115 @@ class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
     """
     def __init__(self) -> None:
         pass
+
+    def get_reflective_carry_lag(self, references: List[Tuple[str, int]], nested_rules: List[AgroRule]) -> Optional[int]:
+        """
+        Gets the rows, before the current one, read by the rule to evaluate a row when it goes on
+        from its results carried over by the previous data (see AgroRule.set_carry_over): the
+        older results read by its reflective factors, and the rows read by its other nested rules.
+
+        Parameters:
+            references: Column and rows before the current one, read by each reflective factor
+            nested_rules: Other nested rules
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if a reflective factor reads 
+                another column or a nested rule carries a state
+        """
+        lags = [0]
+        for column, ref in references:
+            if str(column) != str(self.column):
+                return None
+            lags.append(ref)
+        for r in nested_rules:
+            lag = r.get_lag() if isinstance(r, AgroRule) else None
+            if lag is None:
+                return None
+            lags.append(lag)
+        return max(lags)
+
+    def get_compound_carry_lag(self) -> Optional[int]:
+        """
+        Gets the carry lag (see get_reflective_carry_lag) of compound rules (And | Or), whose 
+        reflective factors are the nested rules targeting the column of the rule.
+
+        Returns:
+            Optional[int]: Rows read before the current one, None if the rule carries another state
+        """
+        rules            = self.rules + (self.reflective_rules or [])
+        reflective_rules = [r for r in rules if str(r.target) == str(self.column) or isinstance(r, ReflectiveAgroFactor)]
+        nested_rules     = [r for r in rules if not any([r is rr for rr in reflective_rules])]
+        nested_rules    += [self.on_condition] if isinstance(self.on_condition, AgroRule) else []
+        #Reflective factors are evaluated by reflective rules only
+        references = [(r.target, r.__dict__.get('ref_start', r.__dict__.get('ref', None))) for r in reflective_rules] \
+            if self.is_reflective \
+            else []
+        return self.get_reflective_carry_lag(references=references, nested_rules=nested_rules)
+
+    def get_carried_start(self, reflective_data: np.ndarray, reflective_data_cond: Optional[np.ndarray], start: int) -> int:
+        """
+        Fills the results of the rows before carry_row with the ones carried over by the previous
+        data (see AgroRule.set_carry_over), the recurrence goes on from them.
+
+        Parameters:
+            reflective_data: Results of the reflective column
+            reflective_data_cond: Results of the reflective condition, None if there is not
+            start: First row to evaluate, after the default values
+
+        Returns:
+            int: First row to evaluate
+        """
+        carry_state = self.__dict__.get('carry_state', None)
+        if carry_state is None:
+            return start
+        reflective_data[:self.carry_row] = carry_state['values']
+        if reflective_data_cond is not None:
+            reflective_data_cond[:self.carry_row] = carry_state['condition']
+        return max(start, self.carry_row)
+
+    def carry_results_over(self, reflective_data: np.ndarray, reflective_data_cond: Optional[np.ndarray]) -> None:
+        """
+        Keeps the results of the rows carried over to the next evaluation (see AgroRule.set_carry_over).
+
+        Parameters:
+            reflective_data: Results of the reflective column
+            reflective_data_cond: Results of the reflective condition, None if there is not
+        """
+        next_rows = self.__dict__.get('next_carry_rows', None)
+        if next_rows is None:
+            return
+        self.next_carry_state = {
+            'values'   : reflective_data[next_rows[0]:next_rows[1]].tolist(),
+            'condition': reflective_data_cond[next_rows[0]:next_rows[1]].tolist() if reflective_data_cond is not None else None}
     
-    def reflective_evaluate(self, data: pd.DataFrame, fnc: Callable, reflective_rules: List[AgroRule], involved_columns: List[str], involved_condition=None, reflective_condition: AgroRule=None) -> pd.DataFrame:
+    def reflective_evaluate(self, data: pd.DataFrame, fnc: Callable, reflective_rules: List[AgroRule], involved_columns: List[str], involved_condition=None, reflective_condition: AgroRule=None, expression: CompiledExpression=None) -> pd.DataFrame:
+        """
+        Evaluates reflective rules line by line on the input data.
+        The 'reference' evaluation_mode walks the dataframe row by row,
+        otherwise the recurrence runs over NumPy arrays.
+
+        Parameters:
+            data: Dataframe containing all required columns
+            fnc: Function to be applied to each row
+            reflective_rules: List of identified reflective rules
+            involved_columns: List of column names involved in calculation
+            involved_condition: Optional condition column name
+            reflective_condition: Optional complex condition containing reflective factors
+            expression: Optional compiled equation, same as fnc where involved_condition is 1
+                (0.0 elsewhere). Allows the JIT-compiled recurrence.
+
+        Returns:
+            pd.DataFrame: Updated dataframe with reflective calculations applied
+        """
+        if getattr(self, 'evaluation_mode', None) == 'reference':
+            return self.reflective_evaluate_reference(
+                data=data, fnc=fnc, reflective_rules=reflective_rules, involved_columns=involved_columns, 
+                involved_condition=involved_condition, reflective_condition=reflective_condition)
+        return self.reflective_evaluate_arrays(
+            data=data, fnc=fnc, reflective_rules=reflective_rules, involved_columns=involved_columns, 
+            involved_condition=involved_condition, reflective_condition=reflective_condition, expression=expression)
+
+    def reflective_evaluate_reference(self, data: pd.DataFrame, fnc: Callable, reflective_rules: List[AgroRule], involved_columns: List[str], involved_condition=None, reflective_condition: AgroRule=None) -> pd.DataFrame:
         """
         Evaluates reflective rules line by line on the input data.
 
@@ -66,7 +235,7 @@ class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
             return internal_dict[max(list(internal_dict.keys()))]
         
         #First we define a temporary column - WARN: With multiple reflective columns?
-        updt_data = deepcopy(data)
+        updt_data = get_evaluation_frame(data)
 
         #check wether a reflective condition is on stage, 
         #we will use to filter reflective operations on 
@@ -83,12 +252,12 @@ class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
         total_columns_involved = list(set(get_unique_involved_columns(involved_columns) + [reflective_column]))
 
         updt_data[reflective_column] = np.nan 
-        reflective_data              = updt_data[reflective_column].values
+        reflective_data              = updt_data[reflective_column].to_numpy(copy=True)
 
         default_values_cond = None
         if is_reflective_condition:
             updt_data[reflective_condition.column] = np.nan 
-            reflective_data_cond              = updt_data[reflective_condition.column].values
+            reflective_data_cond              = updt_data[reflective_condition.column].to_numpy(copy=True)
             #We need to solve the 'non-reflective columns'
             #Cause will be expensive calculated each time the column
             #and get the sigle value
@@ -122,6 +291,15 @@ class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
                 updt_data.at[i, reflective_condition.column] = default_values[i]
                 reflective_data_cond[i]                 = default_values[i]
         
+        #Rows before carry_row get the results carried over by the previous data.
+        start = self.get_carried_start(
+            reflective_data=reflective_data, 
+            reflective_data_cond=reflective_data_cond if is_reflective_condition else None, 
+            start=len(max(default_values, default_values_cond)))
+        updt_data[reflective_column] = reflective_data.copy()
+        if is_reflective_condition:
+            updt_data[reflective_condition.column] = reflective_data_cond.copy()
+
         #Start the reflective calculation, row by row
         #Cause each result depends on the previous values.
         if not reflective_rules and is_reflective_condition:
@@ -129,8 +307,8 @@ class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
         cond_eval = -1
         for i, row in updt_data.iterrows():
             for ref_rule in reflective_rules:
-                #Skip default data
-                if i>=len(max(default_values, default_values_cond)):
+                #Skip default (and carried over) data
+                if i>=start:
                     if is_reflective_condition:
                         #This condition is evaluated by 'values' not by column
                         #So first we need to create row to evaluate.
@@ -175,4 +353,138 @@ class ReflectiveAgroRule(ProtocolReflectiveAgroRule):
                     #     print(f"factor={reflective_column}", f"actual_result={actual_result}")
 
         updt_data['reflective_'+reflective_column] = reflective_data
+        self.carry_results_over(
+            reflective_data=reflective_data, 
+            reflective_data_cond=updt_data[reflective_condition.column].to_numpy(dtype=float) if is_reflective_condition else None)
+        return updt_data
+
+    def reflective_evaluate_arrays(self, data: pd.DataFrame, fnc: Callable, reflective_rules: List[AgroRule], involved_columns: List[str], involved_condition=None, reflective_condition: AgroRule=None, expression: CompiledExpression=None) -> pd.DataFrame:
+        """
+        Evaluates reflective rules as a recurrence over NumPy arrays. Same results 
+        of reflective_evaluate_reference: involved columns are read once, older 
+        results are read from the array of the reflective column and the 
+        result columns are written once at the end.
+
+        Parameters:
+            data: Dataframe containing all required columns
+            fnc: Function to be applied to each row
+            reflective_rules: List of identified reflective rules
+            involved_columns: List of column names involved in calculation
+            involved_condition: Optional condition column name
+            reflective_condition: Optional complex condition containing reflective factors
+            expression: Optional compiled equation, same as fnc where involved_condition is 1
+
+        Returns:
+            pd.DataFrame: Updated dataframe with reflective calculations applied
+        """
+        def get_unique_involved_columns(involved_columns: List[str]) -> List[str]:
+            return [c.split('[')[0] if '[' in c else c for c in involved_columns]
+
+        def get_default_values(default_reflective_values: List[float], default_reflective_condition: List[float]) -> List[float]:
+            if default_reflective_values == None:
+                return default_reflective_condition
+            if default_reflective_condition == None:
+                return default_reflective_values    
+            internal_dict = {
+                len(default_reflective_values): default_reflective_values,
+                len(default_reflective_condition): default_reflective_condition,
+            }
+            return internal_dict[max(list(internal_dict.keys()))]
+
+        def get_max_ref(rules: List[AgroRule]) -> int:
+            return max([r.ref if 'ref' in r.__dict__.keys() else r.ref_start for r in rules])
+
+        updt_data = get_evaluation_frame(data)
+
+        is_reflective_condition = bool(reflective_condition!=None)
+        if is_reflective_condition:
+            reflective_condition.prepare(data=data)
+        reflective_column      = reflective_rules[0].target if len(reflective_rules)>0 else reflective_condition.reflective_rules[0].target
+        total_columns_involved = list(set(get_unique_involved_columns(involved_columns) + [reflective_column]))
+        row_columns            = total_columns_involved + [involved_condition] if involved_condition is not None else total_columns_involved
+
+        updt_data[reflective_column] = np.nan
+        default_values_cond          = None
+        if is_reflective_condition:
+            updt_data[reflective_condition.column] = np.nan
+            non_reflective_columns_data = {r.column:r.evaluate(updt_data)[r.column].values for r in reflective_condition.rules}
+            default_values_cond         = [0.0 for _ in range(get_max_ref(reflective_condition.reflective_rules))]
+
+        default_values      = [0.0 for _ in range(get_max_ref(reflective_rules))] if len(reflective_rules)>0 else []
+        default_values      = get_default_values(default_reflective_values=default_values, default_reflective_condition=default_values_cond)
+        default_values_cond = [0.0] if default_values_cond == None else default_values_cond
+
+        #Arrays of the columns that are calculated (results are written here)
+        #and snapshot of the columns of each row, taken before the recurrence.
+        reflective_data = np.full(len(updt_data), np.nan)
+        reflective_data[:len(default_values)] = default_values
+        reflective_data_cond = None
+        if is_reflective_condition:
+            reflective_data_cond = np.full(len(updt_data), np.nan)
+            reflective_data_cond[:len(default_values)] = default_values
+        #Rows before carry_row get the results carried over by the previous data.
+        start = self.get_carried_start(
+            reflective_data=reflective_data, 
+            reflective_data_cond=reflective_data_cond, 
+            start=len(max(default_values, default_values_cond)))
+        if is_reflective_condition:
+            updt_data[reflective_condition.column] = reflective_data_cond
+        updt_data[reflective_column] = reflective_data
+        rows_data = {c:updt_data[c].to_numpy(copy=True) for c in row_columns}
+
+        #Reflective factors read older values from these arrays
+        def get_values(target: str) -> np.ndarray:
+            if target == reflective_column:
+                return reflective_data
+            if is_reflective_condition and target == reflective_condition.column:
+                return reflective_data_cond
+            return updt_data[target].values
+
+        if not reflective_rules and is_reflective_condition:
+            reflective_rules = reflective_condition.reflective_rules
+
+        jit_recurrence = None
+        if expression is not None and not is_reflective_condition and involved_condition is not None \
+            and len(updt_data) >= JIT_MIN_ROWS \
+            and all([isinstance(r, ReflectiveValue) and r.target == reflective_column for r in reflective_rules]):
+            jit_recurrence = get_jit_recurrence(expression=expression, reflective_column=reflective_column)
+
+        if jit_recurrence is not None:
+            inputs = np.column_stack([rows_data[c].astype(float) for c in expression.columns])
+            jit_result = reflective_data.copy()
+            jit_recurrence(inputs, rows_data[involved_condition].astype(float), jit_result, np.array([r.ref for r in reflective_rules], dtype=np.int64), start)
+            #Non finite results may come from complex numbers (nan in numba),
+            #in that case the recurrence runs again to raise as usual.
+            if np.isfinite(jit_result[start:]).all():
+                reflective_data[:] = jit_result
+                start = len(reflective_data)
+
+        cond_eval = -1
+        for i in range(start, len(reflective_data)):
+            for ref_rule in reflective_rules:
+                if is_reflective_condition:
+                    condition_row = {c:v[i] for c, v in non_reflective_columns_data.items()}
+                    for rr in reflective_condition.reflective_rules:
+                        condition_row[rr.column] = rr.evaluate_on_values(values=get_values(rr.target), actual_index=i)
+                    cond_eval = reflective_condition.fnc(row=condition_row, columns=list(condition_row.keys()))
+                    reflective_data_cond[i] = cond_eval
+                #Evaluate the reflective rule ONLY if there's a 
+                #TRUE reflective condition (1.0) or there's any of them (-1)
+                evaluation = \
+                    ref_rule.evaluate_on_values(values=get_values(ref_rule.target), actual_index=i) \
+                        if cond_eval==-1 or cond_eval==1 \
+                        else 0.0
+                reflective_data[i] = evaluation
+
+                single_row = {k:v[i] for k, v in rows_data.items()}
+                if is_reflective_condition:
+                    single_row[reflective_condition.column] = cond_eval
+                single_row[reflective_column] = evaluation
+                reflective_data[i] = fnc(row=single_row, columns=total_columns_involved)
+
+        updt_data[reflective_column] = reflective_data
+        if is_reflective_condition:
+            updt_data[reflective_condition.column] = reflective_data_cond
+        updt_data['reflective_'+reflective_column] = reflective_data.copy()
+        self.carry_results_over(reflective_data=reflective_data, reflective_data_cond=reflective_data_cond)
         return updt_data
@@ -10,7 +10,7 @@ import re
 #from sympy import sympify
 import pandas as pd
 from copy import deepcopy
-from typing import List, Callable, Dict
+from typing import List, Callable, Dict, Optional
 import numpy as np
 
 from mosaic_framework.core.functions import apply_condition
@@ -37,6 +37,28 @@ class ReflectiveAgroFactor(AgroRule):
             debug=False)
         self.ref    = ref
 
+    def get_lag(self) -> Optional[int]:
+        """
+        Reflective factors read older results of the reflective rule they are part of.
+
+        Returns:
+            Optional[int]: None, the results depend on every row from the start of the data
+        """
+        return None
+
+    def evaluate(self, data:pd.DataFrame, actual_index:int) -> object:
+        """
+        Evaluate the rule on the input data, at the specified actual index.
+
+        Parameters:
+            data: Input DataFrame to evaluate
+            actual_index: Current index position
+
+        Returns:
+            object: Result of evaluate_on_values on the target column
+        """
+        return self.evaluate_on_values(values=data[self.target].values, actual_index=actual_index)
+
 #Describe a particular Rule, where it returns a value, based
 #on actual index, and the shift. Used to point to a value, 
 #that is contained in a column, where calculations must be
@@ -63,20 +85,20 @@ class ReflectiveValue(ReflectiveAgroFactor):
             is_implicit=True, 
             debug=False)
     
-    def evaluate(self, data:pd.DataFrame, actual_index:int) -> float:
+    def evaluate_on_values(self, values:np.ndarray, actual_index:int) -> float:
         """
-        Evaluate the rule on the input data.
-        It returns the value of the target column at the specified actual index,
+        Evaluate the rule on the values of the target column.
+        It returns the value at the specified actual index,
         shifted by the ref value.
 
         Parameters:
-            data: Input DataFrame to evaluate
+            values: Values of the target column
             actual_index: Current index position
 
         Returns:
             float: Value at the specified index position
         """
-        return data[self.target][actual_index-self.ref:actual_index-self.ref+1].values[0]
+        return values[actual_index-self.ref:actual_index-self.ref+1][0]
 
     def __str__(self) -> str:
         return f"class: {self.__class__} | target={self.target} | ref={self.ref}"
@@ -147,18 +169,18 @@ class ReflectiveCondition(ReflectiveAgroFactor):
 
         return 1 if operators[cond['comp']] else 0
 
-    def evaluate(self, data:pd.DataFrame, actual_index:int) -> int:
+    def evaluate_on_values(self, values:np.ndarray, actual_index:int) -> int:
         """
-        Evaluate the rule on the input data.
+        Evaluate the rule on the values of the target column.
 
         Parameters:
-            data: Input DataFrame to evaluate
+            values: Values of the target column
             actual_index: Current index position
 
         Returns:
             int: Result of applying condition to the value
         """
-        return self.apply_condition(data[self.target].values[actual_index-self.ref:actual_index-self.ref+1], self.condition)
+        return self.apply_condition(values[actual_index-self.ref:actual_index-self.ref+1], self.condition)
 
 #<IMPLEMENT> <CHECK>
 #Allows referring to a series of data (a slice) backwards
@@ -184,18 +206,18 @@ class ReflectiveSeries(ReflectiveAgroFactor):
         self.ref_end      = self.ref[1]
         del self.ref
     
-    def evaluate(self, data:pd.DataFrame, actual_index:int) -> np.ndarray:
+    def evaluate_on_values(self, values:np.ndarray, actual_index:int) -> np.ndarray:
         """
-        Evaluate the rule on the input data.
+        Evaluate the rule on the values of the target column.
 
         Parameters:
-            data: Input DataFrame to evaluate
+            values: Values of the target column
             actual_index: Current index position
 
         Returns:
             np.ndarray: Array of values from the specified range
         """
-        return data[self.target][actual_index-self.ref_start:actual_index-self.ref_end+1].values
+        return values[actual_index-self.ref_start:actual_index-self.ref_end+1]
 
     def __str__(self) -> str:
         return f"class: {self.__class__} | target={self.target} | ref={self.ref}"
@@ -246,19 +268,19 @@ class ReflectiveTimeframeCondition(ReflectiveSeries):
         return {'comp': comp, 'val': val}
     
 
-    def evaluate(self, data:pd.DataFrame, actual_index:int) -> int:
+    def evaluate_on_values(self, values:np.ndarray, actual_index:int) -> int:
         """
-        Evaluate the rule on the input data.
+        Evaluate the rule on the values of the target column.
 
         Parameters:
-            data: Input DataFrame to evaluate
+            values: Values of the target column
             actual_index: Current index position
 
         Returns:
             int: Result of applying aggregation and condition
         """
         #Calling the evalute on ReflectiveSeries, obtaining the values (reflective)
-        values = super().evaluate(data=data, actual_index=actual_index)
+        values = super().evaluate_on_values(values=values, actual_index=actual_index)
         #Here we need to apply aggregation_fnc 
         #also confrontation to condition, returning the result
         return apply_condition(self.fnc(values), cond=self.condition)
@@ -0,0 +1,248 @@
+################################################################################
+# Module: rule_graph.py
+# Description: Dependency graph between the rules of an output.
+# Author:     Stefano Zimmitti
+# Date: 15/01/2024
+# Company: xFarm Technologies
+################################################################################
+
+from typing import List, Dict, Set, Tuple, Optional, Any
+
+#Label of the node representing the output rule(s)
+OUTPUT_NODE = 'output'
+
+class RuleDependencyGraph():
+    """
+    Dependency graph between the rules of an output, in declaration order.
+    Each rule is a node, an edge (producer, consumer) means that the consumer
+    reads the column written by the producer. Output rules are collapsed in a
+    single final node. Rules whose inputs are detected only during evaluation
+    (eg. GDD) are considered as consumers of every previous rule.
+    The graph allows to:
+        - skip implicit rules whose column is never consumed (dead rules).
+        - drop implicit columns as soon as their last consumer has been evaluated.
+        - group independent rules in levels, that can be evaluated concurrently.
+    Explicit columns are part of the results, so they are never skipped or dropped.
+
+    Args:
+        rules (List[AgroRule]): Parsed rules of the output, in evaluation order
+        output_rules (List[OutputAgroRule]): Parsed output rules of the output
+    """
+    def __init__(self, rules:List[Any], output_rules:List[Any]) -> None:
+        self.rules        = rules
+        self.output_rules = output_rules if isinstance(output_rules, list) else [output_rules]
+        self.inputs       = [r.get_input_columns() for r in self.rules]
+        self.outputs      = [self.get_written_columns(r) for r in self.rules]
+        self.edges        = self.get_edges()
+        self.dead_rules   = self.get_dead_rules()
+        self.expired_columns = self.get_expired_columns()
+
+    def get_written_columns(self, rule:Any) -> List[str]:
+        """
+        Get the columns a rule adds to the dataframe: its own column, and the columns
+        of its explicit nested rules (on_condition, rules), that are not removed by finalize.
+
+        Args:
+            rule (AgroRule): Rule to analyze
+
+        Returns:
+            List[str]: Column names
+        """
+        columns = [rule.column]
+        if rule.is_implicit:
+            return columns
+        nested_rules = [rule.on_condition] if hasattr(rule.on_condition, 'is_implicit') else []
+        nested_rules += rule.__dict__.get('rules', None) or []
+        for r in nested_rules:
+            if hasattr(r, 'is_implicit') and not r.is_implicit:
+                columns.extend(self.get_written_columns(r))
+        return list(dict.fromkeys(columns))
+
+    def get_output_inputs(self) -> Optional[List[str]]:
+        """
+        Get the columns read by the output rules.
+
+        Returns:
+            Optional[List[str]]: Input column names, None if at least one output rule is not known
+        """
+        columns = list()
+        for r in self.output_rules:
+            r_columns = r.get_input_columns() if hasattr(r, 'get_input_columns') else None
+            if r_columns is None:
+                return None
+            columns.extend(r_columns)
+        return columns
+
+    def get_edges(self) -> List[Tuple[int, Any]]:
+        """
+        Link each consumer to the last rule, evaluated before it, that writes the consumed column.
+
+        Returns:
+            List[Tuple[int, Any]]: Edges as (producer index, consumer index | OUTPUT_NODE)
+        """
+        edges     = list()
+        producers = dict()
+        consumers = [(i, c) for i, c in enumerate(self.inputs)] + [(OUTPUT_NODE, self.get_output_inputs())]
+        for consumer, columns in consumers:
+            if columns is None:
+                edges.extend([(p, consumer) for p in sorted(set(producers.values()))])
+            else:
+                edges.extend([(producers[c], consumer) for c in dict.fromkeys(columns) if c in producers])
+            if consumer != OUTPUT_NODE:
+                producers.update({c:consumer for c in self.outputs[consumer]})
+        return edges
+
+    def get_consumers(self, index:int) -> List[Any]:
+        """
+        Get the consumers of a rule.
+
+        Args:
+            index (int): Index of the rule
+
+        Returns:
+            List[Any]: Consumer indexes, OUTPUT_NODE if consumed by the output rules
+        """
+        return [c for p, c in self.edges if p == index]
+
+    def get_dead_rules(self) -> Set[int]:
+        """
+        Find implicit rules whose column is never consumed, neither directly nor through
+        other rules. Visiting in reverse order, consumers are always classified first.
+
+        Returns:
+            Set[int]: Indexes of the rules that can be skipped
+        """
+        dead_rules = set()
+        for i in reversed(range(len(self.rules))):
+            if not self.rules[i].is_implicit:
+                continue
+            if all([c in dead_rules for c in self.get_consumers(i)]):
+                dead_rules.add(i)
+        return dead_rules
+
+    def get_expired_columns(self, steps:Dict[int, int]=None) -> Dict[int, List[str]]:
+        """
+        For each evaluation step, list the implicit columns not needed anymore after it.
+        Columns consumed by the output rules are kept, then removed at the end, as usual.
+
+        Args:
+            steps (Dict[int, int], optional): Rule index -> step where it is evaluated.
+                Defaults to None, each rule is a step.
+
+        Returns:
+            Dict[int, List[str]]: Step -> columns to drop after its evaluation
+        """
+        steps = steps if steps is not None else {i:i for i in range(len(self.rules))}
+        expired_columns = dict()
+        for i, r in enumerate(self.rules):
+            if not r.is_implicit or i in self.dead_rules:
+                continue
+            consumers = [c for c in self.get_consumers(i) if not c in self.dead_rules]
+            if OUTPUT_NODE in consumers:
+                continue
+            expired_columns.setdefault(max([steps[c] for c in consumers]), list()).append(r.column)
+        return expired_columns
+
+    def get_levels(self) -> List[List[int]]:
+        """
+        Group rules in levels, where rules of the same level are independent, so that they
+        can be evaluated together on the same input. Besides the edges, a rule is placed after
+        every previous rule reading or writing its column, so that the results of a level can be
+        merged in declaration order giving the same dataframe of the sequential evaluation.
+
+        Returns:
+            List[List[int]]: Rule indexes for each level, in declaration order
+        """
+        levels = list()
+        for j in range(len(self.rules)):
+            previous = [p for p, c in self.edges if c == j]
+            for i in range(j):
+                reads_column = self.inputs[i] is None or any([c in self.inputs[i] for c in self.outputs[j]])
+                if reads_column or any([c in self.outputs[i] for c in self.outputs[j]]):
+                    previous.append(i)
+            levels.append(max([levels[p] for p in previous], default=-1)+1)
+        return [[i for i, l in enumerate(levels) if l == level] for level in range(max(levels, default=-1)+1)]
+
+    def get_lag(self, carry:bool=False) -> Optional[int]:
+        """
+        Get the rows, before the first one of a chunk of data, needed to evaluate the rules
+        on the chunk as on the whole data. Lags add up along the dependencies: a rule reading
+        a column needs its own lag, plus the rows its producer needed to compute that column.
+        Dead rules are not considered, their columns never reach the results.
+
+        Args:
+            carry (bool, optional): Rules carrying a state go on from the one carried over by
+                the previous data (see AgroRule.get_carry_lag). Defaults to False
+
+        Returns:
+            Optional[int]: Longest sum of lags of the rules, None if a rule carries a state from the start of the data
+        """
+        lags = dict()
+        for i, r in enumerate(self.rules):
+            if self.is_dead(i):
+                continue
+            lag = r.get_carry_lag() if carry else r.get_lag()
+            if lag is None:
+                return None
+            lags[i] = lag + max([lags[p] for p, c in self.edges if c == i and p in lags], default=0)
+        return max(lags.values(), default=0)
+
+    def is_dead(self, index:int) -> bool:
+        """
+        Check if a rule can be skipped.
+
+        Args:
+            index (int): Index of the rule
+
+        Returns:
+            bool: True if the column of the rule is never consumed
+        """
+        return index in self.dead_rules
+
+    def get_columns_to_drop(self, index:int) -> List[str]:
+        """
+        Get the implicit columns to drop after the evaluation of a rule.
+
+        Args:
+            index (int): Index of the rule
+
+        Returns:
+            List[str]: Column names
+        """
+        return self.expired_columns.get(index, list())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Describe the graph, for inspection.
+
+        Returns:
+            Dict[str, Any]: Nodes, edges, dead rules and columns dropped after each rule
+        """
+        nodes = [{
+            'index'      : i,
+            'rule'       : type(r).__name__,
+            'column'     : r.column,
+            'is_implicit': r.is_implicit,
+            'inputs'     : self.inputs[i],
+            'is_dead'    : self.is_dead(i)} for i, r in enumerate(self.rules)]
+        nodes.append({
+            'index'      : OUTPUT_NODE,
+            'rule'       : [type(r).__name__ for r in self.output_rules],
+            'column'     : [r.column for r in self.output_rules],
+            'is_implicit': False,
+            'inputs'     : self.get_output_inputs(),
+            'is_dead'    : False})
+        return {
+            'nodes'          : nodes,
+            'edges'          : self.edges,
+            'dead_rules'     : sorted(self.dead_rules),
+            'levels'         : self.get_levels(),
+            'expired_columns': self.expired_columns}
+
+    def __str__(self) -> str:
+        lines = list()
+        for i, r in enumerate(self.rules):
+            consumers = self.get_consumers(i)
+            status    = ' (skipped)' if self.is_dead(i) else ''
+            lines.append(f"[{i}] {type(r).__name__}: {r.column}{status} -> {consumers}")
+        return "\nRuleDependencyGraph:\n"+"\n".join(lines)
@@ -7,14 +7,14 @@
 ################################################################################
 
 import pandas as pd
-from copy import deepcopy
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 import json
 from ast import literal_eval
 
 from mosaic_framework.core.agronomical_factors import AgroRule
 from mosaic_framework.core.exceptions import AgroRuleFormatError
+from mosaic_framework.core.evaluation_frame import get_evaluation_frame
 
 class Value(AgroRule):
     """
@@ -57,7 +57,7 @@ class Value(AgroRule):
         """
         AgroRule.evaluate(self, data=data)
         df = self.prepare(data)
-        updt_df = deepcopy(df)
+        updt_df = get_evaluation_frame(df)
         updt_df[self.column] = self.value
 
         return self.finalize(data=updt_df)
@@ -84,6 +84,15 @@ class MappedValueOnTimeRangesRule(AgroRule):
             is_implicit=kwargs.get('is_implicit', False), 
             debug=kwargs.get('debug', False))
         self.mapping = mapping
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Time ranges are placed in the year of the first date of the data.
+
+        Returns:
+            Optional[int]: None, the rule depends on the start of the data
+        """
+        return None
     
     def validation(self) -> bool:
         """
@@ -115,7 +124,7 @@ class MappedValueOnTimeRangesRule(AgroRule):
         """
         prepared_dataset = super().prepare(data)
         self.validation()
-        internal_df = deepcopy(prepared_dataset)
+        internal_df = get_evaluation_frame(prepared_dataset)
         internal_df['sampleDate_dt'] = pd.to_datetime(internal_df[self.target])
         
         ref_year = int(internal_df['sampleDate_dt'].min().year)
@@ -181,6 +190,16 @@ class ReferenceValue(Value):
         super().__init__(value=0, **kwargs)
         self.ref = ref
         self.target = target
+
+    def get_lag(self) -> Optional[int]:
+        """
+        Each value is the one 'ref' rows before it.
+
+        Returns:
+            Optional[int]: Rows read before the current one
+        """
+        lag = super().get_lag()
+        return None if lag is None else max(lag, self.ref)
     
     def prepare(self, data: pd.DataFrame) -> pd.DataFrame:
         """
@@ -207,12 +226,14 @@ class ReferenceValue(Value):
         """
         AgroRule.evaluate(self, data=data)
         df = self.prepare(data)
-        updt_df = deepcopy(df)
+        updt_df = get_evaluation_frame(df)
 
         values = updt_df[self.target].to_list()
-        for _ in range(self.ref):
+        #Data shorter than 'ref' (eg. the first chunk of streaming evaluation) is all defaults.
+        n_defaults = min(self.ref, len(values))
+        for _ in range(n_defaults):
             values.pop()
-        default_values = [0.0 for i in range(self.ref)]
+        default_values = [0.0 for i in range(n_defaults)]
         updt_df[self.column] = default_values + values
         return self.finalize(data=updt_df)
 
@@ -10,7 +10,6 @@
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
 
-import requests
 import json
 from copy import deepcopy
 
@@ -129,6 +128,9 @@ class GetApi(ProtocolDataRetriever):
         updt_url = self.build(api_url=api_url, params=api_parameters)
         print(f"[GetApi] Builted api_url={updt_url}")
 
+        #requests is imported when an API is called, not with the package (slow cold starts).
+        import requests
+
         #Get the response and deal with it.
         #x-api-key needed is got from the Vault
         #secret_name: str that is used to map a secret, 
@@ -140,6 +142,10 @@ class GetApi(ProtocolDataRetriever):
         status_code : int = result.status_code
         body        : str = result.text
 
+        #A refused key is retrieved again by the next call (eg. a rotated key).
+        if status_code in [401, 403]:
+            self.vault.evict_secret(secret_class=APIKeySecret, secret_name=service_domain, stage=self.stage)
+
         if status_code == 403:
             raise APIPermissionException(f"API call lack of permission: Message got: {json.dumps(body, default=str)}")
         
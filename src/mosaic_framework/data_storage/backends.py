@@ -0,0 +1,350 @@
+################################################################################
+# Module:      backends.py
+# Description: Backends where the Resources of MosaicDataStorage are kept.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from __future__ import annotations
+from typing import Protocol, Dict, Tuple
+from copy import deepcopy
+import datetime
+import tempfile
+import shutil
+import inspect
+import io
+import os
+import pandas as pd
+
+from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.config.configuration import WRITERS_MAPPING, READERS_MAPPING
+from mosaic_framework.data_storage.exceptions import WriterClassNotFoundException, ReaderClassNotFoundException, ResourceNotFoundException, DataFormatException
+import mosaic_framework.data_storage.readers
+import mosaic_framework.data_storage.writers
+
+#Classes already found, by (module, name).
+_FOUND_CLASSES : Dict[Tuple[str, str], type] = dict()
+
+def find_cls(module, cls_string:str, exception:type):
+    """
+    Find the class of a module by name, the class found is kept for the next requests.
+    ---\n
+    params:
+    module: module - The module where the class is defined (readers or writers).
+    cls_string: str - The name of the class (see READERS_MAPPING and WRITERS_MAPPING).
+    exception: type - Exception raised if no class is found.
+    ---\n
+    returns:
+    type - The class found.
+    """
+    cls = _FOUND_CLASSES.get((module.__name__, cls_string), None)
+    if cls is not None:
+        return cls
+    cls = getattr(module, cls_string, None)
+    if not inspect.isclass(cls):
+        raise exception(f"Cannot find a proper class for the selected string: {cls_string}")
+    _FOUND_CLASSES[(module.__name__, cls_string)] = cls
+    return cls
+
+class ProtocolStorageBackend(Protocol):
+    def allocate(self, prefix:str) -> str:
+        ...
+    def deallocate(self) -> bool:
+        ...
+    def persist(self, resource:Resource) -> bool:
+        ...
+    def replace(self, resource:Resource, new_resource:Resource) -> bool:
+        ...
+    def append(self, resource:Resource, new_resource:Resource) -> bool:
+        ...
+    def read(self, resource:Resource) -> object:
+        ...
+    def remove(self, resource:Resource) -> bool:
+        ...
+
+class FileStorageBackend(ProtocolStorageBackend):
+    """
+    Resources are written, with the writer of their file type, in a temp folder. Each
+    time data are requested the file is read again. Files can be inspected during the
+    elaboration, useful for debugging and crash forensics.
+    """
+    def __init__(self) -> None:
+        self.path = None
+
+    def allocate(self, prefix:str) -> str:
+        """
+        Allocate a temp folder with the given prefix and suffix equal to the current datetime.
+        ---\n
+        params:
+        prefix: str - Prefix of the temp folder.
+        ---\n
+        returns:
+        str - The path of the allocated temporary directory.
+        """
+        self.path = tempfile.mkdtemp(
+            prefix=prefix+"_",
+            suffix="_"+datetime.datetime.strftime(datetime.datetime.now(), "%Y%m%d%H%M"))
+        return self.path
+
+    def deallocate(self) -> bool:
+        """
+        Remove the temp folder and all the files in it.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        bool - True if the folder has been removed.
+        """
+        shutil.rmtree(self.path)
+        if os.path.isdir(self.path):
+            return False
+        self.path = None
+        return True
+
+    def persist(self, resource:Resource) -> bool:
+        """
+        Write the data of the Resource in the temp folder, with the writer of its file type.
+        ---\n
+        params:
+        resource: Resource - The resource to write.
+        ---\n
+        returns:
+        bool - Value returned based on persistence result.
+        """
+        writer_cls = find_cls(module=mosaic_framework.data_storage.writers, cls_string=WRITERS_MAPPING[resource.file_type], exception=WriterClassNotFoundException)
+        return writer_cls(data_storage=self).persist(label=resource.label, data=resource.data)
+
+    def replace(self, resource:Resource, new_resource:Resource) -> bool:
+        """
+        Replace the file of a Resource with the one of a new Resource with the same label. The new
+        file is written aside, then moved over the old one, so that readers never find it missing 
+        or partially written.
+        ---\n
+        params:
+        resource: Resource - The resource to replace.
+        new_resource: Resource - The new resource.
+        ---\n
+        returns:
+        bool - Value returned based on the result of replacing the resource.
+        """
+        writer_cls = find_cls(module=mosaic_framework.data_storage.writers, cls_string=WRITERS_MAPPING[new_resource.file_type], exception=WriterClassNotFoundException)
+        temp_label = f"{new_resource.label}.replacing"
+        ack        = writer_cls(data_storage=self).persist(label=temp_label, data=new_resource.data)
+        os.replace(self.path + "/" + temp_label + "." + new_resource.file_type, self.path + "/" + new_resource.label + "." + new_resource.file_type)
+        if resource.file_type != new_resource.file_type:
+            self.remove(resource=resource)
+        return ack
+
+    def append(self, resource:Resource, new_resource:Resource) -> bool:
+        """
+        Append the rows of the DataFrame of a new Resource to the file of a Resource with the same
+        label. Rows are appended to csv files, files of the other formats are read and written again.
+        Rows must have the columns of the file.
+        ---\n
+        params:
+        resource: Resource - The resource to extend.
+        new_resource: Resource - The resource with the rows to append.
+        ---\n
+        returns:
+        bool - Value returned based on the result of appending the rows.
+        """
+        if resource.file_type == 'csv':
+            filepath = self.path + "/" + resource.label + ".csv"
+            #Rows are written without header, under the one of the file.
+            columns  = pd.read_csv(filepath, nrows=0, index_col=0).columns.to_list()
+            if columns != [str(c) for c in new_resource.data.columns]:
+                raise DataFormatException(f"Rows appended to '{resource.label}' have columns {new_resource.data.columns.to_list()}, expected: {columns}")
+            new_resource.data.to_csv(filepath, mode='a', header=False)
+            return True
+        data = self.read(resource=resource)
+        if not data.columns.equals(new_resource.data.columns):
+            raise DataFormatException(f"Rows appended to '{resource.label}' have columns {new_resource.data.columns.to_list()}, expected: {data.columns.to_list()}")
+        data = pd.concat([data, new_resource.data])
+        return self.replace(resource=resource, new_resource=Resource(label=resource.label, data=data, file_type=resource.file_type))
+
+    def read(self, resource:Resource) -> object:
+        """
+        Read the file of the Resource, with the reader of its file type.
+        ---\n
+        params:
+        resource: Resource - The resource to read.
+        ---\n
+        returns:
+        object - Data read from the file.
+        """
+        reader_cls = find_cls(module=mosaic_framework.data_storage.readers, cls_string=READERS_MAPPING[resource.file_type], exception=ReaderClassNotFoundException)
+        return reader_cls(data_storage=self).read(label=resource.label)
+
+    def remove(self, resource:Resource) -> bool:
+        """
+        Remove the file of the Resource.
+        ---\n
+        params:
+        resource: Resource - The resource to remove.
+        ---\n
+        returns:
+        bool - Value returned based on the result of removing the resource.
+        """
+        os.remove(self.path + "/" + resource.label + "." + resource.file_type)
+        return True
+
+class MemoryStorageBackend(ProtocolStorageBackend):
+    """
+    Resources are kept in memory as live objects, by label. Raw contents (bytes or text) are
+    decoded once, by the reader of their file type, the first time they are requested.
+    DataFrames are kept as they are when their file type keeps dtypes (feather, npz), in a
+    csv Resource they are decoded once as the csv file would be read. Each request gets its 
+    own copy, so that Components can change the data they get without changing the Resource.
+    """
+    def __init__(self) -> None:
+        self.path    = None
+        self.content = dict()
+        self.decoded = dict()
+
+    def allocate(self, prefix:str) -> str:
+        """
+        Nothing to allocate, the content is cleared.
+        ---\n
+        params:
+        prefix: str - Not used.
+        ---\n
+        returns:
+        str - None, there is no folder.
+        """
+        self.content = dict()
+        self.decoded = dict()
+        return self.path
+
+    def deallocate(self) -> bool:
+        """
+        Release all the objects kept.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        bool - Always True.
+        """
+        self.content = dict()
+        self.decoded = dict()
+        return True
+
+    def persist(self, resource:Resource) -> bool:
+        """
+        Keep the data of the Resource, by label.
+        ---\n
+        params:
+        resource: Resource - The resource to keep.
+        ---\n
+        returns:
+        bool - Always True.
+        """
+        self.content[resource.label] = resource.data
+        self.decoded.pop(resource.label, None)
+        return True
+
+    def replace(self, resource:Resource, new_resource:Resource) -> bool:
+        """
+        Replace the data kept for the label of a Resource with the ones of the new Resource.
+        ---\n
+        params:
+        resource: Resource - The resource to replace.
+        new_resource: Resource - The new resource.
+        ---\n
+        returns:
+        bool - Always True.
+        """
+        return self.persist(resource=new_resource)
+
+    def append(self, resource:Resource, new_resource:Resource) -> bool:
+        """
+        Append the DataFrame of a new Resource to the data kept for the label of a Resource.
+        Appended DataFrames are kept as they are, they are concatenated once, when data are requested.
+        Rows must have the columns of the Resource.
+        ---\n
+        params:
+        resource: Resource - The resource to extend.
+        new_resource: Resource - The resource with the rows to append.
+        ---\n
+        returns:
+        bool - Always True.
+        """
+        data = self.content[resource.label]
+        if not isinstance(data, list):
+            data = [data if isinstance(data, pd.DataFrame) else self.decode(resource=resource)]
+        if not data[0].columns.equals(new_resource.data.columns):
+            raise DataFormatException(f"Rows appended to '{resource.label}' have columns {new_resource.data.columns.to_list()}, expected: {data[0].columns.to_list()}")
+        data.append(new_resource.data)
+        self.content[resource.label] = data
+        self.decoded.pop(resource.label, None)
+        return True
+
+    def decode(self, resource:Resource) -> object:
+        """
+        Decode the data of the Resource as its reader would do with the file.
+        ---\n
+        params:
+        resource: Resource - The resource to decode.
+        ---\n
+        returns:
+        object - Decoded data.
+        """
+        data = self.content[resource.label]
+        if isinstance(data, list):
+            #Appended DataFrames, as rows of a single file, are kept concatenated.
+            data = pd.concat(data)
+            self.content[resource.label] = data
+        if isinstance(data, pd.DataFrame) and resource.file_type == 'csv':
+            #Text does not keep dtypes, the same values of the file are read.
+            buffer = io.StringIO()
+            data.to_csv(buffer)
+            buffer.seek(0)
+            data   = buffer
+        elif isinstance(data, pd.DataFrame):
+            return data
+        if isinstance(data, pd.ExcelFile):
+            return data.parse(sheet_name=data.sheet_names[0])
+        reader_obj = find_cls(module=mosaic_framework.data_storage.readers, cls_string=READERS_MAPPING[resource.file_type], exception=ReaderClassNotFoundException)(data_storage=self)
+        if isinstance(data, str):
+            #Same newlines handling of a file opened in text mode.
+            return reader_obj.load(io.StringIO(data, newline=None))
+        if isinstance(data, io.StringIO):
+            return reader_obj.load(data)
+        return reader_obj.load(io.BytesIO(data))
+
+    def read(self, resource:Resource) -> object:
+        """
+        Get a copy of the decoded data of the Resource.
+        ---\n
+        params:
+        resource: Resource - The resource to read.
+        ---\n
+        returns:
+        object - Data of the Resource.
+        """
+        if not resource.label in self.content:
+            raise ResourceNotFoundException(f"Cannot find data of the resource by label='{resource.label}'")
+        if not resource.label in self.decoded:
+            self.decoded[resource.label] = self.decode(resource=resource)
+        data = self.decoded[resource.label]
+        return data.copy() if isinstance(data, pd.DataFrame) else deepcopy(data)
+
+    def remove(self, resource:Resource) -> bool:
+        """
+        Release the data of the Resource.
+        ---\n
+        params:
+        resource: Resource - The resource to remove.
+        ---\n
+        returns:
+        bool - Value returned based on the result of removing the resource.
+        """
+        self.decoded.pop(resource.label, None)
+        return self.content.pop(resource.label, None) is not None
+
+STORAGE_BACKENDS = {
+    "file"   : FileStorageBackend,
+    "memory" : MemoryStorageBackend
+}
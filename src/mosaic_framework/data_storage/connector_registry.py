@@ -0,0 +1,92 @@
+################################################################################
+# Module:      connector_registry.py
+# Description: Connectors between Components, indexed by both their endpoints.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from typing import List, Iterator
+
+class ConnectorRegistry():
+    """
+    Content of the 'connectors' SharedVariable. Each connector is a dict as
+    {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource | SharedVariable | dict>},
+    kept in the order they are added and indexed by 'connect_in' and 'connect_out', so that
+    Components get the connectors of a label without scanning all of them. Connectors are
+    the same dicts that have been added, their 'resource' can be changed in place.
+    It can be iterated as the list of connectors.
+    """
+    def __init__(self, connectors:List[dict]=None) -> None:
+        self.connectors  = list()
+        self.connect_in  = dict()
+        self.connect_out = dict()
+        for c in (connectors if connectors is not None else []):
+            self.append(c)
+
+    def append(self, connector:dict) -> None:
+        """
+        Add a connector, indexing it by both its endpoints.
+        ---\n
+        params:
+        - connector (dict): Connector as {'connect_in': <str>, 'connect_out': <str>, 'resource': <object>}.
+        ---\n
+        returns:
+        None
+        """
+        self.connectors.append(connector)
+        self.connect_in.setdefault(connector['connect_in'], list()).append(connector)
+        self.connect_out.setdefault(connector['connect_out'], list()).append(connector)
+        return
+
+    def get_by_connect_in(self, label:str) -> List[dict]:
+        """
+        Get the connectors starting from a Component.
+        ---\n
+        params:
+        - label (str): Label of the Component, as 'connect_in'.
+        ---\n
+        returns:
+        List[dict] : Connectors found, in the order they have been added.
+        """
+        return list(self.connect_in.get(label, []))
+
+    def get_by_connect_out(self, label:str) -> List[dict]:
+        """
+        Get the connectors ending in a Component.
+        ---\n
+        params:
+        - label (str): Label of the Component, as 'connect_out'.
+        ---\n
+        returns:
+        List[dict] : Connectors found, in the order they have been added.
+        """
+        return list(self.connect_out.get(label, []))
+
+    def get(self, connect_in:str, connect_out:str) -> dict:
+        """
+        Get the connector between two Components.
+        ---\n
+        params:
+        - connect_in (str): Label of the Component at the start of the connection.
+        - connect_out (str): Label of the Component at the end of the connection.
+        ---\n
+        returns:
+        dict : The connector, None if the Components are not connected.
+        """
+        for c in self.connect_in.get(connect_in, []):
+            if c['connect_out'] == connect_out:
+                return c
+        return None
+
+    def __iter__(self) -> Iterator[dict]:
+        return iter(self.connectors)
+
+    def __len__(self) -> int:
+        return len(self.connectors)
+
+    def __getitem__(self, i:int) -> dict:
+        return self.connectors[i]
+
+    def __str__(self) -> str:
+        return str(self.connectors)
@@ -9,56 +9,56 @@ from __future__ import annotations
 from typing import List, TYPE_CHECKING
 from warnings import warn
 from typing import List
-import datetime
-import tempfile
-import shutil
-import os
 
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.resource import Resource
     ResourceType           = Resource   
 
-from mosaic_framework.data_storage.exceptions import ResourceNotFoundException
+from mosaic_framework.data_storage.backends import STORAGE_BACKENDS
+from mosaic_framework.data_storage.exceptions import ResourceNotFoundException, StorageBackendNotFoundException
 
 class MosaicDataStorage():
     """
     Centralized storage where all data and settings are gathered. In order to have a unique
     entry point for data, always knowing where they are stored. Components can refer to a local or cloud resource, 
     then we transfer data to the MosaicDataStorage and always have control over this kind of object, 
-    and use it during the elaboration
+    and use it during the elaboration. Resources are kept by a backend (see STORAGE_BACKENDS): 
+    'file' writes them in a temp folder, 'memory' keeps them as live objects
     .
     """
-    def __init__(self, DEBUG:bool) -> None:
+    def __init__(self, DEBUG:bool, backend:str='file') -> None:
         """
         Initialize the MosaicDataStorage object with the provided debug setting.
         ---\n
         params:
         DEBUG: bool - Enable or disable debug mode.
+        backend: str - Backend where resources are kept, 'file' or 'memory'. Default is 'file'.
         ---\n
         returns: None
         """
+        if not backend in STORAGE_BACKENDS:
+            raise StorageBackendNotFoundException(f"Cannot find storage backend '{backend}', available: {list(STORAGE_BACKENDS.keys())}")
         self.DEBUG      = DEBUG
         self.prefix     = "mosaic"
         self.path       = None
-        self.content    = []
+        self.content    = dict()
+        self.backend    = STORAGE_BACKENDS[backend]()
     
     def allocate(self):
         """
-        Simply allocate a temp folder with a prefix of 'mosaic' and suffix
-        equal to the current datetime.
+        Allocate the backend, for the 'file' one a temp folder with a prefix of 'mosaic' 
+        and suffix equal to the current datetime.
         ---\n
         params:
         None
         ---\n
         returns:  
-        str - The path of the allocated temporary directory.
+        str - The path of the allocated temporary directory, None if resources are kept in memory.
         """
         print("\n[MosaicDataStorage]: allocating space...\n")
-        temp_dir  = tempfile.mkdtemp(
-            prefix=self.prefix+"_",
-            suffix="_"+datetime.datetime.strftime(datetime.datetime.now(), "%Y%m%d%H%M"))
+        temp_dir  = self.backend.allocate(prefix=self.prefix)
         self.path = temp_dir
-        print(f"\n[MosaicDataStorage]: allocated in: {temp_dir}\n")
+        print(f"\n[MosaicDataStorage]: allocated in: {temp_dir if temp_dir is not None else 'memory'}\n")
         return temp_dir
     
     def deallocate(self) -> bool:
@@ -74,14 +74,12 @@ class MosaicDataStorage():
         bool - Value returned based on the deallocation result.
         """
         try:
-            shutil.rmtree(self.path)
-            
-            if os.path.isdir(self.path):
+            if not self.backend.deallocate():
                 warn("MosaicDataStorage has not been correctly deallocated")
             else:
                 print(f"\n[MosaicDataStorage]: data deallocated.")
                 self.path    = None
-                self.content = []
+                self.content = dict()
             return True
         except:
             print(f"\nCannot deallocate MosaicDataStorage: {self.path}.")
@@ -89,7 +87,7 @@ class MosaicDataStorage():
 
     def add_resource(self, resource: ResourceType) -> bool:
         """
-        Add a Resource to the storage, append it to the current 'content'
+        Add a Resource to the storage, keyed by its label in the current 'content'
         .
         ---\n
         params:
@@ -98,7 +96,7 @@ class MosaicDataStorage():
         returns:  
         bool - Value returned based on the result of adding the resource.
         """
-        self.content.append(resource)
+        self.content[resource.label] = resource
         is_added = resource.persist(data_storage=self)
         print(f"\n[MosaicDataStorage]: {resource} added to the MosaicDataStorage.")
         return is_added
@@ -113,15 +111,15 @@ class MosaicDataStorage():
         returns:
         bool - Value returned based on the result of removing the resource.
         """
-        for r in self.content:
-            if r.label == label:
-                #remove the resource 'physical' part
-                r.remove()
-                #remove the resource 'logical' part
-                self.content.remove(r)
-                print(f"\n[MosaicDataStorage]: {r} removed from the MosaicDataStorage.")
-                return True
-        raise ResourceNotFoundException(f"Cannot removed Resource. Cannot find resource by label='{label}'")
+        if not label in self.content:
+            raise ResourceNotFoundException(f"Cannot removed Resource. Cannot find resource by label='{label}'")
+        #remove the resource 'physical' part
+        r = self.content[label]
+        r.remove()
+        #remove the resource 'logical' part
+        del self.content[label]
+        print(f"\n[MosaicDataStorage]: {r} removed from the MosaicDataStorage.")
+        return True
     
     def get_resource(self, label: str, error_policy: str = 'pass') -> ResourceType:
         """
@@ -134,18 +132,17 @@ class MosaicDataStorage():
         returns:  
         Resource - The requested resource if it is present, otherwise None.
         """
-        print(f"[MosaicDataStorage]: Resource will be searched: {label}")
-        for r in self.content:
-            if r.label == label:
-                print(f"[MosaicDataStorage]: Resource {r} found.")
-                return r
-        if error_policy == 'raise':
+        r = self.content.get(label, None)
+        if self.DEBUG:
+            print(f"[MosaicDataStorage]: Resource {label} {'found' if r is not None else 'not found'}.")
+        if r is None and error_policy == 'raise':
             raise ResourceNotFoundException(f"Cannot find resource by label='{label}'")
-        return None
+        return r
     
     def replace_resource(self, new_resource:Resource) -> bool:
         """
-        Update a Resource in the storage. 
+        Update a Resource in the storage, in place. The backend replaces the data of the old 
+        Resource at once, the label is never missing from the storage.
 
         Args:
             new_resource: Resource - The new resource to be added to the storage.
@@ -154,13 +151,32 @@ class MosaicDataStorage():
             bool - Value returned based on the result of updating the resource.        
         """
         print(f"[MosaicDataStorage]: Resource will be updated: {new_resource.label}")
+        if not new_resource.label in self.content:
+            raise ResourceNotFoundException(f"Cannot replace Resource. Cannot find resource by label='{new_resource.label}'")
+
+        is_replaced = self.backend.replace(resource=self.content[new_resource.label], new_resource=new_resource)
+        new_resource.data_storage         = self
+        self.content[new_resource.label]  = new_resource
+        return is_replaced
+
+    def append_resource(self, resource:Resource) -> bool:
+        """
+        Append the rows of a DataFrame Resource to the Resource with the same label,
+        the Resource is added if its label is not in the storage yet. The Resource kept
+        has the file type of the first one.
+        ---\n
+        params:
+        resource: Resource - The resource with the rows to append.
+        ---\n
+        returns:
+        bool - Value returned based on the result of appending the rows.
+        """
+        if not resource.label in self.content:
+            return self.add_resource(resource=resource)
+        if self.DEBUG:
+            print(f"[MosaicDataStorage]: Rows appended to resource: {resource.label}")
+        return self.backend.append(resource=self.content[resource.label], new_resource=resource)
 
-        #remove the old version of the Resource
-        self.remove_resource(label=new_resource.label)
-        self.add_resource(resource=new_resource)
-    
-        return 
-    
     def __str__(self):
         """
         Return a string representation of the MosaicDataStorage content.
@@ -171,4 +187,4 @@ class MosaicDataStorage():
         returns:
         str - String representation of the MosaicDataStorage content.
         """
-        return f"\n--------------------------------\nMosaicDataStorage content:\n"+str('\n '.join([str(r) for r in self.content])+"\n--------------------------------")
+        return f"\n--------------------------------\nMosaicDataStorage content:\n"+str('\n '.join([str(r) for r in self.content.values()])+"\n--------------------------------")
@@ -52,5 +52,20 @@ class DataFormatException(DataStorageException):
         self.message = message
         super().__init__(self.message)
 
+class ReaderClassNotFoundException(DataStorageException):
+    """Exception raised when trying to get a non-existing or implemented reader."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
 
+class StorageBackendNotFoundException(DataStorageException):
+    """Exception raised when the selected storage backend is not available."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
 
+class FormatNotAvailableException(DataStorageException):
+    """Exception raised when a file format needs an optional dependency that is not installed."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
@@ -7,8 +7,10 @@
 ################################################################################
 
 from __future__ import annotations
-from typing import Protocol, TYPE_CHECKING
+from typing import Protocol, IO, TYPE_CHECKING
+import datetime
 import json
+import numpy as np
 import pandas as pd
 
 if TYPE_CHECKING:
@@ -16,6 +18,76 @@ if TYPE_CHECKING:
 
 from mosaic_framework.data_storage.exceptions import DataFormatException
 
+def decode_npz_value(value:str, kind:str)->object:
+    """
+    Decode a value of an object array from its string (see writers.get_npz_kind).
+    ---\n
+    params:
+    value: str - The value as a string.
+    kind: str - The code of the type of the value.
+    ---\n
+    returns: 
+    object - The value.
+    """
+    if kind == 'b':
+        return value == 'True'
+    if kind == 'i':
+        return int(value)
+    if kind == 'f':
+        return float(value)
+    if kind == 't':
+        return pd.Timestamp(value)
+    if kind == 'd':
+        return datetime.date.fromisoformat(value)
+    if kind == 'D':
+        return pd.Timedelta(value)
+    if kind == 'j':
+        return json.loads(value)
+    return value
+
+def decode_npz_values(arrays:np.lib.npyio.NpzFile, key:str)->np.ndarray:
+    """
+    Decode the values of a column (or of the index) from the arrays of an npz file, 
+    null strings are NaN, as read_csv does.
+    ---\n
+    params:
+    arrays: NpzFile - The arrays of the npz file.
+    key: str - The name of the array.
+    ---\n
+    returns: 
+    np.ndarray - The values.
+    """
+    values = arrays[key]
+    if key+'.kind' in arrays.files:
+        strings = values
+        values  = np.empty(len(strings), dtype=object)
+        for i, (v, k) in enumerate(zip(strings, arrays[key+'.kind'])):
+            values[i] = decode_npz_value(value=str(v), kind=str(k))
+    if key+'.null' in arrays.files:
+        values = values.astype(object)
+        values[arrays[key+'.null']] = np.nan
+    return values
+
+def decode_npz(arrays:np.lib.npyio.NpzFile)->pd.DataFrame:
+    """
+    Decode a pandas DataFrame from the arrays of an npz file (see writers.encode_npz).
+    ---\n
+    params:
+    arrays: NpzFile - The arrays of the npz file.
+    ---\n
+    returns: 
+    pd.DataFrame - The data.
+    """
+    index   = decode_npz_values(arrays=arrays, key='index') if 'index' in arrays.files else pd.RangeIndex(int(arrays['length']))
+    data    = dict()
+    for i, dtype in enumerate(arrays['dtypes']):
+        values  = pd.Series(decode_npz_values(arrays=arrays, key=f'c{i}'), index=index)
+        #Extension dtypes (eg. 'Int64', 'category', timezone aware dates) have been kept as objects.
+        data[i] = values if str(values.dtype) == dtype else values.astype(dtype)
+    data = pd.DataFrame(data=data, index=index)
+    data.columns = pd.Index(decode_npz_values(arrays=arrays, key='columns'))
+    return data
+
 class ProtocolReader(Protocol):
     def persist(self):
         ...
@@ -48,9 +120,22 @@ class TextReader(ProtocolReader):
         """
         filepath = self.data_storage.path + "/" + label + self.ext
         with open(filepath, "r+") as f:
-            data = f.readlines()
-            if len(data) == 1: 
-                data = data[0]
+            data = self.load(f)
+        return data
+
+    def load(self, f: IO) -> object:
+        """
+        Load data from an opened text file.
+        ---\n
+        params:
+        f: IO - The opened file (or an in memory text buffer).
+        ---\n
+        returns: 
+        List[str] or str - The data read from the file.
+        """
+        data = f.readlines()
+        if len(data) == 1: 
+            data = data[0]
         return data
 
 class JsonReader(ProtocolReader):
@@ -81,16 +166,29 @@ class JsonReader(ProtocolReader):
         """
         filepath = self.data_storage.path + "/" + label + self.ext
         with open(filepath, "r+") as f:
-            data = json.load(f)
-            #If 'data' is in the list of keys, then we need to
-            #point to that key and return the content
-            if isinstance(data, dict):
-                if 'data' in list(data.keys()):
-                    data = data['data']
-            elif isinstance(data, list):
-                data = data
-            else: 
-                raise DataFormatException(f'Data format is not what expected: found: {type(data)} | expected: [list | dict]')
+            data = self.load(f)
+        return data
+
+    def load(self, f: IO) -> dict:
+        """
+        Load data from an opened JSON file.
+        ---\n
+        params:
+        f: IO - The opened file (or an in memory buffer).
+        ---\n
+        returns: 
+        dict - The data read from the file in raw format.
+        """
+        data = json.load(f)
+        #If 'data' is in the list of keys, then we need to
+        #point to that key and return the content
+        if isinstance(data, dict):
+            if 'data' in list(data.keys()):
+                data = data['data']
+        elif isinstance(data, list):
+            data = data
+        else: 
+            raise DataFormatException(f'Data format is not what expected: found: {type(data)} | expected: [list | dict]')
         return data
 
 class CsvReader(ProtocolReader):
@@ -121,7 +219,19 @@ class CsvReader(ProtocolReader):
         pd.DataFrame - The data read from the file.
         """
         filepath = self.data_storage.path + "/" + label + self.ext
-        return pd.read_csv(filepath)
+        return self.load(filepath)
+
+    def load(self, f: IO) -> pd.DataFrame:
+        """
+        Load data from a CSV file, or an in memory buffer.
+        ---\n
+        params:
+        f: IO - The filepath or the buffer.
+        ---\n
+        returns: 
+        pd.DataFrame - The data read.
+        """
+        return pd.read_csv(f)
 
 class ExcelReader(ProtocolReader):
     """
@@ -151,7 +261,20 @@ class ExcelReader(ProtocolReader):
         pd.DataFrame - The data read from the file.
         """
         filepath = self.data_storage.path + "/" + label + self.ext
-        return pd.read_excel(io=filepath, sheet_name=pd.ExcelFile(filepath).sheet_names[0], engine='openpyxl')
+        return self.load(filepath)
+
+    def load(self, f: IO) -> pd.DataFrame:
+        """
+        Load the first sheet of an Excel file, or of an in memory buffer.
+        ---\n
+        params:
+        f: IO - The filepath or the buffer.
+        ---\n
+        returns: 
+        pd.DataFrame - The data read.
+        """
+        excel_file = pd.ExcelFile(f, engine='openpyxl')
+        return excel_file.parse(sheet_name=excel_file.sheet_names[0])
 
 class PyReader(ProtocolReader):
     """
@@ -181,5 +304,106 @@ class PyReader(ProtocolReader):
         """
         filepath = self.data_storage.path + "/" + label + self.ext
         with open(filepath, "r+") as f:
-            data = f.read()
+            data = self.load(f)
+        return data
+
+    def load(self, f: IO) -> object:
+        """
+        Load data from an opened py file.
+        ---\n
+        params:
+        f: IO - The opened file (or an in memory text buffer).
+        ---\n
+        returns: 
+        str - The data read from the file.
+        """
+        return f.read()
+
+class FeatherReader(ProtocolReader):
+    """
+    Implementing a feather (Arrow IPC) file reader, returning a pandas DataFrame. It needs pyarrow.
+    """
+    def __init__(self, data_storage: MosaicDataStorage) -> None:
+        """
+        Initialize the FeatherReader with a given MosaicDataStorage.
+        ---\n
+        params:
+        data_storage: MosaicDataStorage - The data storage object to read from.
+        ---\n
+        returns: None
+        """
+        self.data_storage = data_storage
+        self.ext = ".feather"
+
+    def read(self, label: str) -> pd.DataFrame:
+        """
+        Read data from a file in the MosaicDataStorage, in feather format.
+        Returning a pandas DataFrame.
+        ---\n
+        params:
+        label: str - The filename (without extension).
+        ---\n
+        returns: 
+        pd.DataFrame - The data read from the file.
+        """
+        filepath = self.data_storage.path + "/" + label + self.ext
+        return self.load(filepath)
+
+    def load(self, f: IO) -> pd.DataFrame:
+        """
+        Load data from a feather file, or an in memory buffer.
+        ---\n
+        params:
+        f: IO - The filepath or the buffer.
+        ---\n
+        returns: 
+        pd.DataFrame - The data read.
+        """
+        return pd.read_feather(f)
+
+class NpzReader(ProtocolReader):
+    """
+    Implementing a npz (numpy arrays) file reader, returning a pandas DataFrame.
+    """
+    def __init__(self, data_storage: MosaicDataStorage) -> None:
+        """
+        Initialize the NpzReader with a given MosaicDataStorage.
+        ---\n
+        params:
+        data_storage: MosaicDataStorage - The data storage object to read from.
+        ---\n
+        returns: None
+        """
+        self.data_storage = data_storage
+        self.ext = ".npz"
+
+    def read(self, label: str) -> pd.DataFrame:
+        """
+        Read data from a file in the MosaicDataStorage, in npz format.
+        Returning a pandas DataFrame.
+        ---\n
+        params:
+        label: str - The filename (without extension).
+        ---\n
+        returns: 
+        pd.DataFrame - The data read from the file.
+        """
+        filepath = self.data_storage.path + "/" + label + self.ext
+        with open(filepath, "rb") as f:
+            data = self.load(f)
+        return data
+
+    def load(self, f: IO) -> pd.DataFrame:
+        """
+        Load data from an opened npz file.
+        ---\n
+        params:
+        f: IO - The opened file (or an in memory buffer).
+        ---\n
+        returns: 
+        pd.DataFrame - The data read.
+        """
+        #Files are written by NpzWriter, object columns are strings, never pickled.
+        with np.load(f, allow_pickle=False) as arrays:
+            data = decode_npz(arrays)
         return data
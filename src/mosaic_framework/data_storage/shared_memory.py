@@ -42,13 +42,13 @@ class MosaicSharedMemory():
             key=key,
             content=content,
             is_immutable=is_immutable)
-        if not shared_variable.key in list(self.content.keys()):
+        if not shared_variable.key in self.content:
             self.content[shared_variable.key] = shared_variable
         else:
             raise SharedVariableOverwrittenException(f"You are trying to setup a new SharedVariable with an existing key: {shared_variable.key} ")
             
         print(f"\n[MosaicSharedMemory]: {shared_variable} added to the MosaicSharedMemory.")
-        return shared_variable.key in list(self.content.keys())
+        return shared_variable.key in self.content
     
     def get_variable(self, key:str, original:bool=True, error_policy:str='pass')->SharedVariable:
         """
@@ -62,8 +62,9 @@ class MosaicSharedMemory():
         returns:  
         (Resource)-> Get the requested SharedVariablee if it is present.
         """
-        print(f"[MosaicSharedMemory]: Resource will be searched: {key}")
-        if key in list(self.content.keys()): 
+        if self.DEBUG:
+            print(f"[MosaicSharedMemory]: Resource will be searched: {key}")
+        if key in self.content: 
             return {'key':key, 'content': self.content[key]} if not original \
                    else self.content[key]
         if error_policy=='raise':
@@ -84,10 +85,9 @@ class MosaicSharedMemory():
         mutable.
         """
 
-        for k in list(self.content.keys()):
-            if k == key:
-                self.content[k].update(new_content=new_content)
-        return self.content[k]
+        if not key in self.content:
+            return None
+        return self.content[key].update(new_content=new_content)
     
     def __str__(self)-> str:
         data_str = ""
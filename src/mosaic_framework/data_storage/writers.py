@@ -8,12 +8,127 @@
 
 from __future__ import annotations
 from typing import Protocol,TYPE_CHECKING
+import importlib.util
+import datetime
 import json
+import numpy as np
 import pandas as pd
 
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.data_storage import MosaicDataStorage
 
+from mosaic_framework.data_storage.exceptions import FormatNotAvailableException
+
+def is_feather_available()->bool:
+    """
+    Feather files need pyarrow, that is an optional dependency. It is
+    looked for without importing it.
+    ---\n
+    returns: Boolean value (True) wether or not pyarrow can be imported
+    """
+    return importlib.util.find_spec("pyarrow") is not None
+
+def get_frame_format()->str:
+    """
+    Binary file format used for DataFrames kept in the MosaicDataStorage: 'feather' 
+    when pyarrow is available, 'npz' otherwise.
+    ---\n
+    returns: File format, as file type of a Resource
+    """
+    return 'feather' if is_feather_available() else 'npz'
+
+def get_npz_kind(value:object)->str:
+    """
+    Get the code of the type of a value of an object array, written as a string in an npz 
+    file: 's' string, 'b' bool, 'i' int, 'f' float, 't' timestamp, 'd' date, 'D' timedelta,
+    'j' list or dict (as json).
+    ---\n
+    params:
+    value(object) : not null value.
+    ---\n
+    returns: Code of the type of the value
+    """
+    if isinstance(value, str):
+        return 's'
+    if isinstance(value, (bool, np.bool_)):
+        return 'b'
+    if isinstance(value, (int, np.integer)):
+        return 'i'
+    if isinstance(value, (float, np.floating)):
+        return 'f'
+    if isinstance(value, datetime.datetime):
+        return 't'
+    if isinstance(value, datetime.date):
+        return 'd'
+    if isinstance(value, datetime.timedelta):
+        return 'D'
+    if isinstance(value, (list, dict)):
+        return 'j'
+    raise FormatNotAvailableException(f"values of type {type(value).__name__} cannot be written in npz files.")
+
+def encode_npz_value(value:object, kind:str)->str:
+    """
+    Encode a value of an object array as a string (see get_npz_kind).
+    ---\n
+    params:
+    value(object) : not null value,
+    kind(str)     : code of the type of the value.
+    ---\n
+    returns: The value as a string
+    """
+    if kind in 'td':
+        return value.isoformat()
+    if kind == 'f':
+        return repr(float(value))
+    if kind == 'j':
+        return json.dumps(value)
+    return str(value)
+
+def encode_npz_values(key:str, values:np.ndarray)->dict:
+    """
+    Encode the values of a column (or of the index) as arrays of an npz file. Native numpy
+    types are kept as they are, strings become a unicode array with a mask of the null values,
+    other objects (eg. of extension dtypes) become a unicode array with the code of the type
+    of each value, so that npz files are read without pickle.
+    ---\n
+    params:
+    key(str)            : name of the array in the npz file,
+    values(np.ndarray)  : values to encode.
+    ---\n
+    returns: Dict of arrays, by name
+    """
+    if values.dtype.kind in 'biufcmM':
+        return {key: values}
+    values = np.asarray(values, dtype=object)
+    nulls  = pd.isnull(values)
+    kinds  = np.array(['' if null else get_npz_kind(v) for v, null in zip(values, nulls)], dtype='<U1')
+    if all([k == 's' for k in kinds[~nulls]]):
+        strings        = values.copy()
+        strings[nulls] = ''
+        return {key: strings.astype(str), key+'.null': nulls}
+    strings = np.array(['' if null else encode_npz_value(value=v, kind=k) for v, k, null in zip(values, kinds, nulls)], dtype=str)
+    return {key: strings, key+'.null': nulls, key+'.kind': kinds}
+
+def encode_npz(data:pd.DataFrame)->dict:
+    """
+    Encode a pandas DataFrame as the arrays of an npz file: a 'c<i>' array for each column,
+    the names and the dtypes of the columns, the number of rows and the index, when it is 
+    not the default one.
+    ---\n
+    params:
+    data(pd.DataFrame) : data to encode.
+    ---\n
+    returns: Dict of arrays, by name
+    """
+    arrays = encode_npz_values(key='columns', values=data.columns.to_numpy())
+    arrays['dtypes'] = np.array([str(t) for t in data.dtypes], dtype=str)
+    arrays['length'] = np.array(len(data))
+    if not data.index.equals(pd.RangeIndex(len(data))):
+        arrays.update(encode_npz_values(key='index', values=data.index.to_numpy()))
+    for i in range(len(data.columns)):
+        arrays.update(encode_npz_values(key=f'c{i}', values=data.iloc[:, i].to_numpy()))
+    return arrays
+
 class ProtocolWriter(Protocol):
     def persist(self):
         ...
@@ -67,7 +182,7 @@ class PyWriter(ProtocolWriter):
         f = open(filepath, "w+", encoding='utf-8')
         f.write(data)
         f.close()
-        print(f"[TextWriter]: {filepath} written.")
+        print(f"[PyWriter]: {filepath} written.")
         return True
 
 
@@ -166,3 +281,69 @@ class ExcelWriter(ProtocolWriter):
 
         print(f"[XlsxWriter]: {filepath} written.")
         return True
+
+class FeatherWriter(ProtocolWriter):
+    """
+    Implementing a feather (Arrow IPC) writer file, it needs pyarrow.
+    """
+    def __init__(self, data_storage:MosaicDataStorage) -> None:
+        self.data_storage   = data_storage
+        self.ext            = ".feather"
+
+    def persist(self, label:str, data:object)->bool:
+        """
+        Write 'data' in a file, inside a MosaicDataStorage, in feather format. Can be written
+        both bytes or pd.DataFrame, dtypes and index of the DataFrame are kept.
+        ---\n
+        params:
+        label(str): filename (without extension),
+        data(str) : content of file to write.
+        ---\n
+        returns: Boolean value (True) wether or not file is written
+        """
+        filepath = self.data_storage.path + "/" + label + self.ext
+
+        if isinstance(data, pd.DataFrame):
+            if not is_feather_available():
+                raise FormatNotAvailableException("Cannot write a feather file, pyarrow is not installed.")
+            #pandas.to_feather refuses a not default index, pyarrow keeps it.
+            from pyarrow import feather
+            feather.write_feather(data, filepath)
+        else:
+            with open(filepath, 'wb') as file:
+                file.write(data)
+
+        print(f"[FeatherWriter]: {filepath} written.")
+        return True
+
+class NpzWriter(ProtocolWriter):
+    """
+    Implementing a npz (numpy arrays) writer file, used when pyarrow is not available.
+    """
+    def __init__(self, data_storage:MosaicDataStorage) -> None:
+        self.data_storage   = data_storage
+        self.ext            = ".npz"
+
+    def persist(self, label:str, data:object)->bool:
+        """
+        Write 'data' in a file, inside a MosaicDataStorage, in npz format. Can be written
+        both bytes or pd.DataFrame, dtypes and index of the DataFrame are kept.
+        ---\n
+        params:
+        label(str): filename (without extension),
+        data(str) : content of file to write.
+        ---\n
+        returns: Boolean value (True) wether or not file is written
+        """
+        filepath = self.data_storage.path + "/" + label + self.ext
+        #Encoded before opening the file, data that cannot be written leave no file.
+        arrays   = encode_npz(data) if isinstance(data, pd.DataFrame) else None
+
+        with open(filepath, 'wb') as file:
+            if arrays is not None:
+                np.savez(file, **arrays)
+            else:
+                file.write(data)
+
+        print(f"[NpzWriter]: {filepath} written.")
+        return True
@@ -9,13 +9,28 @@
 
 import datetime
 import logging
-from typing import  List, Any
+from typing import  List, Any, Optional
 from dateutil import parser
 from datetime import timezone
+import numpy as np
 import pandas as pd
 
 from mosaic_framework.dt.exceptions import DateParsingException
 
+#Formats tried, in order, to parse a whole batch at once. Day and month 
+#follow the dateutil default order (month first), values that do not 
+#match the format are parsed one by one, as dateutil would do.
+BATCH_FORMATS = [
+    'ISO8601', 
+    '%m-%d-%Y', '%m-%d-%Y %H:%M', '%m-%d-%Y %H:%M:%S', 
+    '%m/%d/%Y', '%m/%d/%Y %H:%M', '%m/%d/%Y %H:%M:%S']
+
+#Number of values, spread over the batch, used to detect its format.
+BATCH_SAMPLE_SIZE = 10
+
+#Default output format, built without strftime in batch mode.
+ISO_OUTPUT_FORMAT = "%Y-%m-%dT%H:%M:%S.%f%z"
+
 class DatetimeParser():
     """    
     This class helps to validate and convert a batch of datetimes or
@@ -29,7 +44,7 @@ class DatetimeParser():
     valid input datetime (or datetimes) than we convert it to the standard.
     """
 
-    def __init__(self, output_format: str = "%Y-%m-%dT%H:%M:%S.%f%z", iso_std: str = 'iso_8601') -> None:
+    def __init__(self, output_format: str = ISO_OUTPUT_FORMAT, iso_std: str = 'iso_8601') -> None:
         self.output_format = output_format
         self.iso_std = iso_std
 
@@ -38,6 +53,8 @@ class DatetimeParser():
         """
         Parse a list of dates.
         """
+        if len(l) > 0 and pd.api.types.infer_dtype(l, skipna=False) == 'string':
+            return DatetimeParser().parse_series(pd.Series(l, dtype=object)).tolist()
         return [DatetimeParser().parse_single(d) for d in l]
     
     @staticmethod
@@ -57,27 +74,28 @@ class DatetimeParser():
         return d
     
     @staticmethod
-    def __parse_dataframe(df: pd.DataFrame) -> pd.DataFrame:
+    def __parse_dataframe(df: pd.DataFrame, columns: List[str] = None) -> pd.DataFrame:
         """
-        Parse a pandas DataFrame of dates.
+        Parse a pandas DataFrame of dates, all columns or just the ones in columns.
         """
-        for c in df.columns:
+        for c in (df.columns if columns is None else columns):
             if pd.api.types.is_datetime64_any_dtype(df[c]) or pd.api.types.is_object_dtype(df[c]):
-                df[c] = df[c].apply(lambda x: DatetimeParser().parse_single(x) if pd.notnull(x) else x)
+                df[c] = DatetimeParser().parse_series(df[c])
         return df
 
     @staticmethod
-    def parse_batch(b: Any) -> Any:
+    def parse_batch(b: Any, columns: List[str] = None) -> Any:
         """
         Parse dates as batch. Available batch formats: list, dict, pandas.DataFrame.
         - list:             list of date-like strings.
         - dict:             dict with at least one key as string and value as string.
-        - pandas.DataFrame: DataFrame with at least one column as datelike.
+        - pandas.DataFrame: DataFrame with at least one column as datelike. If columns
+                            is given, just those columns are parsed (see get_date_columns).
         """
         parser_fnc = {
             list: DatetimeParser.__parse_list,
             dict: DatetimeParser.__parse_dict,
-            pd.DataFrame: DatetimeParser.__parse_dataframe
+            pd.DataFrame: lambda df: DatetimeParser.__parse_dataframe(df, columns=columns)
         }
 
         fnc = parser_fnc.get(type(b), None)
@@ -86,7 +104,162 @@ class DatetimeParser():
             raise DateParsingException("Invalid batch format or no function associated with that type.")
         
         return fnc(b)
-    
+
+    def get_date_columns(self, df: pd.DataFrame) -> List[str]:
+        """
+        Detect the date columns of a DataFrame, as the object columns whose 
+        first not null value is a valid date.
+
+        Args:
+            df (pd.DataFrame): DataFrame to analyze.
+
+        Returns:
+            List[str]: Names of the date columns.
+        """
+        date_columns = list()
+        for c in df.columns:
+            values = df[c].dropna()
+            if not pd.api.types.is_object_dtype(df[c]) or len(values) == 0:
+                continue
+            try:
+                self.parse_single(values.iloc[0])
+                date_columns.append(c)
+            except DateParsingException:
+                pass
+        return date_columns
+
+    def to_datetime(self, values: pd.Series, batch_format: str) -> pd.Series:
+        """
+        Convert date strings to timezone aware datetimes, with a single format. Naive 
+        dates are considered UTC, as in parse_single. Values that do not match the format
+        are NaT.
+
+        Args:
+            values (pd.Series): Date strings.
+            batch_format (str): One of BATCH_FORMATS.
+
+        Raises:
+            ValueError: Dates have different timezones, they cannot be in a single column.
+
+        Returns:
+            pd.Series: Datetimes.
+        """
+        if batch_format != 'ISO8601':
+            return pd.to_datetime(values, format=batch_format, errors='coerce', utc=True)
+        
+        #ISO 8601 dates may have a timezone, that must be kept.
+        dates = pd.to_datetime(values, format=batch_format, errors='coerce')
+        if not pd.api.types.is_datetime64_any_dtype(dates):
+            raise ValueError("Dates with different timezones.")
+        return dates.dt.tz_localize('UTC') if dates.dt.tz is None else dates
+
+    def to_string(self, dates: pd.Series) -> pd.Series:
+        """
+        Format timezone aware datetimes with the output format, as in parse_single.
+        The default ISO 8601 output is built over the whole array, without strftime.
+
+        Args:
+            dates (pd.Series): Datetimes, with a single timezone.
+
+        Returns:
+            pd.Series: Formatted dates, NaT are kept.
+        """
+        valid_dates = dates.dropna()
+        if self.output_format != ISO_OUTPUT_FORMAT or len(valid_dates) == 0:
+            return dates.dt.strftime(self.output_format)
+        
+        utc_offset = valid_dates.iloc[0].strftime('%z')
+        strings    = np.char.add(np.datetime_as_string(dates.dt.tz_localize(None).values, unit='us'), utc_offset)
+        return pd.Series(strings, index=dates.index, dtype=object).where(dates.notnull(), pd.NaT)
+
+    def get_batch_format(self, values: pd.Series) -> Optional[str]:
+        """
+        Detect the format of a batch of date strings, from a sample of its values. 
+        A format is chosen only if it gives the same results of parse_single.
+
+        Args:
+            values (pd.Series): Date strings, without nulls.
+
+        Returns:
+            Optional[str]: One of BATCH_FORMATS, None if no format fits the sample.
+        """
+        sample = values.iloc[np.unique(np.linspace(0, len(values)-1, min(len(values), BATCH_SAMPLE_SIZE)).astype(int))]
+        try:
+            expected = [self.parse_single(v) for v in sample]
+        except DateParsingException:
+            return None
+        for batch_format in BATCH_FORMATS:
+            try:
+                if self.to_string(self.to_datetime(sample, batch_format=batch_format)).tolist() == expected:
+                    return batch_format
+            except (ValueError, TypeError):
+                continue
+        return None
+
+    def parse_series(self, s: pd.Series) -> pd.Series:
+        """
+        Parse a column of dates, standardizing them to ISO8601. Null values are kept.
+        Columns of strings are converted at once, with the format detected by 
+        get_batch_format. Values that do not match it, or columns without a 
+        detected format, are parsed one by one with parse_single.
+
+        Args:
+            s (pd.Series): Dates.
+
+        Raises:
+            DateParsingException: Not valid datetime format
+
+        Returns:
+            pd.Series: Standardized dates, as strings.
+        """
+        not_null     = s.notnull()
+        values       = s[not_null]
+        batch_format = self.get_batch_format(values) \
+            if len(values) > 0 and pd.api.types.infer_dtype(values, skipna=False) == 'string' \
+            else None
+        strings      = None
+        if batch_format is not None:
+            try:
+                strings = self.to_string(self.to_datetime(values, batch_format=batch_format))
+            except ValueError:
+                strings = None
+        if strings is None:
+            return s.apply(lambda x: self.parse_single(x) if pd.notnull(x) else x)
+        
+        #Values not matching the format are parsed one by one.
+        not_parsed = strings.isnull()
+        if not_parsed.any():
+            strings[not_parsed] = values[not_parsed].apply(self.parse_single)
+        parsed_s = s.astype(object)
+        parsed_s[not_null] = strings.values
+        return parsed_s
+
+    def parse_timeline(self, s: pd.Series) -> pd.Series:
+        """
+        Parse a column of dates to timezone aware datetimes, without the round trip
+        through ISO8601 strings when the format of the column is detected. The timezone
+        of the dates is kept, naive dates are considered UTC, as in parse_single.
+
+        Args:
+            s (pd.Series): Dates.
+
+        Raises:
+            DateParsingException: Not valid datetime format
+            ValueError: Dates have different timezones, they cannot be in a single column.
+
+        Returns:
+            pd.Series: Datetimes (datetime64[ns, tz]), null values are NaT.
+        """
+        not_null     = s.notnull()
+        batch_format = self.get_batch_format(s[not_null]) \
+            if not_null.any() and pd.api.types.infer_dtype(s[not_null], skipna=False) == 'string' \
+            else None
+        if batch_format is not None:
+            dates = self.to_datetime(s, batch_format=batch_format)
+            if dates.notnull().equals(not_null):
+                return dates
+        return self.to_datetime(self.parse_series(s), batch_format='ISO8601')
+
     def parse_single(self, d: str) -> str:
         """
         parse a single string, standardizing it to ISO8601
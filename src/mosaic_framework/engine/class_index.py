@@ -0,0 +1,237 @@
+################################################################################
+# Module:      class_index.py
+# Description: Modules defining each class of mosaic_framework, by class name.
+#              Generated by: python -m mosaic_framework.engine.class_registry
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+CLASS_INDEX = {
+    'APIKeySecret': ['mosaic_framework.vault.secret'],
+    'APIKeySecretRetrievingException': ['mosaic_framework.vault.exceptions'],
+    'APIPermissionException': ['mosaic_framework.data_layer.exceptions'],
+    'APIServiceInternalException': ['mosaic_framework.data_layer.exceptions'],
+    'ActualPhenostageData': ['mosaic_framework.core.growth_models_factors'],
+    'ActualPhenostageEnd': ['mosaic_framework.core.growth_models_factors'],
+    'ActualPhenostageId': ['mosaic_framework.core.growth_models_factors'],
+    'ActualPhenostageName': ['mosaic_framework.core.growth_models_factors'],
+    'ActualPhenostageStart': ['mosaic_framework.core.growth_models_factors'],
+    'ActualPhenostageUnit': ['mosaic_framework.core.growth_models_factors'],
+    'AgroRule': ['mosaic_framework.core.agronomical_factors'],
+    'AgroRuleFormatError': ['mosaic_framework.core.exceptions'],
+    'AgronomicsException': ['mosaic_framework.agronomics.exceptions'],
+    'AndComparativeAgroRule': ['mosaic_framework.core.comparative_factors'],
+    'ApplyAndBreakOnCondition': ['mosaic_framework.core.comparative_factors'],
+    'ApplyFunction': ['mosaic_framework.core.math_factors'],
+    'ApplyFunctionOnRange': ['mosaic_framework.core.math_factors'],
+    'ApplySusceptibility': ['mosaic_framework.core.output_factors'],
+    'ApplyWindowing': ['mosaic_framework.core.output_factors'],
+    'AssigningComponentException': ['mosaic_framework.engine.exceptions'],
+    'AverageFillingPolicy': ['mosaic_framework.validation.filling_policies'],
+    'AverageHumidity': ['mosaic_framework.environment.columns.columns'],
+    'AverageTemperature': ['mosaic_framework.environment.columns.columns'],
+    'BatchSourceException': ['mosaic_framework.engine.exceptions'],
+    'ClassNotFoundException': ['mosaic_framework.engine.exceptions'],
+    'Colture': ['mosaic_framework.agronomics.colture'],
+    'ColtureToModelConnector': ['mosaic_framework.retrieving.connectors'],
+    'Column': ['mosaic_framework.environment.columns.column'],
+    'ColumnAtomicValidationRule': ['mosaic_framework.validation.atomic_validation'],
+    'ColumnNameError': ['mosaic_framework.core.exceptions'],
+    'ColumnsParamNotValidException': ['mosaic_framework.environment.exceptions'],
+    'ComparativeRule': ['mosaic_framework.core.comparative_factors'],
+    'ComparativeTimeframeRule': ['mosaic_framework.core.comparative_factors'],
+    'CompiledExpression': ['mosaic_framework.core.math_utils'],
+    'CompiledModel': ['mosaic_framework.engine.compiled_model'],
+    'ComplexValueError': ['mosaic_framework.core.exceptions'],
+    'Component': ['mosaic_framework.components.components'],
+    'ComponentException': ['mosaic_framework.components.exceptions'],
+    'ComponentParameterException': ['mosaic_framework.components.exceptions'],
+    'ComponentParser': ['mosaic_framework.engine.component_parser'],
+    'Connector': ['mosaic_framework.retrieving.connectors'],
+    'ConnectorRegistry': ['mosaic_framework.data_storage.connector_registry'],
+    'ConstantMappingEngine': ['mosaic_framework.data_layer.mapping_engine'],
+    'Converter': ['mosaic_framework.data_storage.converters'],
+    'ConvertionException': ['mosaic_framework.data_storage.exceptions'],
+    'CsvReader': ['mosaic_framework.data_storage.readers'],
+    'CsvWriter': ['mosaic_framework.data_storage.writers'],
+    'CumulatedGrowingDegreeDays': ['mosaic_framework.environment.columns.columns'],
+    'CumulatedGrowingDegreeHourly': ['mosaic_framework.environment.columns.columns'],
+    'DailyAggregate': ['mosaic_framework.core.daily_compaction'],
+    'DailyCompaction': ['mosaic_framework.core.daily_compaction'],
+    'DataBridge': ['mosaic_framework.retrieving.data_bridge'],
+    'DataBridgeConnectionException': ['mosaic_framework.retrieving.exceptions'],
+    'DataFillingPolicy': ['mosaic_framework.validation.filling_policies'],
+    'DataFillingPolicyException': ['mosaic_framework.validation.exceptions'],
+    'DataFormatException': ['mosaic_framework.agronomics.exceptions', 'mosaic_framework.core.exceptions', 'mosaic_framework.data_storage.exceptions', 'mosaic_framework.model.exceptions'],
+    'DataLayerException': ['mosaic_framework.data_layer.exceptions'],
+    'DataProcessor': ['mosaic_framework.engine.processor'],
+    'DataSource': ['mosaic_framework.environment.columns.columns'],
+    'DataStorageException': ['mosaic_framework.data_storage.exceptions', 'mosaic_framework.dt.exceptions'],
+    'DatabaseCredentialsSecret': ['mosaic_framework.vault.secret'],
+    'DateParsingException': ['mosaic_framework.dt.exceptions'],
+    'DatetimeParser': ['mosaic_framework.dt.datetime_parser'],
+    'DayOfYear': ['mosaic_framework.core.growth_models_factors'],
+    'DuplicateMappingColumnsException': ['mosaic_framework.environment.exceptions'],
+    'DynamicMappingEngine': ['mosaic_framework.data_layer.mapping_engine'],
+    'EmptyAgroRule': ['mosaic_framework.core.agronomical_factors'],
+    'EngineException': ['mosaic_framework.engine.exceptions'],
+    'Equation': ['mosaic_framework.core.math_factors'],
+    'ExcelReader': ['mosaic_framework.data_storage.readers'],
+    'ExcelWriter': ['mosaic_framework.data_storage.writers'],
+    'ExpressionFormatError': ['mosaic_framework.core.exceptions'],
+    'FeatherReader': ['mosaic_framework.data_storage.readers'],
+    'FeatherWriter': ['mosaic_framework.data_storage.writers'],
+    'FileStorageBackend': ['mosaic_framework.data_storage.backends'],
+    'FixedGrowthModel': ['mosaic_framework.agronomics.growth_models'],
+    'FolderNotFoundException': ['mosaic_framework.environment.exceptions'],
+    'FormatNotAvailableException': ['mosaic_framework.data_storage.exceptions'],
+    'GDD': ['mosaic_framework.core.growth_models_factors'],
+    'GDDGrowthModel': ['mosaic_framework.agronomics.growth_models'],
+    'GeneralError': ['mosaic_framework.core.exceptions'],
+    'GenericColumn': ['mosaic_framework.environment.columns.columns'],
+    'GeospatialSource': ['mosaic_framework.environment.geospatial_source'],
+    'GetApi': ['mosaic_framework.data_layer.api'],
+    'GrowingDegreeDays': ['mosaic_framework.environment.columns.columns'],
+    'GrowingDegreeHourly': ['mosaic_framework.environment.columns.columns'],
+    'GrowthModel': ['mosaic_framework.agronomics.growth_models'],
+    'Humidity': ['mosaic_framework.environment.columns.columns'],
+    'ImmutableRulesEnvironmentVariableUpdateException': ['mosaic_framework.core.environment.exceptions'],
+    'ImmutableVariableUpdateException': ['mosaic_framework.data_storage.exceptions'],
+    'IncrementalState': ['mosaic_framework.model.incremental_state'],
+    'InputDataFiller': ['mosaic_framework.validation.input_data_filler'],
+    'InputDataValidator': ['mosaic_framework.validation.input_validation'],
+    'InputValidationException': ['mosaic_framework.validation.exceptions'],
+    'InternalComponent': ['mosaic_framework.components.components'],
+    'InvalidConnectionException': ['mosaic_framework.retrieving.exceptions'],
+    'InvalidOutputAgroRule': ['mosaic_framework.core.exceptions'],
+    'IrrigationDeficit': ['mosaic_framework.core.irrigation'],
+    'IsColumnInplace': ['mosaic_framework.validation.atomic_validation'],
+    'IsContentEqual': ['mosaic_framework.validation.atomic_validation'],
+    'IsDaylight': ['mosaic_framework.environment.columns.columns'],
+    'JsonReader': ['mosaic_framework.data_storage.readers'],
+    'JsonWriter': ['mosaic_framework.data_storage.writers'],
+    'LambdaOutput': ['mosaic_framework.cloud.lambda_output'],
+    'LeafWetness': ['mosaic_framework.environment.columns.columns'],
+    'LevenshteinDistanceColumnDetectEngine': ['mosaic_framework.environment.columns.detect_engine'],
+    'LocalFolderCannotBeCreatedException': ['mosaic_framework.environment.exceptions'],
+    'MadeWeatherProvider': ['mosaic_framework.data_layer.made_weather_provider'],
+    'MapValuesRule': ['mosaic_framework.core.value_factors'],
+    'MappedValueOnTimeRangesRule': ['mosaic_framework.core.value_factors'],
+    'MappingEngineException': ['mosaic_framework.data_layer.exceptions'],
+    'MaximumHumidity': ['mosaic_framework.environment.columns.columns'],
+    'MaximumTemperature': ['mosaic_framework.environment.columns.columns'],
+    'MemoryStorageBackend': ['mosaic_framework.data_storage.backends'],
+    'Metadata': ['mosaic_framework.environment.metadata'],
+    'MinimumHumidity': ['mosaic_framework.environment.columns.columns'],
+    'MinimumTemperature': ['mosaic_framework.environment.columns.columns'],
+    'Model': ['mosaic_framework.model.model'],
+    'ModelException': ['mosaic_framework.model.exceptions'],
+    'ModelProcessor': ['mosaic_framework.engine.processor'],
+    'ModelToLambdaOutputConnector': ['mosaic_framework.retrieving.connectors'],
+    'ModelToValidatorConnector': ['mosaic_framework.retrieving.connectors'],
+    'ModelValidation': ['mosaic_framework.validation.activity'],
+    'ModuleParser': ['mosaic_framework.engine.module_parser'],
+    'MosaicDataStorage': ['mosaic_framework.data_storage.data_storage'],
+    'MosaicEngine': ['mosaic_framework.engine.mosaic_engine'],
+    'MosaicRulesHub': ['mosaic_framework.core.environment.rules_hub'],
+    'MosaicRulesHubException': ['mosaic_framework.core.environment.exceptions'],
+    'MosaicSharedMemory': ['mosaic_framework.data_storage.shared_memory'],
+    'MosaicVault': ['mosaic_framework.vault.vault'],
+    'NanReplacePolicy': ['mosaic_framework.validation.replace_policies'],
+    'NestedRuleError': ['mosaic_framework.core.exceptions'],
+    'NpzReader': ['mosaic_framework.data_storage.readers'],
+    'NpzWriter': ['mosaic_framework.data_storage.writers'],
+    'OrComparativeAgroRule': ['mosaic_framework.core.comparative_factors'],
+    'OutputAgroRule': ['mosaic_framework.core.output_factors'],
+    'OutputModel': ['mosaic_framework.core.output_model'],
+    'OutputRuleParser': ['mosaic_framework.engine.output_rule_parser'],
+    'OutputRulesMissingException': ['mosaic_framework.model.exceptions'],
+    'ParamPlaceholderTransformer': ['mosaic_framework.engine.compiled_model'],
+    'ParamReference': ['mosaic_framework.engine.compiled_model'],
+    'ParamReferenceTransformer': ['mosaic_framework.engine.compiled_model'],
+    'ParameterNotAllowedException': ['mosaic_framework.data_layer.exceptions'],
+    'PolicyGrowthModel': ['mosaic_framework.agronomics.growth_models'],
+    'PostProcessor': ['mosaic_framework.engine.processor'],
+    'PreProcessor': ['mosaic_framework.engine.processor'],
+    'Processor': ['mosaic_framework.engine.processor'],
+    'ProtocolAgroRule': ['mosaic_framework.core.protocols'],
+    'ProtocolColumnDetectEngine': ['mosaic_framework.environment.columns.detect_engine'],
+    'ProtocolColumnMapping': ['mosaic_framework.data_layer.mapping_engine'],
+    'ProtocolComponent': ['mosaic_framework.components.protocol_component'],
+    'ProtocolDataRetriever': ['mosaic_framework.data_layer.data_retriever_protocol'],
+    'ProtocolOutputModel': ['mosaic_framework.core.output_model'],
+    'ProtocolProcessor': ['mosaic_framework.engine.protocol_processor'],
+    'ProtocolReader': ['mosaic_framework.data_storage.readers'],
+    'ProtocolReflectiveAgroRule': ['mosaic_framework.core.protocols'],
+    'ProtocolSecret': ['mosaic_framework.vault.secret_protocol'],
+    'ProtocolStorageBackend': ['mosaic_framework.data_storage.backends'],
+    'ProtocolSubComponent': ['mosaic_framework.components.protocol_component'],
+    'ProtocolWriter': ['mosaic_framework.data_storage.writers'],
+    'PyReader': ['mosaic_framework.data_storage.readers'],
+    'PyWriter': ['mosaic_framework.data_storage.writers'],
+    'Rain': ['mosaic_framework.environment.columns.columns'],
+    'RawParser': ['mosaic_framework.engine.preparsing'],
+    'ReaderClassNotFoundException': ['mosaic_framework.data_storage.exceptions'],
+    'ReferenceValue': ['mosaic_framework.core.value_factors'],
+    'ReflectiveAgroFactor': ['mosaic_framework.core.reflection_factors'],
+    'ReflectiveAgroRule': ['mosaic_framework.core.reflection'],
+    'ReflectiveCondition': ['mosaic_framework.core.reflection_factors'],
+    'ReflectiveSeries': ['mosaic_framework.core.reflection_factors'],
+    'ReflectiveTimeframeCondition': ['mosaic_framework.core.reflection_factors'],
+    'ReflectiveValue': ['mosaic_framework.core.reflection_factors'],
+    'ReplacePolicy': ['mosaic_framework.validation.replace_policies'],
+    'ReplacePolicyFunctionException': ['mosaic_framework.validation.exceptions'],
+    'RequestInputException': ['mosaic_framework.engine.exceptions'],
+    'Resource': ['mosaic_framework.data_storage.resource'],
+    'ResourceNotFoundException': ['mosaic_framework.data_storage.exceptions'],
+    'ResultCache': ['mosaic_framework.model.result_cache'],
+    'RetrievingException': ['mosaic_framework.retrieving.exceptions'],
+    'RuleDependencyGraph': ['mosaic_framework.core.rule_graph'],
+    'RuleParser': ['mosaic_framework.engine.rule_parser'],
+    'RulesEnvironmentVariable': ['mosaic_framework.core.environment.rules_env_variable'],
+    'RulesEnvironmentVariableNotFoundException': ['mosaic_framework.core.environment.exceptions'],
+    'RulesEnvironmentVariableOverwrittenException': ['mosaic_framework.core.environment.exceptions'],
+    'RulesFormatError': ['mosaic_framework.model.exceptions'],
+    'SampleDate': ['mosaic_framework.environment.columns.columns'],
+    'Secret': ['mosaic_framework.vault.secret'],
+    'SecretNotMappedException': ['mosaic_framework.vault.exceptions'],
+    'SelectMaxAndCompare': ['mosaic_framework.core.output_factors'],
+    'SelectMaxApplyAndComparison': ['mosaic_framework.core.output_factors'],
+    'SharedVariable': ['mosaic_framework.data_storage.variable'],
+    'SharedVariableNotFoundException': ['mosaic_framework.data_storage.exceptions'],
+    'SharedVariableOverwrittenException': ['mosaic_framework.data_storage.exceptions'],
+    'SimpleComparativeRule': ['mosaic_framework.core.comparative_factors'],
+    'SimpleModelValidator': ['mosaic_framework.validation.model_validation'],
+    'SimpleOutputRule': ['mosaic_framework.core.output_factors'],
+    'Source': ['mosaic_framework.environment.source'],
+    'SourceNotRecognizedException': ['mosaic_framework.environment.exceptions'],
+    'SourceToModelConnector': ['mosaic_framework.retrieving.connectors'],
+    'SourceToValidatorConnector': ['mosaic_framework.retrieving.connectors'],
+    'StartDateValueException': ['mosaic_framework.agronomics.exceptions'],
+    'StorageBackendNotFoundException': ['mosaic_framework.data_storage.exceptions'],
+    'SubComponent': ['mosaic_framework.components.sub_component'],
+    'Susceptibility': ['mosaic_framework.agronomics.susceptibility'],
+    'Temperature': ['mosaic_framework.environment.columns.columns'],
+    'TextReader': ['mosaic_framework.data_storage.readers'],
+    'TextWriter': ['mosaic_framework.data_storage.writers'],
+    'Timeline': ['mosaic_framework.core.evaluation_frame'],
+    'UniqueComponentException': ['mosaic_framework.engine.exceptions'],
+    'UnsupportedFunctionError': ['mosaic_framework.core.exceptions'],
+    'ValidationActivity': ['mosaic_framework.validation.activity'],
+    'ValidationActivityDataFormatException': ['mosaic_framework.validation.exceptions'],
+    'ValidationException': ['mosaic_framework.validation.exceptions'],
+    'ValidationProcessException': ['mosaic_framework.validation.exceptions'],
+    'Validator': ['mosaic_framework.validation.validator'],
+    'Value': ['mosaic_framework.core.value_factors'],
+    'ValueProcess': ['mosaic_framework.core.processing'],
+    'VaultException': ['mosaic_framework.vault.exceptions'],
+    'WeatherProviderFillingPolicy': ['mosaic_framework.validation.filling_policies'],
+    'WindDirection': ['mosaic_framework.environment.columns.columns'],
+    'WindSpeed': ['mosaic_framework.environment.columns.columns'],
+    'WriterClassNotFoundException': ['mosaic_framework.data_storage.exceptions'],
+    'getDayRule': ['mosaic_framework.core.datetime_factors'],
+    'getHourRule': ['mosaic_framework.core.datetime_factors'],
+    'isDayTimeRule': ['mosaic_framework.core.datetime_factors'],
+    'isNightTimeRule': ['mosaic_framework.core.datetime_factors'],
+}
@@ -0,0 +1,100 @@
+################################################################################
+# Module:      class_registry.py
+# Description: Registry of the classes of mosaic_framework, by name.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from typing import Dict, List, Tuple
+import importlib
+import ast
+import os
+
+from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.engine.class_index import CLASS_INDEX
+
+#Classes already imported, by (name, package).
+_CLASSES : Dict[Tuple[str, str], type] = dict()
+
+def get_class(name:str, package:str='mosaic_framework')->type:
+    """
+    Get a class of mosaic_framework by name. The module of the class is found in CLASS_INDEX,
+    then it is imported, just the first time the class is requested. Modules of other classes
+    are not imported.
+    ---\n
+    params:
+    name: str - Name of the class.
+    package: str - Package where the class is looked for (eg. 'mosaic_framework.core').
+    ---\n
+    returns:
+    type - The class found.
+    """
+    cls = _CLASSES.get((name, package), None)
+    if cls is not None:
+        return cls
+    modules = [m for m in CLASS_INDEX.get(name, []) if m == package or m.startswith(package + '.')]
+    if len(modules) == 0:
+        raise ClassNotFoundException(f"Class: {name} cannot be found in modules available ({package}).")
+    cls = getattr(importlib.import_module(modules[0]), name)
+    _CLASSES[(name, package)] = cls
+    return cls
+
+def build_class_index(path:str=None)->Dict[str, List[str]]:
+    """
+    Build the index of the classes of mosaic_framework, reading the source of its modules
+    without importing them: each class defined at the top level of a module is mapped to
+    the module, by name.
+    ---\n
+    params:
+    path: str - Folder of the mosaic_framework package, default is the installed one.
+    ---\n
+    returns:
+    Dict[str, List[str]] - Modules defining each class, by class name.
+    """
+    path  = path if path is not None else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    index = dict()
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for f in sorted(files):
+            if not f.endswith(".py"):
+                continue
+            module = os.path.relpath(os.path.join(root, f[:-3]), os.path.dirname(path)).replace(os.sep, ".")
+            module = module[:-len(".__init__")] if module.endswith(".__init__") else module
+            with open(os.path.join(root, f), "r", encoding="utf-8") as module_f:
+                tree = ast.parse(module_f.read())
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef):
+                    index.setdefault(node.name, []).append(module)
+    return index
+
+def write_class_index(path:str=None)->str:
+    """
+    Write CLASS_INDEX in class_index.py, to be run each time a class is added, moved
+    or renamed: python -m mosaic_framework.engine.class_registry
+    ---\n
+    params:
+    path: str - Folder of the mosaic_framework package, default is the installed one.
+    ---\n
+    returns:
+    str - Path of the written file.
+    """
+    path       = path if path is not None else os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    index_path = os.path.join(path, "engine", "class_index.py")
+    index      = build_class_index(path=path)
+    entries    = "".join([f"    {name!r}: {index[name]!r},\n" for name in sorted(index)])
+    with open(index_path, "w", encoding="utf-8") as index_f:
+        index_f.write(
+            "################################################################################\n"
+            "# Module:      class_index.py\n"
+            "# Description: Modules defining each class of mosaic_framework, by class name.\n"
+            "#              Generated by: python -m mosaic_framework.engine.class_registry\n"
+            "# Author:      Stefano Zimmitti\n"
+            "# Date:        15/01/2024\n"
+            "# Company:     xFarm Technologies\n"
+            "################################################################################\n\n"
+            f"CLASS_INDEX = {{\n{entries}}}\n")
+    return index_path
+
+if __name__ == "__main__":
+    print(f"[ClassRegistry] index written in: {write_class_index()}")
@@ -0,0 +1,281 @@
+################################################################################
+# Module:      compiled_model.py
+# Description: Model file compiled once into its tree of Components and rules,
+#              parsing params are replaced in the tree at each run.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from typing import List, Tuple, Dict
+from copy import deepcopy
+import hashlib
+import json
+import ast
+import sys
+import os
+import re
+
+from mosaic_framework.engine.component_parser import ComponentParser
+from mosaic_framework.engine.version import get_framework_version
+
+#Placeholder of '$param' in the compiled tree, the model file is not valid Python with '$'.
+PARAM_PLACEHOLDER = "__mosaic_param__"
+PARAM_PATTERN     = re.compile(r"\$(\w+)")
+
+#Trees already compiled in this process (eg. warm Lambda invocations), by key.
+_COMPILED_MODELS : Dict[str, dict] = dict()
+
+class ParamReference():
+    """
+    A '$param' of the model file used as a value (eg. commodity_id=$commodity_id), its value
+    is parsed as Python once the parsing params are known. Stringified (eg. in an attribute
+    like $param.attr) it is the placeholder, replaced as the ones in strings.
+    ---\n
+    params:
+    name: str - Name of the param, without '$'.
+    """
+    def __init__(self, name:str) -> None:
+        self.name = name
+
+    def __str__(self) -> str:
+        return PARAM_PLACEHOLDER + self.name
+
+class ParamReferenceTransformer(ast.NodeTransformer):
+    """
+    Replace the names of the placeholders with ParamReference constants.
+    """
+    def visit_Name(self, node:ast.Name) -> ast.AST:
+        if node.id.startswith(PARAM_PLACEHOLDER):
+            return ast.copy_location(ast.Constant(value=ParamReference(name=node.id[len(PARAM_PLACEHOLDER):])), node)
+        return node
+
+class ParamPlaceholderTransformer(ast.NodeTransformer):
+    """
+    Replace the ParamReference constants with the names of the placeholders, as in the 
+    model file before ParamReferenceTransformer.
+    """
+    def visit_Constant(self, node:ast.Constant) -> ast.AST:
+        if isinstance(node.value, ParamReference):
+            return ast.copy_location(ast.Name(id=PARAM_PLACEHOLDER + node.value.name, ctx=ast.Load()), node)
+        return node
+
+def encode_node(node:object) -> object:
+    """
+    Encode a node of the compiled tree as JSON values. Tuples, dicts (their keys may not be 
+    strings), ParamReference and ast nodes (as their source, with the placeholders of the params) 
+    are tagged dicts.
+    ---\n
+    params:
+    node: object - Node of the compiled tree.
+    ---\n
+    returns:
+    object - JSON values.
+    """
+    if isinstance(node, ParamReference):
+        return {'param': node.name}
+    if isinstance(node, ast.AST):
+        return {'ast': ast.unparse(ParamPlaceholderTransformer().visit(deepcopy(node)))}
+    if isinstance(node, tuple):
+        return {'tuple': [encode_node(v) for v in node]}
+    if isinstance(node, list):
+        return [encode_node(v) for v in node]
+    if isinstance(node, dict):
+        return {'dict': [[encode_node(k), encode_node(v)] for k, v in node.items()]}
+    return node
+
+def decode_node(node:object) -> object:
+    """
+    Decode a node of the compiled tree, encoded by encode_node.
+    ---\n
+    params:
+    node: object - JSON values.
+    ---\n
+    returns:
+    object - Node of the compiled tree.
+    """
+    if isinstance(node, list):
+        return [decode_node(v) for v in node]
+    if not isinstance(node, dict):
+        return node
+    if 'param' in node:
+        return ParamReference(name=node['param'])
+    if 'ast' in node:
+        return ParamReferenceTransformer().visit(ast.parse(node['ast'], mode='eval')).body
+    if 'tuple' in node:
+        return tuple(decode_node(v) for v in node['tuple'])
+    return {decode_node(k): decode_node(v) for k, v in node['dict']}
+
+class CompiledModel():
+    """
+    Model file compiled into the calls of its Components, with their args and kwargs (rules
+    included, as the trees parsed by RuleParser and OutputRuleParser), the same ComponentParser
+    gets from the model file. Each '$param' is kept as a placeholder, the parsing params replace
+    them in the compiled tree at each run, as RawParser does in the text, so the model file is
+    parsed once for all the params. The compiled tree is kept in this process and written next
+    to the model file (<model>.py.compiled, in the cloud temp folder on Lambda), keyed by the
+    hash of the model file, the framework version and the Python version. The compiled file is
+    JSON (see encode_node), reading it does not run any code.
+    ---\n
+    params:
+    filepath: str - Path of the model file (eg. 'models/model.py').
+    params: dict - Parsing params, by name (without '$').
+    prefix: str - Folder of filepath, None for the working directory.
+    """
+    def __init__(self, filepath:str, params:dict, prefix:str=None) -> None:
+        self.prefix           = prefix
+        self.filepath         = filepath
+        self.params           = {k: str(v) for k, v in params.items()}
+        self.component_parser = ComponentParser()
+        self.content_hash     = None
+
+    def get_file_path(self) -> str:
+        """
+        Get the path of the model file.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        str - Path of the model file.
+        """
+        return self.filepath if self.prefix is None else self.prefix + "/" + self.filepath
+
+    def get_compiled_path(self) -> str:
+        """
+        Get the path of the compiled model, next to the model file.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        str - Path of the compiled model.
+        """
+        return self.get_file_path() + ".compiled"
+
+    def compile(self, content:str) -> dict:
+        """
+        Compile the content of a model file.
+        ---\n
+        params:
+        content: str - Content of the model file.
+        ---\n
+        returns:
+        dict - 'class_calls', calls of the model file with placeholders, and 'params',
+        names of the '$param' found.
+        """
+        tree = ParamReferenceTransformer().visit(ast.parse(PARAM_PATTERN.sub(PARAM_PLACEHOLDER + r"\1", content)))
+        return {
+            'class_calls': self.component_parser.get_class_calls(tree=tree),
+            'params'     : sorted(set(PARAM_PATTERN.findall(content)))}
+
+    def load(self) -> dict:
+        """
+        Load the compiled model file: from this process, from the compiled file if its key
+        matches, otherwise the model file is compiled and the compiled file written.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        dict - Compiled model (see compile).
+        """
+        with open(self.get_file_path(), 'rb') as model_f:
+            content = model_f.read()
+        self.content_hash = hashlib.sha256(content).hexdigest()
+        key               = hashlib.sha256(
+            json.dumps([self.content_hash, get_framework_version(), sys.version]).encode('utf-8')).hexdigest()
+        if key in _COMPILED_MODELS:
+            return _COMPILED_MODELS[key]
+
+        try:
+            with open(self.get_compiled_path(), 'r') as compiled_f:
+                stored = json.load(compiled_f)
+            if isinstance(stored, dict) and stored.get('key') == key:
+                compiled = decode_node(stored['compiled'])
+                print(f"[CompiledModel] compiled model loaded from: {self.get_compiled_path()}")
+                _COMPILED_MODELS[key] = compiled
+                return compiled
+        except (OSError, ValueError, KeyError, TypeError, SyntaxError):
+            pass
+
+        compiled = self.compile(content=content.decode('utf-8'))
+        try:
+            with open(self.get_compiled_path() + ".writing", 'w') as compiled_f:
+                json.dump({'key': key, 'compiled': encode_node(compiled)}, compiled_f)
+            os.replace(self.get_compiled_path() + ".writing", self.get_compiled_path())
+            print(f"[CompiledModel] model file compiled in: {self.get_compiled_path()}")
+        except OSError as e:
+            print(f"[CompiledModel] compiled model cannot be written, it is kept in memory: {e}")
+        _COMPILED_MODELS[key] = compiled
+        return compiled
+
+    def replace_params(self, text:str) -> str:
+        """
+        Replace each '$param' of a text with its value, as RawParser does.
+        ---\n
+        params:
+        text: str - Text with '$param'.
+        ---\n
+        returns:
+        str - Text with the values.
+        """
+        for param_key, param_value in self.params.items():
+            text = text.replace('$'+param_key, param_value)
+        return text
+
+    def substitute(self, node:object) -> object:
+        """
+        Get a copy of a node of the compiled tree, with the values of the params.
+        ---\n
+        params:
+        node: object - Node of the compiled tree.
+        ---\n
+        returns:
+        object - Node with the values of the params.
+        """
+        if isinstance(node, str):
+            return self.replace_params(node.replace(PARAM_PLACEHOLDER, '$')) if PARAM_PLACEHOLDER in node else node
+        if isinstance(node, ParamReference):
+            #Not replaced params stay as '$param', that is not valid Python (as with RawParser).
+            return self.component_parser.parse_internal_kwargs(ast.parse(self.replace_params('$'+node.name), mode='eval').body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, ParamReference):
+            #Positional args are kept as ast nodes, unless they are calls, lists or dicts.
+            value = ast.parse(self.replace_params('$'+node.value.name), mode='eval').body
+            return self.component_parser.parse_internal_kwargs(value) if isinstance(value, (ast.Call, ast.List, ast.Dict)) else value
+        if isinstance(node, dict):
+            return {k: self.substitute(v) for k, v in node.items()}
+        if isinstance(node, list):
+            return [self.substitute(v) for v in node]
+        if isinstance(node, tuple):
+            return tuple(self.substitute(v) for v in node)
+        return node
+
+    def get_class_calls(self) -> List[Tuple[str, List, Dict]]:
+        """
+        Get the calls of the model file with the values of the parsing params, as
+        ComponentParser.parse_model_file gets them from the model file parsed by RawParser.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        List[Tuple[str, List, Dict]] - Class name, args and kwargs of each call.
+        """
+        compiled = self.load()
+        return [(class_name, self.substitute(args), self.substitute(kwargs)) for class_name, args, kwargs in compiled['class_calls']]
+
+    def get_model_hash(self) -> str:
+        """
+        Get the hash of the model file and of the values of the params it uses. Models evaluated
+        incrementally discard states of other files, results are cached by it.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        str - Hash of the model.
+        """
+        compiled = self.load()
+        params   = {k: v for k, v in self.params.items() if any([p.startswith(k) for p in compiled['params']])}
+        return hashlib.sha256(json.dumps([self.content_hash, params], sort_keys=True).encode('utf-8')).hexdigest()
@@ -10,12 +10,9 @@ from typing import List, TYPE_CHECKING
 
 import ast
 from typing import List, Tuple, Dict
-import importlib
-import pkgutil
 
-import mosaic_framework
 from mosaic_framework.components.components import Component
-from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.engine.class_registry import get_class
 
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.data_storage import MosaicDataStorage
@@ -33,23 +30,6 @@ class ComponentParser:
         self.DEBUG        = DEBUG
         self.data_storage = None
 
-    def get_modules(self) -> list:
-        """
-        Run over mosaic_framework package, find any module that is part of the package
-        then add them to a list. If self.DEBUG=True then displays the found modules. 
-        Modules are found dynamically at runtime.
-        """
-        modules = list()
-        for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.__path__, mosaic_framework.__name__ + '.'):
-            module = importlib.import_module(module_name)
-            modules.append(module)
-
-        if self.DEBUG:
-            for m in modules:
-                print(str(m))
-
-        return modules
-
     def set_storage(self, data_storage:MosaicDataStorage) -> None:
         self.data_storage = data_storage
     
@@ -59,9 +39,14 @@ class ComponentParser:
         objects. Objects are returned in a list 
         """
         
-        class_calls = []
+        return self.get_class_calls(tree=ast.parse(model_content))
 
-        tree = ast.parse(model_content)
+    def get_class_calls(self, tree: ast.AST) -> List[Tuple[str, List, Dict]]:
+        """
+        Walk an already parsed module, returning each call found as (class name, args, kwargs),
+        with the args and kwargs parsed by parse_internal_kwargs.
+        """
+        class_calls = []
 
         for d in ast.walk(tree):
             if isinstance(d, ast.Call):
@@ -119,25 +104,20 @@ class ComponentParser:
 
         return visit_and_extract_constants(internal_kwargs)    
     
-    def import_and_create_objects(self, modules: List[object], class_calls: list) -> list:
+    def import_and_create_objects(self, class_calls: list) -> list:
         """
-        Allow to match the objects found in module (class_calls) with any module
-        find in modules. Then it returns a list of objects that match, otherwise
-        a ClassNotFoundException is raised.
+        Allow to match the objects found in module (class_calls) with the classes of
+        mosaic_framework (see class_registry). Then it returns a list of objects that 
+        match, otherwise a ClassNotFoundException is raised.
         """
         objects = []
-        obj_found = False
         for class_name, args, kwargs in class_calls:
-            for m in modules:
-                if hasattr(m, class_name):
-                    cls = getattr(m, class_name)
-                    if issubclass(cls, Component):
-                        obj = cls(*args, **kwargs)
-                        objects.append(obj)
-                    obj_found = True
-            if not obj_found:
-                raise ClassNotFoundException(f"Class: {class_name} cannot be found in modules available.")
-            obj_found = False
+            cls = get_class(name=class_name)
+            if self.DEBUG:
+                print(f"[Component Parser] {class_name} found in {cls.__module__}")
+            if issubclass(cls, Component):
+                obj = cls(*args, **kwargs)
+                objects.append(obj)
         return objects
 
     def parse(self, model_label:str) -> List[Component]:
@@ -155,6 +135,6 @@ class ComponentParser:
             error_policy = 'raise').get_data()
 
         class_calls = self.parse_model_file(model_content=model_content)
-        objects     = self.import_and_create_objects(modules=self.get_modules(), class_calls=class_calls)
+        objects     = self.import_and_create_objects(class_calls=class_calls)
         filtered_objects = [o for o in objects if isinstance(o, Component)]
         return filtered_objects
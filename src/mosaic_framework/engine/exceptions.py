@@ -30,3 +30,15 @@ class UniqueComponentException(EngineException):
         self.message = message
         super().__init__(self.message)
 
+
+class BatchSourceException(EngineException):
+    """Exception raised when the Source that reads each input of a batch cannot be chosen."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
+
+class RequestInputException(EngineException):
+    """Exception raised when the input of a request cannot be bound to the Source."""
+    def __init__(self, message):
+        self.message = message
+        super().__init__(self.message)
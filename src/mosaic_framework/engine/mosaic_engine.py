@@ -8,24 +8,34 @@
 
 from __future__ import annotations
 import time
+import json
 import os
-import pkg_resources
-from typing import List, TYPE_CHECKING
+from copy import deepcopy
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from mosaic_framework.engine.processor import Processor
 
 from mosaic_framework.config.local_configuration import MOSAIC_FRAMEWORK_LOCAL_PATHS
 from mosaic_framework.engine.component_parser import ComponentParser
-from mosaic_framework.engine.preparsing import RawParser
+from mosaic_framework.engine.compiled_model import CompiledModel
 from mosaic_framework.data_storage.data_storage import MosaicDataStorage
 from mosaic_framework.data_storage.shared_memory import MosaicSharedMemory
 from mosaic_framework.data_storage.resource import Resource
 from mosaic_framework.components.components import Component
-from mosaic_framework.engine.exceptions import AssigningComponentException
+from mosaic_framework.environment.source import Source
+from mosaic_framework.model.model import Model
+from mosaic_framework.core.evaluation_frame import evaluation_context
+from mosaic_framework.engine.exceptions import AssigningComponentException, BatchSourceException, RequestInputException
+from mosaic_framework.engine.version import get_framework_version
 from mosaic_framework.engine.processor import (PreProcessor, 
     DataProcessor, ModelProcessor, PostProcessor)
 
+#Objects parsed from a model file, with their rules built, by model hash. They are kept for the 
+#next runs of the same process (eg. warm AWS Lambda invocations), each run works on a copy.
+_PREPARED_OBJECTS   : Dict[str, List[object]] = dict()
+MAX_PREPARED_MODELS = 8
 
 class MosaicEngine():
     """
@@ -43,17 +53,24 @@ class MosaicEngine():
     - auto_assign_input
     - load_component_params
     - set_storage
+    - run
+    - run_batch
+    - prepare
+    - execute
     """
 
     def __init__(self, input_file:str, DEBUG:bool=False, **kwargs) -> None:
         self.DEBUG            = DEBUG
         self.input_file       = "models" + "/" + input_file
         self.cloud_tmp_fld    = kwargs.get('cloud_temp_folder', None)
-        self.data_storage     = MosaicDataStorage(DEBUG=DEBUG)
+        #Backend of MosaicDataStorage, 'file' (default) or 'memory' (resources kept in RAM, no temp folder).
+        self.storage_backend  = kwargs.get('storage_backend', 'file')
+        self.data_storage     = MosaicDataStorage(DEBUG=DEBUG, backend=self.storage_backend)
         self.shared_memory    = MosaicSharedMemory(DEBUG=DEBUG)
-        self.raw_parser       = RawParser(prefix=kwargs.get('cloud_temp_folder', None), filepath=self.input_file, params=kwargs.get('parsing_params', {}))
+        self.compiled_model   = CompiledModel(prefix=kwargs.get('cloud_temp_folder', None), filepath=self.input_file, params=kwargs.get('parsing_params', {}))
         self.component_parser = ComponentParser(DEBUG=DEBUG)
         self.processors       = list()
+        self.model_hash       = None
 
     @staticmethod
     def __get_title(env:str):
@@ -67,7 +84,7 @@ class MosaicEngine():
         - str : Title of the Mosaic elaboration.
         """
         if env == 'cloud':
-            return f"\n\n-------------------------\nMosaicEngine started in cloud environment\nVersion:{pkg_resources.get_distribution('mosaic_framework').version}\n-------------------------\n"
+            return f"\n\n-------------------------\nMosaicEngine started in cloud environment\nVersion:{get_framework_version()}\n-------------------------\n"
         elif env == 'local':
             title = "\n\n\n" + "----------------------"*3
             title = title + """
@@ -75,7 +92,7 @@ class MosaicEngine():
 ║║║│ │└─┐├─┤││    ╠╣ ├┬┘├─┤│││├┤ ││││ │├┬┘├┴┐
 ╩ ╩└─┘└─┘┴ ┴┴└─┘  ╚  ┴└─┴ ┴┴ ┴└─┘└┴┘└─┘┴└─┴ ┴
 """
-            title = title + f"\nVersion:{pkg_resources.get_distribution('mosaic_framework').version}\n{'----------------------'*3}\n"
+            title = title + f"\nVersion:{get_framework_version()}\n{'----------------------'*3}\n"
             return title
 
     def get_processor(self, tag:str)-> Processor:
@@ -128,48 +145,42 @@ class MosaicEngine():
         
         raise AssigningComponentException(f"Cannot assign {component} with tag to any processor.")
 
-    def run(self):
+    def add_input_file_name(self, data_storage:MosaicDataStorage)->bool:
         """
-        Entry point function of the whole processing.
+        Add to the MosaicDataStorage the name of the model file, without extension.
         ---\n
         params:
-        None
+        - data_storage (MosaicDataStorage): Allocated storage where the Resource is added.
         ---\n
         Returns:
-        - None
+        - bool : Value returned based on the result of adding the resource.
         """
-        start_time = time.time()
-
-        #Allocating space for MosaicDataStorage
-        self.data_storage.allocate()
-
-        self.data_storage.add_resource(
+        return data_storage.add_resource(
             resource=Resource(
                 label="input_file_name", 
                 file_type="txt", 
                 data=(self.input_file \
                     if not '.py' in self.input_file \
                     else self.input_file[:self.input_file.find('.py')] ).replace("models/", "")))
-        
-        print(self.data_storage)
-
-        #Loading to shared memory self.cloud_tmp_fld
-        self.shared_memory.add_variable(key='cloud_tmp_fld', content=str(self.cloud_tmp_fld), is_immutable=True)
 
-        #Printing the title of the Mosaic elaboration
-        print(self.__get_title(env='local' if str(self.cloud_tmp_fld)=="None" else 'cloud'))
-        
-        print(self.shared_memory)
-
-        #Preparse the agro_model file   - once parsed drop into MosaicDataStorage
-        self.raw_parser.set_storage(data_storage=self.data_storage)
-        resource_model_label = self.raw_parser.parse()
-
-        #Parsing the agro_model file(s) - read it from MosaicDataStorage
-        #than apply the abstract tree parsing and match each element with
-        #a valid Component found. 
-        self.component_parser.set_storage(data_storage=self.data_storage)
-        objects  = self.component_parser.parse(model_label=resource_model_label)
+    def parse(self)->List[object]:
+        """
+        Parse the compiled model file, getting all the objects (Components) declared.
+        MosaicDataStorage must be already allocated.
+        ---\n
+        params:
+        None
+        ---\n
+        Returns:
+        - List[object] : Objects parsed from the model file.
+        """
+        #Compiled agro_model file - parsed once (see CompiledModel), the parsing params
+        #are replaced in its calls, than each call is matched with a valid Component found.
+        print(f"[Compiled Model] model file is retrieved from: {self.compiled_model.get_file_path()}")
+        class_calls     = self.compiled_model.get_class_calls()
+        #Hash of the model file and its params, Models evaluated incrementally discard states of other files.
+        self.model_hash = self.compiled_model.get_model_hash()
+        objects         = [o for o in self.component_parser.import_and_create_objects(class_calls=class_calls) if isinstance(o, Component)]
         
         #debug stuff that need to be removed.
         print("\n")
@@ -181,38 +192,83 @@ class MosaicEngine():
                 pass
             print(f"{type(o)}::{debug_o}")
         #-------------------------------------
-        
+        return objects
+
+    def run_components(self, objects:List[object], data_storage:MosaicDataStorage, 
+                       shared_memory:MosaicSharedMemory)->List[Processor]:
+        """
+        Assign the parsed objects to the processors and run them, using the given
+        MosaicDataStorage and MosaicSharedMemory.
+        ---\n
+        params:
+        - objects (List[object]): Objects parsed from the model file.
+        - data_storage (MosaicDataStorage): Allocated storage used by the Components.
+        - shared_memory (MosaicSharedMemory): Memory used by Components and Processors.
+        ---\n
+        Returns:
+        - List[Processor] : Processors that have been run.
+        """
         #Inject useful object into Components.
         for o in objects:
             if isinstance(o, Component):
-                o.set_storage(data_storage=self.data_storage)
-                o.set_memory(shared_memory=self.shared_memory)
+                o.set_storage(data_storage=data_storage)
+                o.set_memory(shared_memory=shared_memory)
 
         #Set the processors:
-        preprocessor     = PreProcessor(tag='preprocess', components=objects)
-        data_processor   = DataProcessor(tag='data')
-        model_processor  = ModelProcessor(tag='model')
-        post_processor   = PostProcessor(tag='postprocess')
-
-        self.add_processor(processor=preprocessor)
-        self.add_processor(processor=data_processor)
-        self.add_processor(processor=model_processor)
-        self.add_processor(processor=post_processor)
+        processors = [
+            PreProcessor(tag='preprocess', components=objects),
+            DataProcessor(tag='data'),
+            ModelProcessor(tag='model'),
+            PostProcessor(tag='postprocess')]
 
         #Inject useful object into Processors.
-        for p in self.processors:
-            p.set_memory(shared_memory=self.shared_memory)
+        for p in processors:
+            p.set_memory(shared_memory=shared_memory)
 
         #We run over each single one of the Components parsed and found.
         #We must run with an order and prio from max to min. 
         for component in objects:
-            self.processors = self.assign_component(
-                component=component, processors=self.processors)
+            processors = self.assign_component(
+                component=component, processors=processors)
         
         #Run each processor defined, they are launched by instanciation-time.
         print("\n")
-        for p in self.processors:
+        for p in processors:
             p.run()
+        return processors
+
+    def run(self):
+        """
+        Entry point function of the whole processing.
+        ---\n
+        params:
+        None
+        ---\n
+        Returns:
+        - None
+        """
+        start_time = time.time()
+
+        #Allocating space for MosaicDataStorage
+        self.data_storage.allocate()
+
+        self.add_input_file_name(data_storage=self.data_storage)
+        
+        print(self.data_storage)
+
+        #Loading to shared memory self.cloud_tmp_fld
+        self.shared_memory.add_variable(key='cloud_tmp_fld', content=str(self.cloud_tmp_fld), is_immutable=True)
+
+        #Printing the title of the Mosaic elaboration
+        print(self.__get_title(env='local' if str(self.cloud_tmp_fld)=="None" else 'cloud'))
+        
+        print(self.shared_memory)
+
+        objects = self.parse()
+        self.shared_memory.add_variable(key='model_hash', content=self.model_hash, is_immutable=True)
+
+        for p in self.run_components(objects=objects, data_storage=self.data_storage, shared_memory=self.shared_memory):
+            self.add_processor(processor=p)
         
         print(self.shared_memory)
         
@@ -222,4 +278,190 @@ class MosaicEngine():
         #Deallocating MosaicDataStorage
         self.data_storage.deallocate()
         print(f"\n[MosaicEngine]: completed elaboration in: {round(end_time-start_time, 2)} seconds.\n")
-        return
\ No newline at end of file
+        return
+
+    def get_batch_source(self, objects:List[object], source_label:str=None)->Source:
+        """
+        Get the Source whose file is replaced by each input of a batch.
+        ---\n
+        params:
+        - objects (List[object]): Objects parsed from the model file.
+        - source_label (str): Label of the Source, can be omitted if the model 
+        declares a single Source.
+        ---\n
+        Returns:
+        - Source : Source found.
+        """
+        sources = [o for o in objects if isinstance(o, Source) and (source_label is None or o.label == source_label)]
+        if len(sources) != 1:
+            raise BatchSourceException(
+                f"Cannot choose the Source of the batch (label={source_label}), found: {[s.label for s in sources]}.")
+        return sources[0]
+
+    def run_field(self, objects:List[object], source_label:str, file:str, input_data:bytes=None, field:str=None)->dict:
+        """
+        Run the already parsed objects on a single input file, with its own MosaicDataStorage
+        and MosaicSharedMemory, so that fields of the same batch do not share any state.
+        ---\n
+        params:
+        - objects (List[object]): Objects parsed from the model file, they are not modified.
+        - source_label (str): Label of the Source that reads the file.
+        - file (str): Input file of the field (eg. 'data_1.json').
+        - input_data (bytes): Content of the input file, read in place of the file. None to read the file.
+        - field (str): Identity of the field, keys the state of 'incremental' evaluation (see Model). 
+        None to key it by the input file.
+        ---\n
+        Returns:
+        - dict : Results and compact results of each Model, by resource label.
+        """
+        #Each field works on its own copy of the objects.
+        field_objects = deepcopy(objects)
+        field_source  = self.get_batch_source(objects=field_objects, source_label=source_label)
+        field_source.file       = file
+        field_source.input_data = input_data
+
+        data_storage  = MosaicDataStorage(DEBUG=self.DEBUG, backend=self.storage_backend)
+        shared_memory = MosaicSharedMemory(DEBUG=self.DEBUG)
+        data_storage.allocate()
+        try:
+            self.add_input_file_name(data_storage=data_storage)
+            shared_memory.add_variable(key='cloud_tmp_fld', content=str(self.cloud_tmp_fld), is_immutable=True)
+            shared_memory.add_variable(key='model_hash', content=self.model_hash, is_immutable=True)
+            if field is not None:
+                shared_memory.add_variable(key='field', content=str(field), is_immutable=True)
+            self.run_components(objects=field_objects, data_storage=data_storage, shared_memory=shared_memory)
+
+            results = dict()
+            for o in field_objects:
+                if isinstance(o, Model):
+                    for label in [f"{o.label}_results", f"{o.label}_compact_results"]:
+                        results[label] = data_storage.get_resource(label=label).get_data()
+        finally:
+            data_storage.deallocate()
+        return results
+
+    def run_batch(self, sources:List[str], max_workers:int=1, source_label:str=None)->Dict[str, dict]:
+        """
+        Run the same model on many input files (eg. one for each field). The model is 
+        parsed, validated and its rules are built once, then each input is evaluated
+        on its own copy of the Components. A failing input does not stop the batch, 
+        its error is collected together with the results of the others.
+        ---\n
+        params:
+        - sources (List[str]): Input files, searched as the 'file' param of the Source.
+        - max_workers (int): Number of inputs evaluated concurrently. Defaults to 1.
+        - source_label (str): Label of the Source that reads the inputs, can be omitted 
+        if the model declares a single Source.
+        ---\n
+        Returns:
+        - Dict[str, dict] : For each input, {'status': 'success', 'results': dict} where results
+        are the DataFrames of each Model (<label>_results, <label>_compact_results), or 
+        {'status': 'failed', 'error': str}.
+        """
+        start_time = time.time()
+
+        #The model is parsed and its rules are built once, each field gets a copy of them.
+        objects = self.prepare()
+        self.get_batch_source(objects=objects, source_label=source_label)
+
+        def evaluate_field(file:str)->dict:
+            try:
+                results = self.run_field(objects=objects, source_label=source_label, file=file)
+                return {'status': 'success', 'results': results}
+            except Exception as e:
+                print(f"[MosaicEngine]: elaboration of {file} failed: {e}")
+                return {'status': 'failed', 'error': str(e)}
+
+        #Copy-on-write is set once for the whole batch, the option is global in pandas.
+        with evaluation_context():
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                batch_results = dict(zip(sources, executor.map(evaluate_field, sources)))
+
+        end_time = time.time()
+        print(f"\n[MosaicEngine]: completed batch of {len(sources)} input(s) in: {round(end_time-start_time, 2)} seconds, "
+              f"failed: {[k for k, v in batch_results.items() if v['status'] == 'failed']}.\n")
+        return batch_results
+
+    def prepare(self)->List[object]:
+        """
+        Setup of the elaboration: the model file is parsed, and the rules of each Model are built.
+        Objects are kept in this process by model hash (model file and parsing params), so that
+        the next engines of the same model (eg. warm AWS Lambda invocations) skip the setup.
+        ---\n
+        params:
+        None
+        ---\n
+        Returns:
+        - List[object] : Objects parsed from the model file, they must not be modified (see execute).
+        """
+        model_hash = self.compiled_model.get_model_hash()
+        if model_hash in _PREPARED_OBJECTS:
+            print(f"[MosaicEngine]: model already prepared, setup skipped.")
+            self.model_hash = model_hash
+            return _PREPARED_OBJECTS[model_hash]
+
+        #Allocating space for MosaicDataStorage, used just for parsing.
+        self.data_storage.allocate()
+        try:
+            self.add_input_file_name(data_storage=self.data_storage)
+
+            #Printing the title of the Mosaic elaboration
+            print(self.__get_title(env='local' if str(self.cloud_tmp_fld)=="None" else 'cloud'))
+
+            objects = self.parse()
+        finally:
+            self.data_storage.deallocate()
+
+        for o in objects:
+            if isinstance(o, Model):
+                o.parse_rules()
+
+        #The oldest model is dropped, a process serving many models (or params) does not grow.
+        if len(_PREPARED_OBJECTS) >= MAX_PREPARED_MODELS:
+            del _PREPARED_OBJECTS[next(iter(_PREPARED_OBJECTS))]
+        _PREPARED_OBJECTS[self.model_hash] = objects
+        return objects
+
+    def execute(self, event:dict=None)->dict:
+        """
+        Run the prepared model (see prepare) on the input of a request, eg. an AWS Lambda event. 
+        Each request gets its own copy of the objects, MosaicDataStorage and MosaicSharedMemory, 
+        dropped at the end, so nothing is kept between requests but the prepared model.
+        ---\n
+        params:
+        - event (dict): Input of the request, all keys are optional:
+            - source_label (str): Label of the Source that reads the input, can be omitted 
+            if the model declares a single Source.
+            - file (str): Input file, as the 'file' param of the Source (a file name, without
+            folders). Defaults to the one of the model file.
+            - input (object): Content of the input file (str, bytes or an object written as JSON), 
+            read by the Source in place of the file. Nothing is written in the data folder.
+            - field (str): Identity of the field (eg. its id), keys the state of 'incremental' evaluation.
+            Defaults to the input file, requests of different fields sharing it (eg. data.json) must set it.
+        ---\n
+        Returns:
+        - dict : Results and compact results of each Model, by resource label.
+        """
+        start_time   = time.time()
+        event        = dict() if event is None else event
+        source_label = event.get('source_label', None)
+
+        objects = self.prepare()
+        source  = self.get_batch_source(objects=objects, source_label=source_label)
+        file    = event.get('file', source.file)
+        if file is not None and (os.path.basename(file) != file or '\\' in file or file in ['.', '..']):
+            raise RequestInputException(f"'file' must be a file name, without folders, got: {file}")
+
+        input_data = event.get('input', None)
+        if input_data is not None:
+            if file in ['', None]:
+                file = self.input_file[:self.input_file.find('.py')].replace("models/", "") + ".json"
+            input_data = input_data if isinstance(input_data, bytes) \
+                else input_data.encode('utf-8') if isinstance(input_data, str) \
+                else json.dumps(input_data).encode('utf-8')
+
+        results = self.run_field(objects=objects, source_label=source_label, file=file, input_data=input_data, field=event.get('field', None))
+
+        end_time = time.time()
+        print(f"\n[MosaicEngine]: completed request in: {round(end_time-start_time, 2)} seconds.\n")
+        return results
@@ -11,8 +11,6 @@ from typing import List, TYPE_CHECKING
 
 import json
 from typing import Any
-import pkgutil
-import importlib
 from collections import deque
 
 if TYPE_CHECKING:
@@ -21,10 +19,8 @@ if TYPE_CHECKING:
     MosaicRulesHubType  = MosaicRulesHub
 
 
-import mosaic_framework
-import mosaic_framework.core
-
-from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.core.rule_graph import RuleDependencyGraph
+from mosaic_framework.engine.class_registry import get_class
 
 class RuleParser():
     """
@@ -36,34 +32,12 @@ class RuleParser():
     """
 
     def __init__(self, rules_hub:MosaicRulesHubType) -> None:
-        self.core_rules_modules = self.get_core_modules()
         self.rules_hub          = rules_hub
-    
-    def get_core_modules(self)->list:
-        """
-        Run over mosaic_framework.core package, find any module that is part of the package
-        then add them to a list. Modules are found dynamically at runtime.
-        ---\n
-        params:
-        None
-        ---
-        Returns:
-        -  List[module] -> modules find in mosaic_framework path.
-        """
-        # Scorri tutti i moduli nel package
-        modules = list()
-        for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.core.__path__, mosaic_framework.core.__name__ + '.'):
-            # Importa il modulo dinamicamente
-            module = importlib.import_module(module_name)
-            # Aggiungi il modulo alla lista
-            modules.append(module)    
-        return modules
 
     def get_object(self, node, parent, key):
         """
-        Run over modules, finding the one that matches. 
-        Modules are found dynamically at runtime, but not in this function. 
-        They are in: self.core_rules_modules, got from get_core_modules function.
+        Get the class of the node from the classes of mosaic_framework.core (see class_registry),
+        then replace the node with its object in the parent.
         ---\n
         params:
         None
@@ -73,18 +47,11 @@ class RuleParser():
         """
         # Implement your logic here
         # For now, we just print the node
-        obj       = None
-        obj_found = False
-        for m in self.core_rules_modules:
-            if hasattr(m, node['func']):
-                cls = getattr(m, node['func'])
-                # Instanciate new object as AST expression
-                # Need to cast each <_ast.Constant> to the value in it.
-                obj = cls(*node['args'], **node['kwargs']) 
-                obj.set_rules_hub(self.rules_hub)
-                obj_found = True
-        if obj_found == False:
-            raise ClassNotFoundException(f"Class: {node['func']} cannot be found in modules (cores) available.")
+        cls = get_class(name=node['func'], package='mosaic_framework.core')
+        # Instanciate new object as AST expression
+        # Need to cast each <_ast.Constant> to the value in it.
+        obj = cls(*node['args'], **node['kwargs']) 
+        obj.set_rules_hub(self.rules_hub)
        
         # Replace the node with 1 in the parent
         if parent is not None and key is not None:
@@ -170,13 +137,10 @@ class RuleParser():
         Returns:
         - list: Parsed root node as a list.
         """
-        for m in self.core_rules_modules:
-            if hasattr(m, unparsed_root['func']):
-                cls = getattr(m, unparsed_root['func'])
-                # Instanciate new object as AST expression
-                # Need to cast each <_ast.Constant> to the value in it.
-                parsed_root = cls(*unparsed_root['args'], **unparsed_root['kwargs']) 
-                break
+        cls = get_class(name=unparsed_root['func'], package='mosaic_framework.core')
+        # Instanciate new object as AST expression
+        # Need to cast each <_ast.Constant> to the value in it.
+        parsed_root = cls(*unparsed_root['args'], **unparsed_root['kwargs']) 
         return parsed_root
 
     def parse(self, output_rules:dict):
@@ -199,4 +163,17 @@ class RuleParser():
             output_rules[i].set_rules_hub(self.rules_hub)
 
         return output_rules
-    
+
+    def build_dependency_graph(self, rules:list, output_rules:list)->RuleDependencyGraph:
+        """ 
+        Build the dependency graph between parsed rules, based on their target, column,
+        on_condition and nested rules. Output rules are the final consumers.
+        
+        Parameters:
+        - rules (list): Parsed rules of an output, in evaluation order.
+        - output_rules (list): Parsed output rules of the same output.
+        
+        Returns:
+        - RuleDependencyGraph: Graph used to skip dead rules and drop expired implicit columns.
+        """
+        return RuleDependencyGraph(rules=rules, output_rules=output_rules)
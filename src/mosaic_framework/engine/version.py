@@ -0,0 +1,30 @@
+################################################################################
+# Module:      version.py
+# Description: Version of the installed mosaic_framework.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+#Version read from the package metadata, once.
+_VERSION : str = None
+
+def get_framework_version() -> str:
+    """
+    Get the version of the installed mosaic_framework, read once from the package metadata.
+    ---\n
+    params:
+    None
+    ---\n
+    returns:
+    str - Version, 'unknown' if the package is not installed.
+    """
+    global _VERSION
+    if _VERSION is None:
+        #Package metadata are read just when the version is requested.
+        from importlib.metadata import version, PackageNotFoundError
+        try:
+            _VERSION = version('mosaic_framework')
+        except PackageNotFoundError:
+            _VERSION = 'unknown'
+    return _VERSION
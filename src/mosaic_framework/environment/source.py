@@ -10,11 +10,11 @@ from __future__ import annotations
 from typing import List, TYPE_CHECKING
 
 import os
+import io
+import mmap
 import pandas as pd
 from typing import Any
 import warnings
-import re
-import inspect
 
 import mosaic_framework.data_storage.readers
 import mosaic_framework.data_storage.writers
@@ -22,6 +22,9 @@ import mosaic_framework.environment.columns.columns
 from mosaic_framework.config.configuration import SOURCE
 from mosaic_framework.data_storage.resource import Resource
 from mosaic_framework.data_storage.converters import Converter
+from mosaic_framework.data_storage.writers import get_frame_format
+from mosaic_framework.data_storage.backends import find_cls
+from mosaic_framework.data_storage.exceptions import ReaderClassNotFoundException
 from mosaic_framework.dt.datetime_parser import DatetimeParser
 from mosaic_framework.components.components import Component
 from mosaic_framework.engine.module_parser import ModuleParser
@@ -57,6 +60,13 @@ class Source(Component):
     - file(str):          If environment is local, a file with that name will searched
                           in local data folder, to load the data. Will be ignored if 
                           environment is 'cloud'.
+    - datetime_columns(str): 'all' standardizes the datetimes of every text column,
+                          'auto' only the ones detected as date columns. Defaults to 'all'.
+    - loading(str):       'resource' (default) loads the raw file into the MosaicDataStorage,
+                          each step reads and writes it back. 'mapped' memory-maps the input file, 
+                          parses it once into a DataFrame that goes through date parsing, 
+                          validation and filling, then is added to the MosaicDataStorage 
+                          (useful for large inputs, eg. multi-year hourly archives).
     - tag(str):           tag the processor where this component will be assigned.
     ---\n
     Examples:\n
@@ -69,16 +79,12 @@ class Source(Component):
         self.tag          = 'preprocess'
         self.data_storage : MosaicDataStorageType  = None
         self.shared_memory: MosaicSharedMemoryType = None
+        #Content of the input file bound to a request (see MosaicEngine.execute), read in place of the file.
+        self.input_data   : bytes                  = None
 
     @staticmethod
     def get_reader_class(module, cls_string):
-        # Inspects all classes defined in the module
-        for name, cls in inspect.getmembers(module, inspect.isclass):
-            # Gets the source code of the class
-            source = inspect.getsource(cls)
-            # Searches for the string in the source code of the class
-            if re.search(cls_string, source):
-                return cls
+        return find_cls(module=module, cls_string=cls_string, exception=ReaderClassNotFoundException)
 
     def set_structure_references(self, environment:str, **kwargs):
         """
@@ -166,6 +172,54 @@ class Source(Component):
             raise ColumnsParamNotValidException("detect_type not implemented or wrong.")
         return mapping
 
+    def load_mapped(self, source_filepath:str, file_type:str)->pd.DataFrame:
+        """
+        Parse the input file into a DataFrame, memory-mapping it, without loading its raw 
+        content into the MosaicDataStorage. CSV files are parsed from the mapped file, JSON 
+        files are decoded from the mapped bytes, as JsonReader does with the Resource.
+        The input bound to a request (input_data) is parsed from memory.
+        ---\n
+        params:
+        source_filepath (str): Path of the input file.
+        file_type (str): Extension of the input file (csv, json, xlsx).
+        ---\n
+        returns:
+        pd.DataFrame: Input data.
+        """
+        converter = Converter()
+        if file_type == 'csv':
+            return pd.read_csv(io.BytesIO(self.input_data)) if self.input_data is not None \
+                else pd.read_csv(source_filepath, memory_map=True)
+        if file_type == 'json':
+            if self.input_data is not None:
+                data = mosaic_framework.data_storage.readers.JsonReader(data_storage=self.data_storage).load(io.BytesIO(self.input_data))
+            else:
+                with open(source_filepath, 'rb') as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped_f:
+                        data = mosaic_framework.data_storage.readers.JsonReader(data_storage=self.data_storage).load(mapped_f)
+            return converter.to_data_format(data=data, data_format='dataframe')
+        if file_type == 'xlsx':
+            return mosaic_framework.data_storage.readers.ExcelReader(data_storage=self.data_storage).load(
+                io.BytesIO(self.input_data) if self.input_data is not None else source_filepath)
+        raise SourceNotRecognizedException(f"Cannot load a '{file_type}' file with 'mapped' loading.")
+
+    def to_resource_data(self, data:pd.DataFrame, file_type:str)->Any:
+        """
+        Convert the input data back to the format of the input file, to replace its Resource.
+        CSV files are written without the index of the DataFrame, as they are read (and as 
+        the 'mapped' loading reads them), reading them does not add an 'Unnamed: 0' column.
+        ---\n
+        params:
+        data (pd.DataFrame): Input data.
+        file_type (str): Extension of the input file (csv, json, xlsx).
+        ---\n
+        returns:
+        Any: Data of the Resource.
+        """
+        if file_type == 'csv':
+            return data.to_csv(index=False).encode('utf-8')
+        return Converter().to_resource_format(data=data, file_format=file_type, details='UpdateResource')
+
     def run(self)->None:
         """
         Entry point behaviour of the class. Based on the 'params', create a new Resource
@@ -233,33 +287,53 @@ class Source(Component):
         else:
             raise SourceNotRecognizedException(f"Cannot recognize the selected source. Selected: {self.environment}")
 
-        print(f"[Source]: source_filepath={source_filepath}.")
+        print(f"[Source]: source_filepath={source_filepath}." if self.input_data is None else f"[Source]: input bound to the request, as {file}.{chosen_ext}.")
+
+        #Files read by each Source, they identify the field evaluated (eg. for incremental evaluation).
+        source_files = self.shared_memory.get_variable(key='source_files', error_policy='pass')
+        if source_files == None:
+            self.shared_memory.add_variable(key='source_files', content={self.label:f"{file}.{chosen_ext}"}, is_immutable=False)
+        else:
+            self.shared_memory.update_variable(key='source_files', new_content={**source_files.content, self.label:f"{file}.{chosen_ext}"})
+
+        converter = Converter()
+        dt_parser = DatetimeParser()
 
-        with open(source_filepath, 'rb+') as f:
+        #In 'mapped' loading the input is parsed once, the same DataFrame
+        #goes through all the steps and is added to the DataStorage at the end.
+        input_data_df = None
+        if self.loading == 'mapped':
+            input_data_df = self.load_mapped(source_filepath=source_filepath, file_type=chosen_ext)
+            input_data_df = dt_parser.parse_batch(input_data_df, 
+                columns=dt_parser.get_date_columns(input_data_df) if self.datetime_columns == 'auto' else None)
+        else:
+            if self.input_data is None:
+                with open(source_filepath, 'rb+') as f:
+                    raw_data = f.read()
+            else:
+                raw_data = self.input_data
             #Flush the <input_file_name>.[csv|json|xlsx] into DataStorage            
             self.data_storage.add_resource(
                 resource=Resource(
                     label=self.label, #resource takes label name equal to Source.label
-                    data=f.read(),
+                    data=raw_data,
                     file_type=chosen_ext
                 )
             )
 
-        converter = Converter()
-
-        #Datetime handling
-        #We are going to deal with standardizing the datetimes found in the 
-        #Resource, why directly the resource? Cause we are guaranteed that 
-        #we have a pd.DataFrame.
-        dt_parser       = DatetimeParser()
-        r_dt_to_replace = self.data_storage.get_resource(label=self.label).get_data()
-        r_dt_to_replace = converter.to_data_format(data=r_dt_to_replace, data_format='dataframe')
-        r_dt_to_replace = dt_parser.parse_batch(r_dt_to_replace)
-        self.data_storage.replace_resource(
-            new_resource=Resource(
-                label=self.label,
-                data=converter.to_resource_format(data=r_dt_to_replace, file_format=chosen_ext, details='UpdateResource'),
-                file_type=chosen_ext))
+            #Datetime handling
+            #We are going to deal with standardizing the datetimes found in the 
+            #Resource, why directly the resource? Cause we are guaranteed that 
+            #we have a pd.DataFrame.
+            r_dt_to_replace = self.data_storage.get_resource(label=self.label).get_data()
+            r_dt_to_replace = converter.to_data_format(data=r_dt_to_replace, data_format='dataframe')
+            r_dt_to_replace = dt_parser.parse_batch(r_dt_to_replace, 
+                columns=dt_parser.get_date_columns(r_dt_to_replace) if self.datetime_columns == 'auto' else None)
+            self.data_storage.replace_resource(
+                new_resource=Resource(
+                    label=self.label,
+                    data=self.to_resource_data(data=r_dt_to_replace, file_type=chosen_ext),
+                    file_type=chosen_ext))
 
         #Dynamic column(s) handling:
         #   Once a Source component is istanciated, columns can be took in account or not
@@ -270,8 +344,11 @@ class Source(Component):
         if self.columns == 'auto':
             #If we have 'auto', we need to get the data as pandas dataframe and catch
             #the columns, so we need to convert from whatever is the input format.
-            r_data       = self.data_storage.get_resource(label=self.label).get_data()  
-            r_data_df    = converter.to_data_format(data=r_data, data_format="dataframe")
+            if input_data_df is None:
+                r_data       = self.data_storage.get_resource(label=self.label).get_data()  
+                r_data_df    = converter.to_data_format(data=r_data, data_format="dataframe")
+            else:
+                r_data_df    = input_data_df
             auto_columns = r_data_df.columns.to_list()
         detect_engine   = LevenshteinDistanceColumnDetectEngine(duplicate_policy='best')
         columns_mapping = \
@@ -291,7 +368,8 @@ class Source(Component):
             self.shared_memory.update_variable(key='global_columns_sources_mapping', new_content=global_columns_sources_mapping)
         global_columns_sources_mapping = self.shared_memory.get_variable(key='global_columns_sources_mapping', error_policy='raise').content
         #Input validation
-        input_data_df        = converter.to_data_format(data=self.data_storage.get_resource(label=self.label).get_data(), data_format="dataframe")
+        if input_data_df is None:
+            input_data_df    = converter.to_data_format(data=self.data_storage.get_resource(label=self.label).get_data(), data_format="dataframe")
         #Here we need to get if a dataframe is fillable, 
         #we define a dataframe as fillable if it has no GenericColumn in it
         #GenericColumn means that we have not addressable columns 
@@ -318,11 +396,22 @@ class Source(Component):
         filled_df            = input_data_filler.fill(data=input_data_df, missing_data=missing_records)
         #Now we get to update the resource with the filled data, 
         #replacing it entirely.
-        self.data_storage.replace_resource(
-            new_resource=Resource(
-                label=self.label,
-                data=converter.to_resource_format(data=filled_df, file_format=chosen_ext, details='UpdateResource'),
-                file_type=chosen_ext))
+        if self.loading == 'mapped':
+            #The DataFrame itself is added, kept in a binary format that keeps its dtypes.
+            #Dates converted by the validation go back to text, as written in the resource.
+            for c in filled_df.columns[[pd.api.types.is_datetime64_any_dtype(t) for t in filled_df.dtypes]]:
+                filled_df[c] = filled_df[c].map(str)
+            self.data_storage.add_resource(
+                resource=Resource(
+                    label=self.label,
+                    data=filled_df,
+                    file_type=get_frame_format()))
+        else:
+            self.data_storage.replace_resource(
+                new_resource=Resource(
+                    label=self.label,
+                    data=self.to_resource_data(data=filled_df, file_type=chosen_ext),
+                    file_type=chosen_ext))
         
         self.file = file + "." + chosen_ext
         print("[Source]: Data 'local' dumped into MosaicDataStorage.")
@@ -0,0 +1,295 @@
+################################################################################
+# Module:      incremental_state.py
+# Description: State of a Model evaluated incrementally, kept between runs.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from typing import List, Dict, Tuple, Any
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+
+from mosaic_framework.core.evaluation_frame import get_days
+from mosaic_framework.data_storage.backends import FileStorageBackend
+from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.data_storage.writers import get_frame_format
+
+def shift_day(day:str, days:int) -> str:
+    """
+    Shift a day by a number of days.
+    ---\n
+    params:
+    day: str - Day as "YYYY-MM-DD".
+    days: int - Days to add, negative to go back.
+    ---\n
+    returns:
+    str - Shifted day as "YYYY-MM-DD".
+    """
+    return (pd.Timestamp(day) + pd.Timedelta(days=days)).strftime("%Y-%m-%d")
+
+class IncrementalState():
+    """
+    State of a Model evaluated incrementally, kept in a folder between runs. It holds the
+    hash of the model file, the last day evaluated, the results of the previous runs, and
+    for each output the tail of its input data: the days its rules (and output rules) read
+    before the first day to evaluate in the next run, like rolling windows and reference days.
+    Rules carrying a state from the start of the data (eg. reflective rules, cumulated values)
+    go on from the state they carried over at the start of the tail (see OutputModel.get_carry_over).
+    Results are appended: each run writes a part with the days the next run does not evaluate 
+    again, and replaces the pending days, without reading the results of the previous runs.
+    DataFrames are written by the FileStorageBackend, in a format that keeps dtypes, the state 
+    file is written last, so that a run stopped while writing does not leave a state to continue 
+    from. Each field (input of the Model) has its own state.
+    ---\n
+    params:
+    path: str - Folder of the state, created if it does not exist.
+    label: str - Label of the Model.
+    model_hash: str - Hash of the model file of the current run, None if not known.
+    field: str - Key of the input of the Model (eg. hash of the Source files), None if not known.
+    """
+    def __init__(self, path:str, label:str, model_hash:str, field:str=None) -> None:
+        self.path         = path
+        self.label        = label
+        self.model_hash   = model_hash
+        self.name         = label if field is None else f"{label}_{field}"
+        self.content      = None
+        self.backend      = FileStorageBackend()
+        self.backend.path = path
+
+    def get_state_file(self) -> str:
+        """
+        Get the path of the state file.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        str - Path of the json file of the state.
+        """
+        return f"{self.path}/{self.name}_state.json"
+
+    def load(self, outputs:List[str]) -> bool:
+        """
+        Load the state of the previous run, if it can be continued: it must have been saved
+        for the same model file and outputs.
+        ---\n
+        params:
+        outputs: List[str] - Outputs of the Model.
+        ---\n
+        returns:
+        bool - True if the state is loaded, False if the Model must be evaluated from scratch.
+        """
+        self.content = None
+        if self.model_hash is None or not os.path.isfile(self.get_state_file()):
+            return False
+        with open(self.get_state_file(), 'r') as state_f:
+            content = json.load(state_f)
+        if content.get('model_hash') != self.model_hash:
+            print(f"[IncrementalState] {self.label}: model file has changed, state is discarded.")
+            return False
+        if content.get('outputs') != outputs or not 'carry_over' in content:
+            return False
+        self.content = content
+        return True
+
+    def get_last_day(self) -> str:
+        """
+        Get the last day evaluated by the previous run.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        str - Day as "YYYY-MM-DD".
+        """
+        return self.content['last_day']
+
+    def read(self, name:str) -> pd.DataFrame:
+        """
+        Read a DataFrame of the state.
+        ---\n
+        params:
+        name: str - Name of the DataFrame (eg. 'results', '<output>_tail').
+        ---\n
+        returns:
+        pd.DataFrame - Data read.
+        """
+        return self.backend.read(resource=Resource(label=f"{self.name}_{name}", data=None, file_type=self.content['file_type']))
+
+    def write(self, name:str, data:pd.DataFrame, file_type:str) -> bool:
+        """
+        Write a DataFrame of the state, replacing the one of the previous run.
+        ---\n
+        params:
+        name: str - Name of the DataFrame (eg. 'results', '<output>_tail').
+        data: pd.DataFrame - Data to write.
+        file_type: str - Format of the file.
+        ---\n
+        returns:
+        bool - Value returned based on the result of writing the data.
+        """
+        resource = Resource(label=f"{self.name}_{name}", data=data, file_type=file_type)
+        return self.backend.replace(resource=resource, new_resource=resource)
+
+    def matches(self, output:str, data:pd.DataFrame, start_day:str, column:str) -> bool:
+        """
+        Check that the new data are the continuation of the data of the previous run: rows of 
+        the tail taken instead of the new data (before start_day) must be equal to the rows 
+        of the new data at the same dates. The state of another field (eg. the same input file 
+        with other data) is not continued, as a state whose rows cannot be checked.
+        ---\n
+        params:
+        output: str - Label of the output.
+        data: pd.DataFrame - New input data of the output.
+        start_day: str - First day to evaluate, as "YYYY-MM-DD".
+        column: str - Date column.
+        ---\n
+        returns:
+        bool - True if the overlapping rows are equal, and there is at least one.
+        """
+        tail    = self.read(name=f"{output}_tail")
+        tail    = tail[(get_days(data=tail, column=column) < start_day).values]
+        columns = [c for c in data.columns if c in tail.columns and c != column]
+        merged  = tail[[column]+columns].merge(data[[column]+columns], on=column, how='inner', suffixes=('_tail', ''))
+        if len(merged) == 0:
+            return False
+        return all([merged[c+'_tail'].astype(str).equals(merged[c].astype(str)) for c in columns])
+
+    def get_frame(self, output:str, data:pd.DataFrame, start_day:str, column:str) -> pd.DataFrame:
+        """
+        Get the input data of an output: the tail of the previous run, before start_day,
+        followed by the new data, from start_day on.
+        ---\n
+        params:
+        output: str - Label of the output.
+        data: pd.DataFrame - New input data of the output.
+        start_day: str - First day to evaluate, as "YYYY-MM-DD".
+        column: str - Date column.
+        ---\n
+        returns:
+        pd.DataFrame - Input data of the output.
+        """
+        tail = self.read(name=f"{output}_tail")
+        return pd.concat([
+            tail[(get_days(data=tail, column=column) < start_day).values],
+            data[(get_days(data=data, column=column) >= start_day).values]], ignore_index=True)
+
+    def get_carry_over(self, output:str) -> Dict[str, Dict]:
+        """
+        Get the states of the rules of an output, carried over by the previous run.
+        ---\n
+        params:
+        output: str - Label of the output.
+        ---\n
+        returns:
+        Dict[str, Dict] - States of the rules (see OutputModel.get_carry_over).
+        """
+        return self.content['carry_over'].get(output, dict())
+
+    def get_next_index(self, name:str) -> int:
+        """
+        Get the index the new results go on from: the one after the results the previous runs settled.
+        ---\n
+        params:
+        name: str - Name of the results ('results' or 'compact_results').
+        ---\n
+        returns:
+        int - First index of the new results.
+        """
+        return self.content['next_index'][name]
+
+    def get_results(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Get the results of all the runs: the parts settled by each run, followed by the days
+        pending of the last one.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        Tuple[pd.DataFrame, pd.DataFrame] - Results and compact results.
+        """
+        def read_results(name:str) -> pd.DataFrame:
+            parts = [self.read(name=f"{name}_part_{k}") for k in range(self.content['parts'][name])]
+            return pd.concat(parts + [self.read(name=f"{name}_pending_{self.content['parts'][name]}")])
+        return read_results(name="results"), read_results(name="compact_results")
+
+    def remove_results(self) -> None:
+        """
+        Remove the results files of the previous runs, when the Model is evaluated from scratch.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        None
+        """
+        pattern = re.compile(rf"^{re.escape(self.name)}_(compact_)?results_(part|pending)_\d+\.")
+        for file in os.listdir(self.path):
+            if pattern.match(file):
+                os.remove(f"{self.path}/{file}")
+
+    def save(self, last_day:str, days:Tuple[int, int], frames:Dict[str, pd.DataFrame], results:pd.DataFrame, compact_results:pd.DataFrame, carry_over:Dict[str, Dict], column:str, is_continued:bool) -> bool:
+        """
+        Save the state of the current run. Results of the days before the first day the next run
+        evaluates are appended as a new part, the following ones replace the pending ones.
+        ---\n
+        params:
+        last_day: str - Last day evaluated, as "YYYY-MM-DD".
+        days: Tuple[int, int] - Days before last_day kept in the tail of each output, and days before last_day evaluated again by the next run.
+        frames: Dict[str, pd.DataFrame] - Input data of each output, in evaluation order.
+        results: pd.DataFrame - Results of the current run, indexed from get_next_index('results').
+        compact_results: pd.DataFrame - Compact results of the current run, indexed from get_next_index('compact_results').
+        carry_over: Dict[str, Dict] - States of the rules of each output (see OutputModel.get_carry_over).
+        column: str - Date column.
+        is_continued: bool - True if the run continued the previous one, False if it evaluated all the data.
+        ---\n
+        returns:
+        bool - True if the state is saved.
+        """
+        def to_json(value:Any) -> Any:
+            if isinstance(value, np.generic):
+                return value.item()
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+        os.makedirs(self.path, exist_ok=True)
+        file_type  = get_frame_format()
+        first_day  = shift_day(day=last_day, days=-days[0])
+        next_start = shift_day(day=last_day, days=-days[1])
+        for output, frame in frames.items():
+            self.write(name=f"{output}_tail", data=frame[(get_days(data=frame, column=column) >= first_day).values], file_type=file_type)
+        if not is_continued:
+            self.remove_results()
+        
+        previous_parts = dict(self.content['parts']) if is_continued else dict()
+        parts          = dict(self.content['parts']) if is_continued else {'results': 0, 'compact_results': 0}
+        next_index     = dict(self.content['next_index']) if is_continued else {'results': 0, 'compact_results': 0}
+        for name, data in [('results', results), ('compact_results', compact_results)]:
+            is_settled = (get_days(data=data, column=column) < next_start).values
+            if is_settled.any():
+                self.write(name=f"{name}_part_{parts[name]}", data=data[is_settled], file_type=file_type)
+                parts[name]      = parts[name]+1
+                next_index[name] = int(data.index[is_settled].max())+1
+            self.write(name=f"{name}_pending_{parts[name]}", data=data[~is_settled], file_type=file_type)
+
+        self.content = {
+            'model_hash': self.model_hash,
+            'outputs'   : list(frames.keys()),
+            'last_day'  : last_day,
+            'file_type' : file_type,
+            'parts'     : parts,
+            'next_index': next_index,
+            'carry_over': carry_over}
+        with open(self.get_state_file()+".replacing", 'w') as state_f:
+            json.dump(self.content, state_f, default=to_json)
+        os.replace(self.get_state_file()+".replacing", self.get_state_file())
+        #Pending days of the previous run are now in the new part.
+        for name, k in previous_parts.items():
+            if k != parts[name]:
+                self.backend.remove(resource=Resource(label=f"{self.name}_{name}_pending_{k}", data=None, file_type=file_type))
+        print(f"[IncrementalState] {self.label}: state saved, last day: {last_day}.")
+        return True
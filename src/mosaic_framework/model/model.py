@@ -7,28 +7,30 @@
 ################################################################################
 
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import List, Tuple, Optional, TYPE_CHECKING
 
 from copy import deepcopy
 import pandas as pd
 from typing import Any
-import pkgutil
-import importlib
 import dateutil
+import hashlib
 import json
 from datetime import datetime, timedelta
 
-import mosaic_framework.core
 from mosaic_framework.config.configuration import MODEL
 from mosaic_framework.data_storage.converters import Converter
 from mosaic_framework.components.components import Component
 from mosaic_framework.engine.rule_parser import RuleParser
 from mosaic_framework.engine.output_rule_parser import OutputRuleParser
 from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.data_storage.writers import get_frame_format
 from mosaic_framework.dt.datetime_parser import DatetimeParser
-from mosaic_framework.model.exceptions import DataFormatException, RulesFormatError
+from mosaic_framework.model.exceptions import DataFormatException, RulesFormatError, ModelException
 from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
 from mosaic_framework.core.output_model import OutputModel
+from mosaic_framework.core.evaluation_frame import get_days
+from mosaic_framework.model.incremental_state import IncrementalState, shift_day
+from mosaic_framework.model.result_cache import ResultCache
 from mosaic_framework.core.output_factors import OutputAgroRule
 
 if TYPE_CHECKING:
@@ -52,6 +54,32 @@ class Model(Component):
     output (List[str]): used to define the outputs that are needed to be calculated. 
     Also allows to validate the rules params, for each output listed a <output> param is check
     for the rules, relative to the output.
+    rule_pruning (str): 'active' (default) skips implicit rules whose column is never consumed and
+    drops implicit columns after their last consumer, based on the dependency graph of the rules.
+    'inactive' evaluates every rule.
+    max_workers (int): number of threads evaluating independent rules of an output concurrently,
+    default is 1 (rules evaluated one by one).
+    results_format (str): file format of the results in the MosaicDataStorage, 'feather' or 'npz' 
+    keep dtypes and index of the results, 'csv' is plain text. 'auto' (default) chooses 'feather' 
+    when pyarrow is installed, 'npz' otherwise.
+    evaluation (str): 'batch' (default) evaluates each output on the whole data at once. 'streaming'
+    evaluates it in chunks of chunk_days days, appending the results of each chunk to the results
+    Resources as soon as it is done. Outputs with rules carrying a state from the start of the data 
+    are evaluated at once. Models with more than one output cannot be streamed.
+    chunk_days (int): days of a chunk, when evaluation is 'streaming'. Default is 30.
+    'incremental' evaluation keeps a state in 'state_folder' between runs (see IncrementalState), each
+    run evaluates just the new days and appends them to the results of the previous runs, kept in the 
+    state. The results Resources of the run have just the days it evaluated. Outputs are evaluated from 
+    scratch when the model file changes. Each field has its own state, keyed by the 'field' shared 
+    variable (see MosaicEngine.run_field), or by the files of the Sources when it is not set.
+    state_folder (str): folder of the state of 'incremental' evaluation. Default is 'state'.
+    result_cache (str): 'active' keeps the results in 'cache_folder' (see ResultCache), keyed by the model
+    file, the label of the Model, the framework version and the input data. A run with the same key gets
+    the stored results, without evaluating the outputs. 'inactive' (default) does not use the cache, as
+    'incremental' evaluation does.
+    cache_folder (str): folder of the result cache. Default is 'cache'.
+    cache_size (int): size of the result cache in MB, least recently used results are removed beyond it.
+    Default is 512.
     ---\n
     Examples:\n
     label='antrapi', output=['primary', 'intermidiate', 'secondary'], primary=[...], intermidiate=[...], secondary=[...]
@@ -66,6 +94,8 @@ class Model(Component):
         self.output_rule_parser  = OutputRuleParser(rules_hub=self.rules_hub)
         self.data                = None
         self.outputs_rules       = dict()
+        self.rule_graphs         = dict()
+        self.is_parsed           = False
 
     @staticmethod
     def append_results(actual:pd.DataFrame, to_merge:pd.DataFrame):
@@ -79,29 +109,234 @@ class Model(Component):
         """
         return pd.concat([actual, to_merge]) if not actual.empty else to_merge
 
-    def get_modules(self)->list:
+    @staticmethod
+    def shift_index(to_shift:pd.DataFrame, offset:int)->pd.DataFrame:
+        """
+        @staticmethod
+        Shift the index of new results, so that it goes on from the index of the previous ones.
+        ---\n
+        params:
+        to_shift: pd.DataFrame - New results, indexed from 0.
+        offset: int - First index of the new results (see IncrementalState.get_next_index).
+        ---\n
+        returns:
+        pd.DataFrame - New results, with the shifted index.
+        """
+        to_shift.index = to_shift.index + offset
+        return to_shift
+
+    def get_output_model(self, output_label:str, data:pd.DataFrame, previsionDay:datetime, history:tuple, days:int, start_day:str=None, carry_over:dict=None, carry_days:Tuple[str, str]=None)->OutputModel:
+        """
+        Instanciate the OutputModel of an output, with its rules and output rule(s).
+        ---\n
+        params:
+        output_label: str - Label of the output.
+        data: pd.DataFrame - Input data of the output.
+        previsionDay: datetime - Starting day of calculation.
+        history: tuple - Historical data window.
+        days: int - Days calculated by the model.
+        start_day: str - First day of the results, None for all the days (see OutputModel).
+        carry_over: dict - States of the rules carried over by the previous run, None if not carried over (see OutputModel).
+        carry_days: Tuple[str, str] - Days the states of the rules are carried over to (see OutputModel).
+        ---\n
+        returns:
+        OutputModel - OutputModel of the output.
+        """
+        output_model = OutputModel(
+            label=output_label, 
+            previsionDay=previsionDay,
+            data=data,
+            history=history, 
+            days=days, 
+            rules_hub=self.rules_hub,
+            rule_graph=self.rule_graphs.get(output_label, None) if self.rule_pruning=='active' else None,
+            max_workers=int(self.max_workers),
+            chunk_days=int(self.chunk_days) if self.evaluation=='streaming' else None,
+            start_day=start_day,
+            carry_over=carry_over,
+            carry_days=carry_days)
+        #Appending all available rules for the selected output
+        for r in self.__dict__.get(output_label, None):
+            output_model.add_factor(factor=r)
+
+        #Set the current output rule(s) for the selected output
+        output_model.set_output_rule(factor=self.__dict__.get(output_label+'_output_rule', None))
+        return output_model
+
+    def get_calculation_window(self, data:pd.DataFrame, date_column:str)->Tuple[datetime, int]:
+        """
+        Get previsionDay and days of the calculation, based on 'history' and 'days' params, and
+        on the dates of the data.
+        ---\n
+        params:
+        data: pd.DataFrame - Input data.
+        date_column: str - Date column.
+        ---\n
+        returns:
+        Tuple[datetime, int] - Standardized ISO8601 previsionDay, and days calculated by the model.
+        """
+        previsionDay    = self.get_default_prevision_day(
+            past_days=self.history, 
+            data=data, 
+            column=date_column)
+        days            = \
+            self.get_default_days(data=data, previsionDay=previsionDay, future_days=0, column=date_column) \
+                if self.days == 'default'             \
+                else self.days
+
+        #Getting a standardized ISO8601 previsionDay
+        dt_parser    = DatetimeParser()
+        previsionDay = dt_parser.get_standard_datetime(dt_parser.parse_single(previsionDay.isoformat()))
+        print(f"[Model] previsionDay: {previsionDay} | type: {type(previsionDay)}")
+        return previsionDay, days
+
+    def get_local_folder(self, folder:str)->str:
+        """
+        Get a folder kept between runs (eg. state_folder, cache_folder), inside the cloud temp folder if set.
+        ---\n
+        params:
+        folder: str - Folder, as set in the params.
+        ---\n
+        returns:
+        str - Path of the folder.
+        """
+        cloud_tmp_fld = self.shared_memory.get_variable(key='cloud_tmp_fld')
+        if cloud_tmp_fld is None or cloud_tmp_fld.content == "None":
+            return folder
+        return cloud_tmp_fld.content + "/" + folder
+
+    def get_result_cache(self, data:pd.DataFrame)->Tuple[Optional[ResultCache], Optional[str]]:
         """
-        Run over mosaic_framework package, find any module that is part of the package
-        then add them to a list. If self.DEBUG=True then displays the found modules. 
-        Modules are found dynamically at runtime.
+        Get the result cache and the key of the results of the run.
         ---\n
         params:
+        data: pd.DataFrame - Input data.
+        ---\n
+        returns:
+        Tuple[Optional[ResultCache], Optional[str]] - Cache and key, None if results cannot be cached:
+        the cache is not active, evaluation is 'incremental' (results depend on the state) or the hash
+        of the model file is not known.
+        """
+        model_hash = self.shared_memory.get_variable(key='model_hash')
+        if self.result_cache != 'active' or self.evaluation == 'incremental' or model_hash is None:
+            return None, None
+        #Variables of the MosaicRulesHub are read by the rules (eg. growth models of the v_look_up_table),
+        #debug just prints.
+        shared = {k: v.content for k, v in self.rules_hub.content.items() if k != 'debug'}
+        key    = ResultCache.get_key(model_hash=model_hash.content, label=self.label, data=data, shared=shared)
+        if key is None:
+            return None, None
+        return ResultCache(path=self.get_local_folder(folder=self.cache_folder), max_size=float(self.cache_size)), key
+
+    def get_incremental_state(self, data:pd.DataFrame, date_column:str)->Tuple[IncrementalState, Optional[str], Optional[Tuple[int, int]]]:
+        """
+        Get the state of incremental evaluation, and the first day to evaluate. Days evaluated by
+        the previous run are not evaluated again, except the last one (it may have been incomplete)
+        and the ones whose output rules read following days. Rules carrying a state from the start 
+        of the data go on from the one carried over by the previous run. Outputs are evaluated from 
+        scratch if the model file (or its outputs) changed, there is no new data, or the new data do 
+        not continue the ones of the previous run. A state cannot be saved if 'days' is set or a rule 
+        carries a state it cannot go on from (see AgroRule.get_carry_lag), the Model is then evaluated 
+        from scratch at each run.
+        ---\n
+        params:
+        data: pd.DataFrame - New input data.
+        date_column: str - Date column.
+        ---\n
+        returns:
+        Tuple[IncrementalState, Optional[str], Optional[Tuple[int, int]]] - State, first day to evaluate 
+        (None to evaluate all the data), days before the last day kept in the tails of the state and 
+        evaluated again by the next run (None if the state cannot be saved).
+        """
+        model_hash   = self.shared_memory.get_variable(key='model_hash')
+        #Fields evaluated with the same model file are told apart by their key,
+        #or by the files of their Sources.
+        field        = self.shared_memory.get_variable(key='field')
+        if field is None:
+            field    = self.shared_memory.get_variable(key='source_files')
+        state        = IncrementalState(
+            path=self.get_local_folder(folder=self.state_folder), 
+            label=self.label, 
+            model_hash=model_hash.content if model_hash is not None else None,
+            field=hashlib.sha256(json.dumps(field.content, sort_keys=True).encode('utf-8')).hexdigest()[:16] \
+                if field is not None else None)
+        try:
+            data_days = get_days(data=data, column=date_column)
+        except ValueError:
+            print(f"[Model] {self.label}: dates have different timezones, evaluated from scratch.")
+            return state, None, None
+        lags = [self.get_output_model(output_label=o, data=data, previsionDay=None, history=None, days=None).get_chunk_lag(
+            rows_per_day=int(data_days.value_counts().min()), carry=True) for o in self.outputs]
+        if self.days != 'default' or None in lags:
+            print(f"[Model] {self.label}: rules carry a state from the start of the data (or days are set), evaluated from scratch.")
+            return state, None, None
+        lead      = max([l[1] for l in lags])
+        tail_days = max([l[0] for l in lags]) + lead
+        if not state.load(outputs=self.outputs):
+            return state, None, (tail_days, lead)
+        start_day = shift_day(day=state.get_last_day(), days=-lead)
+        if not (data_days >= start_day).any():
+            print(f"[Model] {self.label}: no new data after {state.get_last_day()}, evaluated from scratch.")
+            return state, None, (tail_days, lead)
+        if not state.matches(output=self.outputs[0], data=data, start_day=start_day, column=date_column):
+            print(f"[Model] {self.label}: new data do not continue the ones of the previous run, evaluated from scratch.")
+            return state, None, (tail_days, lead)
+        return state, start_day, (tail_days, lead)
+
+    def estimate_streaming(self, date_column:str)->None:
+        """
+        Estimate the output chunk by chunk (see OutputModel.estimate_chunks). The results of each chunk
+        are appended to the results Resources of the model as soon as they are available, then dropped,
+        the results of the whole data are never kept by the Model.
+        ---\n
+        params:
+        date_column: str - Date column.
+        ---\n
+        returns:
         None
-        ---
-        returns: List of modules find in mosaic_framework path.
-        """
-        # Scorri tutti i moduli nel package
-        modules = list()
-        for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.core.__path__, mosaic_framework.core.__name__ + '.'):
-            # Importa il modulo dinamicamente
-            module = importlib.import_module(module_name)
-            # Aggiungi il modulo alla lista
-            modules.append(module)    
-        return modules
+        """
+        history            = (self.history, 0, 0)
+        previsionDay, days = self.get_calculation_window(data=self.data, date_column=date_column)
+        print(f"[Model] Initial params: history={history} | date_column={date_column} | previsionDay={previsionDay} | days={days}\n\n")
+        output_model       = self.get_output_model(
+            output_label=self.outputs[0], 
+            data=self.data, 
+            previsionDay=previsionDay, 
+            history=history, 
+            days=days)
+        
+        #Rows are cleaned as in evaluate_outputs, chunk by chunk.
+        columns_filter = [date_column]+[v for v in self.outputs]
+        for results, compact_results in output_model.estimate_chunks():
+            self.data_storage.append_resource(resource=Resource(
+                label=f"{self.label}_results",
+                data=results.dropna(),
+                file_type=self.get_results_format(),
+                description='hourly results of model'))
+            self.data_storage.append_resource(resource=Resource(
+                label=f"{self.label}_compact_results",
+                data=compact_results.dropna()[columns_filter],
+                file_type=self.get_results_format(),
+                description='daily results of model'))
+        return
 
     def get_debug(self)->bool:
         return True if self.debug=='active' else False
     
+    def get_results_format(self)->str:
+        """
+        Get the file format of the results in the MosaicDataStorage.
+        ---\n
+        params:
+        None
+        ---\n
+        Returns:
+        - str : 'csv', 'feather' or 'npz'.
+        """
+        if self.results_format != 'auto':
+            return self.results_format
+        return get_frame_format()
+
     def get_v_look_up_table(self)->dict:
         """
         This function is used to handle the v_look_up_table, in particular it is used to 
@@ -127,13 +362,26 @@ class Model(Component):
 
         super().prepare()
 
+        #Rules can be already parsed (eg. batch execution, where the
+        #Model is parsed once and copied for each input dataset).
+        if not self.is_parsed:
+            self.parse_rules()
+        return
+
+    def parse_rules(self)->None:
+        """
+        Parse the rules and the output rules of each output, replacing them with
+        their objects, then build the dependency graph between the rules of each output.
+        ---\n
+        params:
+        None
+        ---\n
+        returns: None
+        """
         #Parsing bottom-to-top the rules find in each output param.
         for output_label in self.outputs:
             unparsed_rules = self.__dict__.get(output_label)
             print(f"[Model] Parsing outputs rules :{output_label}")
-            # parsed_rules   = self.get_parsed_rules(
-            #     output_rules=unparsed_rules, 
-            #     core_rules_modules=self.get_modules())
             parsed_rules   = self.rule_parser.parse(output_rules=unparsed_rules)
             self.outputs_rules[output_label] = parsed_rules
         
@@ -146,6 +394,15 @@ class Model(Component):
             #parsing one by one.
             self.__dict__[output_label+'_output_rule'] = \
                 [self.output_rule_parser.parse(output_rule=outr) for outr in self.__dict__[output_label+'_output_rule']]
+        
+        #Building the dependency graph between rules, for each output.
+        for output_label in self.outputs:
+            self.rule_graphs[output_label] = self.rule_parser.build_dependency_graph(
+                rules=self.outputs_rules[output_label], 
+                output_rules=self.__dict__[output_label+'_output_rule'])
+            if self.get_debug(): print(self.rule_graphs[output_label])
+        
+        self.is_parsed = True
         return
     
     def get_data(self)->pd.DataFrame:
@@ -164,10 +421,9 @@ class Model(Component):
         connectors               = self.shared_memory.get_variable('connectors').content
         resource : Resource  = None
         #looking for connect_out == self.label
-        for c in connectors:
-            if c['connect_out'] == self.label:
-                resource = c['resource']
-                break
+        for c in connectors.get_by_connect_out(self.label):
+            resource = c['resource']
+            break
         raw_data  = resource.get_data()
         converter = Converter()
         data      = converter.to_data_format(data=raw_data, data_format='dataframe')
@@ -191,6 +447,10 @@ class Model(Component):
             if len(self.__dict__.get(output_rules_name, None)) == 0:
                 raise RulesFormatError(f"{output_rules_name} does not have rules in it.")
         
+        #Outputs are chained, each one needs the whole results of the previous one.
+        if self.evaluation == 'streaming' and len(self.outputs) > 1:
+            raise ModelException(f"'streaming' evaluation allows a single output, found: {self.outputs}.")
+
         #Check for each output if <OUTPUT_NAME>_output_rule is present
         #Check if type is correct.
         for output_label in self.outputs:
@@ -313,45 +573,19 @@ class Model(Component):
 
         return diff
     
-    def run(self)->None:
+    def evaluate_outputs(self, date_column:str)->Tuple[pd.DataFrame, pd.DataFrame]:
         """
-        Entry point behaviour of the class. Based on the 'params', elaborate all the rules
-        specified, and calculate outputs.
+        Evaluate each one of the outputs on the input data, each output on the results of the previous one.
+        Incremental runs give the results of the days they evaluated.
         ---\n
         params:
-        None
+        date_column: str - Date column.
         ---\n
-        Returns:
-        - None
+        returns:
+        Tuple[pd.DataFrame, pd.DataFrame] - Results and compact results of all the outputs.
         """
-        super().run()
-        self.prepare()
-
-        #Setting vars for MosaicRulesHub
-        self.rules_hub.add_variable("debug", content=self.get_debug(), is_immutable=True)
-        self.rules_hub.add_variable("granularity", content=self.granularity, is_immutable=True)
-        self.rules_hub.add_variable("v_look_up_table", content=self.get_v_look_up_table(), is_immutable=True)
-
-        print(f"[Model] debug parameter is set: {self.rules_hub.get_variable('debug').content}")
-        
-        #Get data from connector (SharedMemory variable)
-        self.data = self.get_data()
-
-        #launches validate_outputs & validate_data
-        self.validate()
-
         #Need to calculate previsionDay on demand, based on 'history' and 'risk_window'
         history         = (self.history, 0, 0)
-        date_column     = self.get_default_date_column(self.data) if self.date_column=='default' else self.date_column
-        previsionDay    = self.get_default_prevision_day(
-            past_days=self.history, 
-            data=self.data, 
-            column=date_column)
-        days            = \
-            self.get_default_days(data=self.data, previsionDay=previsionDay, future_days=0, column=date_column) \
-                if self.days == 'default'             \
-                else self.days
-        print(f"[Model] Initial params: history={history} | date_column={date_column} | previsionDay={previsionDay} | days={days}\n\n")
         #Istanciate and run each one of the outputs
         final_results         = pd.DataFrame(data=None)
         final_compact_results = pd.DataFrame(data=None)
@@ -359,27 +593,43 @@ class Model(Component):
         #data
         data = deepcopy(self.data)
 
-        #Getting a standardized ISO8601 previsionDay
-        dt_parser    = DatetimeParser()
-        previsionDay = dt_parser.get_standard_datetime(dt_parser.parse_single(previsionDay.isoformat()))
-        print(f"[Model] previsionDay: {previsionDay} | type: {type(previsionDay)}")
+        #Incremental evaluation goes on from the last day of the previous run, with the tails it saved.
+        state, start_day, state_days = \
+            self.get_incremental_state(data=data, date_column=date_column) \
+                if self.evaluation == 'incremental' \
+                else (None, None, None)
+        if start_day is not None:
+            data = state.get_frame(output=self.outputs[0], data=data, start_day=start_day, column=date_column)
+            print(f"[Model] Incremental evaluation from: {start_day}")
+        #States of the rules are carried over to the first day of the tails of the next run.
+        last_day   = get_days(data=data, column=date_column).max() if state_days is not None else None
+        carry_days = (shift_day(day=last_day, days=-state_days[0]), shift_day(day=last_day, days=-state_days[1])) \
+            if state_days is not None \
+            else None
+        carry_over = dict()
+
+        previsionDay, days = self.get_calculation_window(data=data, date_column=date_column)
+        print(f"[Model] Initial params: history={history} | date_column={date_column} | previsionDay={previsionDay} | days={days}\n\n")
+        frames = dict()
         for output_label in self.outputs:
-            output_model = OutputModel(
-                label=output_label, 
-                previsionDay=previsionDay,
-                data=data,
+            if start_day is not None and len(frames) > 0:
+                data = state.get_frame(output=output_label, data=data, start_day=start_day, column=date_column)
+            frames[output_label] = data
+            output_model = self.get_output_model(
+                output_label=output_label, 
+                data=data, 
+                previsionDay=previsionDay, 
                 history=history, 
                 days=days, 
-                rules_hub=self.rules_hub)
-            #Appending all available rules for the selected output
-            for r in self.__dict__.get(output_label, None):
-                output_model.add_factor(factor=r)
-
-            #Set the current output rule(s) for the selected output
-            output_model.set_output_rule(factor=self.__dict__.get(output_label+'_output_rule', None))
+                start_day=start_day,
+                carry_over=(state.get_carry_over(output=output_label) if start_day is not None else dict()) \
+                    if state_days is not None \
+                    else None,
+                carry_days=carry_days)
             
             #just the results, results with columns = output_model.estimate()
             results, compact_results = output_model.estimate()
+            carry_over[output_label] = output_model.get_carry_over()
             
             #updating data with the latest OutputModel
             data = results
@@ -397,25 +647,90 @@ class Model(Component):
         columns_filter        = [date_column]+[v for v in self.outputs]
         final_compact_results = final_compact_results[columns_filter]
 
+        #New results go on from the ones of the previous runs, then they are appended to them in the state.
+        if start_day is not None:
+            final_results         = self.shift_index(final_results, state.get_next_index(name='results'))
+            final_compact_results = self.shift_index(final_compact_results, state.get_next_index(name='compact_results'))
+        if state_days is not None:
+            state.save(
+                last_day=last_day,
+                days=state_days,
+                frames=frames,
+                results=final_results,
+                compact_results=final_compact_results,
+                carry_over=carry_over,
+                column=date_column,
+                is_continued=start_day is not None)
+        return final_results, final_compact_results
+
+    def run(self)->None:
+        """
+        Entry point behaviour of the class. Based on the 'params', elaborate all the rules
+        specified, and calculate outputs.
+        ---\n
+        params:
+        None
+        ---\n
+        Returns:
+        - None
+        """
+        super().run()
+        self.prepare()
+
+        #Setting vars for MosaicRulesHub
+        self.rules_hub.add_variable("debug", content=self.get_debug(), is_immutable=True)
+        self.rules_hub.add_variable("granularity", content=self.granularity, is_immutable=True)
+        self.rules_hub.add_variable("v_look_up_table", content=self.get_v_look_up_table(), is_immutable=True)
+
+        print(f"[Model] debug parameter is set: {self.rules_hub.get_variable('debug').content}")
+        
+        #Get data from connector (SharedMemory variable)
+        self.data = self.get_data()
+
+        #launches validate_outputs & validate_data
+        self.validate()
+
+        date_column     = self.get_default_date_column(self.data) if self.date_column=='default' else self.date_column
+
+        #Results of the same model file and data are got from the cache, if active.
+        result_cache, key = self.get_result_cache(data=self.data)
+        cached            = result_cache.get(key=key) if result_cache is not None else None
+        is_streamed       = cached is None and self.evaluation == 'streaming'
+        if cached is not None:
+            final_results, final_compact_results = cached
+        elif is_streamed:
+            #Results are appended to the MosaicDataStorage chunk by chunk.
+            self.estimate_streaming(date_column=date_column)
+            if result_cache is not None:
+                result_cache.put(
+                    key=key, 
+                    results=self.data_storage.get_resource(label=f"{self.label}_results").get_data(), 
+                    compact_results=self.data_storage.get_resource(label=f"{self.label}_compact_results").get_data())
+        else:
+            final_results, final_compact_results = self.evaluate_outputs(date_column=date_column)
+            if result_cache is not None:
+                result_cache.put(key=key, results=final_results, compact_results=final_compact_results)
+
         #Load self.outputs into the SharedMemory in order to be furtherly used
         self.shared_memory.add_variable(key="outputs_labels", content=self.outputs, is_immutable=True)
 
         #Eventually we are going to replace eventual VLookUpTable with the current one.
         self.shared_memory.update_variable(key='v_look_up_table', new_content=self.rules_hub.get_variable('v_look_up_table'))
 
-        #load results into MosaicDataStorage
-        self.data_storage.add_resource(resource=Resource(
-            label=f"{self.label}_results", 
-            data=final_results, 
-            file_type='csv',
-            description='hourly results of model'
-        ))
-        self.data_storage.add_resource(resource=Resource(
-            label=f"{self.label}_compact_results", 
-            data=final_compact_results, 
-            file_type='csv',
-            description='daily results of model'
-        ))
+        #load results into MosaicDataStorage, streamed results are already there.
+        if not is_streamed:
+            self.data_storage.add_resource(Resource(
+                label=f"{self.label}_results", 
+                data=final_results, 
+                file_type=self.get_results_format(),
+                description='hourly results of model'
+            ))
+            self.data_storage.add_resource(Resource(
+                label=f"{self.label}_compact_results", 
+                data=final_compact_results, 
+                file_type=self.get_results_format(),
+                description='daily results of model'
+            ))
         #update connectors, find the connector that has 'connect_in' equal to the
         #label of current model. Then update the Resource in it (that current value,
         #should be empty (None)) to a new dict that points to the label's resource
@@ -424,12 +739,11 @@ class Model(Component):
         #are pointed by the 'resource' content
 
         connectors = self.shared_memory.get_variable(key='connectors').content
-        for i, _ in enumerate(connectors):
-            if connectors[i]['connect_in'] == self.label:
-                connectors[i]['resource'] = {
-                    'results_pointer'         : f"{self.label}_results",
-                    'compact_results_pointer' : f"{self.label}_compact_results"
-                }
+        for c in connectors.get_by_connect_in(self.label):
+            c['resource'] = {
+                'results_pointer'         : f"{self.label}_results",
+                'compact_results_pointer' : f"{self.label}_compact_results"
+            }
 
         #0. Merge the results into a solo dataframe that has all columns.  
         #1. Load the results into the MosaicDataStorage, cause the connectors get the data from it.
@@ -0,0 +1,160 @@
+################################################################################
+# Module:      result_cache.py
+# Description: Content-addressed cache of the results of a Model.
+# Author:      Stefano Zimmitti
+# Date:        15/01/2024
+# Company:     xFarm Technologies
+################################################################################
+
+from typing import Optional, Tuple
+import tempfile
+import hashlib
+import shutil
+import json
+import os
+import pandas as pd
+
+from mosaic_framework.data_storage.backends import FileStorageBackend
+from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.data_storage.writers import get_frame_format
+from mosaic_framework.engine.version import get_framework_version
+
+class ResultCache():
+    """
+    Cache of the results of Models, in a local folder. Each entry is a folder named by its key,
+    the hash of everything the results depend on: the model file and its parsing params, the label
+    of the Model, the version of the framework, the input data and the shared inputs the rules read
+    (eg. the growth models of the v_look_up_table). Entries are written aside and moved in place, so that a reader never finds them partially
+    written. When the folder exceeds its size, the least recently used entries are removed.
+    ---\n
+    params:
+    path: str - Folder of the cache, created if it does not exist.
+    max_size: float - Size of the folder, in MB.
+    """
+    def __init__(self, path:str, max_size:float) -> None:
+        self.path     = path
+        self.max_size = max_size*1024*1024
+
+    @staticmethod
+    def get_key(model_hash:str, label:str, data:pd.DataFrame, shared:dict=None) -> Optional[str]:
+        """
+        Get the key of the results of a Model.
+        ---\n
+        params:
+        model_hash: str - Hash of the parsed model file.
+        label: str - Label of the Model.
+        data: pd.DataFrame - Input data of the Model.
+        shared: dict - Shared inputs the rules read, by name (eg. v_look_up_table).
+        ---\n
+        returns:
+        Optional[str] - Key, None if the data cannot be hashed.
+        """
+        try:
+            data_hash = pd.util.hash_pandas_object(data, index=True).values.tobytes()
+        except TypeError:
+            return None
+        key = hashlib.sha256()
+        key.update(json.dumps([model_hash, label, get_framework_version(), list(map(str, data.columns)), list(map(str, data.dtypes))]).encode('utf-8'))
+        key.update(data_hash)
+        key.update(json.dumps(shared if shared is not None else {}, sort_keys=True, default=str).encode('utf-8'))
+        return key.hexdigest()
+
+    def get_backend(self, entry_path:str) -> FileStorageBackend:
+        """
+        Get a backend reading and writing the files of an entry.
+        ---\n
+        params:
+        entry_path: str - Folder of the entry.
+        ---\n
+        returns:
+        FileStorageBackend - Backend on the folder.
+        """
+        backend      = FileStorageBackend()
+        backend.path = entry_path
+        return backend
+
+    def get(self, key:str) -> Optional[Tuple[pd.DataFrame, pd.DataFrame]]:
+        """
+        Get the results of a key, the entry becomes the most recently used.
+        ---\n
+        params:
+        key: str - Key of the results.
+        ---\n
+        returns:
+        Optional[Tuple[pd.DataFrame, pd.DataFrame]] - Results and compact results, None if not cached.
+        """
+        entry_path = self.path + "/" + key
+        try:
+            with open(entry_path + "/entry.json", 'r') as entry_f:
+                file_type = json.load(entry_f)['file_type']
+            backend = self.get_backend(entry_path=entry_path)
+            results = tuple([backend.read(resource=Resource(label=label, data=None, file_type=file_type)) for label in ['results', 'compact_results']])
+            os.utime(entry_path)
+        except (OSError, ValueError, KeyError):
+            #Missing, or removed while reading.
+            return None
+        print(f"[ResultCache]: results found, key: {key}")
+        return results
+
+    def put(self, key:str, results:pd.DataFrame, compact_results:pd.DataFrame) -> bool:
+        """
+        Store the results of a key, then remove the least recently used entries if the
+        cache exceeds its size.
+        ---\n
+        params:
+        key: str - Key of the results.
+        results: pd.DataFrame - Results.
+        compact_results: pd.DataFrame - Compact results.
+        ---\n
+        returns:
+        bool - True if the results are stored.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        file_type  = get_frame_format()
+        entry_path = tempfile.mkdtemp(prefix=".writing_", dir=self.path)
+        backend    = self.get_backend(entry_path=entry_path)
+        backend.persist(resource=Resource(label='results', data=results, file_type=file_type))
+        backend.persist(resource=Resource(label='compact_results', data=compact_results, file_type=file_type))
+        with open(entry_path + "/entry.json", 'w') as entry_f:
+            json.dump({'file_type': file_type}, entry_f)
+        try:
+            os.replace(entry_path, self.path + "/" + key)
+        except OSError:
+            #Already stored, eg. by another field of the same batch.
+            shutil.rmtree(entry_path, ignore_errors=True)
+            return False
+        print(f"[ResultCache]: results stored, key: {key}")
+        self.evict()
+        return True
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries, until the cache fits its size.
+        ---\n
+        params:
+        None
+        ---\n
+        returns:
+        int - Number of entries removed.
+        """
+        entries = list()
+        for key in os.listdir(self.path):
+            entry_path = self.path + "/" + key
+            if key.startswith(".") or not os.path.isdir(entry_path):
+                continue
+            try:
+                size = sum([os.path.getsize(entry_path + "/" + f) for f in os.listdir(entry_path)])
+                entries.append((os.path.getmtime(entry_path), size, entry_path))
+            except OSError:
+                continue
+        size    = sum([e[1] for e in entries])
+        removed = 0
+        for _, entry_size, entry_path in sorted(entries):
+            if size <= self.max_size:
+                break
+            shutil.rmtree(entry_path, ignore_errors=True)
+            size    -= entry_size
+            removed += 1
+        if removed > 0:
+            print(f"[ResultCache]: {removed} entries removed.")
+        return removed
@@ -17,6 +17,7 @@ if TYPE_CHECKING:
 
 from mosaic_framework.components.sub_component import SubComponent
 from mosaic_framework.data_storage.variable import SharedVariable
+from mosaic_framework.data_storage.connector_registry import ConnectorRegistry
 
 class Connector(SubComponent):
     """
@@ -82,7 +83,7 @@ class SourceToModelConnector(Connector):
     def run(self):
         """
         Get connectors from SharedMemory, if they exist: create a new key inside 'connectors',
-        otherwise: create 'connectors' as list, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource>}
+        otherwise: create 'connectors' as ConnectorRegistry, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource>}
         .
         ---\n
         params:
@@ -96,7 +97,7 @@ class SourceToModelConnector(Connector):
         existing_connectors = self.shared_memory.get_variable(key="connectors")
         if existing_connectors != None:
             #existing case, getting old content, creating new connector and appending.
-            new_content : list   = self.shared_memory.get_variable(key="connectors").content
+            new_content : ConnectorRegistry = self.shared_memory.get_variable(key="connectors").content
             new_connector        = {
                         'connect_in':  self.connect_in, 
                         'connect_out': self.connect_out, 
@@ -107,11 +108,11 @@ class SourceToModelConnector(Connector):
             #not existing case
             self.shared_memory.add_variable(
                 key='connectors', 
-                content=[
+                content=ConnectorRegistry([
                     {
                         'connect_in' : self.connect_in, 
                         'connect_out': self.connect_out, 
-                        'resource'   : self.data_storage.get_resource(label=self.connect_in)}])
+                        'resource'   : self.data_storage.get_resource(label=self.connect_in)}]))
         print("[SourceToModelConnector] Closed running...")
         return
 
@@ -137,7 +138,7 @@ class SourceToValidatorConnector(Connector):
     def run(self):
         """
         Get connectors from SharedMemory, if they exist: create a new key inside 'connectors',
-        otherwise: create 'connectors' as list, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource>}
+        otherwise: create 'connectors' as ConnectorRegistry, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource>}
         .
         ---\n
         params:
@@ -151,7 +152,7 @@ class SourceToValidatorConnector(Connector):
         existing_connectors = self.shared_memory.get_variable(key="connectors")
         if existing_connectors != None:
             #existing case, getting old content, creating new connector and appending.
-            new_content : list   = self.shared_memory.get_variable(key="connectors").content
+            new_content : ConnectorRegistry = self.shared_memory.get_variable(key="connectors").content
             new_connector        = {
                         'connect_in': self.connect_in, 
                         'connect_out': self.connect_out, 
@@ -162,11 +163,11 @@ class SourceToValidatorConnector(Connector):
             #not existing case
             self.shared_memory.add_variable(
                 key='connectors', 
-                content=[
+                content=ConnectorRegistry([
                     {
                         'connect_in' : self.connect_in, 
                         'connect_out': self.connect_out, 
-                        'resource'   : self.data_storage.get_resource(label=self.connect_in)}])
+                        'resource'   : self.data_storage.get_resource(label=self.connect_in)}]))
         print("[SourceToValidatorConnector] Closed running...")
         return
 
@@ -192,7 +193,7 @@ class ColtureToModelConnector(Connector):
     def run(self):
         """
         Get connectors from SharedMemory, if they exist: create a new key inside 'connectors',
-        otherwise: create 'connectors' as list, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource>}
+        otherwise: create 'connectors' as ConnectorRegistry, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <Resource>}
         .
         ---\n
         params:
@@ -206,7 +207,7 @@ class ColtureToModelConnector(Connector):
         existing_connectors = self.shared_memory.get_variable(key="connectors")
         if existing_connectors != None:
             #existing case, getting old content, creating new connector and appending.
-            new_content : list   = self.shared_memory.get_variable(key="connectors").content
+            new_content : ConnectorRegistry = self.shared_memory.get_variable(key="connectors").content
             new_connector        = {
                         'connect_in':  self.connect_in, 
                         'connect_out': self.connect_out, 
@@ -217,11 +218,11 @@ class ColtureToModelConnector(Connector):
             #not existing case
             self.shared_memory.add_variable(
                 key='connectors', 
-                content=[
+                content=ConnectorRegistry([
                     {
                         'connect_in' : self.connect_in, 
                         'connect_out': self.connect_out, 
-                        'resource'   : self.data_storage.get_resource(label=self.connect_in)}])
+                        'resource'   : self.data_storage.get_resource(label=self.connect_in)}]))
         print("[SourceToModelConnector] Closed running...")
         return
 
@@ -247,7 +248,7 @@ class ModelToValidatorConnector(Connector):
     def run(self):
         """
         Get connectors from SharedMemory, if they exist: create a new key inside 'connectors',
-        otherwise: create 'connectors' as list, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <AllocatedResource>}
+        otherwise: create 'connectors' as ConnectorRegistry, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <AllocatedResource>}
         .
         ---\n
         params:
@@ -266,7 +267,7 @@ class ModelToValidatorConnector(Connector):
         existing_connectors = self.shared_memory.get_variable(key="connectors")
         if existing_connectors != None:
             #existing case, getting old content, creating new connector and appending.
-            new_content : list   = self.shared_memory.get_variable(key="connectors").content
+            new_content : ConnectorRegistry = self.shared_memory.get_variable(key="connectors").content
             
             new_connector        = {
                         'connect_in' : self.connect_in, 
@@ -278,11 +279,11 @@ class ModelToValidatorConnector(Connector):
             #not existing case
             self.shared_memory.add_variable(
                 key='connectors', 
-                content=[
+                content=ConnectorRegistry([
                     {
                         'connect_in' : self.connect_in, 
                         'connect_out': self.connect_out, 
-                        'resource'   : pre_allocated_resource}])
+                        'resource'   : pre_allocated_resource}]))
         print("[ModelToValidatorConnector] Closed running...")
         return
 
@@ -308,7 +309,7 @@ class ModelToLambdaOutputConnector(Connector):
     def run(self):
         """
         Get connectors from SharedMemory, if they exist: create a new key inside 'connectors',
-        otherwise: create 'connectors' as list, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <AllocatedResource>}
+        otherwise: create 'connectors' as ConnectorRegistry, append {'connect_in': <str>, 'connect_out': <str>, 'resource': <AllocatedResource>}
         .
         ---\n
         params:
@@ -327,7 +328,7 @@ class ModelToLambdaOutputConnector(Connector):
         existing_connectors = self.shared_memory.get_variable(key="connectors")
         if existing_connectors != None:
             #existing case, getting old content, creating new connector and appending.
-            new_content : list   = self.shared_memory.get_variable(key="connectors").content
+            new_content : ConnectorRegistry = self.shared_memory.get_variable(key="connectors").content
             
             new_connector        = {
                         'connect_in' : self.connect_in, 
@@ -339,10 +340,10 @@ class ModelToLambdaOutputConnector(Connector):
             #not existing case
             self.shared_memory.add_variable(
                 key='connectors', 
-                content=[
+                content=ConnectorRegistry([
                     {
                         'connect_in' : self.connect_in, 
                         'connect_out': self.connect_out, 
-                        'resource'   : pre_allocated_resource}])
+                        'resource'   : pre_allocated_resource}]))
         print("[ModelToValidatorConnector] Closed running...")
         return
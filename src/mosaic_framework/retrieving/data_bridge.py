@@ -8,12 +8,7 @@
 
 from __future__ import annotations
 from typing import List, TYPE_CHECKING
-import pkgutil
-import importlib
-
-import mosaic_framework.retrieving
-import mosaic_framework.retrieving.connectors
-from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.engine.class_registry import get_class
 from mosaic_framework.retrieving.exceptions import DataBridgeConnectionException
 
 if TYPE_CHECKING:
@@ -24,7 +19,6 @@ if TYPE_CHECKING:
     MosaicSharedMemoryType = MosaicSharedMemory
     ConnectorType          = Connector
 
-import mosaic_framework
 from mosaic_framework.components.components import Component
 from mosaic_framework.config.configuration import DATA_BRIDGE
 from mosaic_framework.retrieving.exceptions import InvalidConnectionException
@@ -70,27 +64,6 @@ class DataBridge(Component):
         self.data_storage : MosaicDataStorageType
         self.shared_memory: MosaicSharedMemoryType
     
-    @staticmethod
-    def get_modules()->list:
-        """
-        Run over mosaic_framework.retrieving.connectors package, find any Connector that is part of the package
-        then add them to a list. Modules are found dynamically at runtime.
-        ---\n
-        params:
-        None
-        ---
-        returns: List of modules find in mosaic_framework.retrieving.connectors path.
-        """
-        # Scorri tutti i moduli nel package
-        modules = list()
-        for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.retrieving.__path__, mosaic_framework.retrieving.__name__ + '.'):
-            # Importa il modulo dinamicamente
-            module = importlib.import_module(module_name)
-            # Aggiungi il modulo alla lista
-            modules.append(module)
-
-        return modules
-    
     def get_one_to_one(self, connect_in:str, connect_out:str)->Connector:
         """
         Based on connect_in and connect_out that are label, look for the actual Components 
@@ -117,18 +90,14 @@ class DataBridge(Component):
         
         class_name = connect_in_classname + "To" + connect_out_classname + "Connector"
         print(f"[DataBridge] {class_name} class will be used to map connection.")
-        modules   = self.get_modules()
-        for m in modules:
-            if hasattr(m, class_name):
-                cls = getattr(m, class_name)
-                obj = cls(
-                    data_storage=self.data_storage, 
-                    shared_memory=self.shared_memory,
-                    connect_in=connect_in, 
-                    connect_out=connect_out) 
-                print(f'Oggetto creato della classe: {class_name}.')
-                return obj
-        raise ClassNotFoundException(f"Class: {class_name} cannot be found in modules available.")
+        cls = get_class(name=class_name, package='mosaic_framework.retrieving')
+        obj = cls(
+            data_storage=self.data_storage, 
+            shared_memory=self.shared_memory,
+            connect_in=connect_in, 
+            connect_out=connect_out) 
+        print(f'Oggetto creato della classe: {class_name}.')
+        return obj
 
     def get_connectors(self)-> List[Connector]:
         """
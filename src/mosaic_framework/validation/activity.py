@@ -11,15 +11,12 @@ from __future__ import annotations
 from typing import List, TYPE_CHECKING
 
 import pandas as pd
-import importlib
-import pkgutil
 import json
 
 from mosaic_framework.config.configuration import MODEL_VALIDATION_ACTIVITY
 from mosaic_framework.components.components import InternalComponent
 from mosaic_framework.validation.exceptions import ValidationActivityDataFormatException
-from mosaic_framework.engine.exceptions import ClassNotFoundException
-import mosaic_framework
+from mosaic_framework.engine.class_registry import get_class
 
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.data_storage import MosaicDataStorage
@@ -108,45 +105,14 @@ class ModelValidation(ValidationActivity):
 
     @staticmethod
     def get_model_validation_cls(model_validation_type:str):
-        def get_model_validation_modules()->list:
-            """
-            Run over mosaic_framework package, find any module that is part of the package
-            then add them to a list. If self.DEBUG=True then displays the found modules. 
-            Modules are found dynamically at runtime.
-            ---\n
-            params:
-            None
-            ---
-            returns: List of modules find in mosaic_framework path.
-            """
-            # Scorri tutti i moduli nel package
-            modules = list()
-            for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.validation.__path__, mosaic_framework.validation.__name__ + '.'):
-                # Importa il modulo dinamicamente
-                module = importlib.import_module(module_name)
-                # Aggiungi il modulo alla lista
-                modules.append(module)    
-            return modules
-
-        def get_class(modules: List[object], model_validation_type: str) -> ValidationActivity:
-            """
-            Allow to match the objects found in module (class_calls) with any module
-            find in modules. Then it returns a list of objects that match, otherwise
-            a ClassNotFoundException is raised.
-            """
-            cls = None
-            obj_found = False
-            for m in modules:
-                if hasattr(m, model_validation_type):
-                    cls = getattr(m, model_validation_type)
-                    obj_found = True
-            if not obj_found:
-                raise ClassNotFoundException(f"Class: {model_validation_type} cannot be found in modules available.")
-            return cls
-
-        model_validation_cls_modules = get_model_validation_modules()
-        model_validation_cls         = get_class(modules=model_validation_cls_modules, model_validation_type=model_validation_type)
-        return model_validation_cls
+        """
+        @staticmethod
+        Get the class of a model validation, from the classes of mosaic_framework.validation (see class_registry).
+        ----\n
+        params:
+        model_validation_type:str name of the class
+        """
+        return get_class(name=model_validation_type, package='mosaic_framework.validation')
 
     def prepare(self)->None:
         """
@@ -11,16 +11,13 @@ from __future__ import annotations
 from typing import List, TYPE_CHECKING
 
 import json
-import pkgutil
-import importlib
 import pandas as pd
 
-import mosaic_framework
 from mosaic_framework.config.configuration import VALIDATOR
 from mosaic_framework.components.components import Component
 from mosaic_framework.validation.activity import ValidationActivity
 from mosaic_framework.model.exceptions import DataFormatException
-from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.engine.class_registry import get_class
 
 if TYPE_CHECKING:
     from mosaic_framework.data_storage.data_storage import MosaicDataStorage
@@ -52,46 +49,8 @@ class Validator(Component):
         activity:str string needed to look for the activity
         """
 
-        def get_activity_modules()->list:
-            """
-            Run over mosaic_framework package, find any module that is part of the package
-            then add them to a list. If self.DEBUG=True then displays the found modules. 
-            Modules are found dynamically at runtime.
-            ---\n
-            params:
-            None
-            ---
-            returns: List of modules find in mosaic_framework path.
-            """
-            # Scorri tutti i moduli nel package
-            modules = list()
-            for _loader, module_name, _ispkg in pkgutil.walk_packages(mosaic_framework.validation.__path__, mosaic_framework.validation.__name__ + '.'):
-                # Importa il modulo dinamicamente
-                module = importlib.import_module(module_name)
-                # Aggiungi il modulo alla lista
-                modules.append(module)    
-            return modules
-
-        def import_and_create_objects(modules: List[object], activity: str) -> ValidationActivity:
-            """
-            Allow to match the objects found in module (class_calls) with any module
-            find in modules. Then it returns a list of objects that match, otherwise
-            a ClassNotFoundException is raised.
-            """
-            obj = None
-            obj_found = False
-            for m in modules:
-                if hasattr(m, activity['func']):
-                    cls = getattr(m, activity['func'])
-                    if issubclass(cls, Component):
-                        obj = cls(*activity['args'], **activity['kwargs'])
-                    obj_found = True
-            if not obj_found:
-                raise ClassNotFoundException(f"Class: {activity['func']} cannot be found in modules available.")
-            return obj
-
-        activity_modules = get_activity_modules()
-        activity_obj     = import_and_create_objects(modules=activity_modules, activity=activity)
+        cls          = get_class(name=activity['func'], package='mosaic_framework.validation')
+        activity_obj = cls(*activity['args'], **activity['kwargs']) if issubclass(cls, Component) else None
         return activity_obj
 
     def get_involved_connectors(self)->List[dict]:
@@ -109,10 +68,9 @@ class Validator(Component):
         #But also we need to check the the stub type, in facts we need that 
         #c['connect_in'] is a Model Component
         involved_connectors = list()
-        for c in connectors:
-            if c['connect_out'] == self.label \
-                and components_image[c['connect_in']]=='Model':
-                    involved_connectors.append(c)
+        for c in connectors.get_by_connect_out(self.label):
+            if components_image[c['connect_in']]=='Model':
+                involved_connectors.append(c)
 
         #Returning all the involved connectors, that we gonna need for the validation
         #activities
@@ -131,10 +89,9 @@ class Validator(Component):
         components_image = self.shared_memory.get_variable(key='components_image', error_policy='raise').content
         
         data = None
-        for c in connectors:
-            if c['connect_out'] == self.label \
-                and components_image[c['connect_in']]=='Source':
-                    data = c['resource'].get_data()
+        for c in connectors.get_by_connect_out(self.label):
+            if components_image[c['connect_in']]=='Source':
+                data = c['resource'].get_data()
 
         return data
     
@@ -150,11 +107,9 @@ class Validator(Component):
 
         connectors       = self.shared_memory.get_variable(key='connectors',       error_policy='raise').content
 
-        for c in connectors:
-            if c['connect_out'] == self.label \
-                and c['connect_in']==involved_connector['connect_in']:
-                    results         = self.data_storage.get_resource(label=c['resource']['results_pointer']).get_data()
-                    compact_results = self.data_storage.get_resource(label=c['resource']['compact_results_pointer']).get_data()
+        c               = connectors.get(connect_in=involved_connector['connect_in'], connect_out=self.label)
+        results         = self.data_storage.get_resource(label=c['resource']['results_pointer']).get_data()
+        compact_results = self.data_storage.get_resource(label=c['resource']['compact_results_pointer']).get_data()
 
         return {'results':results, 'compact_results':compact_results}
     
@@ -6,7 +6,6 @@
 # Company:     xFarm Technologies
 ################################################################################
 
-import boto3
 import json
 
 from mosaic_framework.vault.secret_protocol import ProtocolSecret
@@ -32,6 +31,9 @@ class Secret(ProtocolSecret):
         Get the secret data from the secret manager, by its name.
         """
 
+        #boto3 is imported when a secret is requested, not with the package (slow cold starts).
+        import boto3
+
         # Create a Secrets Manager client
         session = boto3.session.Session()
         client = session.client(
@@ -7,7 +7,9 @@
 ################################################################################
 
 from __future__ import annotations
-from typing import List, Any, TYPE_CHECKING
+from typing import List, Any, Dict, Tuple, TYPE_CHECKING
+import json
+import time
 
 from mosaic_framework.vault.exceptions import SecretNotMappedException
 
@@ -15,6 +17,13 @@ if TYPE_CHECKING:
     from mosaic_framework.vault.secret import APIKeySecret
     APIKeySecretType  = APIKeySecret
 
+#Seconds a retrieved secret is reused, then it is retrieved again (eg. rotated keys).
+SECRETS_TTL = 900
+
+#Secrets already retrieved in this process (eg. warm AWS Lambda invocations), by class, name and params,
+#with the time they were retrieved.
+_SECRETS : Dict[Tuple[str, str, str], Tuple[str, float]] = dict()
+
 class MosaicVault:
     def __init__(self) -> None:
         self.prefix   = 'Mosaic'
@@ -24,9 +33,53 @@ class MosaicVault:
             'disease'              : f'{self.prefix}_api_keys_disease',
             'insurtech'            : f'{self.prefix}_api_keys_insurtech'}
 
-    def retrieve_secret(self, secret_class:object, secret_name: str, **kwargs) -> str:
+    def get_secret_key(self, secret_class:object, secret_name: str, **kwargs) -> Tuple[str, str, str]:
+        """
+        Get the key of a secret among the ones already retrieved. Params are written as 
+        JSON, so that any value (eg. a list) makes a key.
+        ---\n
+        params:
+        secret_class: object - Class retrieving the secret.
+        secret_name: str - Name of the secret, as in the mappings.
+        kwargs - Params of the secret.
+        ---\n
+        returns:
+        Tuple[str, str, str] - Key of the secret.
+        """
         secret_name_mapped = self.mappings.get(secret_name, None)
         if secret_name_mapped == None:
             raise SecretNotMappedException(f"Secret '{secret_name}' not found in the mappings.")
-        secret             = secret_class(secret_name_mapped, **kwargs)
-        return secret.get()
+        return (secret_class.__name__, secret_name_mapped, json.dumps(kwargs, sort_keys=True, default=str))
+
+    def retrieve_secret(self, secret_class:object, secret_name: str, **kwargs) -> str:
+        """
+        Retrieve a secret, reused for SECRETS_TTL seconds by every MosaicVault of this process.
+        ---\n
+        params:
+        secret_class: object - Class retrieving the secret.
+        secret_name: str - Name of the secret, as in the mappings.
+        kwargs - Params of the secret.
+        ---\n
+        returns:
+        str - Value of the secret.
+        """
+        key    = self.get_secret_key(secret_class, secret_name, **kwargs)
+        stored = _SECRETS.get(key, None)
+        if stored is None or time.monotonic() - stored[1] >= SECRETS_TTL:
+            _SECRETS[key] = (secret_class(key[1], **kwargs).get(), time.monotonic())
+        return _SECRETS[key][0]
+
+    def evict_secret(self, secret_class:object, secret_name: str, **kwargs) -> None:
+        """
+        Drop a retrieved secret, the next request retrieves it again. Used when the secret is 
+        refused (eg. a revoked or rotated API key).
+        ---\n
+        params:
+        secret_class: object - Class retrieving the secret.
+        secret_name: str - Name of the secret, as in the mappings.
+        kwargs - Params of the secret.
+        ---\n
+        returns:
+        None
+        """
+        _SECRETS.pop(self.get_secret_key(secret_class, secret_name, **kwargs), None)
@@ -0,0 +1,48 @@
+import subprocess
+import unittest
+import sys
+
+from mosaic_framework.engine.class_registry import get_class, build_class_index
+from mosaic_framework.engine.class_index import CLASS_INDEX
+from mosaic_framework.engine.exceptions import ClassNotFoundException
+from mosaic_framework.core.comparative_factors import SimpleComparativeRule
+from mosaic_framework.validation.activity import ModelValidation
+
+class TestClassRegistry(unittest.TestCase):
+    """
+    Testing class_registry:
+        test_0: tests that CLASS_INDEX is up to date with the modules of mosaic_framework.
+        test_1: tests that classes are found by name in their package, and not in the other packages.
+        test_2: tests that getting a class imports just its module, not the whole package.
+    """
+    def setUp(self) -> None:
+        return
+    def tearDown(self) -> None:
+        return
+
+    def test_0(self):
+        self.assertEqual(build_class_index(), CLASS_INDEX, "CLASS_INDEX is outdated, run: python -m mosaic_framework.engine.class_registry")
+        return
+
+    def test_1(self):
+        self.assertIs(get_class(name='SimpleComparativeRule', package='mosaic_framework.core'), SimpleComparativeRule)
+        self.assertIs(get_class(name='SimpleComparativeRule'), SimpleComparativeRule)
+        self.assertIs(get_class(name='ModelValidation', package='mosaic_framework.validation'), ModelValidation)
+        with self.assertRaises(ClassNotFoundException):
+            get_class(name='SimpleComparativeRule', package='mosaic_framework.validation')
+        with self.assertRaises(ClassNotFoundException):
+            get_class(name='NotAMosaicClass')
+        return
+
+    def test_2(self):
+        script = (
+            "import sys\n"
+            "from mosaic_framework.engine.class_registry import get_class\n"
+            "get_class(name='GetApi', package='mosaic_framework.data_layer')\n"
+            "print([m in sys.modules for m in ['mosaic_framework.data_layer.api', 'mosaic_framework.data_layer.made_weather_provider', 'mosaic_framework.core.output_model']])\n")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[True, False, False]")
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import tempfile
+import unittest
+import pickle
+import shutil
+import json
+import os
+
+from mosaic_framework.engine.component_parser import ComponentParser
+from mosaic_framework.engine.compiled_model import CompiledModel, _COMPILED_MODELS
+
+class TestCompiledModel(unittest.TestCase):
+    """
+    Testing CompiledModel:
+        test_0: tests that the calls of the compiled model, with params replaced, are the ones parsed from the model file with params replaced in the text.
+        test_1: tests that the compiled model is written next to the model file and reused, even for other params.
+        test_2: tests that a changed model file is compiled again.
+        test_3: tests that the compiled model is written as JSON, and a compiled file with another key (or not JSON, 
+            eg. a pickle) is compiled again without being loaded.
+    """
+    def setUp(self) -> None:
+        self.folder = tempfile.mkdtemp()
+        self.model  = (
+            "Colture(label='hazelnut', commodity_id=$commodity_id, model_type='fixed')\n"
+            "Model(label='agro_model', infection=[\n"
+            "    SimpleComparativeRule(target='doy', condition='goet$doyStart', is_implicit=True),\n"
+            "    ApplyFunctionOnRange(column='fnc', target='doy', range=($range, 0), function=sum)])\n")
+        with open(self.folder + "/model.py", "w") as model_f:
+            model_f.write(self.model)
+        _COMPILED_MODELS.clear()
+        return
+    def tearDown(self) -> None:
+        shutil.rmtree(self.folder)
+        _COMPILED_MODELS.clear()
+        return
+
+    def test_0(self):
+        params   = {'commodity_id': 1753, 'doyStart': 121.0, 'range': 2}
+        expected = self.model
+        for k, v in params.items():
+            expected = expected.replace('$'+k, str(v))
+        compiled = CompiledModel(filepath="model.py", params=params, prefix=self.folder)
+        self.assertEqual(compiled.get_class_calls(), ComponentParser().parse_model_file(model_content=expected))
+        return
+
+    def test_1(self):
+        compiled = CompiledModel(filepath="model.py", params={'commodity_id': 1753, 'doyStart': 121.0, 'range': 2}, prefix=self.folder)
+        compiled.get_class_calls()
+        self.assertTrue(os.path.exists(self.folder + "/model.py.compiled"))
+
+        #A new process (eg. a cold start) reads the compiled model, the model file is not parsed again.
+        _COMPILED_MODELS.clear()
+        compiled = CompiledModel(filepath="model.py", params={'commodity_id': 1, 'doyStart': 60.0, 'range': 3}, prefix=self.folder)
+        compiled.compile = None
+        class_calls = {class_name: kwargs for class_name, _, kwargs in compiled.get_class_calls()}
+        self.assertEqual(class_calls['Colture']['commodity_id'], 1)
+        self.assertEqual(class_calls['SimpleComparativeRule']['condition'], 'goet60.0')
+        self.assertEqual(class_calls['ApplyFunctionOnRange']['range'], (3, 0))
+        return
+
+    def test_2(self):
+        params   = {'commodity_id': 1753, 'doyStart': 121.0, 'range': 2}
+        compiled = CompiledModel(filepath="model.py", params=params, prefix=self.folder)
+        hash_0   = compiled.get_model_hash()
+        with open(self.folder + "/model.py", "w") as model_f:
+            model_f.write(self.model.replace("'fixed'", "'dynamic'"))
+        self.assertEqual(compiled.get_class_calls()[0][2]['model_type'], 'dynamic')
+        self.assertNotEqual(compiled.get_model_hash(), hash_0)
+        return
+
+    def test_3(self):
+        params   = {'commodity_id': 1753, 'doyStart': 121.0, 'range': 2}
+        expected = CompiledModel(filepath="model.py", params=params, prefix=self.folder).get_class_calls()
+        with open(self.folder + "/model.py.compiled", "r") as compiled_f:
+            stored = json.load(compiled_f)
+        
+        #Objects of a compiled file with another key are never built.
+        stored_files = {
+            'other_key': json.dumps({'key': 'other', 'compiled': {'param': 'commodity_id'}}).encode('utf-8'),
+            'pickle'   : pickle.dumps({'key': stored['key'], 'compiled': None})}
+        for name, stored_file in stored_files.items():
+            with self.subTest(stored_file=name):
+                _COMPILED_MODELS.clear()
+                with open(self.folder + "/model.py.compiled", "wb") as compiled_f:
+                    compiled_f.write(stored_file)
+                self.assertEqual(CompiledModel(filepath="model.py", params=params, prefix=self.folder).get_class_calls(), expected)
+                with open(self.folder + "/model.py.compiled", "r") as compiled_f:
+                    self.assertEqual(json.load(compiled_f), stored)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
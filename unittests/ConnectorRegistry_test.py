@@ -0,0 +1,50 @@
+import unittest
+
+from mosaic_framework.data_storage.connector_registry import ConnectorRegistry
+from mosaic_framework.data_storage.shared_memory import MosaicSharedMemory
+
+class ConnectorRegistryTest(unittest.TestCase):
+    maxDiff = None  
+
+    """
+    Testing ConnectorRegistry:
+        test_0: connectors are found by both their endpoints, in the order they have been added.
+        test_1: connectors are changed in place, also when kept in the MosaicSharedMemory.
+    """
+
+    def setUp(self) -> None:
+        self.connectors = [
+            {'connect_in': 'test_source',       'connect_out': 'agro_model',      'resource': 'test_source'},
+            {'connect_in': 'validation_source', 'connect_out': 'model_validator', 'resource': 'validation_source'},
+            {'connect_in': 'agro_model',        'connect_out': 'model_validator', 'resource': None},
+            {'connect_in': 'agro_model',        'connect_out': 'lambda_output',   'resource': None}]
+        return 
+    def tearDown(self) -> None:
+        return
+
+    def test_0(self):
+        registry = ConnectorRegistry(self.connectors[:1])
+        for c in self.connectors[1:]:
+            registry.append(c)
+        self.assertListEqual(self.connectors, list(registry))
+        self.assertEqual(4, len(registry))
+        self.assertIs(self.connectors[2], registry[2])
+        self.assertListEqual(self.connectors[2:], registry.get_by_connect_in('agro_model'))
+        self.assertListEqual(self.connectors[1:3], registry.get_by_connect_out('model_validator'))
+        self.assertListEqual([], registry.get_by_connect_out('missing'))
+        self.assertIs(self.connectors[3], registry.get(connect_in='agro_model', connect_out='lambda_output'))
+        self.assertIsNone(registry.get(connect_in='test_source', connect_out='lambda_output'))
+        return
+
+    def test_1(self):
+        shared_memory = MosaicSharedMemory(DEBUG=False)
+        shared_memory.add_variable(key='connectors', content=ConnectorRegistry(self.connectors))
+        for c in shared_memory.get_variable(key='connectors').content.get_by_connect_in('agro_model'):
+            c['resource'] = {'results_pointer': 'agro_model_results'}
+        registry = shared_memory.get_variable(key='connectors').content
+        self.assertListEqual([{'results_pointer': 'agro_model_results'}]*2, [c['resource'] for c in registry.get_by_connect_out('model_validator')[1:]+registry.get_by_connect_out('lambda_output')])
+        self.assertIsNone(shared_memory.update_variable(key='missing', new_content=None))
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -44,6 +44,9 @@ class TestConverter(unittest.TestCase):
         result_to_assert= [{'sample_date': "2020-01-01 00:00"}]
         converted_data  = Converter().to_resource_format(data=data, file_format="json")
         self.assertListEqual(json.loads(converted_data), result_to_assert)
+        #Binary formats are written from the DataFrame itself.
+        for file_format in ["npz", "feather"]:
+            self.assertIs(Converter().to_resource_format(data=data, file_format=file_format), data)
         return
     
     def test_to_data_format(self):
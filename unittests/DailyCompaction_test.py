@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from mosaic_framework.core.daily_compaction import DailyCompaction
+from mosaic_framework.core.output_factors import SelectMaxAndCompare, SimpleOutputRule
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+
+class TestDailyCompaction(unittest.TestCase):
+    """
+    Testing DailyCompaction and the output rules sharing it:
+        test_0: tests daily aggregates against a grouping by day, with missing values and missing days.
+        test_1: tests that aggregates are computed once, with the requests of the other rules, and again when the hourly values change.
+        test_2: tests that output rules give the same results with a shared and with a private compaction.
+    """
+    def setUp(self) -> None:
+        self.rules_hub_config = MODEL.get("data").get("rules_hub")
+        dates = list(pd.date_range('2024-01-01', periods=48, freq='h'))+list(pd.date_range('2024-01-04', periods=24, freq='h'))
+        self.data = pd.DataFrame(data={
+            'sampleDate': [d.strftime("%Y-%m-%d %H:%M") for d in dates],
+            'risk'      : [float((i*7)%5) if i%11 else np.nan for i in range(72)],
+            'wet'       : [(i*3)%4 for i in range(72)]})
+        return
+    def tearDown(self) -> None:
+        return
+
+    def get_rules_hub(self):
+        rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+        rules_hub.add_variable("debug", content=False, is_immutable=True)
+        return rules_hub
+
+    def test_0(self):
+        aggregates = [('risk', 'max'), ('risk', 'sum'), ('risk', 'mean'), ('wet', 'max')]
+        daily_data = DailyCompaction().get_aggregates(data=self.data, aggregates=aggregates)
+        expected   = self.data.assign(date=self.data['sampleDate'].str[:10]).groupby('date')
+        self.assertListEqual(['2024-01-01', '2024-01-02', '2024-01-04'], daily_data['date'].to_list())
+        for t, f in aggregates:
+            np.testing.assert_array_equal(expected[t].agg(f).values, daily_data[f'{t}_{f}'].values)
+        self.assertEqual('int64', str(daily_data['wet_max'].dtype))
+        return
+
+    def test_1(self):
+        daily_compaction = DailyCompaction()
+        daily_compaction.add_requests([('risk', 'max'), ('wet', 'sum'), ('missing', 'max')])
+        daily_compaction.get_aggregates(data=self.data, aggregates=[('risk', 'max')])
+        self.assertListEqual([('risk', 'max'), ('wet', 'sum')], list(daily_compaction.aggregates))
+
+        cached = dict(daily_compaction.aggregates)
+        daily_compaction.get_aggregates(data=self.data.copy(), aggregates=[('wet', 'sum'), ('risk', 'max')])
+        self.assertTrue(all([cached[a] is daily_compaction.aggregates[a] for a in cached]))
+
+        data = self.data.copy()
+        data.loc[0, 'wet'] = 10
+        daily_data = daily_compaction.get_aggregates(data=data, aggregates=[('wet', 'sum')])
+        self.assertIs(cached[('risk', 'max')], daily_compaction.aggregates[('risk', 'max')])
+        self.assertEqual(self.data['wet'].iloc[:24].sum()+10, daily_data['wet_sum'].iloc[0])
+        return
+
+    def test_2(self):
+        results = list()
+        for is_shared in [False, True]:
+            rules_hub    = self.get_rules_hub()
+            output_rules = [
+                SelectMaxAndCompare(column='infection', target='risk', condition='goet3.0', ref=0),
+                SimpleOutputRule(column='risk_max', target='risk', select_fnc='max')]
+            daily_compaction = DailyCompaction()
+            for r in output_rules:
+                r.set_rules_hub(rules_hub)
+                if is_shared:
+                    r.set_daily_compaction(daily_compaction)
+                    daily_compaction.add_requests(r.get_daily_aggregates())
+            compact_data, data = None, self.data.iloc[:48].copy()
+            for r in output_rules:
+                compact_data, data = r.evaluate(data=data)
+            results.append((compact_data, data))
+            if is_shared:
+                self.assertListEqual([('risk', 'max')], list(daily_compaction.aggregates))
+        pd.testing.assert_frame_equal(results[0][0], results[1][0])
+        pd.testing.assert_frame_equal(results[0][1], results[1][1])
+        self.assertListEqual(['max_inner_column', 'sampleDate', 'risk', 'risk_max'], results[1][0].columns.to_list())
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -153,5 +153,51 @@ class TestDatetimeParser(unittest.TestCase):
                 result = self.parser.parse_single(input_date)
                 self.assertEqual(result, expected)
 
+    # Test parse_batch gives the same results of parse_single, with formats detected on the batch
+    def test_parse_batch_list_same_as_single(self):
+        date_lists = [
+            [f"2023-01-{d:02d} {h:02d}:00" for d in range(1, 29) for h in range(24)],
+            ["01-01-2021", "01-02-2021", "13-02-2021", "12-31-2021"],
+            ["2024-01-01T12:00:00+02:00", "2024-01-01T13:00:00+02:00", "2024-01-01T14:00:00.500000+02:00"],
+            ["2024-01-01T12:00:00+02:00", "2024-01-01T13:00:00Z", "2024-01-01T14:00:00"],
+            ["2024-01-01 12:00", "January 3, 2024 09:15 AM", "2024-01-05 10:30"]]
+        for date_list in date_lists:
+            with self.subTest(date_list=date_list[:3]):
+                expected = [self.parser.parse_single(d) for d in date_list]
+                self.assertEqual(DatetimeParser.parse_batch(date_list), expected)
+
+    # Test parse_series keeps null values and raises on not valid dates
+    def test_parse_series_nulls_and_invalid(self):
+        result = self.parser.parse_series(pd.Series(["2024-01-01", None, "2024-01-03"]))
+        self.assertEqual(result.tolist(), ["2024-01-01T00:00:00.000000+0000", None, "2024-01-03T00:00:00.000000+0000"])
+        with self.assertRaises(DateParsingException):
+            self.parser.parse_series(pd.Series(["2024-01-01", "2024-01-02", "not a date"]))
+
+    # Test parse_batch restricted to the detected date columns
+    def test_parse_batch_dataframe_date_columns(self):
+        df          = pd.DataFrame([{"sampledate": "2024-01-01 12:00", "station": "north", "temperature": 20.0}])
+        expected_df = pd.DataFrame([{"sampledate": "2024-01-01T12:00:00.000000+0000", "station": "north", "temperature": 20.0}])
+        self.assertEqual(self.parser.get_date_columns(df), ["sampledate"])
+        with self.assertRaises(DateParsingException):
+            DatetimeParser.parse_batch(df.copy())
+        result_df   = DatetimeParser.parse_batch(df, columns=self.parser.get_date_columns(df))
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    # Test parse_timeline gives the datetimes of parse_series, keeping the timezone, and raises on mixed timezones
+    def test_parse_timeline_same_as_series(self):
+        date_lists = [
+            [f"2023-01-{d:02d} {h:02d}:00" for d in range(1, 29) for h in range(24)],
+            ["01-01-2021", "01-02-2021", None, "12-31-2021"],
+            ["2024-01-01T12:00:00+02:00", "2024-01-01T13:00:00+02:00", "2024-01-01T14:00:00.500000+02:00"],
+            ["2024-01-01 12:00", "January 3, 2024 09:15 AM", "2024-01-05 10:30"]]
+        for date_list in date_lists:
+            with self.subTest(date_list=date_list[:3]):
+                s        = pd.Series(date_list)
+                expected = pd.to_datetime(self.parser.parse_series(s), format='ISO8601')
+                pd.testing.assert_series_equal(self.parser.parse_timeline(s), expected)
+        self.assertEqual(str(self.parser.parse_timeline(pd.Series(date_lists[2])).dt.tz), 'UTC+02:00')
+        with self.assertRaises(ValueError):
+            self.parser.parse_timeline(pd.Series(["2024-01-01T12:00:00+02:00", "2024-01-01T13:00:00Z"]))
+
 if __name__ == '__main__':
     unittest.main(argv=[''], exit=False)
\ No newline at end of file
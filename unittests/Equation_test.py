@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from mosaic_framework.core.math_factors import Equation
+from mosaic_framework.core.math_utils import compile_expression
+from mosaic_framework.core.comparative_factors import SimpleComparativeRule, AndComparativeAgroRule
+from mosaic_framework.core.reflection_factors import ReflectiveCondition
+from mosaic_framework.core.exceptions import ComplexValueError, ExpressionFormatError, UnsupportedFunctionError
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+import mosaic_framework.core.reflection as reflection
+
+class TestEquation(unittest.TestCase):
+    """
+    Testing Equation:
+        test_0: tests 'vectorized' mode against 'reference' mode, on random data and several equations.
+        test_1: tests that a complex result raises ComplexValueError, only on active rows.
+        test_2: tests that not supported expressions raise ExpressionFormatError.
+        test_3: tests reflective equations (on values and on condition), 'vectorized' mode against 'reference' mode.
+        test_4: tests sign, abs, round and pow, 'vectorized' mode against 'reference' mode, and that equations 
+            calling not mapped functions (eg. np.exp) are evaluated as 'reference'.
+        test_5: tests reflective equations on a condition, JIT-compiled recurrence (numba) against the NumPy one.
+    """
+    def setUp(self) -> None:
+        self.rules_hub_config      = MODEL.get("data").get("rules_hub")
+        self.rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+        self.rules_hub.add_variable("debug", content=False, is_immutable=True)
+        rng = np.random.default_rng(seed=0)
+        self.data = pd.DataFrame(data={
+            'sampleDate': [str(i) for i in range(200)], 
+            'temp'      : rng.uniform(low=-5.0, high=35.0, size=200),
+            'hum'       : rng.uniform(low=30.0, high=100.0, size=200)})
+        return 
+    def tearDown(self) -> None:
+        return
+    
+    def get_rule(self, apply:str, **kwargs) -> Equation:
+        rule = Equation(column=kwargs.pop('column', 'out_column'), target=kwargs.pop('target', ['temp', 'hum']), apply=apply, **kwargs)
+        rule.set_rules_hub(self.rules_hub)
+        for r in [rule.on_condition] + getattr(rule.on_condition, 'rules', []):
+            if hasattr(r, 'set_rules_hub'):
+                r.set_rules_hub(self.rules_hub)
+        return rule
+
+    def test_0(self):
+        equations = [
+            '(1-(<hum>/100))*6.11*(CONSTANT_E)^((17.47*<temp>)/(239+<temp>))',
+            '(-14.035 + 15.217*<temp> - 0.586*<temp>*<temp> + 0.852*<hum>)/100.0',
+            'max([<temp>, <hum>/4]) - min(<temp>, 0)',
+            'sin(<temp>) + arctan(<hum>) + mean([<temp>, <hum>])',
+            '<temp> > 10']
+        for apply in equations:
+            with self.subTest(apply=apply):
+                results = {m: self.get_rule(apply=apply, evaluation_mode=m).evaluate(data=self.data) for m in ['vectorized', 'reference']}
+                np.testing.assert_allclose(results['vectorized']['out_column'].values, results['reference']['out_column'].values, rtol=1e-12)
+        return
+    def test_1(self):
+        rule = self.get_rule(apply='<temp>^0.5')
+        with self.assertRaises(ComplexValueError):
+            rule.evaluate(data=self.data)
+        rule = self.get_rule(apply='<temp>^0.5', on_condition=SimpleComparativeRule(target='temp', condition='goet0.0', is_implicit=True))
+        result = rule.evaluate(data=self.data)
+        expected = np.where(self.data['temp'].values >= 0.0, np.sqrt(self.data['temp'].clip(lower=0.0).values), 0.0)
+        np.testing.assert_allclose(result['out_column'].values, expected, rtol=1e-12)
+        return
+    def test_2(self):
+        for apply in ['__import__("os")', '<temp>.real', '<temp>.__class__(1)', '(lambda x: x)(<temp>)', '<temp> +']:
+            with self.subTest(apply=apply):
+                with self.assertRaises(ExpressionFormatError):
+                    self.get_rule(apply=apply).evaluate(data=self.data)
+        return
+    def test_3(self):
+        cases = {
+            'on_values'   : lambda m: self.get_rule(
+                apply='<out_column>*0.5+<temp>', column='out_column', target=['out_column[-1]', 'out_column[-2]', 'temp'], evaluation_mode=m),
+            'on_condition': lambda m: self.get_rule(
+                apply='<out_column>+<hum>/100', column='out_column', target=['out_column[-1]', 'hum'], evaluation_mode=m,
+                on_condition=AndComparativeAgroRule(is_implicit=True, rules=[
+                    ReflectiveCondition(target='out_column', ref=1, condition='lt10.0'),
+                    SimpleComparativeRule(target='temp', condition='goet5.0', is_implicit=True)]))}
+        for case, get_rule in cases.items():
+            with self.subTest(case=case):
+                results = {m: get_rule(m).evaluate(data=self.data) for m in ['vectorized', 'reference']}
+                np.testing.assert_allclose(results['vectorized']['out_column'].values, results['reference']['out_column'].values, rtol=1e-12)
+                self.assertGreater(np.count_nonzero(results['vectorized']['out_column'].values), 0)
+        return
+    def test_4(self):
+        self.assertListEqual(['a'], compile_expression('(0.5*(1+sign(<a>-5)))').columns)
+        equations = [
+            '(0.5*(1+sign(<temp>-5)))*<hum>',
+            'abs(<temp>) + round(<hum>/3, 1)',
+            'pow(abs(<temp>), 0.5) + pow(<hum>, 2)']
+        for apply in equations:
+            with self.subTest(apply=apply):
+                results = {m: self.get_rule(apply=apply, evaluation_mode=m).evaluate(data=self.data) for m in ['vectorized', 'reference']}
+                np.testing.assert_allclose(results['vectorized']['out_column'].values, results['reference']['out_column'].values, rtol=1e-12)
+        
+        #Not mapped functions are evaluated row by row, also in reflective equations.
+        with self.assertRaises(UnsupportedFunctionError):
+            compile_expression('np.exp(<temp>/10)')
+        rule   = self.get_rule(apply='np.exp(<temp>/10) + sign(<hum>-50)')
+        result = rule.evaluate(data=self.data)
+        self.assertEqual('reference', rule.get_evaluation_mode())
+        np.testing.assert_allclose(result['out_column'].values, np.exp(self.data['temp'].values/10) + np.sign(self.data['hum'].values-50), rtol=1e-12)
+        results = {m: self.get_rule(apply='<out_column>*0.5+np.log1p(abs(<temp>))', column='out_column', 
+            target=['out_column[-1]', 'temp'], evaluation_mode=m).evaluate(data=self.data) for m in ['vectorized', 'reference']}
+        np.testing.assert_allclose(results['vectorized']['out_column'].values, results['reference']['out_column'].values, rtol=1e-12)
+        return
+
+    @unittest.skipUnless(reflection.njit is not None, "numba is not installed.")
+    def test_5(self):
+        jit_min_rows = reflection.JIT_MIN_ROWS
+        equations    = ['<out_column>*0.5+<temp>', 'sin(<out_column>)+arctan(<hum>)*<temp>']
+        try:
+            for apply in equations:
+                with self.subTest(apply=apply):
+                    self.assertIsNotNone(reflection.get_jit_recurrence(expression=compile_expression(apply), reflective_column='out_column'))
+                    results = dict()
+                    for recurrence, min_rows in [('jit', 0), ('numpy', len(self.data)+1)]:
+                        reflection.JIT_MIN_ROWS = min_rows
+                        results[recurrence]     = self.get_rule(
+                            apply=apply, column='out_column', target=['out_column[-1]', 'out_column[-2]', 'temp', 'hum'], 
+                            on_condition=SimpleComparativeRule(target='hum', condition='goet50.0', is_implicit=True)).evaluate(data=self.data)
+                    np.testing.assert_allclose(results['jit']['out_column'].values, results['numpy']['out_column'].values, rtol=1e-12)
+                    self.assertGreater(np.count_nonzero(results['jit']['out_column'].values), 0)
+        finally:
+            reflection.JIT_MIN_ROWS = jit_min_rows
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import unittest
+
+from mosaic_framework.core.evaluation_frame import evaluation_context, get_evaluation_frame, get_timeline, get_days, TIMELINE_ATTR
+from mosaic_framework.core.output_model import OutputModel
+from mosaic_framework.core.comparative_factors import SimpleComparativeRule
+from mosaic_framework.core.math_factors import Equation
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+
+class TestEvaluationFrame(unittest.TestCase):
+    """
+    Testing get_evaluation_frame and evaluation_context:
+        test_0: tests that the evaluation frame can be modified without side effects, with and without copy-on-write.
+        test_1: tests that rules evaluated in evaluation_context do not modify the columns of their input and give the same results.
+        test_2: tests that the timeline is attached once, follows copies and merges, and is rebuilt when the date column changes.
+        test_3: tests that OutputModel.prepare formats dates once and attaches their timeline, keeping the wall clock of the source.
+    """
+    def setUp(self) -> None:
+        self.rules_hub_config      = MODEL.get("data").get("rules_hub")
+        self.rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+        self.rules_hub.add_variable("debug", content=False, is_immutable=True)
+        self.data = pd.DataFrame(data={
+            'sampleDate': [f"2024-01-01 0{i}:00" for i in range(6)], 
+            'temp'      : [20.0, 10.0, 10.0, 16.0, 14.0, 30.0],
+            'hum'       : [60.0, 80.0, 50.0, 90.0, 20.0, 10.0]})
+        return 
+    def tearDown(self) -> None:
+        return
+
+    def test_0(self):
+        for context in [evaluation_context, lambda: pd.option_context('mode.copy_on_write', False)]:
+            with context():
+                data  = self.data.copy()
+                frame = get_evaluation_frame(data)
+                frame.loc[0, 'temp'] = -1.0
+                frame['new_column']  = 1.0
+                self.assertEqual(20.0, data.loc[0, 'temp'])
+                self.assertListEqual(['sampleDate', 'temp', 'hum'], data.columns.to_list())
+        return
+    def test_1(self):
+        def get_rules():
+            rules = [
+                SimpleComparativeRule(column='hot', target='temp', condition='goet15.0'),
+                Equation(column='acc', target=['acc[-1]', 'hum'], apply='<acc>+<hum>', evaluation_mode='reference')]
+            for r in rules:
+                r.set_rules_hub(self.rules_hub)
+            return rules
+        results = list()
+        for context in [evaluation_context, lambda: pd.option_context('mode.copy_on_write', False)]:
+            with context():
+                data = self.data.copy()
+                updt_data = data
+                for r in get_rules():
+                    updt_data = r.evaluate(data=updt_data)
+                pd.testing.assert_frame_equal(self.data, data[self.data.columns])
+                results.append(updt_data)
+        pd.testing.assert_frame_equal(results[0], results[1])
+        return
+
+    def test_2(self):
+        with evaluation_context():
+            data     = self.data.copy()
+            timeline = get_timeline(data)
+            self.assertEqual('UTC', str(timeline.dt.tz))
+            self.assertListEqual(list(range(6)), timeline.dt.hour.to_list())
+            cached   = data.attrs[TIMELINE_ATTR]['sampleDate']
+            get_timeline(data)
+            self.assertIs(cached, data.attrs[TIMELINE_ATTR]['sampleDate'])
+
+            frame = get_evaluation_frame(data)
+            frame['new_column'] = 1.0
+            frame = pd.merge(frame, data[['sampleDate']], on='sampleDate', how='left')
+            get_timeline(frame)
+            self.assertIs(cached, frame.attrs[TIMELINE_ATTR]['sampleDate'])
+
+            frame['sampleDate'] = [f"2024-01-02 0{i}:00" for i in range(6)]
+            self.assertListEqual(['2024-01-02']*6, get_days(frame).to_list())
+            self.assertListEqual(['2024-01-01']*6, get_days(data).to_list())
+            self.assertIsNot(frame.attrs[TIMELINE_ATTR]['sampleDate'], data.attrs[TIMELINE_ATTR]['sampleDate'])
+        return
+    def test_3(self):
+        data = pd.DataFrame(data={
+            'sampleDate': [d.strftime("%Y-%m-%dT%H:%M:%S+02:00") for d in pd.date_range('2024-01-01', periods=72, freq='h')],
+            'temp'      : [10.0+i for i in range(72)]})
+        output_model = OutputModel(
+            label='test_timeline',
+            previsionDay=pd.to_datetime('2024-01-02T00:00:00+02:00'),
+            days=1,
+            data=data,
+            history=(1,0,0),
+            rules_hub=self.rules_hub)
+        prep_data = output_model.prepare()
+        cached    = prep_data.attrs[TIMELINE_ATTR]['sampleDate']
+        timeline  = get_timeline(prep_data)
+        self.assertEqual(72, len(prep_data))
+        self.assertEqual("2024-01-01 00:00", prep_data['sampleDate'].iloc[0])
+        self.assertEqual(pd.Timestamp('2024-01-01T00:00:00+02:00'), timeline.iloc[0])
+        self.assertIs(cached, prep_data.attrs[TIMELINE_ATTR]['sampleDate'])
+        self.assertListEqual(['2024-01-01']*24+['2024-01-02']*24+['2024-01-03']*24, get_days(prep_data).to_list())
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import subprocess
+import unittest
+import sys
+
+from mosaic_framework.engine.version import get_framework_version
+
+class TestLazyImport(unittest.TestCase):
+    """
+    Testing lazy imports of mosaic_framework:
+        test_0: tests that importing MosaicEngine does not import boto3, requests, openpyxl and pkg_resources.
+        test_1: tests that the framework version is read from the package metadata.
+    """
+    def setUp(self) -> None:
+        return
+    def tearDown(self) -> None:
+        return
+
+    def test_0(self):
+        script = (
+            "import sys\n"
+            "import mosaic_framework.engine.mosaic_engine\n"
+            "print([m for m in ['boto3', 'botocore', 'requests', 'openpyxl', 'pkg_resources'] if m in sys.modules])\n")
+        output = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True).stdout
+        self.assertEqual(output.strip(), "[]")
+        return
+
+    def test_1(self):
+        self.assertNotEqual(get_framework_version(), 'unknown')
+        self.assertIs(get_framework_version(), get_framework_version())
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+import unittest
+import datetime
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from mosaic_framework.data_storage.data_storage import MosaicDataStorage
+from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.data_storage.writers import is_feather_available
+from mosaic_framework.data_storage.exceptions import StorageBackendNotFoundException, ResourceNotFoundException, ReaderClassNotFoundException, FormatNotAvailableException, DataFormatException
+from mosaic_framework.data_storage.backends import find_cls
+from mosaic_framework.config.configuration import READERS_MAPPING, WRITERS_MAPPING
+import mosaic_framework.data_storage.readers
+import mosaic_framework.data_storage.writers
+
+class MosaicDataStorageTest(unittest.TestCase):
+    maxDiff = None  
+
+    """
+    Testing MosaicDataStorage backends:
+        test_0: raw resources (txt, py, json, csv) are read the same with the 'file' and the 'memory' backend.
+        test_1: 'memory' backend keeps DataFrames of binary formats as they are, each read gets its own copy, DataFrames in csv are read as the file.
+        test_2: replaced and removed resources, deallocation and not available backend.
+        test_3: resources are replaced in place, by label, with both backends.
+        test_4: DataFrames written as npz keep dtypes, index and null values.
+        test_5: DataFrames written as feather keep dtypes and index (needs pyarrow).
+        test_6: rows of DataFrames are appended to the resource with the same label, with both backends, rows
+            with other columns are rejected.
+        test_7: readers and writers are found by name, for each file type, a missing one raises an error.
+        test_8: DataFrames with object and extension columns written as npz are read without pickle, objects
+            that cannot be written as strings raise an error.
+    """
+
+    def setUp(self) -> None:
+        self.resources = [
+            Resource(label="input_file_name", data="test_0", file_type="txt"),
+            Resource(label="lines", data="first\nsecond\r\nthird\n", file_type="txt"),
+            Resource(label="model", data="import mosaic_framework\n\nsource = Source()\n", file_type="py"),
+            Resource(label="source_json", data=json.dumps({'data': [{'sampleDate': '2024-01-01 00:00', 'temp': 1.5}]}).encode('utf-8'), file_type="json"),
+            Resource(label="source_csv", data=b"sampleDate,temp\n2024-01-01 00:00,1.5\n2024-01-01 01:00,\n", file_type="csv")]
+        return 
+    def tearDown(self) -> None:
+        return
+
+    def test_0(self):
+        data = dict()
+        for backend in ['file', 'memory']:
+            data_storage = MosaicDataStorage(DEBUG=False, backend=backend)
+            data_storage.allocate()
+            for r in self.resources:
+                data_storage.add_resource(resource=Resource(label=r.label, data=r.data, file_type=r.file_type))
+            data[backend] = {r.label: data_storage.get_resource(label=r.label).get_data() for r in self.resources}
+            data_storage.deallocate()
+        for r in self.resources:
+            if r.file_type == 'csv':
+                pd.testing.assert_frame_equal(data['file'][r.label], data['memory'][r.label])
+            else:
+                self.assertEqual(data['file'][r.label], data['memory'][r.label])
+        self.assertListEqual(["first\n", "second\n", "third\n"], data['memory']['lines'])
+        return
+
+    def test_1(self):
+        data_storage = MosaicDataStorage(DEBUG=False, backend='memory')
+        data_storage.allocate()
+        results      = pd.DataFrame(data={'sampleDate': ['2024-01-01 00:00'], 'infection': [True]}, index=[5])
+        data_storage.add_resource(resource=Resource(label="model_results", data=results, file_type="npz"))
+        data         = data_storage.get_resource(label="model_results").get_data()
+        pd.testing.assert_frame_equal(results, data)
+        data['infection'] = False
+        pd.testing.assert_frame_equal(results, data_storage.get_resource(label="model_results").get_data())
+        self.assertIsNone(data_storage.path)
+        data_storage.deallocate()
+
+        csv_data = dict()
+        results  = pd.DataFrame(data={'sampleDate': pd.to_datetime(['2024-01-01 00:00']), 'infection': [1.0]})
+        for backend in ['file', 'memory']:
+            data_storage = MosaicDataStorage(DEBUG=False, backend=backend)
+            data_storage.allocate()
+            data_storage.add_resource(resource=Resource(label="model_results", data=results, file_type="csv"))
+            csv_data[backend] = data_storage.get_resource(label="model_results").get_data()
+            data_storage.deallocate()
+        pd.testing.assert_frame_equal(csv_data['file'], csv_data['memory'])
+        self.assertEqual(object, csv_data['memory']['sampleDate'].dtype)
+        return
+
+    def test_2(self):
+        data_storage = MosaicDataStorage(DEBUG=False, backend='memory')
+        data_storage.allocate()
+        data_storage.add_resource(resource=Resource(label="source_json", data=b'{"data": [{"temp": 1}]}', file_type="json"))
+        self.assertListEqual([{'temp': 1}], data_storage.get_resource(label="source_json").get_data())
+        data_storage.replace_resource(new_resource=Resource(label="source_json", data=b'{"data": [{"temp": 2}]}', file_type="json"))
+        self.assertListEqual([{'temp': 2}], data_storage.get_resource(label="source_json").get_data())
+        data_storage.remove_resource(label="source_json")
+        self.assertIsNone(data_storage.get_resource(label="source_json"))
+        self.assertTrue(data_storage.deallocate())
+        self.assertDictEqual({}, data_storage.backend.content)
+        with self.assertRaises(StorageBackendNotFoundException):
+            MosaicDataStorage(DEBUG=False, backend='s3')
+        return
+
+    def test_3(self):
+        for backend in ['file', 'memory']:
+            data_storage = MosaicDataStorage(DEBUG=False, backend=backend)
+            data_storage.allocate()
+            for r in self.resources:
+                data_storage.add_resource(resource=Resource(label=r.label, data=r.data, file_type=r.file_type))
+            old_resource = data_storage.get_resource(label="source_csv")
+            new_resource = Resource(label="source_csv", data=pd.DataFrame(data={'temp': [2.5]}), file_type="csv")
+            data_storage.replace_resource(new_resource=new_resource)
+            self.assertIs(new_resource, data_storage.get_resource(label="source_csv"))
+            self.assertListEqual([r.label for r in self.resources], list(data_storage.content.keys()))
+            #Resources kept by the Components (eg. in connectors) get the new data too.
+            self.assertListEqual([2.5], old_resource.get_data()['temp'].to_list())
+            data_storage.replace_resource(new_resource=Resource(label="source_json", data=pd.DataFrame(data={'temp': [3.5]}), file_type="csv"))
+            self.assertListEqual([3.5], data_storage.get_resource(label="source_json").get_data()['temp'].to_list())
+            if backend == 'file':
+                self.assertListEqual(sorted(["input_file_name.txt", "lines.txt", "model.py", "source_csv.csv", "source_json.csv"]), sorted(os.listdir(data_storage.path)))
+            with self.assertRaises(ResourceNotFoundException):
+                data_storage.replace_resource(new_resource=Resource(label="missing", data=b"", file_type="csv"))
+            data_storage.deallocate()
+        return
+
+    def get_results(self):
+        return pd.DataFrame(data={
+            'sampleDate': ['2024-01-01 00:00', '2024-01-01 01:00', None],
+            'risk'      : [0.1+0.2, np.nan, 3.0],
+            'hours'     : [1, 2, 3],
+            'infection' : [True, False, True],
+            'level'     : pd.array([1, None, 2], dtype='Int64')}, index=[4, 5, 6])
+
+    def test_4(self):
+        results = self.get_results()
+        for backend in ['file', 'memory']:
+            data_storage = MosaicDataStorage(DEBUG=False, backend=backend)
+            data_storage.allocate()
+            data_storage.add_resource(resource=Resource(label="model_results", data=results, file_type="npz"))
+            pd.testing.assert_frame_equal(results, data_storage.get_resource(label="model_results").get_data())
+            data_storage.deallocate()
+        return
+
+    @unittest.skipUnless(is_feather_available(), "pyarrow is not installed.")
+    def test_5(self):
+        results = self.get_results()
+        data_storage = MosaicDataStorage(DEBUG=False, backend='file')
+        data_storage.allocate()
+        data_storage.add_resource(resource=Resource(label="model_results", data=results, file_type="feather"))
+        pd.testing.assert_frame_equal(results, data_storage.get_resource(label="model_results").get_data())
+        data_storage.deallocate()
+        return
+
+    def test_6(self):
+        results = self.get_results()
+        for file_type in ['csv', 'npz']:
+            data = list()
+            for backend in ['file', 'memory']:
+                data_storage = MosaicDataStorage(DEBUG=False, backend=backend)
+                data_storage.allocate()
+                for chunk in [results.iloc[:2], results.iloc[2:]]:
+                    data_storage.append_resource(resource=Resource(label="model_results", data=chunk, file_type=file_type))
+                with self.assertRaises(DataFormatException):
+                    data_storage.append_resource(resource=Resource(label="model_results", data=results.iloc[2:][['hours', 'risk']], file_type=file_type))
+                self.assertListEqual(["model_results"], list(data_storage.content.keys()))
+                data.append(data_storage.get_resource(label="model_results").get_data())
+                if backend == 'file':
+                    self.assertListEqual(["model_results."+file_type], os.listdir(data_storage.path))
+                data_storage.deallocate()
+            pd.testing.assert_frame_equal(data[0], data[1])
+            if file_type == 'npz':
+                pd.testing.assert_frame_equal(results, data[1])
+            else:
+                self.assertListEqual([1, 2, 3], data[1]['hours'].to_list())
+        return
+
+    def test_7(self):
+        for mapping, module in [(READERS_MAPPING, mosaic_framework.data_storage.readers), (WRITERS_MAPPING, mosaic_framework.data_storage.writers)]:
+            for file_type, cls_string in mapping.items():
+                self.assertEqual(cls_string, find_cls(module=module, cls_string=cls_string, exception=ReaderClassNotFoundException).__name__)
+        with self.assertRaises(ReaderClassNotFoundException):
+            find_cls(module=mosaic_framework.data_storage.readers, cls_string='ParquetReader', exception=ReaderClassNotFoundException)
+        return
+    def test_8(self):
+        results = self.get_results().assign(**{
+            'phase'     : pd.Categorical(['BBCH 10', 'BBCH 60', 'BBCH 10']),
+            'localDate' : pd.date_range('2024-03-30 23:00', periods=3, freq='h', tz='Europe/Rome'),
+            'warning'   : pd.array([True, None, False], dtype='boolean'),
+            'mixed'     : ['high', 1.5, None],
+            'details'   : [[1, 2], {'gdd': 120.0}, datetime.date(2024, 1, 2)]})
+        data_storage = MosaicDataStorage(DEBUG=False, backend='file')
+        data_storage.allocate()
+        data_storage.add_resource(resource=Resource(label="model_results", data=results, file_type="npz"))
+        with np.load(data_storage.path + "/model_results.npz", allow_pickle=False) as arrays:
+            self.assertTrue(all([arrays[key].dtype != object for key in arrays.files]))
+        pd.testing.assert_frame_equal(results, data_storage.get_resource(label="model_results").get_data())
+        with self.assertRaises(FormatNotAvailableException):
+            data_storage.add_resource(resource=Resource(label="other_results", data=results.assign(details=[object()]*3), file_type="npz"))
+        self.assertFalse(os.path.exists(data_storage.path + "/other_results.npz"))
+        data_storage.deallocate()
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,10 +1,15 @@
+import gc
 import inspect
+import types
 import unittest
 import os
 import json
 import shutil
+import pandas as pd
 
-from mosaic_framework.engine.mosaic_engine import MosaicEngine
+from mosaic_framework.engine.mosaic_engine import MosaicEngine, _PREPARED_OBJECTS
+from mosaic_framework.engine.exceptions import RequestInputException
+from mosaic_framework.model.incremental_state import IncrementalState
 
 class MosaicEngineTest(unittest.TestCase):
     maxDiff = None  
@@ -19,6 +24,25 @@ class MosaicEngineTest(unittest.TestCase):
             -   Parsing:   active
             -   Colture:   not active
             -   Validator: not active
+        test_2: MosaicPipeline in batch mode, with a failing input that does not stop the others.
+        test_3: MosaicPipeline in batch mode, same results with the 'file' and the 'memory' storage backends.
+        test_4: MosaicPipeline with incremental evaluation, a run gives the results of the new days of a field, appended 
+            to the results of the previous run as if all the data were evaluated at once, a changed model file is 
+            evaluated from scratch.
+        test_5: MosaicPipeline with the result cache, the same data get the cached results, other data are
+            evaluated, and the least recently used results are removed beyond the size of the cache.
+        test_6: MosaicPipeline prepared once and executed on each request (warm AWS Lambda invocations), 
+            requests skip the setup, bind their own input (not written, nor read by other requests) and do not 
+            change the prepared objects.
+        test_7: MosaicPipeline with incremental evaluation of two fields sharing the state folder, each field
+            gets the results of its own data, as a field with the input file of another one.
+        test_8: MosaicPipeline with streaming evaluation, results appended chunk by chunk are the ones of the
+            batch evaluation, with both storage backends and results formats, a model with more outputs is rejected.
+        test_9: MosaicPipeline with incremental evaluation of rules carrying a state from the start of the data 
+            (cumulated GDD, reflective equation, break on condition, susceptibility), going on from the states 
+            carried over, of two fields requesting the same input file, each one with its own state.
+        test_10: MosaicPipeline prepared once and executed on many requests, the prepared objects and their number
+            are the same after the requests (nothing of a request is kept).
     """
 
     def setUp(self) -> None:
@@ -74,6 +98,281 @@ class MosaicEngineTest(unittest.TestCase):
         
         return
 
+    def test_2(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        shutil.copy("data/test_0.json", "data/test_0_field_2.json")
+        #Run Engine in batch mode
+        engine  = MosaicEngine(input_file="test_0.py", DEBUG=False)
+        results = engine.run_batch(sources=["test_0.json", "test_0_field_2.json", "missing.json"], max_workers=2)
+
+        self.assertListEqual(["test_0.json", "test_0_field_2.json", "missing.json"], list(results.keys()))
+        self.assertListEqual(["success", "success", "failed"], [r['status'] for r in results.values()])
+        self.assertIn("missing.json", results["missing.json"]['error'])
+        self.assertListEqual(["agro_model_results", "agro_model_compact_results"], list(results["test_0.json"]['results'].keys()))
+        for label, data in results["test_0.json"]['results'].items():
+            pd.testing.assert_frame_equal(data, results["test_0_field_2.json"]['results'][label])
+        return
+
+    def test_3(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        results = dict()
+        for storage_backend in ['file', 'memory']:
+            engine  = MosaicEngine(input_file="test_0.py", DEBUG=False, storage_backend=storage_backend)
+            results[storage_backend] = engine.run_batch(sources=["test_0.json"])["test_0.json"]['results']
+        for label, data in results['file'].items():
+            #Results are written in a binary format that keeps dtypes and index.
+            pd.testing.assert_frame_equal(data, results['memory'][label])
+        return
+
+    def test_4(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("data/test_0.json", "r") as data_f:
+            data = json.load(data_f)['data']
+        #Each run of the field gets the last 200 days, in the same input file.
+        with open("data/test_4_field.json", "w") as data_f:
+            json.dump({'data': data[:200]}, data_f)
+
+        full_results = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_0.json"])["test_0.json"]['results']
+        MosaicEngine(input_file="test_4.py", DEBUG=False).run_batch(sources=["test_4_field.json"])
+        self.assertEqual(len([f for f in os.listdir("state") if f.endswith("_state.json")]), 1)
+        with open("data/test_4_field.json", "w") as data_f:
+            json.dump({'data': data[165:]}, data_f)
+        results = MosaicEngine(input_file="test_4.py", DEBUG=False).run_batch(sources=["test_4_field.json"])["test_4_field.json"]['results']
+        for label, data in full_results.items():
+            self.assertLess(len(results[label]), len(data))
+            pd.testing.assert_frame_equal(data.loc[results[label].index], results[label])
+        #Results of all the runs are kept in the state.
+        state_file = [f for f in os.listdir("state") if f.endswith("_state.json")][0]
+        with open(f"state/{state_file}", "r") as state_f:
+            model_hash = json.load(state_f)['model_hash']
+        state = IncrementalState(path="state", label=state_file[:-len("_state.json")], model_hash=model_hash)
+        self.assertTrue(state.load(outputs=['infection']))
+        for label, data in zip(full_results.keys(), state.get_results()):
+            pd.testing.assert_frame_equal(full_results[label], data)
+
+        with open("models/test_4.py", "a") as model_f:
+            model_f.write("\n#model file changed\n")
+        second_results = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_4_field.json"])["test_4_field.json"]['results']
+        results        = MosaicEngine(input_file="test_4.py", DEBUG=False).run_batch(sources=["test_4_field.json"])["test_4_field.json"]['results']
+        for label, data in second_results.items():
+            pd.testing.assert_frame_equal(data, results[label])
+        return
+
+    def test_5(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("data/test_0.json", "r") as data_f:
+            data = json.load(data_f)['data']
+        with open("data/test_5_other.json", "w") as data_f:
+            json.dump({'data': data[:200]}, data_f)
+
+        full_results = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_0.json"])["test_0.json"]['results']
+        MosaicEngine(input_file="test_5.py", DEBUG=False).run_batch(sources=["test_0.json"])
+        self.assertEqual(len(os.listdir("cache")), 1)
+        results = MosaicEngine(input_file="test_5.py", DEBUG=False).run_batch(sources=["test_0.json"])["test_0.json"]['results']
+        self.assertEqual(len(os.listdir("cache")), 1)
+        for label, data in full_results.items():
+            pd.testing.assert_frame_equal(data, results[label])
+
+        other_results = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_5_other.json"])["test_5_other.json"]['results']
+        results       = MosaicEngine(input_file="test_5.py", DEBUG=False).run_batch(sources=["test_5_other.json"])["test_5_other.json"]['results']
+        self.assertEqual(len(os.listdir("cache")), 2)
+        for label, data in other_results.items():
+            pd.testing.assert_frame_equal(data, results[label])
+
+        #Results larger than the cache are not kept.
+        with open("models/test_5.py", "r") as model_f:
+            model = model_f.read()
+        with open("models/test_5.py", "w") as model_f:
+            model_f.write(model.replace("result_cache='active',", "result_cache='active', cache_size=0,"))
+        MosaicEngine(input_file="test_5.py", DEBUG=False).run_batch(sources=["test_0.json"])
+        self.assertEqual(len(os.listdir("cache")), 0)
+        return
+
+    def test_6(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("data/test_0.json", "r") as data_f:
+            data = json.load(data_f)['data']
+        with open("data/test_6_other.json", "w") as data_f:
+            json.dump({'data': data[:200]}, data_f)
+        full_results  = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_0.json"])["test_0.json"]['results']
+        other_results = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_6_other.json"])["test_6_other.json"]['results']
+
+        engine  = MosaicEngine(input_file="test_0.py", DEBUG=False)
+        objects = engine.prepare()
+        prepared_models = len(_PREPARED_OBJECTS)
+
+        #Warm requests, new engines skip the setup.
+        engine       = MosaicEngine(input_file="test_0.py", DEBUG=False)
+        engine.parse = None
+        results      = engine.execute()
+        for label, data_results in full_results.items():
+            pd.testing.assert_frame_equal(data_results, results[label])
+        results = engine.execute(event={'file': 'test_6_request.json', 'input': {'data': data[:200]}})
+        for label, data_results in other_results.items():
+            pd.testing.assert_frame_equal(data_results, results[label])
+        #The input of a request is not written, the next requests cannot read it.
+        self.assertFalse(os.path.exists("data/test_6_request.json"))
+        with self.assertRaises(FileNotFoundError):
+            engine.execute(event={'file': 'test_6_request.json'})
+        with self.assertRaises(RequestInputException):
+            engine.execute(event={'file': '../test_6_request.json', 'input': {'data': data[:200]}})
+
+        self.assertIs(engine.prepare(), objects)
+        self.assertEqual(len(_PREPARED_OBJECTS), prepared_models)
+        self.assertEqual(engine.get_batch_source(objects=objects).file, "test_0.json")
+        return
+
+    def test_7(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("data/test_0.json", "r") as data_f:
+            data = json.load(data_f)['data']
+        field_b = [{**d, 'avgTemp': d['avgTemp']-2.0, 'avgHumidity': min(100.0, d['avgHumidity']+8.0)} for d in data[:300]]
+        with open("data/test_7_a.json", "w") as data_f:
+            json.dump({'data': data[:200]}, data_f)
+        with open("data/test_7_b.json", "w") as data_f:
+            json.dump({'data': field_b}, data_f)
+
+        full_results = MosaicEngine(input_file="test_0.py", DEBUG=False).run_batch(sources=["test_7_b.json"])["test_7_b.json"]['results']
+        MosaicEngine(input_file="test_4.py", DEBUG=False).run_batch(sources=["test_7_a.json"])
+        results = MosaicEngine(input_file="test_4.py", DEBUG=False).run_batch(sources=["test_7_b.json"])["test_7_b.json"]['results']
+        for label, data_results in full_results.items():
+            pd.testing.assert_frame_equal(data_results, results[label])
+
+        #Another field with the same input file (eg. AWS Lambda).
+        with open("data/test_7_a.json", "w") as data_f:
+            json.dump({'data': field_b}, data_f)
+        results = MosaicEngine(input_file="test_4.py", DEBUG=False).run_batch(sources=["test_7_a.json"])["test_7_a.json"]['results']
+        for label, data_results in full_results.items():
+            pd.testing.assert_frame_equal(data_results, results[label])
+        return
+
+    def test_8(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("models/test_0.py", "r") as model_f:
+            model = model_f.read()
+        for results_format in ['csv', 'npz']:
+            for evaluation in ['batch', 'streaming']:
+                with open(f"models/test_8_{evaluation}.py", "w") as model_f:
+                    model_f.write(model.replace("granularity='daily',", f"granularity='daily', evaluation='{evaluation}', chunk_days=20, results_format='{results_format}',"))
+            for storage_backend in ['file', 'memory']:
+                with self.subTest(results_format=results_format, storage_backend=storage_backend):
+                    full_results = MosaicEngine(input_file="test_8_batch.py", DEBUG=False, storage_backend=storage_backend).run_batch(sources=["test_0.json"])["test_0.json"]['results']
+                    results      = MosaicEngine(input_file="test_8_streaming.py", DEBUG=False, storage_backend=storage_backend).run_batch(sources=["test_0.json"])["test_0.json"]['results']
+                    for label, data in full_results.items():
+                        pd.testing.assert_frame_equal(data, results[label])
+        
+        #Outputs are chained, they cannot be streamed.
+        with open("models/test_8.py", "w") as model_f:
+            model_f.write(model.replace("outputs=['infection'],", "outputs=['infection', 'secondary'],").replace(
+                "granularity='daily',", "granularity='daily', evaluation='streaming',").replace(
+                "infection_output_rule=", "secondary=[DayOfYear(column='doy_secondary', target='sampleDate')],\n    secondary_output_rule="
+                "SelectMaxAndCompare(column='secondary', target='infection', condition='goet1.0', ref=0),\n    infection_output_rule="))
+        results = MosaicEngine(input_file="test_8.py", DEBUG=False).run_batch(sources=["test_0.json"])["test_0.json"]
+        self.assertEqual(results['status'], 'failed')
+        self.assertIn("'streaming' evaluation allows a single output", results['error'])
+        return
+
+    def test_9(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("data/test_0.json", "r") as data_f:
+            data = json.load(data_f)['data']
+        with open("models/test_9.py", "r") as model_f:
+            model = model_f.read()
+        with open("models/test_9_batch.py", "w") as model_f:
+            model_f.write(model.replace("evaluation='incremental',", ""))
+        fields = {
+            'a': data, 
+            'b': [{**d, 'avgTemp': d['avgTemp']-2.0, 'avgHumidity': min(100.0, d['avgHumidity']+8.0), 'rain': d['rain']*2} for d in data]}
+        full_results = dict()
+        for field, field_data in fields.items():
+            with open(f"data/test_9_{field}.json", "w") as data_f:
+                json.dump({'data': field_data}, data_f)
+            full_results[field] = MosaicEngine(input_file="test_9_batch.py", DEBUG=False).run_batch(sources=[f"test_9_{field}.json"])[f"test_9_{field}.json"]['results']
+        
+        #Requests of both fields have the same input file, each one continues the state of its field.
+        engine = MosaicEngine(input_file="test_9.py", DEBUG=False)
+        for rows in [slice(0, 200), slice(165, None)]:
+            for field, field_data in fields.items():
+                results = engine.execute(event={'file': 'data.json', 'input': {'data': field_data[rows]}, 'field': field})
+                for label, data_results in full_results[field].items():
+                    pd.testing.assert_frame_equal(data_results.loc[results[label].index], results[label])
+        self.assertEqual(len(results['agro_model_results']), len(data)-200+1)
+        
+        state_files = [f for f in os.listdir("state") if f.endswith("_state.json")]
+        self.assertEqual(len(state_files), 2)
+        for state_file in state_files:
+            with open(f"state/{state_file}", "r") as state_f:
+                carry_over = json.load(state_f)['carry_over']['infection']
+            self.assertListEqual(['0_gdd', '1_wet', '2_rain_acc', 'output_0_infection'], list(carry_over.keys()))
+        return
+
+    def get_size(self, obj:object)->int:
+        #Number of the objects reachable from obj, but modules, classes and functions.
+        seen, stack = set(), [obj]
+        while stack:
+            item = stack.pop()
+            if id(item) in seen or isinstance(item, (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType)):
+                continue
+            seen.add(id(item))
+            #Instances dicts are made when first read (eg. by deepcopy), reading them counts all of them.
+            if hasattr(item, '__dict__'):
+                stack.append(vars(item))
+            stack.extend(gc.get_referents(item))
+        return len(seen)
+
+    def test_10(self):
+        #Home folder where data | models are stored for the run-test
+        try:
+            os.chdir("temp/") 
+        except:
+            pass
+        with open("data/test_0.json", "r") as data_f:
+            data = json.load(data_f)['data']
+
+        engine          = MosaicEngine(input_file="test_0.py", DEBUG=False)
+        objects         = engine.prepare()
+        prepared_models = len(_PREPARED_OBJECTS)
+        prepared_size   = self.get_size(objects)
+
+        for request in range(5):
+            engine.execute()
+            engine.execute(event={'file': 'test_10_request.json', 'input': {'data': data[:100+request*20]}})
+            self.assertIs(engine.prepare(), objects)
+            self.assertEqual(len(_PREPARED_OBJECTS), prepared_models)
+            self.assertEqual(self.get_size(objects), prepared_size)
+        return
+
 if __name__ == '__main__':
     unittest.main()
-
@@ -0,0 +1,76 @@
+import unittest
+
+import mosaic_framework.vault.vault as vault
+from mosaic_framework.vault.vault import MosaicVault, _SECRETS
+from mosaic_framework.vault.exceptions import SecretNotMappedException
+
+class CountingSecret():
+    """
+    Secret that counts the requests to the secret manager.
+    """
+    requests = 0
+
+    def __init__(self, secret_name:str, **kwargs) -> None:
+        self.secret_name = secret_name
+        self.params      = kwargs
+
+    def get(self):
+        CountingSecret.requests += 1
+        return f"{self.secret_name}_{self.params.get('stage')}"
+
+class TestMosaicVault(unittest.TestCase):
+    """
+    Testing MosaicVault:
+        test_0: tests that a secret is retrieved once for each name and params, then it is reused by every MosaicVault.
+        test_1: tests that a secret not mapped raises SecretNotMappedException.
+        test_2: tests that a secret is retrieved again when it expires or it is evicted.
+        test_3: tests that params with values that are not hashable (eg. lists) key a secret.
+    """
+    def setUp(self) -> None:
+        _SECRETS.clear()
+        CountingSecret.requests = 0
+        self.secrets_ttl        = vault.SECRETS_TTL
+        return
+    def tearDown(self) -> None:
+        _SECRETS.clear()
+        vault.SECRETS_TTL = self.secrets_ttl
+        return
+
+    def test_0(self):
+        self.assertEqual(MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop'), "Mosaic_api_keys_made_develop")
+        self.assertEqual(MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop'), "Mosaic_api_keys_made_develop")
+        self.assertEqual(CountingSecret.requests, 1)
+        self.assertEqual(MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='production'), "Mosaic_api_keys_made_production")
+        self.assertEqual(MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='disease', stage='develop'), "Mosaic_api_keys_disease_develop")
+        self.assertEqual(CountingSecret.requests, 3)
+        return
+
+    def test_1(self):
+        with self.assertRaises(SecretNotMappedException):
+            MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='not-mapped', stage='develop')
+        return
+
+    def test_2(self):
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop')
+        MosaicVault().evict_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop')
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop')
+        self.assertEqual(CountingSecret.requests, 2)
+        #Evicting a secret not retrieved does nothing.
+        MosaicVault().evict_secret(secret_class=CountingSecret, secret_name='disease', stage='develop')
+
+        vault.SECRETS_TTL = 0
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop')
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop')
+        self.assertEqual(CountingSecret.requests, 4)
+        return
+
+    def test_3(self):
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop', scopes=['read', 'write'])
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop', scopes=['read', 'write'])
+        self.assertEqual(CountingSecret.requests, 1)
+        MosaicVault().retrieve_secret(secret_class=CountingSecret, secret_name='api-xmade', stage='develop', scopes=['read'])
+        self.assertEqual(CountingSecret.requests, 2)
+        return
+
+if __name__ == '__main__':
+    unittest.main()
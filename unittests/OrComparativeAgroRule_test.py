@@ -0,0 +1,20 @@
+import unittest
+
+from mosaic_framework.core.comparative_factors import OrComparativeAgroRule
+from unittests.comparative_agro_rule import ComparativeAgroRuleTest
+
+class TestOrComparativeAgroRule(ComparativeAgroRuleTest, unittest.TestCase):
+    """
+    Testing OrComparativeAgroRule (fixture in ComparativeAgroRuleTest):
+        test_0: tests a simple case, with two implicit rules.
+        test_1: tests 'vectorized' mode against 'reference' mode, on random data.
+    """
+    rule_class = OrComparativeAgroRule
+
+    def test_0(self):
+        result = self.get_rule().evaluate(data=self.get_data())
+        self.assertListEqual([1, 1, 0, 1, 0, 1], result['out_column'].values.tolist())
+        return
+
+if __name__ == '__main__':
+    unittest.main()
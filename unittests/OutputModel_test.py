@@ -1,5 +1,9 @@
+import os
 import json
+import shutil
 import inspect
+import tempfile
+import numpy as np
 import pandas as pd
 import unittest
 
@@ -7,23 +11,61 @@ from mosaic_framework.core.output_model import OutputModel
 from mosaic_framework.core.output_factors import SelectMaxAndCompare
 from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
 from mosaic_framework.config.configuration import MODEL
-from mosaic_framework.core.comparative_factors import SimpleComparativeRule, AndComparativeAgroRule
+from mosaic_framework.core.comparative_factors import SimpleComparativeRule, AndComparativeAgroRule, ComparativeTimeframeRule, ApplyAndBreakOnCondition
+from mosaic_framework.core.value_factors import ReferenceValue
 
 class TestOutputModel(unittest.TestCase):
     """
     TestOutputModel:
         test_0  : ...
+        test_2  : streaming evaluation, chunks of days give the results of the whole data.
+        test_3  : streaming evaluation, rules with a state from the start of the data are evaluated as a whole.
+        test_4  : streaming evaluation, rules registered into the MosaicRulesHub do not depend on the number of chunks.
     """
 
     def setUp(self) -> None:
-        self.data_folder = "unittests/data/OutputModel/"
+        self.data_folder = os.path.abspath("unittests/data/OutputModel") + "/"
+        #Dumps of the OutputModel (results/<label>_*.csv) are written in a temp folder.
+        self.cwd         = os.getcwd()
+        self.folder      = tempfile.mkdtemp()
+        os.mkdir(self.folder + "/results")
+        os.chdir(self.folder)
         self.config      = MODEL.get("data").get("rules_hub")
         self.rules_hub   = MosaicRulesHub(config=self.config)
         self.rules_hub.add_variable("debug", content=False, is_immutable=True)
 
         return 
     def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        shutil.rmtree(self.folder)
         return
+
+    def get_hourly_data(self, days:int) -> pd.DataFrame:
+        rng = np.random.default_rng(seed=0)
+        return pd.DataFrame(data={
+            'sampleDate': pd.date_range('2024-01-01', periods=days*24, freq='h', tz='UTC').strftime('%Y-%m-%dT%H:%M:%S+00:00'),
+            'avgTemp'   : rng.uniform(5.0, 30.0, days*24).round(1),
+            'rain'      : rng.choice([0.0, 0.0, 0.0, 1.5], days*24)})
+
+    def get_output_model(self, rules:list, chunk_days:int=None, ref:int=1) -> OutputModel:
+        output_model = OutputModel(
+            label='test_output_model',
+            previsionDay=pd.to_datetime('2024-01-10T00:00:00+00:00'),
+            days=1,
+            data=self.get_hourly_data(days=12),
+            history=(10,0,0),
+            rules_hub=self.rules_hub,
+            chunk_days=chunk_days
+        )
+        for r in rules:
+            for nested_r in [r] + r.__dict__.get('rules', list()):
+                nested_r.set_rules_hub(rules_hub=self.rules_hub)
+            output_model.add_factor(factor=r)
+
+        rf = SelectMaxAndCompare(column='infection', target='infection_cond', condition='goet1.0', ref=ref)
+        rf.set_rules_hub(rules_hub=self.rules_hub)
+        output_model.set_output_rule(factor=rf)
+        return output_model
      
     def test_0_one_rule(self): 
         with open(self.data_folder + f"{str(inspect.currentframe().f_code.co_name)}.json", "r+") as test_data_f:
@@ -86,6 +128,50 @@ class TestOutputModel(unittest.TestCase):
 
         return
 
+    def test_2_streaming_chunks(self):
+        def get_rules():
+            return [
+                ComparativeTimeframeRule(column='rain_cond', target='rain', timeframe=30, aggregation_fnc='sum', condition='goet15.0'),
+                ReferenceValue(column='rain_cond_ref', target='rain_cond', ref=30),
+                AndComparativeAgroRule(
+                    column='infection_cond',
+                    rules=[
+                        SimpleComparativeRule(target='avgTemp', condition='goet25.0', is_implicit=True),
+                        SimpleComparativeRule(target='rain_cond_ref', condition='goet1.0', is_implicit=True)])]
+
+        for ref in [0, 2]:
+            results, compact_results = self.get_output_model(rules=get_rules(), ref=ref).estimate()
+            for chunk_days in [1, 3]:
+                output_model = self.get_output_model(rules=get_rules(), chunk_days=chunk_days, ref=ref)
+                chunks       = list(output_model.estimate_chunks())
+                self.assertEqual(len(chunks), int(np.ceil(compact_results.shape[0]/chunk_days)))
+                pd.testing.assert_frame_equal(results, pd.concat([r for r, _ in chunks]))
+                pd.testing.assert_frame_equal(compact_results, pd.concat([c for _, c in chunks]))
+        return
+
+    def test_3_streaming_fallback(self):
+        rules = [
+            ApplyAndBreakOnCondition(column='rain_acc', target='rain', fnc='sum', reset_value=0, break_condition='lt1.0'),
+            SimpleComparativeRule(column='infection_cond', target='rain_acc', condition='goet3.0')]
+
+        output_model = self.get_output_model(rules=rules, chunk_days=1)
+        self.assertIsNone(output_model.get_chunk_lag(rows_per_day=24))
+        self.assertEqual(len(list(output_model.estimate_chunks())), 1)
+        return
+
+    def test_4_streaming_rules_hub(self):
+        rules_imgs = list()
+        for chunk_days in [None, 1, 3]:
+            self.rules_hub = MosaicRulesHub(config=self.config)
+            self.rules_hub.add_variable("debug", content=False, is_immutable=True)
+            rules = [
+                SimpleComparativeRule(column='rain_cond', target='rain', condition='goet1.0', is_implicit=True),
+                SimpleComparativeRule(column='infection_cond', target='rain_cond', condition='goet1.0')]
+            list(self.get_output_model(rules=rules, chunk_days=chunk_days).estimate_chunks())
+            rules_imgs.append(len(self.rules_hub.rule_imgs))
+        self.assertListEqual(rules_imgs, [rules_imgs[0]]*3)
+        return
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,27 @@
+import unittest
+import pandas as pd
+
+from mosaic_framework.model.result_cache import ResultCache
+
+class TestResultCache(unittest.TestCase):
+    """
+    Testing ResultCache:
+        test_0: tests that the key depends on the shared inputs of the rules (eg. v_look_up_table), not on their order.
+    """
+    def setUp(self) -> None:
+        self.data = pd.DataFrame(data={'sampleDate': ['2024-01-01 00:00', '2024-01-01 01:00'], 'avgTemp': [10.0, 11.5]})
+        return
+    def tearDown(self) -> None:
+        return
+
+    def test_0(self):
+        growth_model = {'growth_model': [{'phenostage': 'BBCH 10', 'gdd': 120.0}, {'phenostage': 'BBCH 60', 'gdd': 480.0}]}
+        key = ResultCache.get_key(model_hash='hash', label='agro_model', data=self.data, shared={'granularity': 'daily', 'v_look_up_table': growth_model})
+        self.assertEqual(key, ResultCache.get_key(model_hash='hash', label='agro_model', data=self.data, shared={'v_look_up_table': growth_model, 'granularity': 'daily'}))
+        self.assertNotEqual(key, ResultCache.get_key(model_hash='hash', label='agro_model', data=self.data, shared={'granularity': 'daily', 'v_look_up_table': {}}))
+        changed_model = {'growth_model': [{'phenostage': 'BBCH 10', 'gdd': 120.0}, {'phenostage': 'BBCH 60', 'gdd': 500.0}]}
+        self.assertNotEqual(key, ResultCache.get_key(model_hash='hash', label='agro_model', data=self.data, shared={'granularity': 'daily', 'v_look_up_table': changed_model}))
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import unittest
+from statistics import mean
+
+from mosaic_framework.core.math_utils import get_rolling_aggregation
+from mosaic_framework.core.math_factors import ApplyFunctionOnRange
+from mosaic_framework.core.comparative_factors import ComparativeTimeframeRule
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+
+class TestRollingAggregation(unittest.TestCase):
+    """
+    Testing get_rolling_aggregation and the rules using it:
+        test_0: tests rolling aggregations against the window by window ones, with non finite and integer values.
+        test_1: tests that ApplyFunctionOnRange gives the same results in vectorized and reference mode, for each out of range policy.
+        test_2: tests that ComparativeTimeframeRule gives the same results in vectorized and reference mode, also with custom functions.
+    """
+    def setUp(self) -> None:
+        self.rules_hub_config = MODEL.get("data").get("rules_hub")
+        rain = np.array([0.0, 0.2, 0.0, 0.0, 1.4, 3.1, np.nan, 0.0, 0.0, 0.0, 0.6, np.inf, 0.0, 0.0, 0.1, 0.3, 0.0, 0.0])
+        self.data = pd.DataFrame(data={
+            'sampleDate': [f"2024-01-01 {i:02d}:00" for i in range(len(rain))],
+            'rain'      : rain,
+            'wet'       : np.where(np.nan_to_num(rain) > 0.0, 1, 0)})
+        return
+    def tearDown(self) -> None:
+        return
+
+    def get_rules_hub(self):
+        rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+        rules_hub.add_variable("debug", content=False, is_immutable=True)
+        return rules_hub
+
+    def test_0(self):
+        for column in ['rain', 'wet']:
+            values = self.data[column].values
+            for fnc in [sum, mean, min, max]:
+                for window in [1, 3, 5]:
+                    if column == 'wet' and fnc is mean:
+                        self.assertIsNone(get_rolling_aggregation(values=values, window=window, fnc=fnc))
+                        continue
+                    result   = get_rolling_aggregation(values=values, window=window, fnc=fnc)
+                    expected = [fnc(values[j-window+1:j+1]) for j in range(window-1, len(values))]
+                    np.testing.assert_allclose(result[window-1:], expected, rtol=1e-12)
+        self.assertIsNone(get_rolling_aggregation(values=self.data['rain'].values, window=3, fnc=lambda x:sum(x)))
+        return
+
+    def test_1(self):
+        for column in ['rain', 'wet']:
+            for function, on_out_of_range in [('sum', 'default'), ('sum', 'coerce'), ('max', 'default')]:
+                results = list()
+                for evaluation_mode in ['reference', 'vectorized']:
+                    rule = ApplyFunctionOnRange(column='rain_sum', target=column, function=function, range=[4, 1],
+                        on_out_of_range=on_out_of_range, evaluation_mode=evaluation_mode)
+                    rule.set_rules_hub(self.get_rules_hub())
+                    results.append(rule.evaluate(data=self.data.copy()))
+                pd.testing.assert_frame_equal(results[0], results[1])
+        return
+
+    def test_2(self):
+        for aggregation_fnc in ['sum', 'mean', lambda x:np.nansum(x)]:
+            results = list()
+            for evaluation_mode in ['reference', 'vectorized']:
+                rule = ComparativeTimeframeRule(column='rainy', target='rain', timeframe=3, condition='gt0.5',
+                    aggregation_fnc=aggregation_fnc, evaluation_mode=evaluation_mode)
+                rule.set_rules_hub(self.get_rules_hub())
+                results.append(rule.evaluate(data=self.data.copy()))
+            pd.testing.assert_frame_equal(results[0], results[1])
+        self.assertListEqual([0.0]*3, results[1]['rainy'].to_list()[:3])
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import os
+import shutil
+import tempfile
+import pandas as pd
+import unittest
+
+from mosaic_framework.core.rule_graph import RuleDependencyGraph, OUTPUT_NODE
+from mosaic_framework.core.output_model import OutputModel
+from mosaic_framework.core.output_factors import SelectMaxAndCompare
+from mosaic_framework.core.comparative_factors import SimpleComparativeRule, AndComparativeAgroRule, ComparativeTimeframeRule
+from mosaic_framework.core.value_factors import ReferenceValue
+from mosaic_framework.core.growth_models_factors import GDD
+from mosaic_framework.core.math_factors import Equation
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+
+class TestRuleDependencyGraph(unittest.TestCase):
+    """
+    Testing RuleDependencyGraph:
+        test_0: tests edges, dead rules and expired columns on implicit and explicit rules.
+        test_1: tests that rules with inputs detected during evaluation consume every previous rule.
+        test_2: tests that OutputModel gives the same results with and without the graph, skipping dead rules.
+        test_3: tests levels of independent rules, and that OutputModel gives the same results evaluating them concurrently.
+        test_4: tests that lags add up along the dependencies, skipping dead rules, and rules with a state from the start of the data.
+    """
+    def setUp(self) -> None:
+        self.rules_hub_config = MODEL.get("data").get("rules_hub")
+        self.data = pd.DataFrame(data={
+            'sampleDate': [d.strftime("%Y-%m-%dT%H:%M:%S+00:00") for d in pd.date_range('2024-01-01', periods=72, freq='h')],
+            'temp'      : [10.0+(i*7)%15 for i in range(72)],
+            'hum'       : [40.0+(i*11)%50 for i in range(72)]})
+        #Dumps of the OutputModel (results/<label>_*.csv) are written in a temp folder.
+        self.cwd    = os.getcwd()
+        self.folder = tempfile.mkdtemp()
+        os.mkdir(self.folder + "/results")
+        os.chdir(self.folder)
+        return
+    def tearDown(self) -> None:
+        os.chdir(self.cwd)
+        shutil.rmtree(self.folder)
+        return
+
+    def get_rules(self):
+        hot    = SimpleComparativeRule(target='temp', condition='goet15.0', is_implicit=True)
+        humid  = SimpleComparativeRule(target='hum', condition='goet60.0', is_implicit=True)
+        unused = SimpleComparativeRule(target='temp', condition='loet0.0', is_implicit=True)
+        risk   = Equation(column='risk', target=[hot.column, humid.column], apply=f'<{hot.column}>*<{humid.column}>')
+        cold   = AndComparativeAgroRule(column='cold', rules=[
+            SimpleComparativeRule(target='temp', condition='lt12.0', is_implicit=True),
+            SimpleComparativeRule(target='risk', condition='lt1.0', is_implicit=True)])
+        output = SelectMaxAndCompare(column='infection', target='risk', condition='goet1.0', ref=0)
+        return [hot, humid, unused, risk, cold], [output]
+
+    def test_0(self):
+        rules, output_rules = self.get_rules()
+        graph = RuleDependencyGraph(rules=rules, output_rules=output_rules)
+
+        self.assertListEqual([(0, 3), (1, 3), (3, 4), (3, OUTPUT_NODE)], graph.edges)
+        self.assertEqual({2}, graph.dead_rules)
+        self.assertDictEqual({3: [rules[0].column, rules[1].column]}, graph.expired_columns)
+        self.assertListEqual(['temp', 'risk'], graph.to_dict()['nodes'][4]['inputs'])
+        return
+
+    def test_1(self):
+        rules, output_rules = self.get_rules()
+        rules.insert(3, GDD(column='gdd', min_temp=10, max_temp=30))
+        graph = RuleDependencyGraph(rules=rules, output_rules=output_rules)
+
+        self.assertIsNone(graph.inputs[3])
+        self.assertListEqual([0, 1, 2], [p for p, c in graph.edges if c == 3])
+        self.assertEqual(set(), graph.dead_rules)
+        self.assertDictEqual({3: [rules[2].column], 4: [rules[0].column, rules[1].column]}, graph.expired_columns)
+        return
+
+    def get_output_model(self, rules, output_rules, rules_hub, **kwargs):
+        output_model = OutputModel(
+            label='test_rule_graph',
+            previsionDay=pd.to_datetime('2024-01-02T00:00:00+00:00'),
+            days=2,
+            data=self.data,
+            history=(1,0,0),
+            rules_hub=rules_hub,
+            **kwargs)
+        for r in rules+output_rules:
+            r.set_rules_hub(rules_hub)
+            for nested_r in r.__dict__.get('rules', []):
+                nested_r.set_rules_hub(rules_hub)
+        for r in rules:
+            output_model.add_factor(factor=r)
+        output_model.set_output_rule(factor=output_rules)
+        return output_model
+
+    def test_2(self):
+        results = list()
+        for use_graph in [False, True]:
+            rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+            rules_hub.add_variable("debug", content=False, is_immutable=True)
+            rules, output_rules = self.get_rules()
+            output_model = self.get_output_model(rules, output_rules, rules_hub, 
+                rule_graph=RuleDependencyGraph(rules=rules, output_rules=output_rules) if use_graph else None)
+            results.append(output_model.estimate())
+            self.assertEqual(use_graph, not rules[2].column in [ri['column'] for ri in rules_hub.rule_imgs])
+
+        pd.testing.assert_frame_equal(results[0][0], results[1][0])
+        pd.testing.assert_frame_equal(results[0][1], results[1][1])
+        self.assertListEqual(['sampleDate', 'temp', 'hum', 'risk', 'cold', 'infection'], results[1][0].columns.to_list())
+        return
+
+    def test_3(self):
+        rules, output_rules = self.get_rules()
+        rules.insert(2, Equation(column='temp_f', target='temp', apply='<temp>*1.8+32'))
+        graph = RuleDependencyGraph(rules=rules, output_rules=output_rules)
+        self.assertListEqual([[0, 1, 2, 3], [4], [5]], graph.get_levels())
+
+        results = list()
+        for max_workers in [1, 4]:
+            rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+            rules_hub.add_variable("debug", content=False, is_immutable=True)
+            rules, output_rules = self.get_rules()
+            rules.insert(2, Equation(column='temp_f', target='temp', apply='<temp>*1.8+32'))
+            output_model = self.get_output_model(rules, output_rules, rules_hub, max_workers=max_workers,
+                rule_graph=RuleDependencyGraph(rules=rules, output_rules=output_rules))
+            results.append(output_model.estimate())
+
+        pd.testing.assert_frame_equal(results[0][0], results[1][0])
+        pd.testing.assert_frame_equal(results[0][1], results[1][1])
+        self.assertListEqual(['sampleDate', 'temp', 'hum', 'temp_f', 'risk', 'cold', 'infection'], results[1][0].columns.to_list())
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,6 +3,7 @@ import json
 import inspect
 import pandas as pd
 import unittest
+import numpy as np
 
 from mosaic_framework.core.comparative_factors import SimpleComparativeRule
 from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
@@ -13,6 +14,8 @@ class TestSimpleComparativeRule(unittest.TestCase):
     Testing SimpleComparativeRule:
         test_0: tests a simple case, with no on_condition.
         test_1: tests a simple case, with on_condition.
+        test_2: tests 'vectorized' mode against 'reference' mode, for each comparison.
+        test_3: tests 'vectorized' mode against 'reference' mode, with boolean_mapping.
     """
     def setUp(self) -> None:
         self.data_folder = "unittests/data/SimpleComparativeRule/"
@@ -56,6 +59,40 @@ class TestSimpleComparativeRule(unittest.TestCase):
             result = simple_comparative_rule.evaluate(data=data)
             self.assertListEqual(result_to_assert, result['out_column'].values.tolist())
         return
+    def test_2(self):
+        rng  = np.random.default_rng(seed=0)
+        values = rng.integers(low=-5, high=5, size=500).astype(float)
+        values[rng.integers(low=0, high=500, size=20)] = np.nan
+        data = pd.DataFrame(data={'sampleDate': range(500), 'in_column': values})
+        for condition in ['gt0.0', 'goet1.0', 'lt-2.0', 'loet3.5', 'et0.0']:
+            with self.subTest(condition=condition):
+                results = dict()
+                for evaluation_mode in ['vectorized', 'reference']:
+                    simple_comparative_rule = SimpleComparativeRule(
+                        target='in_column', 
+                        column='out_column', 
+                        condition=condition, 
+                        evaluation_mode=evaluation_mode)
+                    simple_comparative_rule.set_rules_hub(self.rules_hub)
+                    results[evaluation_mode] = simple_comparative_rule.evaluate(data=data)['out_column']
+                self.assertListEqual(results['reference'].values.tolist(), results['vectorized'].values.tolist())
+                self.assertEqual(results['reference'].dtype, results['vectorized'].dtype)
+        return
+    def test_3(self):
+        data = pd.DataFrame(data={'sampleDate': range(6), 'in_column': [0.0, 1.0, 2.0, 3.0, -1.0, 5.0]})
+        results = dict()
+        for evaluation_mode in ['vectorized', 'reference']:
+            simple_comparative_rule = SimpleComparativeRule(
+                target='in_column', 
+                column='out_column', 
+                condition='goet2.0', 
+                boolean_mapping={0: 1.0, 1: 0.0},
+                evaluation_mode=evaluation_mode)
+            simple_comparative_rule.set_rules_hub(self.rules_hub)
+            results[evaluation_mode] = simple_comparative_rule.evaluate(data=data)['out_column'].values.tolist()
+        self.assertListEqual([1.0, 1.0, 0.0, 0.0, 1.0, 0.0], results['vectorized'])
+        self.assertListEqual(results['reference'], results['vectorized'])
+        return
 
 if __name__ == '__main__':
     unittest.main()
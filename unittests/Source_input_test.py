@@ -2,11 +2,13 @@ import os
 import json
 import unittest
 import shutil
+import pandas as pd
 
 from mosaic_framework.environment.source import Source
 from mosaic_framework.data_storage.data_storage import MosaicDataStorage
 from mosaic_framework.data_storage.shared_memory import MosaicSharedMemory
 from mosaic_framework.data_storage.resource import Resource
+from mosaic_framework.data_storage.writers import get_frame_format
 from mosaic_framework.environment.columns.columns import *
 
 class TestSource(unittest.TestCase):
@@ -15,6 +17,8 @@ class TestSource(unittest.TestCase):
         test_0: Entire processing of Source Component.
         test_1: Processing with columns equal to 'auto' (or not specified).
         test_2: Processing with columns specified.
+        test_3: 'mapped' loading gives the same data of the 'resource' one.
+        test_4: 'mapped' loading gives the same data of the 'resource' one for a CSV input, without index columns.
     """
 
     def setUp(self) -> None:
@@ -95,6 +99,54 @@ class TestSource(unittest.TestCase):
         self.assertDictEqual(self.test_assertResult_file['test_source_2'], test_source_2_columns)
         return
 
+    def test_3_loading_mapped(self):
+        data = dict()
+        for loading in ['resource', 'mapped']:
+            data_storage = MosaicDataStorage(DEBUG=False)
+            data_storage.allocate()
+            source = Source(
+                label=f'test_source_{loading}', 
+                environment="local", 
+                file="data.json",
+                loading=loading
+            )
+            source.set_storage(data_storage=data_storage)
+            source.set_memory(shared_memory=MosaicSharedMemory(DEBUG=False))
+
+            source.run()
+
+            data[loading] = data_storage.get_resource(label=f'test_source_{loading}')
+            data[loading] = (data[loading].file_type, data[loading].get_data())
+            data_storage.deallocate()
+        self.assertEqual('json', data['resource'][0])
+        self.assertEqual(get_frame_format(), data['mapped'][0])
+        pd.testing.assert_frame_equal(pd.DataFrame(data['resource'][1]), data['mapped'][1])
+        return
+
+    def test_4_loading_mapped_csv(self):
+        dates = pd.date_range("2024-01-01 00:00", periods=48, freq="h").strftime("%Y-%m-%d %H:%M")
+        pd.DataFrame({'sample_date': dates, 'temp': [10.0+i%24 for i in range(48)], 'rh': [60+i%30 for i in range(48)]}).to_csv("data/data.csv", index=False)
+        data = dict()
+        for loading in ['resource', 'mapped']:
+            data_storage = MosaicDataStorage(DEBUG=False)
+            data_storage.allocate()
+            source = Source(
+                label=f'test_source_{loading}', 
+                environment="local", 
+                file="data.csv",
+                loading=loading
+            )
+            source.set_storage(data_storage=data_storage)
+            source.set_memory(shared_memory=MosaicSharedMemory(DEBUG=False))
+
+            source.run()
+
+            data[loading] = data_storage.get_resource(label=f'test_source_{loading}').get_data()
+            data_storage.deallocate()
+        self.assertListEqual(['sample_date', 'temp', 'rh'], data['resource'].columns.to_list())
+        pd.testing.assert_frame_equal(data['resource'], data['mapped'])
+        return
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import unittest
+from statistics import mean, median
+
+from mosaic_framework.core.math_utils import get_window_aggregation
+from mosaic_framework.core.output_factors import ApplyWindowing, ApplySusceptibility
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+
+class TestWindowAggregation(unittest.TestCase):
+    """
+    Testing get_window_aggregation and the output rules using it, on randomized series:
+        test_0: tests window aggregations against the window by window ones, with non finite and integer values.
+        test_1: tests that ApplyWindowing gives the same results in vectorized and reference mode, for each window.
+        test_2: tests that ApplySusceptibility gives the same results in vectorized and reference mode.
+    """
+    def setUp(self) -> None:
+        self.rules_hub_config = MODEL.get("data").get("rules_hub")
+        self.rng = np.random.default_rng(seed=7)
+        return
+    def tearDown(self) -> None:
+        return
+
+    def get_rules_hub(self):
+        rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+        rules_hub.add_variable("debug", content=False, is_immutable=True)
+        rules_hub.add_variable("granularity", content='daily', is_immutable=True)
+        return rules_hub
+
+    def get_series(self, length:int, dtype:str):
+        if dtype == 'int':
+            return self.rng.integers(0, 5, length)
+        values = np.round(self.rng.random(length)*4, 1)
+        if dtype == 'nan':
+            values[self.rng.random(length) < 0.15] = np.nan
+        return values
+
+    def get_daily_data(self, values):
+        return pd.DataFrame(data={
+            'sampleDate'    : [d.strftime("%Y-%m-%d 00:00") for d in pd.date_range('2024-03-01', periods=len(values), freq='D')],
+            'risk'          : values,
+            'susceptibility': 1})
+
+    def test_0(self):
+        for _ in range(200):
+            values  = self.get_series(length=int(self.rng.integers(0, 25)), dtype=self.rng.choice(['float', 'int', 'nan']))
+            offsets = sorted(set(self.rng.integers(-4, 5, int(self.rng.integers(1, 5))).tolist()))
+            for fnc in [sum, mean, median, min, max]:
+                result = get_window_aggregation(values=values, offsets=offsets, fnc=fnc)
+                if result is None:
+                    self.assertTrue(values.dtype.kind == 'i' and fnc in [mean, median])
+                    continue
+                for i in range(len(values)):
+                    if all([0 <= i+o < len(values) for o in offsets]):
+                        expected = fnc([values[i+o] for o in offsets])
+                        np.testing.assert_allclose(result[i], expected, rtol=1e-12)
+        return
+
+    def test_1(self):
+        for _ in range(100):
+            data   = self.get_daily_data(values=self.get_series(length=int(self.rng.integers(2, 20)), dtype=self.rng.choice(['float', 'int', 'nan'])))
+            window = (int(self.rng.integers(0, 6)), int(self.rng.integers(0, 2)), int(self.rng.integers(0, 4)))
+            if window == (0, 0, 0):
+                continue
+            #Only sum supports the empty window of the first value, when there are just past values.
+            window_fnc = self.rng.choice(['sum', 'max', 'mean']) if window[1]+window[2] > 0 else 'sum'
+            results = list()
+            for evaluation_mode in ['reference', 'vectorized']:
+                rule = ApplyWindowing(column='infection', target='risk', window_past=window[0], window_current=window[1],
+                    window_future=window[2], select_fnc='max', window_fnc=window_fnc, evaluation_mode=evaluation_mode)
+                rule.set_rules_hub(self.get_rules_hub())
+                results.append(rule.evaluate(data=data.copy())[0])
+            pd.testing.assert_frame_equal(results[0], results[1], check_exact=False, rtol=1e-12)
+        return
+
+    def test_2(self):
+        for _ in range(100):
+            data = self.get_daily_data(values=self.get_series(length=int(self.rng.integers(2, 20)), dtype=self.rng.choice(['float', 'int', 'nan'])))
+            data['susceptibility'] = int(self.rng.integers(-2, 3))
+            susceptibility_window  = int(self.rng.integers(1, 5))
+            results = list()
+            for evaluation_mode in ['reference', 'vectorized']:
+                rule = ApplySusceptibility(column='infection', target='risk', select_fnc='max',
+                    susceptibility_window=susceptibility_window, evaluation_mode=evaluation_mode)
+                rule.set_rules_hub(self.get_rules_hub())
+                results.append(rule.evaluate(data=data.copy())[0])
+            pd.testing.assert_frame_equal(results[0], results[1])
+        return
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from mosaic_framework.core.comparative_factors import SimpleComparativeRule
+from mosaic_framework.core.environment.rules_hub import MosaicRulesHub
+from mosaic_framework.config.configuration import MODEL
+
+class ComparativeAgroRuleTest():
+    """
+    Fixture of the tests of And|OrComparativeAgroRule, mixed with unittest.TestCase. 
+    The rule compares 'temp' >= 15.0 and 'hum' >= 70.0, in the 'out_column' column.
+        test_1: tests 'vectorized' mode against 'reference' mode, on random data.
+    """
+    rule_class = None
+
+    def setUp(self) -> None:
+        self.rules_hub_config      = MODEL.get("data").get("rules_hub")
+        self.rules_hub = MosaicRulesHub(config=self.rules_hub_config)
+        self.rules_hub.add_variable("debug", content=False, is_immutable=True)
+        return 
+    def tearDown(self) -> None:
+        return
+    
+    def get_rule(self, **kwargs):
+        rule = self.rule_class(
+            column='out_column', 
+            rules=[
+                SimpleComparativeRule(target='temp', condition='goet15.0', is_implicit=True),
+                SimpleComparativeRule(target='hum', condition='goet70.0', is_implicit=True)],
+            **kwargs)
+        rule.set_rules_hub(self.rules_hub)
+        for r in rule.rules:
+            r.set_rules_hub(self.rules_hub)
+        return rule
+
+    def get_data(self) -> pd.DataFrame:
+        return pd.DataFrame(data={
+            'sampleDate': [f"2024-01-01 0{i}:00" for i in range(6)], 
+            'temp'      : [20.0, 10.0, 10.0, 16.0, 14.0, 30.0],
+            'hum'       : [60.0, 80.0, 50.0, 90.0, 20.0, 10.0]})
+
+    def test_1(self):
+        rng  = np.random.default_rng(seed=0)
+        data = pd.DataFrame(data={
+            'sampleDate': [str(i) for i in range(300)], 
+            'temp'      : rng.uniform(low=0.0, high=30.0, size=300),
+            'hum'       : rng.uniform(low=40.0, high=100.0, size=300)})
+        results = {m: self.get_rule(evaluation_mode=m).evaluate(data=data) for m in ['vectorized', 'reference']}
+        self.assertListEqual(results['reference']['out_column'].values.tolist(), results['vectorized']['out_column'].values.tolist())
+        return
@@ -0,0 +1,47 @@
+from mosaic_framework.environment.source import Source
+from mosaic_framework.model.model import Model
+from mosaic_framework.retrieving.data_bridge import DataBridge
+from mosaic_framework.core.comparative_factors import ApplyAndBreakOnCondition
+from mosaic_framework.core.math_factors import Equation, ApplyFunctionOnRange
+from mosaic_framework.core.growth_models_factors import GDD
+from mosaic_framework.core.output_factors import ApplySusceptibility
+
+
+Source(
+    label='test_source', 
+    environment="local",
+    file="test_0.json")
+
+DataBridge(
+    label='source_to_model_databridge',
+    connect_in='test_source',
+    connect_out='agro_model')
+
+Model(
+    label="agro_model", 
+    outputs=['infection'],
+    history=3,
+    granularity='daily',
+    evaluation='incremental',
+    infection=[
+        GDD(column='gdd', min_temp=10, max_temp=30, cumulate=True),
+        Equation(
+            column='wet',
+            target=['wet[-1]', 'avgHumidity'],
+            apply='<wet[-1]>*0.5+<avgHumidity>/100'),
+        ApplyAndBreakOnCondition(column='rain_acc', target='rain', fnc='sum', reset_value=0, break_condition='goet3.0'),
+        ApplyFunctionOnRange(
+            column='gdd_fnc',
+            target='gdd',
+            range=(2, 0),
+            function=sum),
+        Equation(
+            column='risk',
+            target=['wet', 'rain_acc', 'gdd_fnc'],
+            apply='round(<wet>+<rain_acc>/10+<gdd_fnc>/1000)'),
+        Equation(
+            column='susceptibility',
+            target=['avgTemp'],
+            apply='<avgTemp>*0+1')
+    ],
+    infection_output_rule=ApplySusceptibility(column='infection', target='risk', select_fnc='max', susceptibility_window=2))